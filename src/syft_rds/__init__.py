@@ -1,7 +1,46 @@
 __version__ = "0.5.0"
 
-from syft_rds.utils.paths import RDS_NOTEBOOKS_PATH, RDS_REPO_PATH  # noqa
-from syft_rds.display_utils.jupyter.display import display  # noqa
-from syft_core import Client as SyftBoxClient  # noqa
-from syft_rds.client.rds_client import RDSClient, init_session  # noqa
-from syft_rds.client.setup import discover_rds_apps  # noqa
+from typing import TYPE_CHECKING
+
+# The public API is imported on first access (PEP 562), so `import syft_rds`,
+# the CLI and server processes don't load the client and display dependencies upfront.
+_LAZY_IMPORTS = {
+    "RDS_NOTEBOOKS_PATH": "syft_rds.utils.paths",
+    "RDS_REPO_PATH": "syft_rds.utils.paths",
+    "display": "syft_rds.display_utils.jupyter.display",
+    "SyftBoxClient": "syft_core",
+    "RDSClient": "syft_rds.client.rds_client",
+    "init_session": "syft_rds.client.rds_client",
+    "FederatedRDSClient": "syft_rds.client.federated",
+    "discover_rds_apps": "syft_rds.client.setup",
+    "find_rds_servers": "syft_rds.client.setup",
+}
+# Attributes that are exported under a different name
+_ALIASES = {"SyftBoxClient": "Client"}
+
+__all__ = ["__version__", *_LAZY_IMPORTS]
+
+if TYPE_CHECKING:
+    from syft_core import Client as SyftBoxClient  # noqa
+    from syft_rds.client.federated import FederatedRDSClient  # noqa
+    from syft_rds.client.rds_client import RDSClient, init_session  # noqa
+    from syft_rds.client.setup import discover_rds_apps, find_rds_servers  # noqa
+    from syft_rds.display_utils.jupyter.display import display  # noqa
+    from syft_rds.utils.paths import RDS_NOTEBOOKS_PATH, RDS_REPO_PATH  # noqa
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), _ALIASES.get(name, name))
+    # Cache on the module, later lookups don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
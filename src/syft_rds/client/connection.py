@@ -1,6 +1,12 @@
+import copy
+import inspect
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Callable, Optional, get_type_hints
+from uuid import uuid4
+
+from loguru import logger
+from pydantic import BaseModel, PrivateAttr
 
 from syft_core import Client as SyftBoxClient
 from syft_core import SyftBoxURL
@@ -13,11 +19,17 @@ from syft_core.exceptions import SyftBoxException
 from syft_core.types import RelativePath
 from syft_event import SyftEvents
 from syft_event.deps import func_args_from_request
+from syft_event.types import Request, Response
 from syft_rpc import SyftRequest, SyftResponse, rpc
 from syft_rpc.protocol import SyftMethod, SyftStatus
 from syft_rpc.rpc import BodyType
 from syft_rpc.protocol import SyftTimeoutError, SyftFuture
 
+from syft_rds.client.singleflight import SingleFlight
+from syft_rds.utils.attachments import write_attachment
+from syft_rds.utils.constants import IN_PROCESS_HEADER
+from syft_rds.utils.metrics import MetricsRegistry
+
 
 class BlockingRPCConnection(ABC):
     def __init__(
@@ -27,6 +39,10 @@ class BlockingRPCConnection(ABC):
     ):
         self.sender_client = sender_client
         self.default_expiry = default_expiry
+        # Shared by all RPC client modules using this connection, to coalesce identical in-flight requests
+        self.singleflight: SingleFlight[SyftResponse] = SingleFlight()
+        # Round-trip latency per endpoint, recorded by the RPC client modules
+        self.metrics = MetricsRegistry()
 
     @abstractmethod
     def send(
@@ -39,6 +55,19 @@ class BlockingRPCConnection(ABC):
     ) -> SyftResponse:
         raise NotImplementedError()
 
+    def write_attachment(self, url: str, data: bytes) -> str:
+        """Write `data` as a binary attachment next to the requests sent to `url`.
+
+        Returns:
+            The attachment id, to be referenced from the request body.
+        """
+        syft_url = url if isinstance(url, SyftBoxURL) else SyftBoxURL(url)
+        request_dir = (
+            syft_url.to_local_path(self.sender_client.workspace.datasites)
+            / self.sender_client.email
+        )
+        return write_attachment(request_dir, data)
+
     def _serialize(self, body: BodyType) -> str:
         # NOTE to enable partial BaseModel updates, always exclude unset fields when serializing
         # exclude_unset will only affect the serialization of Pydantic models
@@ -54,8 +83,6 @@ class FileSyncRPCConnection(BlockingRPCConnection):
         expiry: Optional[str] = None,
         cache: bool = False,
     ) -> SyftResponse:
-        headers = None
-
         body = self._serialize(body)
         future: SyftFuture = rpc.send(
             url=url,
@@ -81,6 +108,180 @@ class FileSyncRPCConnection(BlockingRPCConnection):
             ) from e
 
 
+class InProcessResponse(SyftResponse):
+    """SyftResponse that holds the handler result as a Python object.
+
+    The result is returned as a deep copy when it matches the requested model, so
+    the caller and the server never share mutable instances, and only serialized
+    when the caller needs raw bytes.
+    """
+
+    _result: Any = PrivateAttr(default=None)
+
+    @classmethod
+    def from_result(
+        cls,
+        request_url: SyftBoxURL,
+        sender: str,
+        result: Any,
+        status_code: SyftStatus = SyftStatus.SYFT_200_OK,
+        headers: Optional[dict] = None,
+    ) -> "InProcessResponse":
+        # Errors keep their message in the body, so raise_for_status reports it
+        body = result.encode() if isinstance(result, str) else None
+        response = cls(
+            sender=sender,
+            url=request_url,
+            headers=headers or {},
+            body=body,
+            status_code=status_code,
+        )
+        response._result = result
+        return response
+
+    def _ensure_body(self) -> None:
+        if self.body is None and self._result is not None:
+            self.body = rpc.serialize(self._result)
+
+    def model(self, model_cls: type[BaseModel]) -> BaseModel:
+        if isinstance(self._result, model_cls):
+            return self._result.model_copy(deep=True)
+        self._ensure_body()
+        return super().model(model_cls)
+
+    def json(self, **kwargs) -> Any:
+        if isinstance(self._result, (dict, list)):
+            return copy.deepcopy(self._result)
+        self._ensure_body()
+        return super().json(**kwargs)
+
+    def text(self) -> str:
+        self._ensure_body()
+        return super().text()
+
+
+class InProcessRPCConnection(FileSyncRPCConnection):
+    def __init__(
+        self,
+        sender_client: SyftBoxClient,
+        app_resolver: Callable[[str], Optional[SyftEvents]],
+        default_expiry: str = "15m",
+    ):
+        """Call handlers directly when the RDS server runs in this process.
+
+        Requests from the server's own datasite to a co-located server skip the
+        request/response files: the handler is resolved with the same routing as
+        the server and called with a copy of the request model object, and a copy
+        of the result is returned without serializing it. All other requests are
+        sent with file sync.
+
+        The handler runs on the caller's thread, through the same middleware but not
+        through the request dispatcher, so the datasite owner's own calls are not
+        subject to the per-route concurrency caps, like backlog requests that are
+        run inline.
+
+        Args:
+            sender_client: SyftBox client of the sender
+            app_resolver: Returns the running server for a host, or None. Called on
+                every request, so servers started after the connection are picked up.
+            default_expiry: Default request expiry
+        """
+        super().__init__(sender_client, default_expiry=default_expiry)
+        self.app_resolver = app_resolver
+
+    def _resolve_handler(
+        self, syft_url: SyftBoxURL
+    ) -> tuple[Optional[SyftEvents], Optional[Callable]]:
+        app = self.app_resolver(syft_url.host)
+        # Only the data owner is co-located with their server, other senders go through file sync
+        if app is None or app.client.email != self.sender_client.email:
+            return None, None
+        handler = app.get_handler(
+            syft_url.to_local_path(app.client.workspace.datasites)
+        )
+        return app, handler
+
+    def send(
+        self,
+        url: str,
+        body: BodyType,
+        headers: Optional[dict] = None,
+        expiry: Optional[str] = None,
+        cache: bool = False,
+    ) -> SyftResponse:
+        syft_url = url if isinstance(url, SyftBoxURL) else SyftBoxURL(url)
+        app, handler = self._resolve_handler(syft_url)
+        if handler is None or inspect.iscoroutinefunction(handler):
+            return super().send(url, body, headers, expiry, cache)
+
+        headers = {**(headers or {}), IN_PROCESS_HEADER: "true"}
+        request = Request(
+            id=str(uuid4()),
+            sender=self.sender_client.email,
+            url=syft_url,
+            headers=headers,
+            body=None,
+            method=SyftMethod.GET.value,
+        )
+        try:
+            kwargs = self._handler_kwargs(handler, request, body, app)
+        except Exception as e:
+            return InProcessResponse.from_result(
+                syft_url,
+                app.client.email,
+                f"Invalid request schema: {e}",
+                status_code=SyftStatus.SYFT_400_BAD_REQUEST,
+            )
+
+        try:
+            result = handler(**kwargs)
+        except Exception as e:
+            logger.error(f"Error calling function {handler.__name__}: {e}")
+            return InProcessResponse.from_result(
+                syft_url,
+                app.client.email,
+                f"{type(e).__name__}: {e}",
+                status_code=SyftStatus.SYFT_500_SERVER_ERROR,
+            )
+
+        if isinstance(result, Response):
+            return InProcessResponse.from_result(
+                syft_url,
+                app.client.email,
+                result.body,
+                status_code=SyftStatus(result.status_code),
+                headers=result.headers,
+            )
+        return InProcessResponse.from_result(syft_url, app.client.email, result)
+
+    def _handler_kwargs(
+        self, handler: Callable, request: Request, body: BodyType, app: SyftEvents
+    ) -> dict[str, Any]:
+        """Resolve handler arguments like syft_event, without a serialize/parse round trip."""
+        type_hints = get_type_hints(handler)
+        kwargs = {}
+        for name in inspect.signature(handler).parameters:
+            ptype = type_hints.get(name, Any)
+            if ptype is Request:
+                kwargs[name] = request
+            elif ptype is SyftEvents:
+                kwargs[name] = app
+            elif inspect.isclass(ptype) and isinstance(body, ptype):
+                # Deep copy, so the handler does not share objects with the caller
+                kwargs[name] = body.model_copy(deep=True)
+            else:
+                # Other argument types (dicts, raw strings, ...) use the regular parsing
+                syft_request = SyftRequest(
+                    id=request.id,
+                    sender=request.sender,
+                    url=request.url,
+                    headers=request.headers,
+                    body=self._serialize(body),
+                )
+                return func_args_from_request(handler, syft_request, app)
+        return kwargs
+
+
 def check_permission(
     client: SyftBoxClient,
     path: str,
@@ -121,6 +322,15 @@ class MockRPCConnection(BlockingRPCConnection):
     def receiver_client(self) -> SyftBoxClient:
         return self.app.client
 
+    def write_attachment(self, url: str, data: bytes) -> str:
+        # No file sync in mock mode, write directly to the receiver's datasites
+        syft_url = url if isinstance(url, SyftBoxURL) else SyftBoxURL(url)
+        request_dir = (
+            syft_url.to_local_path(self.receiver_client.workspace.datasites)
+            / self.sender_client.email
+        )
+        return write_attachment(request_dir, data)
+
     def _build_request(
         self,
         url: str,
@@ -128,8 +338,6 @@ class MockRPCConnection(BlockingRPCConnection):
         headers: Optional[dict] = None,
         expiry: Optional[str] = None,
     ) -> SyftRequest:
-        headers = None
-
         expiry_time = datetime.now(timezone.utc) + rpc.parse_duration(expiry)
         return SyftRequest(
             sender=self.sender_client.email,
@@ -146,11 +354,17 @@ class MockRPCConnection(BlockingRPCConnection):
         response_body: BodyType,
         status_code: SyftStatus = SyftStatus.SYFT_200_OK,
     ) -> SyftResponse:
+        headers = {}
+        if isinstance(response_body, Response):
+            # Unwrap handler Responses the same way the SyftEvents server does
+            status_code = SyftStatus(response_body.status_code)
+            headers = response_body.headers or {}
+            response_body = response_body.body
         return SyftResponse(
             id=request.id,
             sender=self.receiver_client.email,
             url=request.url,
-            headers={},
+            headers=headers,
             body=rpc.serialize(response_body),
             expires=request.expires,
             status_code=status_code,
@@ -199,8 +413,13 @@ def get_connection(
     sender_client: SyftBoxClient,
     app: SyftEvents,
     mock: bool = False,
+    app_resolver: Optional[Callable[[str], Optional[SyftEvents]]] = None,
 ) -> BlockingRPCConnection:
     if mock:
         return MockRPCConnection(sender_client=sender_client, app=app)
+    elif app_resolver is not None:
+        return InProcessRPCConnection(
+            sender_client=sender_client, app_resolver=app_resolver
+        )
     else:
         return FileSyncRPCConnection(sender_client=sender_client)
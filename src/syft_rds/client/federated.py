@@ -0,0 +1,298 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
+from uuid import UUID
+
+from loguru import logger
+from pydantic import BaseModel
+
+from syft_rds.client.exceptions import RDSClientError, RDSValidationError
+from syft_rds.client.rds_client import RDSClient, init_session
+from syft_rds.client.utils import PathLike
+from syft_rds.display_utils.jupyter.types import TableList
+from syft_rds.models import Job, JobStatus, UserCodeCreate
+from syft_rds.models.job_models import JobResults
+from syft_rds.utils.constants import JOB_STATUS_POLLING_INTERVAL
+
+DEFAULT_FEDERATED_WORKERS = 16
+
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+class FederatedJobInfo(BaseModel):
+    host: str
+    uid: Optional[UUID] = None
+    name: Optional[str] = None
+    status: Optional[JobStatus] = None
+    error: Optional[str] = None
+
+
+class FederatedRDSClient:
+    def __init__(
+        self,
+        clients: Iterable[RDSClient],
+        max_workers: int = DEFAULT_FEDERATED_WORKERS,
+    ):
+        """Client for running the same analysis on many datasites.
+
+        Wraps one RDSClient per host. Code is zipped once and submitted to all hosts
+        concurrently, the submitted jobs are tracked in a single view, and results are
+        streamed as each data owner shares them.
+
+        Args:
+            clients: One client per host, e.g. from `FederatedRDSClient.connect`
+            max_workers: Number of hosts that are contacted in parallel
+        """
+        self.clients: dict[str, RDSClient] = {client.host: client for client in clients}
+        if not self.clients:
+            raise RDSValidationError("At least one client is required.")
+        self.max_workers = max_workers
+        # Jobs of the latest submit, and the hosts where it failed
+        self.jobs_by_host: dict[str, Job] = {}
+        self.errors: dict[str, Exception] = {}
+
+    @classmethod
+    def connect(
+        cls,
+        hosts: list[str],
+        email: str,
+        max_workers: int = DEFAULT_FEDERATED_WORKERS,
+        **session_kwargs,
+    ) -> "FederatedRDSClient":
+        """Initialize a session with all hosts concurrently.
+
+        Args:
+            hosts: Emails of the remote datasites
+            email: Email of the user
+            max_workers: Number of sessions that are initialized in parallel
+            **session_kwargs: Additional arguments for `init_session`
+
+        Returns:
+            FederatedRDSClient: Client for the hosts that could be connected to.
+                Failed hosts are listed in `errors`.
+
+        Raises:
+            RDSClientError: If no host could be connected to
+        """
+        session_kwargs.setdefault("start_syft_event_server", False)
+        clients, errors = _map_hosts(
+            lambda host: init_session(host=host, email=email, **session_kwargs),
+            hosts,
+            max_workers,
+        )
+        for host, error in errors.items():
+            logger.warning(f"Could not connect to {host}: {error}")
+        if not clients:
+            raise RDSClientError(f"Could not connect to any of {hosts}")
+
+        federated = cls([clients[host] for host in hosts if host in clients])
+        federated.max_workers = max_workers
+        federated.errors.update(errors)
+        return federated
+
+    @property
+    def hosts(self) -> list[str]:
+        return list(self.clients)
+
+    def close(self) -> None:
+        for client in self.clients.values():
+            client.close()
+
+    def submit(
+        self,
+        user_code_path: Union[PathLike, UserCodeCreate],
+        dataset_name: Optional[str] = None,
+        entrypoint: Optional[str] = None,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        runtime_name: Optional[str] = None,
+        ignore_patterns: Optional[list[str]] = None,
+        retry: bool = False,
+        max_retries: int = 3,
+        hosts: Optional[list[str]] = None,
+    ) -> TableList:
+        """Submit the same code to all hosts concurrently.
+
+        The code is zipped once, every host receives the same bundle. A failure on
+        one host does not stop the submit to other hosts, failed hosts are listed in
+        `errors` and in the returned view. Arguments not listed below are passed
+        to `JobRDSClient.submit` of every host.
+
+        Args:
+            user_code_path: Path to the code file or directory, or a bundle created with
+                `client.user_code.prepare`
+            dataset_name: Name of the dataset to use, must exist on every host
+            hosts: Subset of the hosts to submit to, defaults to all hosts
+
+        Returns:
+            TableList[FederatedJobInfo]: The submitted jobs, one row per host
+        """
+        hosts = self._resolve_hosts(hosts)
+        if isinstance(user_code_path, UserCodeCreate):
+            bundle = user_code_path
+        else:
+            bundle = self.clients[hosts[0]].user_code.prepare(
+                user_code_path,
+                name=name,
+                entrypoint=entrypoint,
+                ignore_patterns=ignore_patterns,
+            )
+
+        def submit_to(host: str) -> Job:
+            return self.clients[host].job.submit(
+                user_code_path=bundle,
+                dataset_name=dataset_name,
+                entrypoint=entrypoint,
+                name=name,
+                description=description,
+                tags=tags,
+                runtime_name=runtime_name,
+                retry=retry,
+                max_retries=max_retries,
+            )
+
+        jobs, errors = _map_hosts(submit_to, hosts, self.max_workers)
+        for host in hosts:
+            self.jobs_by_host.pop(host, None)
+            self.errors.pop(host, None)
+        self.jobs_by_host.update(jobs)
+        self.errors.update(errors)
+
+        for host, error in errors.items():
+            logger.warning(f"Could not submit job to {host}: {error}")
+        logger.info(f"Submitted job to {len(jobs)}/{len(hosts)} hosts")
+        return self._job_infos(hosts)
+
+    def jobs(self, refresh: bool = True) -> TableList:
+        """Status of the submitted jobs on all hosts, as a single view.
+
+        Args:
+            refresh: If True, reload the jobs of all hosts concurrently first
+
+        Returns:
+            TableList[FederatedJobInfo]: One row per host
+        """
+        if refresh:
+            self._refresh(list(self.jobs_by_host))
+        return self._job_infos(list(self.clients))
+
+    def iter_results(
+        self,
+        timeout: Optional[float] = None,
+        poll_interval: float = JOB_STATUS_POLLING_INTERVAL,
+    ) -> Iterator[tuple[str, JobResults]]:
+        """Yield (host, results) as soon as each host shares the results of its job.
+
+        Rejected jobs are skipped and recorded in `errors`. When `timeout` is reached,
+        the iteration stops and the hosts that did not share results are logged.
+
+        Args:
+            timeout: Maximum seconds to wait for all results, waits forever if None
+            poll_interval: Seconds between status checks of the pending jobs
+        """
+        pending = set(self.jobs_by_host)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while pending:
+            for host, job in self._refresh(sorted(pending)).items():
+                if job.status == JobStatus.shared:
+                    pending.discard(host)
+                    try:
+                        yield host, self.clients[host].job.get_results(job)
+                    except (RDSClientError, ValueError) as e:
+                        self.errors[host] = e
+                        logger.warning(f"Could not load results of {host}: {e}")
+                elif job.status == JobStatus.rejected:
+                    pending.discard(host)
+                    self.errors[host] = RDSClientError(
+                        f"Job {job.uid} was rejected by {host}"
+                    )
+                    logger.warning(f"Job {job.uid} was rejected by {host}")
+
+            if not pending:
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(
+                    f"No results after {timeout}s from {len(pending)} hosts: {sorted(pending)}"
+                )
+                return
+            time.sleep(poll_interval)
+
+    def collect(
+        self,
+        reduce: Optional[Callable[[dict[str, JobResults]], R]] = None,
+        timeout: Optional[float] = None,
+        poll_interval: float = JOB_STATUS_POLLING_INTERVAL,
+    ) -> Union[R, dict[str, JobResults]]:
+        """Wait for the results of all hosts, and optionally reduce them.
+
+        Args:
+            reduce: Function combining the results per host into a single value,
+                e.g. averaging an output file over all hosts
+            timeout: Maximum seconds to wait, results collected so far are reduced
+            poll_interval: Seconds between status checks of the pending jobs
+
+        Returns:
+            The reduced value, or {host: JobResults} if no reduce function is given
+        """
+        results = dict(self.iter_results(timeout=timeout, poll_interval=poll_interval))
+        if reduce is None:
+            return results
+        return reduce(results)
+
+    def _resolve_hosts(self, hosts: Optional[list[str]]) -> list[str]:
+        if hosts is None:
+            return list(self.clients)
+        unknown = [host for host in hosts if host not in self.clients]
+        if unknown:
+            raise RDSValidationError(f"No client for hosts {unknown}")
+        return list(hosts)
+
+    def _refresh(self, hosts: list[str]) -> dict[str, Job]:
+        def refresh(host: str) -> Job:
+            job = self.jobs_by_host[host]
+            return self.clients[host].job.get(uid=job.uid)
+
+        jobs, errors = _map_hosts(refresh, hosts, self.max_workers)
+        for host, error in errors.items():
+            logger.debug(f"Could not refresh job of {host}: {error}")
+        self.jobs_by_host.update(jobs)
+        return jobs
+
+    def _job_infos(self, hosts: list[str]) -> TableList:
+        infos = []
+        for host in hosts:
+            job = self.jobs_by_host.get(host)
+            error = self.errors.get(host)
+            infos.append(
+                FederatedJobInfo(
+                    host=host,
+                    uid=job.uid if job else None,
+                    name=job.name if job else None,
+                    status=job.status if job else None,
+                    error=str(error) if error else None,
+                )
+            )
+        return TableList(infos)
+
+
+def _map_hosts(
+    func: Callable[[str], T], hosts: list[str], max_workers: int
+) -> tuple[dict[str, T], dict[str, Exception]]:
+    """Run `func` for all hosts in parallel, returns the results and errors per host."""
+    results: dict[str, T] = {}
+    errors: dict[str, Exception] = {}
+    if not hosts:
+        return results, errors
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(hosts)), thread_name_prefix="rds-federated"
+    ) as executor:
+        futures = {host: executor.submit(func, host) for host in hosts}
+        for host, future in futures.items():
+            try:
+                results[host] = future.result()
+            except Exception as e:
+                errors[host] = e
+    return results, errors
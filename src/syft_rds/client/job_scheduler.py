@@ -0,0 +1,321 @@
+import os
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from uuid import UUID
+
+from loguru import logger
+
+from syft_rds.client.exceptions import RDSValidationError
+from syft_rds.display_utils.jupyter.types import TableList
+from syft_rds.models import Job, JobStatus, ResourceLimits
+
+if TYPE_CHECKING:
+    from syft_rds.client.rds_client import RDSClient
+
+
+@dataclass(frozen=True)
+class JobResources:
+    """Resources a job is expected to use while running."""
+
+    cpus: float = 1.0
+    memory_mb: float = 0.0
+
+
+def job_resources_from_limits(job: Job) -> JobResources:
+    """Expected resources of a job from the limits of its runtime.
+
+    Use as `JobScheduler(client, cpu_budget=..., job_resources=job_resources_from_limits)`.
+    """
+    runtime = job.runtime
+    limits = runtime.config.limits if runtime is not None else ResourceLimits()
+    return JobResources(cpus=limits.cpus or 1.0, memory_mb=limits.memory_mb or 0.0)
+
+
+@dataclass
+class _QueuedJob:
+    job: Job
+    priority: int
+    resources: JobResources
+    run_kwargs: dict[str, Any] = field(default_factory=dict)
+    on_exit: Optional[Callable[[Job], None]] = None
+
+    @property
+    def submitter(self) -> str:
+        return self.job.created_by or ""
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        client: "RDSClient",
+        max_parallel: Optional[int] = None,
+        cpu_budget: Optional[float] = None,
+        memory_budget_mb: Optional[float] = None,
+        job_resources: Optional[Callable[[Job], JobResources]] = None,
+    ):
+        """Runs queued jobs on the data owner's machine without oversubscribing it.
+
+        - Jobs start when they fit in the budget: at most `max_parallel` jobs, and the
+          summed resources of running jobs stay within `cpu_budget` and `memory_budget_mb`.
+          A job larger than the budget runs alone.
+        - Higher priorities run first. Within a priority, submitters take turns,
+          so one data scientist with 200 jobs does not block everyone else.
+
+        Jobs run as non-blocking `run_private` calls, the slot of a job is released
+        when its process exits.
+
+        Args:
+            client: Admin client of the datasite
+            max_parallel: Maximum number of running jobs. Defaults to the CPU count if
+                no other budget is set.
+            cpu_budget: Maximum summed `JobResources.cpus` of running jobs
+            memory_budget_mb: Maximum summed `JobResources.memory_mb` of running jobs
+            job_resources: Expected resources of a job, defaults to 1 CPU per job.
+                See `job_resources_from_limits` to use the limits of the job's runtime.
+        """
+        if max_parallel is None and cpu_budget is None and memory_budget_mb is None:
+            max_parallel = os.cpu_count() or 1
+        self.client = client
+        self.max_parallel = max_parallel
+        self.cpu_budget = cpu_budget
+        self.memory_budget_mb = memory_budget_mb
+        self.job_resources = job_resources or (lambda job: JobResources())
+
+        self._cond = threading.Condition()
+        # priority -> submitter -> queued jobs, submitters rotate after each started job
+        self._queues: dict[int, OrderedDict[str, deque[_QueuedJob]]] = {}
+        self._queued: dict[UUID, _QueuedJob] = {}
+        self._running: dict[UUID, _QueuedJob] = {}
+        self._used = JobResources(cpus=0.0, memory_mb=0.0)
+        self.finished = 0
+        self.failed_to_start: dict[UUID, Exception] = {}
+        self._shutdown = False
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(
+        self,
+        job: Job,
+        priority: int = 0,
+        on_exit: Optional[Callable[[Job], None]] = None,
+        **run_kwargs: Any,
+    ) -> Job:
+        """Queue a job to run on private data.
+
+        Args:
+            job: The job to run
+            priority: Jobs with a higher priority run first
+            on_exit: Called with the job when it finished, or could not be started.
+                Jobs that could not be started are listed in `failed_to_start`.
+            **run_kwargs: Additional arguments for `RDSClient.run_private`,
+                e.g. `uv_args` or `show_stdout`
+
+        Returns:
+            Job: The queued job, see `job.queue_position`
+        """
+        if job.status == JobStatus.rejected:
+            raise RDSValidationError(f"Cannot run rejected job {job.uid}")
+        run_kwargs.pop("blocking", None)
+        run_kwargs.setdefault("show_stdout", False)
+        run_kwargs.setdefault("show_stderr", False)
+
+        # May fetch the job's runtime, not done while holding the lock
+        resources = self.job_resources(job)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("JobScheduler is shut down")
+            if job.uid in self._queued or job.uid in self._running:
+                return job
+            queued = _QueuedJob(
+                job=job,
+                priority=priority,
+                resources=resources,
+                run_kwargs=run_kwargs,
+                on_exit=on_exit,
+            )
+            self._queued[job.uid] = queued
+            by_submitter = self._queues.setdefault(priority, OrderedDict())
+            by_submitter.setdefault(queued.submitter, deque()).append(queued)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="rds-job-scheduler", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify_all()
+        return job
+
+    def submit_many(
+        self, jobs: list[Job], priority: int = 0, **run_kwargs
+    ) -> list[Job]:
+        return [self.submit(job, priority=priority, **run_kwargs) for job in jobs]
+
+    def run_approved(self, priority: int = 0, **run_kwargs) -> list[Job]:
+        """Queue all approved jobs of the datasite that are not queued or running yet."""
+        jobs = self.client.job.get_all(status=JobStatus.approved, sort_order="asc")
+        return self.submit_many(jobs, priority=priority, **run_kwargs)
+
+    def cancel(self, job: Job) -> bool:
+        """Remove a queued job, returns False if it is not queued. Running jobs are not stopped."""
+        with self._cond:
+            queued = self._queued.pop(job.uid, None)
+            if queued is None:
+                return False
+            by_submitter = self._queues[queued.priority]
+            jobs = by_submitter[queued.submitter]
+            jobs.remove(queued)
+            if not jobs:
+                del by_submitter[queued.submitter]
+            self._cond.notify_all()
+            return True
+
+    def position(self, job: Job) -> Optional[int]:
+        """Number of queued jobs that start before `job`, None if it is not queued."""
+        with self._cond:
+            if job.uid not in self._queued:
+                return None
+            for position, queued in enumerate(self._iter_queue()):
+                if queued.job.uid == job.uid:
+                    return position
+        return None
+
+    def queue(self) -> TableList:
+        """Queued jobs in the order they will start."""
+        with self._cond:
+            queued = list(self._iter_queue())
+        return TableList(
+            [
+                {
+                    "position": position,
+                    "uid": q.job.uid,
+                    "name": q.job.name,
+                    "submitter": q.submitter,
+                    "priority": q.priority,
+                }
+                for position, q in enumerate(queued)
+            ]
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                "queued": len(self._queued),
+                "running": len(self._running),
+                "finished": self.finished,
+                "failed_to_start": len(self.failed_to_start),
+                "cpus_used": self._used.cpus,
+                "memory_mb_used": self._used.memory_mb,
+            }
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued and running jobs have finished, False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queued and not self._running, timeout=timeout
+            )
+
+    def shutdown(self, cancel_queued: bool = True) -> None:
+        """Stop starting jobs. Running jobs keep running and update their status."""
+        with self._cond:
+            self._shutdown = True
+            if cancel_queued:
+                self._queues.clear()
+                self._queued.clear()
+            self._cond.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+
+    def _iter_queue(self):
+        # Simulates the start order: priorities descending, submitters round-robin
+        for priority in sorted(self._queues, reverse=True):
+            lanes = [deque(jobs) for jobs in self._queues[priority].values()]
+            while lanes:
+                for lane in list(lanes):
+                    yield lane.popleft()
+                    if not lane:
+                        lanes.remove(lane)
+
+    def _next_job(self) -> Optional[_QueuedJob]:
+        for priority in sorted(self._queues, reverse=True):
+            by_submitter = self._queues[priority]
+            if not by_submitter:
+                continue
+            submitter, jobs = next(iter(by_submitter.items()))
+            # The next job waits for capacity, smaller jobs behind it don't overtake it
+            if not self._fits(jobs[0].resources):
+                return None
+            queued = jobs.popleft()
+            if jobs:
+                by_submitter.move_to_end(submitter)
+            else:
+                del by_submitter[submitter]
+            del self._queued[queued.job.uid]
+            return queued
+        return None
+
+    def _fits(self, resources: JobResources) -> bool:
+        if not self._running:
+            return True
+        if self.max_parallel is not None and len(self._running) >= self.max_parallel:
+            return False
+        if (
+            self.cpu_budget is not None
+            and self._used.cpus + resources.cpus > self.cpu_budget
+        ):
+            return False
+        if (
+            self.memory_budget_mb is not None
+            and self._used.memory_mb + resources.memory_mb > self.memory_budget_mb
+        ):
+            return False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                queued = None
+                while not self._shutdown:
+                    queued = self._next_job()
+                    if queued is not None:
+                        break
+                    self._cond.wait()
+                if queued is None:
+                    return
+                self._running[queued.job.uid] = queued
+                self._add_used(queued.resources, sign=1)
+
+            # Starting a job updates its status over RPC, done outside the lock
+            try:
+                self.client.run_private(
+                    queued.job,
+                    blocking=False,
+                    on_exit=lambda job, queued=queued: self._release(queued, job),
+                    **queued.run_kwargs,
+                )
+            except Exception as e:
+                logger.error(f"Could not start job {queued.job.uid}: {e}")
+                with self._cond:
+                    self.failed_to_start[queued.job.uid] = e
+                self._release(queued)
+
+    def _release(self, queued: _QueuedJob, job: Optional[Job] = None) -> None:
+        """Free the resources of a job, `job` is the finished job or None if it failed to start."""
+        with self._cond:
+            if self._running.pop(queued.job.uid, None) is None:
+                return
+            self._add_used(queued.resources, sign=-1)
+            if job is not None:
+                self.finished += 1
+            self._cond.notify_all()
+
+        if queued.on_exit is not None:
+            try:
+                queued.on_exit(job if job is not None else queued.job)
+            except Exception as e:
+                logger.error(f"Error in exit callback of job {queued.job.uid}: {e}")
+
+    def _add_used(self, resources: JobResources, sign: int) -> None:
+        self._used = JobResources(
+            cpus=self._used.cpus + sign * resources.cpus,
+            memory_mb=self._used.memory_mb + sign * resources.memory_mb,
+        )
@@ -63,6 +63,7 @@ class DatasetSchemaManager:
             readme=readme_url,
             auto_approval=dataset_create.auto_approval,
             runtime_id=dataset_create.runtime_id,
+            resource_limits=dataset_create.resource_limits,
         )
 
         # Persist the schema to store
@@ -1,9 +1,10 @@
 import atexit
+import json
 import subprocess
 import threading
 import time
 from pathlib import Path
-from typing import Optional, Type, TypeVar
+from typing import Callable, Optional, Type, TypeVar, Union
 from uuid import UUID
 import shutil
 
@@ -17,6 +18,7 @@ from syft_event import SyftEvents
 
 from syft_rds.client.client_registry import GlobalClientRegistry
 from syft_rds.client.connection import get_connection
+from syft_rds.client.job_scheduler import JobScheduler
 from syft_rds.client.local_store import LocalStore
 from syft_rds.client.rds_clients.base import (
     ClientRunnerConfig,
@@ -36,9 +38,11 @@ from syft_rds.models import (
     Dataset,
     Job,
     JobStatus,
+    JobUsage,
     PythonRuntimeConfig,
     Runtime,
     RuntimeKind,
+    ServerStatus,
     UserCode,
     JobConfig,
 )
@@ -50,7 +54,14 @@ from syft_rds.syft_runtime import (
     TextUI,
     get_runner_cls,
 )
-from syft_rds.utils.constants import JOB_STATUS_POLLING_INTERVAL, get_datasite_url
+from syft_rds.syft_runtime.docker_images import DockerImageBuilder
+from syft_rds.syft_runtime.reaper import ProcessReaper
+from syft_rds.syft_runtime.limits import read_job_usage, save_job_usage
+from syft_rds.syft_runtime.result_cache import ResultCache, remove_cached_result
+from syft_rds.syft_runtime.runners import read_job_errors
+from syft_rds.syft_runtime.uv_env_cache import UvEnvCache
+from syft_rds.syft_runtime.warm_pool import WarmPools
+from syft_rds.utils.constants import get_datasite_url
 
 T = TypeVar("T", bound=ItemBase)
 
@@ -241,18 +252,22 @@ def init_session(
     logger.info("🔐 End-to-end encryption enabled for RPC messages")
 
     # Store job output folder in .syftbox/rds/<email>/jobs/ to keep sensitive logs local and never synced
-    job_output_folder = (
+    local_rds_folder = (
         syftbox_client.workspace.data_dir.parent
         / ".syftbox"
         / "rds"
         / syftbox_client.email
-        / "jobs"
     )
+    job_output_folder = local_rds_folder / "jobs"
+    uv_env_cache_folder = local_rds_folder / "uv_envs"
+    result_cache_folder = local_rds_folder / "results"
 
     # Set runner config with absolute path if not provided
     if "runner_config" not in config_kwargs:
         config_kwargs["runner_config"] = ClientRunnerConfig(
-            job_output_folder=job_output_folder
+            job_output_folder=job_output_folder,
+            uv_env_cache_folder=uv_env_cache_folder,
+            result_cache_folder=result_cache_folder,
         )
     elif not hasattr(config_kwargs["runner_config"], "job_output_folder"):
         config_kwargs["runner_config"].job_output_folder = job_output_folder
@@ -260,7 +275,12 @@ def init_session(
     config = RDSClientConfig(host=host, **config_kwargs)
 
     use_mock = mock_server is not None
-    connection = get_connection(syftbox_client, mock_server, mock=use_mock)
+    connection = get_connection(
+        syftbox_client,
+        mock_server,
+        mock=use_mock,
+        app_resolver=_get_running_server,
+    )
     rpc_client = RPCClient(config, connection)
     local_store = LocalStore(config, syftbox_client)
 
@@ -323,14 +343,66 @@ class RDSClient(RDSClientBase):
         self.close()
 
     def start(self) -> None:
-        self._start_job_polling()
+        # Exits of non-blocking jobs are detected by the reaper, which only starts a
+        # thread for the first job. Clients that never run jobs stay threadless.
+        self._non_blocking_jobs: dict[UUID, tuple[Job, subprocess.Popen]] = {}
+        self._jobs_lock = threading.Lock()
+        self._reaper = ProcessReaper()
+        self._scheduler: Optional[JobScheduler] = None
+        self._uv_env_cache: Optional[UvEnvCache] = None
+        self._result_cache: Optional[ResultCache] = None
+        # Started by the first job of a runtime with `warm_pool_size > 0`
+        self.warm_pools = WarmPools()
+        # Replace `docker_images.cli` to use another docker binary
+        self.docker_images = DockerImageBuilder()
 
     def close(self) -> None:
-        if self._polling_stop_event.is_set():
-            return
-        logger.debug("Stopping job polling thread.")
-        self._polling_stop_event.set()
-        self._polling_thread.join(timeout=2)
+        if self._scheduler is not None:
+            self._scheduler.shutdown()
+        self._reaper.stop()
+        self.warm_pools.close()
+        self.docker_images.close()
+
+    @property
+    def scheduler(self) -> JobScheduler:
+        """Scheduler for running many jobs in parallel, e.g. `client.scheduler.run_approved()`.
+
+        Created with the default budget of one job per CPU on first use. Assign a
+        `JobScheduler(client, ...)` to use a different budget.
+        """
+        if self._scheduler is None:
+            self._scheduler = JobScheduler(self)
+        return self._scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler: JobScheduler) -> None:
+        if self._scheduler is not None:
+            self._scheduler.shutdown(cancel_queued=False)
+        self._scheduler = scheduler
+
+    @property
+    def uv_env_cache(self) -> Optional[UvEnvCache]:
+        """Shared uv environments of jobs, None if disabled in the runner config."""
+        runner_config = self.config.runner_config
+        if self._uv_env_cache is None and runner_config.uv_env_cache_folder is not None:
+            self._uv_env_cache = UvEnvCache(
+                runner_config.uv_env_cache_folder,
+                max_bytes=runner_config.uv_env_cache_max_bytes,
+            )
+        return self._uv_env_cache
+
+    @property
+    def result_cache(self) -> Optional[ResultCache]:
+        """Results of earlier jobs, None unless `use_result_cache` is set in the runner config."""
+        runner_config = self.config.runner_config
+        if not runner_config.use_result_cache:
+            return None
+        if self._result_cache is None and runner_config.result_cache_folder is not None:
+            self._result_cache = ResultCache(
+                runner_config.result_cache_folder,
+                max_bytes=runner_config.result_cache_max_bytes,
+            )
+        return self._result_cache
 
     def for_type(self, type_: Type[T]) -> RDSClientModule[T]:
         if type_ not in self._type_map:
@@ -372,7 +444,28 @@ class RDSClient(RDSClientBase):
         blocking: bool = True,
         uv_args: list[str] = [],
         args: list[str] = [],
+        on_exit: Optional[Callable[[Job], None]] = None,
+        use_cache: bool = True,
     ) -> Job:
+        """Run a job on the private dataset.
+
+        Args:
+            job: The job to run
+            display_type: How to show the job output, "text" or "rich"
+            show_stdout: Whether to show the stdout of the job
+            show_stderr: Whether to show the stderr of the job
+            blocking: If False, return directly and update the job status when the
+                process exits. Use `client.scheduler` to run many jobs in parallel.
+            uv_args: Extra arguments for `uv run`
+            args: Extra arguments for the entrypoint
+            on_exit: Non-blocking only, called with the job after its status is updated
+            use_cache: If the result cache is enabled in the runner config, reuse the
+                results of an earlier successful run of an identical job instead of
+                running it
+
+        Returns:
+            Job: The finished job, or the running job if `blocking` is False
+        """
         if job.status == JobStatus.rejected:
             raise ValueError(
                 "Cannot run rejected job. "
@@ -382,6 +475,16 @@ class RDSClient(RDSClientBase):
         job_config: JobConfig = self._get_config_for_job(
             job, blocking=blocking, uv_args=uv_args, args=args
         )
+        # Remove results copied from the cache by an earlier run, the job runs itself
+        remove_cached_result(job_config)
+        fingerprint = (
+            self._get_result_fingerprint(job, job_config) if use_cache else None
+        )
+        if fingerprint is not None:
+            cached_job = self._run_from_cache(job, job_config, fingerprint, on_exit)
+            if cached_job is not None:
+                return cached_job
+
         result = self._run(
             job,
             job_config,
@@ -393,11 +496,20 @@ class RDSClient(RDSClientBase):
         if isinstance(result, tuple):  # result from a blocking job
             return_code, error_message = result
             job_update = job.get_update_for_return_code(
-                return_code=return_code, error_message=error_message
+                return_code=return_code,
+                error_message=error_message,
+                usage=read_job_usage(job_config.logs_dir),
             )
-            return self.job.update_job_status(job_update, job)
+            job = self.job.update_job_status(job_update, job)
+            if fingerprint is not None:
+                self._cache_result(job, job_config, fingerprint)
+            return job
         else:  # non-blocking job
-            return self._register_nonblocking_job(result, job)
+            if fingerprint is not None:
+                on_exit = self._cache_result_on_exit(
+                    job_config, fingerprint, on_exit=on_exit
+                )
+            return self._register_nonblocking_job(result, job, on_exit=on_exit)
 
     def run_mock(
         self,
@@ -435,6 +547,7 @@ class RDSClient(RDSClientBase):
         user_code = self.user_code.get(job.user_code_id)
 
         # Try to get dataset, set None if not found (for jobs that don't need data)
+        dataset_limits = None
         if job.dataset_name is None:
             logger.debug(
                 "Job has no dataset_name. Job will run without data_path "
@@ -445,6 +558,7 @@ class RDSClient(RDSClientBase):
             try:
                 dataset = self.dataset.get(name=job.dataset_name)
                 data_path = dataset.get_private_path()
+                dataset_limits = dataset.resource_limits
             except (ValueError, Exception) as e:
                 logger.debug(
                     f"Dataset '{job.dataset_name}' not found or inaccessible: {e}. "
@@ -471,20 +585,114 @@ class RDSClient(RDSClientBase):
                 "Please use init_session() to properly initialize the RDSClient."
             )
 
+        job_folder = runner_config.job_output_folder / job.uid.hex
+        function_folder = user_code.local_dir
+        if job.sweep_params is not None:
+            function_folder = self._prepare_sweep_code(job, function_folder, job_folder)
+
+        # A dataset can only make the limits of its jobs stricter
+        limits = runtime.config.limits.merge(dataset_limits)
         job_config = JobConfig(
             data_path=data_path,
-            function_folder=user_code.local_dir,
+            function_folder=function_folder,
             runtime=runtime,
             args=[user_code.entrypoint, *args],
             uv_args=uv_args,
-            job_folder=runner_config.job_output_folder / job.uid.hex,
-            timeout=runner_config.timeout,
+            job_folder=job_folder,
+            timeout=limits.timeout or runner_config.timeout,
+            limits=limits,
+            max_log_bytes=runner_config.max_log_bytes,
+            log_backups=runner_config.log_backups,
             blocking=blocking,
         )
         return job_config
 
-    def _prepare_job(self, job: Job, config: JobConfig) -> None:
+    def _get_result_fingerprint(self, job: Job, job_config: JobConfig) -> Optional[str]:
+        """Result cache key of the job, None if the result cache is disabled."""
+        result_cache = self.result_cache
+        if result_cache is None:
+            return None
+        extra_dirs = []
         if job.custom_function_id is not None:
+            extra_dirs.append(
+                self.custom_function.get(uid=job.custom_function_id).local_dir
+            )
+        try:
+            return result_cache.fingerprint(job_config, extra_dirs=extra_dirs)
+        except OSError as e:
+            logger.warning(f"Could not fingerprint job '{job.name}': {e}")
+            return None
+
+    def _run_from_cache(
+        self,
+        job: Job,
+        job_config: JobConfig,
+        fingerprint: str,
+        on_exit: Optional[Callable[[Job], None]] = None,
+    ) -> Optional[Job]:
+        """Finish the job with cached results, None if there are none."""
+        source_job_uid = self.result_cache.materialize(fingerprint, job_config)
+        if source_job_uid is None:
+            return None
+        logger.info(
+            f"Reusing the results of job {source_job_uid} for job '{job.name}', "
+            "they have the same code, dataset and runtime"
+        )
+        # The job did not run, record zero usage instead of the usage.json copied
+        # from the source job
+        usage = JobUsage(wall_seconds=0.0, cpu_seconds=0.0)
+        save_job_usage(usage, job_config.logs_dir)
+        job_update = job.get_update_for_return_code(return_code=0, usage=usage)
+        job = self.job.update_job_status(job_update, job)
+        if not job_config.blocking and on_exit is not None:
+            on_exit(job)
+        return job
+
+    def _cache_result(self, job: Job, job_config: JobConfig, fingerprint: str) -> None:
+        if job.status != JobStatus.job_run_finished or self.result_cache is None:
+            return
+        try:
+            self.result_cache.store(fingerprint, job_config, job_uid=job.uid.hex)
+        except Exception as e:
+            logger.warning(f"Could not cache results of job '{job.name}': {e}")
+
+    def _cache_result_on_exit(
+        self,
+        job_config: JobConfig,
+        fingerprint: str,
+        on_exit: Optional[Callable[[Job], None]] = None,
+    ) -> Callable[[Job], None]:
+        def cache_and_exit(job: Job) -> None:
+            try:
+                self._cache_result(job, job_config, fingerprint)
+            finally:
+                if on_exit is not None:
+                    on_exit(job)
+
+        return cache_and_exit
+
+    def _prepare_sweep_code(self, job: Job, code_dir: Path, job_folder: Path) -> Path:
+        """Code of a job of a parameter sweep, with its custom function and params.
+
+        All jobs of a sweep share `code_dir`, the code of each job is put together in
+        its local job folder.
+        """
+        sweep_code_dir = job_folder / "code"
+        shutil.rmtree(sweep_code_dir, ignore_errors=True)
+        copy_dir_contents(src=code_dir, dst=sweep_code_dir)
+        params_filename = CustomFunction.model_fields["input_params_filename"].default
+        if job.custom_function_id is not None:
+            custom_function = self.custom_function.get(uid=job.custom_function_id)
+            copy_dir_contents(
+                src=custom_function.local_dir, dst=sweep_code_dir, exists_ok=True
+            )
+            params_filename = custom_function.input_params_filename
+        (sweep_code_dir / params_filename).write_text(json.dumps(job.sweep_params))
+        return sweep_code_dir
+
+    def _prepare_job(self, job: Job, config: JobConfig) -> None:
+        # The code of sweep jobs already holds the custom function
+        if job.custom_function_id is not None and job.sweep_params is None:
             self._prepare_custom_function(
                 code_dir=job.user_code.local_dir,
                 custom_function_id=job.custom_function_id,
@@ -540,68 +748,96 @@ class RDSClient(RDSClientBase):
         runner = runner_cls(
             handlers=[FileOutputHandler(), display_handler],
             update_job_status_callback=self.job.update_job_status,
+            uv_env_cache=self.uv_env_cache,
+            warm_pools=self.warm_pools,
+            docker_images=self.docker_images,
         )
 
         self._prepare_job(job, job_config)
         return runner.run(job, job_config)
 
-    def _start_job_polling(self) -> None:
-        """Starts the job polling mechanism."""
-        logger.debug("Starting thread to poll jobs.")
-        self._non_blocking_jobs: dict[UUID, tuple[Job, subprocess.Popen]] = {}
-        self._jobs_lock = threading.Lock()
-        self._polling_stop_event = threading.Event()
-        self._polling_thread = threading.Thread(
-            target=self._poll_update_nonblocking_jobs
-        )
-        self._polling_thread.daemon = True
-        self._polling_thread.start()
-
-    def _register_nonblocking_job(self, result: subprocess.Popen, job: Job) -> Job:
+    def _register_nonblocking_job(
+        self,
+        result: subprocess.Popen,
+        job: Job,
+        on_exit: Optional[Callable[[Job], None]] = None,
+    ) -> Job:
         with self._jobs_lock:
             self._non_blocking_jobs[job.uid] = (job, result)
+        self._reaper.watch(
+            result,
+            lambda process: self._on_nonblocking_job_exit(job, process, on_exit),
+        )
         logger.debug(f"Non-blocking job '{job.name}' started with PID {result.pid}")
         return job
 
-    def _poll_update_nonblocking_jobs(self) -> None:
+    def _on_nonblocking_job_exit(
+        self,
+        job: Job,
+        process: subprocess.Popen,
+        on_exit: Optional[Callable[[Job], None]] = None,
+    ) -> None:
+        """Update the job status of a finished non-blocking job, called by the reaper."""
+        with self._jobs_lock:
+            self._non_blocking_jobs.pop(job.uid, None)
+
+        # The process wrote to the log files directly, `process.stderr` is None
+        log_files = getattr(process, "_log_files", ())
+        for log_file in log_files:
+            log_file.close()
+        stderr_log_path = (
+            Path(log_files[1].name)
+            if log_files
+            else self.job._get_job_output_folder() / job.uid.hex / "logs" / "stderr.log"
+        )
+
+        try:
+            job_monitor = getattr(process, "_job_monitor", None)
+            usage = job_monitor.finish() if job_monitor is not None else None
+            return_code, error_message = read_job_errors(
+                stderr_log_path, process.returncode
+            )
+            job_update = job.get_update_for_return_code(
+                return_code=return_code, error_message=error_message, usage=usage
+            )
+            self.job.update_job_status(job_update, job)
+            logger.debug(
+                f"Non-blocking job '{job.name}' (PID: {process.pid}) "
+                f"finished with code {return_code}."
+            )
+        except Exception as e:
+            logger.error(f"Error updating status for job {job.name}: {e}")
+        finally:
+            if on_exit is not None:
+                on_exit(job)
+
+    def metrics(self, include_server: Optional[bool] = None) -> dict:
+        """RPC latency and throughput metrics per endpoint.
+
+        Args:
+            include_server: If True, also fetch the server-side metrics (queue wait,
+                handler and serialize time) from the host's /metrics endpoint, which
+                is only available to the datasite owner. Defaults to `is_admin`.
+
+        Returns:
+            dict: {"client": ..., "server": ...} metrics
         """
-        Polls for non-blocking jobs and updates the job status accordingly.
-        If a job is finished, it is removed from the list of non-blocking jobs.
+        metrics = {"client": self.rpc.metrics()}
+        if include_server is None:
+            include_server = self.is_admin
+        if include_server:
+            metrics["server"] = self.rpc.server_metrics()
+        return metrics
+
+    def server_status(self, expiry: Optional[Union[str, int]] = "10s") -> ServerStatus:
+        """Status of the host's server: uptime, request queues, store sizes,
+        cache hit rates, running jobs, last cleanup and process RSS/CPU.
+        Only the datasite owner sees who is running which jobs.
+
+        Args:
+            expiry: How long to wait for the server to respond
         """
-        while not self._polling_stop_event.is_set():
-            with self._jobs_lock:
-                finished_jobs = []
-                for job_uid, (job, process) in self._non_blocking_jobs.items():
-                    if process.poll() is not None:
-                        finished_jobs.append(job_uid)
-                        try:
-                            return_code = process.returncode
-                            stderr = process.stderr.read() if process.stderr else None
-
-                            # TODO: remove this once we have a better way to handle errors
-                            if return_code == 0 and stderr and "| ERROR" in stderr:
-                                logger.debug(
-                                    "Error detected in logs, even with return code 0."
-                                )
-                                return_code = 1
-
-                            job_update = job.get_update_for_return_code(
-                                return_code=return_code, error_message=stderr
-                            )
-                            self.job.update_job_status(job_update, job)
-                            logger.debug(
-                                f"Non-blocking job '{job.name}' (PID: {process.pid}) "
-                                f"finished with code {return_code}."
-                            )
-                        except Exception as e:
-                            logger.error(
-                                f"Error updating status for job {job.name}: {e}"
-                            )
-
-                for job_uid in finished_jobs:
-                    del self._non_blocking_jobs[job_uid]
-
-            time.sleep(JOB_STATUS_POLLING_INTERVAL)
+        return self.rpc.status(expiry=expiry)
 
     def stop_server(self) -> bool:
         """Stop the syft-rds server for this client's host.
@@ -629,6 +865,14 @@ def _start_server_thread(syftbox_client: SyftBoxClient) -> dict:
     return {"thread": thread, "server": rds_app}
 
 
+def _get_running_server(host: str) -> Optional[SyftEvents]:
+    """Return the syft-rds server for `host` if it is running in this process."""
+    server_info = _RUNNING_RDS_SERVERS.get(host)
+    if server_info is None or not server_info["thread"].is_alive():
+        return None
+    return server_info["server"]
+
+
 def _wait_for_server(
     host: str,
     syftbox_client: SyftBoxClient,
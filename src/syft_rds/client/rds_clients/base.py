@@ -17,6 +17,9 @@ from syft_rds.client.local_store import LocalStore
 from syft_rds.client.rpc import RPCClient, T
 from syft_rds.client.utils import deprecation_warning
 from syft_rds.models import GetAllRequest, GetOneRequest, Job, Runtime
+from syft_rds.syft_runtime.log_files import DEFAULT_LOG_BACKUPS, DEFAULT_MAX_LOG_BYTES
+from syft_rds.syft_runtime.result_cache import DEFAULT_RESULT_CACHE_MAX_BYTES
+from syft_rds.syft_runtime.uv_env_cache import DEFAULT_UV_ENV_CACHE_MAX_BYTES
 
 if TYPE_CHECKING:
     from syft_rds.client.rds_client import RDSClient
@@ -26,6 +29,16 @@ class ClientRunnerConfig(BaseModel):
     runtime: Optional[Runtime] = None
     timeout: int = 60
     job_output_folder: Optional[Path] = None
+    # Shared uv environments for jobs with identical dependencies, None to disable
+    uv_env_cache_folder: Optional[Path] = None
+    uv_env_cache_max_bytes: int = DEFAULT_UV_ENV_CACHE_MAX_BYTES
+    # Size cap of each job log, older output is kept in `log_backups` gzipped files
+    max_log_bytes: Optional[int] = DEFAULT_MAX_LOG_BYTES
+    log_backups: int = DEFAULT_LOG_BACKUPS
+    # Reuse the results of earlier successful runs of identical jobs, opt-in
+    use_result_cache: bool = False
+    result_cache_folder: Optional[Path] = None
+    result_cache_max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES
 
 
 class RDSClientConfig(BaseModel):
@@ -33,6 +46,8 @@ class RDSClientConfig(BaseModel):
     host: str
     app_name: str = "RDS"
     rpc_expiry: str = "5m"
+    # Times a rate limited (429) request is retried before the error is returned
+    rate_limit_retries: int = 5
     runner_config: ClientRunnerConfig = Field(default_factory=ClientRunnerConfig)
 
 
@@ -8,6 +8,7 @@ from syft_rds.models import (
     Dataset,
     DatasetCreate,
     DatasetUpdate,
+    ResourceLimits,
 )
 
 
@@ -25,6 +26,7 @@ class DatasetRDSClient(RDSClientModule[Dataset]):
         tags: list[str] = [],
         runtime_id: Optional[UUID] = None,
         auto_approval: list[str] = [],
+        resource_limits: Optional[ResourceLimits] = None,
     ) -> Dataset:
         dataset_create = DatasetCreate(
             name=name,
@@ -35,6 +37,7 @@ class DatasetRDSClient(RDSClientModule[Dataset]):
             tags=tags,
             runtime_id=runtime_id,
             auto_approval=auto_approval,
+            resource_limits=resource_limits,
         )
         return self.local_store.dataset.create(dataset_create)
 
@@ -1,26 +1,44 @@
 import json
 import shutil
 import tempfile
+import time
 from pathlib import Path
-from typing_extensions import Any, Optional, Union
-from uuid import UUID
+from typing_extensions import Any, Iterator, Optional, Union
+from uuid import UUID, uuid4
 import html
+import itertools
 
 from loguru import logger
 
 from syft_core import Client
 from syft_rds.client.exceptions import RDSValidationError
 from syft_rds.client.rds_clients.base import RDSClientModule
-from syft_rds.client.utils import PathLike
+from syft_rds.client.utils import PathLike, call_with_retry, new_idempotency_key
 from syft_rds.models import (
     Job,
     JobCreate,
     JobStatus,
     JobUpdate,
     UserCode,
+    UserCodeCreate,
 )
 from syft_rds.models.custom_function_models import CustomFunction
-from syft_rds.models.job_models import JobErrorKind, JobResults
+from syft_rds.models.job_models import (
+    MAX_JOBS_PER_CREATE,
+    SWEEP_ID_KEY,
+    SWEEP_PARAMS_KEY,
+    JobErrorKind,
+    JobResults,
+)
+from syft_rds.syft_runtime.log_files import (
+    LogRange,
+    follow_log_files,
+    read_log,
+)
+
+
+# Bytes of each log shown by `show_logs`
+DEFAULT_LOG_PAGE_BYTES = 64 * 1024
 
 
 class JobRDSClient(RDSClientModule[Job]):
@@ -28,7 +46,7 @@ class JobRDSClient(RDSClientModule[Job]):
 
     def submit(
         self,
-        user_code_path: PathLike,
+        user_code_path: Union[PathLike, UserCodeCreate],
         dataset_name: Optional[str] = None,
         entrypoint: Optional[str] = None,
         name: Optional[str] = None,
@@ -38,6 +56,8 @@ class JobRDSClient(RDSClientModule[Job]):
         runtime_name: Optional[str] = None,
         enclave: str = "",
         ignore_patterns: Optional[list[str]] = None,
+        retry: bool = False,
+        max_retries: int = 3,
     ) -> Job:
         """`submit` is a convenience method to create both a UserCode and a Job in one call.
 
@@ -46,8 +66,12 @@ class JobRDSClient(RDSClientModule[Job]):
         to disk and will be automatically processed when the Data Owner's server comes
         online. You can check later with `client.job.get_all()` to see if your job was created.
 
+        Create requests carry idempotency keys, so with `retry=True` timed out requests
+        are re-sent without creating duplicate UserCode or Job objects on the server.
+
         Args:
-            user_code_path: Path to the code file or directory
+            user_code_path: Path to the code file or directory, or a bundle created with
+                        `client.user_code.prepare`
             dataset_name: Name of the dataset to use (optional)
             entrypoint: Entry point file for folder-type code
             name: Optional name for the job
@@ -59,14 +83,17 @@ class JobRDSClient(RDSClientModule[Job]):
             ignore_patterns: Optional list of patterns to ignore when uploading code.
                         If None, uses default ignore patterns (.venv, __pycache__, etc.).
                         Pass [] to include all files.
+            retry: If True, re-send timed out requests with the same idempotency keys
+            max_retries: Maximum number of retries per request when `retry` is True
 
         Returns:
             Job: The created job
 
         Raises:
             SyftTimeoutError: If Data Owner's server doesn't respond within the timeout period
-                            (default 5 minutes). Your request is still saved and will be
-                            processed when the server comes online.
+                            (default 5 minutes), or after all retries when `retry` is True.
+                            Your request is still saved and will be processed when the
+                            server comes online.
         """
         if custom_function is not None:
             custom_function_id = self._resolve_custom_func_id(custom_function)
@@ -81,10 +108,19 @@ class JobRDSClient(RDSClientModule[Job]):
                 )
             entrypoint = custom_function.entrypoint
 
-        user_code = self.rds.user_code.create(
-            code_path=user_code_path,
-            entrypoint=entrypoint,
-            ignore_patterns=ignore_patterns,
+        # Fixed keys for the whole submit, so retries return the original objects
+        user_code_key = new_idempotency_key()
+        job_key = new_idempotency_key()
+        max_retries = max_retries if retry else 0
+
+        user_code = call_with_retry(
+            lambda: self.rds.user_code.create(
+                code_path=user_code_path,
+                entrypoint=entrypoint,
+                ignore_patterns=ignore_patterns,
+                idempotency_key=user_code_key,
+            ),
+            max_retries=max_retries,
         )
 
         if runtime_name is not None:
@@ -99,15 +135,19 @@ class JobRDSClient(RDSClientModule[Job]):
                     f"Ask the data owner to create the runtime first."
                 )
 
-        job = self.create(
-            name=name,
-            description=description,
-            user_code=user_code,
-            dataset_name=dataset_name,
-            tags=tags,
-            custom_function=custom_function,
-            runtime_name=runtime_name,
-            enclave=enclave,
+        job = call_with_retry(
+            lambda: self.create(
+                name=name,
+                description=description,
+                user_code=user_code,
+                dataset_name=dataset_name,
+                tags=tags,
+                custom_function=custom_function,
+                runtime_name=runtime_name,
+                enclave=enclave,
+                idempotency_key=job_key,
+            ),
+            max_retries=max_retries,
         )
 
         return job
@@ -161,6 +201,109 @@ class JobRDSClient(RDSClientModule[Job]):
                 ignore_patterns=ignore_patterns,
             )
 
+    def submit_sweep(
+        self,
+        custom_function: Union[CustomFunction, UUID],
+        param_grid: Union[dict[str, list[Any]], list[dict[str, Any]]],
+        dataset_name: Optional[str] = None,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        tags: Optional[list[str]] = None,
+        runtime_name: Optional[str] = None,
+        retry: bool = False,
+        max_retries: int = 3,
+    ) -> list[Job]:
+        """Submit a job of a custom function for every parameter set of a sweep.
+
+        Unlike calling `submit_with_params` per parameter set, the code is uploaded
+        once and shared by all jobs. The parameters of each job are stored in its
+        `user_metadata` and written to the params file of the custom function when
+        the job runs. Jobs are created in batches of `MAX_JOBS_PER_CREATE` per request.
+
+        Args:
+            custom_function: The custom function to run
+            param_grid: Parameter names mapped to lists of values, with a job for every
+                combination, or a list with the parameters of each job
+            dataset_name: Name of the dataset to use (optional)
+            name: Optional name prefix, the jobs are named `<name>-<index>`
+            description: Optional description for the jobs
+            tags: Optional tags for the jobs
+            runtime_name: Optional runtime name to use
+            retry: If True, re-send timed out requests with the same idempotency keys
+            max_retries: Maximum number of retries per request when `retry` is True
+
+        Returns:
+            list[Job]: The created jobs, in the order of the parameter sets
+        """
+        if isinstance(custom_function, UUID):
+            custom_function = self.rds.custom_function.get(uid=custom_function)
+        elif not isinstance(custom_function, CustomFunction):
+            raise ValueError(
+                f"Invalid custom_function type {type(custom_function)}. Must be CustomFunction or UUID"
+            )
+
+        params_suffix = Path(custom_function.input_params_filename).suffix
+        if not params_suffix == ".json":
+            raise ValueError(
+                f"Input params file must be a JSON file, got {params_suffix}. Please contact the administrator."
+            )
+
+        param_sets = _expand_param_grid(param_grid)
+        if not param_sets:
+            raise RDSValidationError("The parameter grid has no parameter sets.")
+        for params in param_sets:
+            try:
+                json.dumps(params)
+            except Exception as e:
+                raise ValueError(f"Failed to serialize params to JSON: {e}.") from e
+
+        runtime_id = self._resolve_runtime_id(runtime_name)
+        max_retries = max_retries if retry else 0
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # The shared code holds empty params, every job gets its own when it runs
+            user_params_path = Path(tmpdir) / custom_function.input_params_filename
+            user_params_path.write_text("{}")
+            user_code_key = new_idempotency_key()
+            user_code = call_with_retry(
+                lambda: self.rds.user_code.create(
+                    code_path=user_params_path,
+                    entrypoint=custom_function.entrypoint,
+                    idempotency_key=user_code_key,
+                ),
+                max_retries=max_retries,
+            )
+
+        sweep_id = uuid4().hex
+        job_creates = [
+            JobCreate(
+                name=f"{name}-{index}" if name else None,
+                description=description,
+                tags=tags if tags is not None else [],
+                user_code_id=user_code.uid,
+                runtime_id=runtime_id,
+                dataset_name=dataset_name,
+                custom_function_id=custom_function.uid,
+                user_metadata={SWEEP_ID_KEY: sweep_id, SWEEP_PARAMS_KEY: params},
+            )
+            for index, params in enumerate(param_sets)
+        ]
+
+        jobs = []
+        for start in range(0, len(job_creates), MAX_JOBS_PER_CREATE):
+            batch = job_creates[start : start + MAX_JOBS_PER_CREATE]
+            batch_key = new_idempotency_key()
+            jobs.extend(
+                call_with_retry(
+                    lambda batch=batch, batch_key=batch_key: self.rpc.job.create_many(
+                        batch, idempotency_key=batch_key
+                    ),
+                    max_retries=max_retries,
+                )
+            )
+        logger.info(f"Submitted sweep {sweep_id} with {len(jobs)} jobs")
+        return jobs
+
     def _resolve_custom_func_id(
         self, custom_function: Optional[Union[CustomFunction, UUID]]
     ) -> Optional[UUID]:
@@ -220,6 +363,7 @@ class JobRDSClient(RDSClientModule[Job]):
         custom_function: Optional[Union[CustomFunction, UUID]] = None,
         runtime_name: Optional[str] = None,
         enclave: str = "",
+        idempotency_key: Optional[str] = None,
     ) -> Job:
         user_code_id = self._resolve_usercode_id(user_code)
         custom_function_id = self._resolve_custom_func_id(custom_function)
@@ -238,7 +382,7 @@ class JobRDSClient(RDSClientModule[Job]):
             custom_function_id=custom_function_id,
             enclave=enclave,
         )
-        job = self.rpc.job.create(job_create)
+        job = self.rpc.job.create(job_create, idempotency_key=idempotency_key)
 
         return job
 
@@ -304,11 +448,10 @@ class JobRDSClient(RDSClientModule[Job]):
         if not syftbox_output_path.exists():
             syftbox_output_path.mkdir(parents=True)
 
-        # Copy all contents from job_output_folder to the output path
-        for item in job_results_folder.iterdir():
-            if item.is_file():
-                shutil.copy2(item, syftbox_output_path)
-            elif item.is_dir():
+        # Copy the output and logs, the job folder can also hold the code of sweep jobs
+        for name in ("output", "logs"):
+            item = job_results_folder / name
+            if item.is_dir():
                 shutil.copytree(
                     item,
                     syftbox_output_path / item.name,
@@ -325,19 +468,96 @@ class JobRDSClient(RDSClientModule[Job]):
             )
         return self._get_results_from_dir(job, job.output_path)
 
-    def get_logs(self, job: Union[Job, UUID, str]) -> dict[str, str]:
+    def get_logs(
+        self,
+        job: Union[Job, UUID, str],
+        stdout_offset: int = 0,
+        stderr_offset: int = 0,
+        limit: Optional[int] = None,
+        tail: Optional[int] = None,
+        grep: Optional[str] = None,
+    ) -> dict[str, Any]:
         """Get the stdout and stderr logs for a job.
 
+        Only the requested part of each log is read, so this is cheap for large logs.
+
         Args:
             job: Job object or UUID of the job
+            stdout_offset: Byte offset to start reading stdout at, negative to start
+                that many bytes before the end of the log
+            stderr_offset: Byte offset to start reading stderr at, like `stdout_offset`
+            limit: Maximum bytes to read from each log. Pass the returned
+                'stdout_offset' and 'stderr_offset' back to read the next part.
+            tail: Only return the last `tail` lines of each log
+            grep: Only return the lines that match this regular expression
 
         Returns:
-            dict with 'logs_dir', 'stdout', and 'stderr' keys
+            dict with 'logs_dir', 'stdout', and 'stderr' keys, and 'stdout_offset'
+            and 'stderr_offset' with the offset where each read ended.
             Format matches get_output_dir() for consistency.
 
         Raises:
             ValueError: If logs directory doesn't exist
         """
+        logs_dir = self._get_logs_dir(job)
+
+        logs: dict[str, Any] = {"logs_dir": str(logs_dir)}
+        for name, offset in (("stdout", stdout_offset), ("stderr", stderr_offset)):
+            log = read_log(
+                logs_dir / f"{name}.log",
+                offset=offset,
+                limit=limit,
+                tail=tail,
+                grep=grep,
+            )
+            logs[name] = log.text
+            logs[f"{name}_offset"] = log.end
+        return logs
+
+    def follow_logs(
+        self,
+        job: Union[Job, UUID, str],
+        from_start: bool = True,
+        poll_interval: float = 0.1,
+        status_interval: float = 1.0,
+    ) -> Iterator[tuple[str, str]]:
+        """Yield the lines of a running job's logs as they are written.
+
+        Stops when the job is no longer running and its logs are read to the end.
+
+        Args:
+            job: Job object or UUID of the job
+            from_start: Whether to yield the lines written before the call
+            poll_interval: Seconds between reads of the logs
+            status_interval: Seconds between checks of the job status
+
+        Yields:
+            tuple[str, str]: The log name, 'stdout' or 'stderr', and the line
+
+        Raises:
+            ValueError: If logs directory doesn't exist
+        """
+        logs_dir = self._get_logs_dir(job)
+        job_uid = logs_dir.parent.name
+        status_checked_at = 0.0
+        running = True
+
+        def is_running() -> bool:
+            nonlocal status_checked_at, running
+            if time.monotonic() - status_checked_at >= status_interval:
+                status_checked_at = time.monotonic()
+                status = self.get(uid=UUID(job_uid), mode="local").status
+                running = status == JobStatus.job_in_progress
+            return running
+
+        yield from follow_log_files(
+            {name: logs_dir / f"{name}.log" for name in ("stdout", "stderr")},
+            is_running,
+            from_start=from_start,
+            poll_interval=poll_interval,
+        )
+
+    def _get_logs_dir(self, job: Union[Job, UUID, str]) -> Path:
         if isinstance(job, str):
             job = UUID(job)
 
@@ -351,15 +571,7 @@ class JobRDSClient(RDSClientModule[Job]):
                 f"Logs directory does not exist for job {job.uid} at {logs_dir}. "
                 f"Job may not have been executed yet."
             )
-
-        stdout_file = logs_dir / "stdout.log"
-        stderr_file = logs_dir / "stderr.log"
-
-        return {
-            "logs_dir": str(logs_dir),
-            "stdout": stdout_file.read_text() if stdout_file.exists() else "",
-            "stderr": stderr_file.read_text() if stderr_file.exists() else "",
-        }
+        return logs_dir
 
     def get_output_dir(self, job: Union[Job, UUID, str]) -> dict[str, Any]:
         """Get the output directory and all files for a job.
@@ -448,21 +660,43 @@ class JobRDSClient(RDSClientModule[Job]):
         job: Union[Job, UUID, str],
         show_stdout: bool = True,
         show_stderr: bool = True,
+        stdout_offset: Optional[int] = None,
+        stderr_offset: Optional[int] = None,
+        page_size: int = DEFAULT_LOG_PAGE_BYTES,
     ) -> None:
         """Display the stdout and stderr logs for a job in a formatted way.
 
+        Large logs are shown one page at a time, by default the last page. The header
+        of each log tells how to show the pages before and after it.
+
         Args:
             job: Job object or UUID of the job
             show_stdout: Whether to display stdout logs (default: True)
             show_stderr: Whether to display stderr logs (default: True)
+            stdout_offset: Byte offset of the stdout page to show, None for the last page
+            stderr_offset: Byte offset of the stderr page to show, None for the last page
+            page_size: Maximum bytes of each log to show
 
         Raises:
             ValueError: If logs directory doesn't exist
         """
-        if isinstance(job, str):
-            job = UUID(job)
-
-        logs = self.get_logs(job)
+        logs_dir = self._get_logs_dir(job)
+        job_uid = logs_dir.parent.name
+
+        pages = {}
+        for name, show, offset in (
+            ("stdout", show_stdout, stdout_offset),
+            ("stderr", show_stderr, stderr_offset),
+        ):
+            if not show:
+                continue
+            page = read_log(
+                logs_dir / f"{name}.log",
+                offset=-page_size if offset is None else offset,
+                limit=page_size,
+            )
+            if page.text:
+                pages[name] = (page, _log_page_hint(job_uid, name, page, page_size))
 
         # Try to use IPython display if available (for Jupyter notebooks)
         try:
@@ -493,61 +727,46 @@ class JobRDSClient(RDSClientModule[Job]):
             """
             html_parts.append(copy_script)
 
-            if show_stdout and logs["stdout"]:
-                stdout_id = f"stdout_{uuid.uuid4().hex[:8]}"
-                copy_btn_id = f"copy_stdout_{uuid.uuid4().hex[:8]}"
-                # Escape HTML in logs to prevent injection
-                escaped_stdout = html.escape(logs["stdout"])
-
-                stdout_html = f"""
-                <div style="margin-bottom: 20px;">
-                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                        <h3 style="color: #4caf50; margin: 0;">📄 STDOUT</h3>
-                        <button id="{copy_btn_id}"
-                                onclick="copyToClipboard('{stdout_id}', '{copy_btn_id}')"
-                                style="background-color: #555; color: white; border: none;
-                                       padding: 8px 16px; border-radius: 4px; cursor: pointer;
-                                       font-size: 12px; transition: all 0.3s;">
-                            📋 Copy
-                        </button>
-                    </div>
-                    <pre id="{stdout_id}" style="background-color: #1e1e1e;
-                                color: #e0e0e0;
-                                padding: 15px; border-radius: 5px;
-                                border-left: 4px solid #4caf50; overflow-x: auto;
-                                font-family: 'Courier New', monospace; font-size: 12px;">{escaped_stdout}</pre>
-                </div>
-                """
-                html_parts.append(stdout_html)
-
-            if show_stderr and logs["stderr"]:
-                stderr_id = f"stderr_{uuid.uuid4().hex[:8]}"
-                copy_btn_id = f"copy_stderr_{uuid.uuid4().hex[:8]}"
+            titles = {
+                "stdout": ("📄 STDOUT", "#4caf50"),
+                "stderr": ("🛠️ STDERR", "#ff5252"),
+            }
+            for name, (page, hint) in pages.items():
+                title, color = titles[name]
+                log_id = f"{name}_{uuid.uuid4().hex[:8]}"
+                copy_btn_id = f"copy_{name}_{uuid.uuid4().hex[:8]}"
                 # Escape HTML in logs to prevent injection
-                escaped_stderr = html.escape(logs["stderr"])
+                escaped_log = html.escape(page.text)
+                hint_html = (
+                    f'<p style="color: #888; font-size: 12px; margin: 0 0 10px 0;">'
+                    f"{html.escape(hint)}</p>"
+                    if hint
+                    else ""
+                )
 
-                stderr_html = f"""
+                log_html = f"""
                 <div style="margin-bottom: 20px;">
                     <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                        <h3 style="color: #ff5252; margin: 0;">🛠️ STDERR</h3>
+                        <h3 style="color: {color}; margin: 0;">{title}</h3>
                         <button id="{copy_btn_id}"
-                                onclick="copyToClipboard('{stderr_id}', '{copy_btn_id}')"
+                                onclick="copyToClipboard('{log_id}', '{copy_btn_id}')"
                                 style="background-color: #555; color: white; border: none;
                                        padding: 8px 16px; border-radius: 4px; cursor: pointer;
                                        font-size: 12px; transition: all 0.3s;">
                             📋 Copy
                         </button>
                     </div>
-                    <pre id="{stderr_id}" style="background-color: #1e1e1e;
+                    {hint_html}
+                    <pre id="{log_id}" style="background-color: #1e1e1e;
                                 color: #e0e0e0;
                                 padding: 15px; border-radius: 5px;
-                                border-left: 4px solid #ff5252; overflow-x: auto;
-                                font-family: 'Courier New', monospace; font-size: 12px;">{escaped_stderr}</pre>
+                                border-left: 4px solid {color}; overflow-x: auto;
+                                font-family: 'Courier New', monospace; font-size: 12px;">{escaped_log}</pre>
                 </div>
                 """
-                html_parts.append(stderr_html)
+                html_parts.append(log_html)
 
-            if not html_parts or len(html_parts) == 1:  # Only script, no logs
+            if not pages:
                 display(HTML("<p><i>No logs to display</i></p>"))
             else:
                 display(HTML("".join(html_parts)))
@@ -555,20 +774,17 @@ class JobRDSClient(RDSClientModule[Job]):
         except ImportError:
             # Fallback to plain text for console environments
             separator = "=" * 80
+            titles = {"stdout": "📄 STDOUT", "stderr": "🛠️ STDERR"}
 
-            if show_stdout and logs["stdout"]:
+            for name, (page, hint) in pages.items():
                 print(f"\n{separator}")
-                print("📄 STDOUT")
+                print(titles[name])
+                if hint:
+                    print(hint)
                 print(separator)
-                print(logs["stdout"])
+                print(page.text)
 
-            if show_stderr and logs["stderr"]:
-                print(f"\n{separator}")
-                print("🛠️ STDERR")
-                print(separator)
-                print(logs["stderr"])
-
-            if not logs["stdout"] and not logs["stderr"]:
+            if not pages:
                 print("\nNo logs to display")
 
     def approve(self, job: Job) -> Job:
@@ -746,3 +962,32 @@ class JobRDSClient(RDSClientModule[Job]):
                 "Please use init_session() to properly initialize the RDSClient."
             )
         return job_output_folder
+
+
+def _log_page_hint(job_uid: str, name: str, page: LogRange, page_size: int) -> str:
+    """Where a page of a log is, and how to show the pages around it."""
+    if page.start == 0 and page.end == page.size:
+        return ""
+    hint = f"Showing bytes {page.start}-{page.end} of {page.size}."
+    other = "show_stderr=False" if name == "stdout" else "show_stdout=False"
+    if page.start > 0:
+        previous = max(0, page.start - page_size)
+        hint += f" Previous page: show_logs('{job_uid}', {name}_offset={previous}, {other})."
+    if page.end < page.size:
+        hint += (
+            f" Next page: show_logs('{job_uid}', {name}_offset={page.end}, {other})."
+        )
+    return hint
+
+
+def _expand_param_grid(
+    param_grid: Union[dict[str, list[Any]], list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """The parameter sets of a sweep, every combination of the values of a grid."""
+    if isinstance(param_grid, dict):
+        names = list(param_grid)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(param_grid[name] for name in names))
+        ]
+    return [dict(params) for params in param_grid]
@@ -32,8 +32,13 @@ class RuntimeRDSClient(RDSClientModule[Runtime]):
         runtime_kind: str,
         config: dict | None = None,
         description: str | None = None,
+        prebuild: bool = True,
     ) -> Runtime:
-        """Create a runtime. Only admins can create runtimes."""
+        """Create a runtime. Only admins can create runtimes.
+
+        The image of a Docker runtime is built in the background, unless `prebuild` is
+        False. See `runtime.build_status`.
+        """
 
         # Validate runtime kind
         valid_kinds = [r.value for r in RuntimeKind]
@@ -58,6 +63,10 @@ class RuntimeRDSClient(RDSClientModule[Runtime]):
 
         runtime = self.rpc.runtime.create(runtime_create)
         logger.info(f"Runtime created: {runtime}")
+
+        if runtime.kind == RuntimeKind.DOCKER and prebuild:
+            # The first job of the runtime does not have to wait for a full build
+            self.rds.docker_images.prebuild(runtime)
         return runtime
 
     def get_runtime_by_name(self, name: str) -> Runtime | None:
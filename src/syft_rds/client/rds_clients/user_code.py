@@ -18,24 +18,75 @@ class UserCodeRDSClient(RDSClientModule[UserCode]):
 
     def create(
         self,
-        code_path: PathLike,
+        code_path: PathLike | UserCodeCreate,
         name: str | None = None,
         entrypoint: str | None = None,
         ignore_patterns: list[str] | None = None,
+        idempotency_key: str | None = None,
     ) -> UserCode:
         """Create a new UserCode object from a file or directory.
 
         Args:
-            code_path: Path to the code file or directory
+            code_path: Path to the code file or directory, or a bundle created with
+                        `prepare`. A bundle is sent as-is, without zipping the code again.
             name: Optional name for the user code
             entrypoint: Entry point file for folder-type code (required for folders)
             ignore_patterns: Optional list of patterns to ignore when zipping.
                         If None, uses default ignore patterns (.venv, __pycache__, etc.).
                         Pass [] to include all files.
+            idempotency_key: Optional key to de-duplicate retried requests on the server.
+                        Re-use the same key when retrying a create.
 
         Returns:
             UserCode: The created user code object
 
+        Raises:
+            FileNotFoundError: If code_path or entrypoint doesn't exist
+            ValueError: If entrypoint is not provided for folder-type code
+        """
+        if isinstance(code_path, UserCodeCreate):
+            user_code_create = code_path
+            overrides = {"name": name, "entrypoint": entrypoint}
+            overrides = {k: v for k, v in overrides.items() if v is not None}
+            if overrides:
+                user_code_create = user_code_create.model_copy(update=overrides)
+        else:
+            user_code_create = self.prepare(
+                code_path,
+                name=name,
+                entrypoint=entrypoint,
+                ignore_patterns=ignore_patterns,
+            )
+
+        user_code = self.rpc.user_code.create(
+            user_code_create, idempotency_key=idempotency_key
+        )
+
+        return user_code
+
+    def prepare(
+        self,
+        code_path: PathLike,
+        name: str | None = None,
+        entrypoint: str | None = None,
+        ignore_patterns: list[str] | None = None,
+    ) -> UserCodeCreate:
+        """Zip a file or directory into a UserCodeCreate bundle, without sending it.
+
+        The bundle can be passed to `create` or `job.submit` of any client, so code that
+        is submitted to many datasites is only zipped once.
+
+        Args:
+            code_path: Path to the code file or directory
+            name: Optional name for the user code
+            entrypoint: Entry point file for folder-type code (required for folders)
+            ignore_patterns: Optional list of patterns to ignore when zipping.
+                        If None, uses default ignore patterns (.venv, __pycache__, etc.).
+                        Pass [] to include all files.
+
+        Returns:
+            UserCodeCreate: The zipped code
+
         Raises:
             FileNotFoundError: If code_path or entrypoint doesn't exist
             ValueError: If entrypoint is not provided for folder-type code
@@ -74,17 +125,13 @@ class UserCodeRDSClient(RDSClientModule[UserCode]):
             # Single files don't need ignore patterns
             files_zipped = zip_to_bytes(files_or_dirs=code_path, ignore_patterns=[])
 
-        user_code_create = UserCodeCreate(
+        return UserCodeCreate(
             name=name,
             files_zipped=files_zipped,
             code_type=code_type,
             entrypoint=entrypoint,
         )
 
-        user_code = self.rpc.user_code.create(user_code_create)
-
-        return user_code
-
 
 def _has_editable_dependencies(pyproject_path: Path) -> bool:
     """Check if pyproject.toml contains editable/path dependencies.
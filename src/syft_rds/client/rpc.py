@@ -1,17 +1,22 @@
+import time
 from typing import (
     TYPE_CHECKING,
     ClassVar,
     Generic,
+    Literal,
     Optional,
     Type,
     TypeVar,
     Union,
 )
 
+from loguru import logger
 from syft_rpc import SyftResponse
+from syft_rpc.protocol import SyftStatus
 from syft_rpc.rpc import BodyType
 
 from syft_rds.client.connection import BlockingRPCConnection
+from syft_rds.client.utils import new_idempotency_key
 from syft_rds.models import (
     ItemBase,
     ItemBaseCreate,
@@ -23,7 +28,10 @@ from syft_rds.models import (
     GetOneRequest,
     ItemList,
     Job,
+    MetricsRequest,
+    ServerStatus,
     JobCreate,
+    JobCreateMany,
     JobUpdate,
     Runtime,
     RuntimeCreate,
@@ -35,11 +43,16 @@ from syft_rds.models import (
     CustomFunctionCreate,
     CustomFunctionUpdate,
 )
+from syft_rds.utils.constants import IDEMPOTENCY_KEY_HEADER, RETRY_AFTER_HEADER
 
 if TYPE_CHECKING:
     from syft_rds.client.rds_client import RDSClientConfig
 
 
+# Backoff for rate limited requests, used when it exceeds the server's Retry-After
+RATE_LIMIT_BACKOFF_BASE = 1.0  # seconds
+RATE_LIMIT_BACKOFF_MAX = 60.0  # seconds
+
 T = TypeVar("T", bound=ItemBase)
 CreateT = TypeVar("CreateT", bound=ItemBaseCreate)
 UpdateT = TypeVar("UpdateT", bound=ItemBaseUpdate)
@@ -53,20 +66,101 @@ class RPCClientModule:
         self.prefix = f"syft://{self.config.host}/app_data/{self.config.app_name}/rpc"
 
     def _send(
-        self, path: str, body: BodyType, expiry: Optional[Union[str, int]] = None
+        self,
+        path: str,
+        body: BodyType,
+        expiry: Optional[Union[str, int]] = None,
+        coalesce: bool = False,
+        headers: Optional[dict[str, str]] = None,
+    ) -> SyftResponse:
+        """Send a request to the RDS server.
+
+        Args:
+            path: Endpoint path, relative to the app rpc prefix
+            body: Request body
+            expiry: Optional request expiry, defaults to the config rpc_expiry
+            coalesce: If True, identical concurrent requests (same url and serialized body)
+                share a single underlying request and response. Only use for read-only requests.
+            headers: Optional request headers
+
+        Requests rejected with 429 Too Many Requests are retried up to
+        `config.rate_limit_retries` times, waiting for the Retry-After hint of the
+        server or an exponential backoff, whichever is longer.
+        """
+        for attempt in range(self.config.rate_limit_retries + 1):
+            response = self._send_once(path, body, expiry, coalesce, headers)
+            if (
+                response.status_code != SyftStatus.TOO_MANY_REQUESTS
+                or attempt == self.config.rate_limit_retries
+            ):
+                return response
+            delay = _rate_limit_delay(response, attempt)
+            logger.warning(
+                f"Request to {path} was rate limited, retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+        return response
+
+    def _send_once(
+        self,
+        path: str,
+        body: BodyType,
+        expiry: Optional[Union[str, int]],
+        coalesce: bool,
+        headers: Optional[dict[str, str]],
     ) -> SyftResponse:
         expiry = expiry or self.config.rpc_expiry
         if isinstance(expiry, int):
             expiry = f"{expiry}s"
-
-        return self.connection.send(
-            f"{self.prefix}/{path}",
-            body,
-            expiry=expiry,
-            cache=False,
+        url = f"{self.prefix}/{path}"
+
+        start = time.perf_counter()
+        try:
+            if not coalesce:
+                return self.connection.send(
+                    url, body, headers=headers, expiry=expiry, cache=False
+                )
+
+            # Serialize once, the serialized body is both the coalescing key and the payload
+            body = self.connection._serialize(body)
+            key = (url, body, tuple(sorted((headers or {}).items())))
+            return self.connection.singleflight.do(
+                key,
+                lambda: self.connection.send(
+                    url, body, headers=headers, expiry=expiry, cache=False
+                ),
+            )
+        finally:
+            self.connection.metrics.observe(
+                "round_trip", path.strip("/"), time.perf_counter() - start
+            )
+
+    def _offload_files_zipped(self, path: str, item: CreateT) -> CreateT:
+        """Move zipped files out of the request body into a binary attachment.
+
+        Embedding zip bytes in the JSON body base64-encodes them, which inflates the
+        request by ~33% and forces the server to decode the full payload in memory.
+        """
+        files_zipped = getattr(item, "files_zipped", None)
+        if files_zipped is None:
+            return item
+        attachment_id = self.connection.write_attachment(
+            f"{self.prefix}/{path}", files_zipped
+        )
+        return item.model_copy(
+            update={"files_attachment_id": attachment_id, "files_zipped": None}
         )
 
 
+def _rate_limit_delay(response: SyftResponse, attempt: int) -> float:
+    backoff = min(RATE_LIMIT_BACKOFF_BASE * 2**attempt, RATE_LIMIT_BACKOFF_MAX)
+    try:
+        retry_after = float((response.headers or {}).get(RETRY_AFTER_HEADER, 0))
+    except ValueError:
+        retry_after = 0.0
+    return max(retry_after, backoff)
+
+
 class CRUDRPCClient(RPCClientModule, Generic[T, CreateT, UpdateT]):
     MODULE_NAME: ClassVar[str]
     ITEM_TYPE: ClassVar[type[T]]
@@ -76,22 +170,33 @@ class CRUDRPCClient(RPCClientModule, Generic[T, CreateT, UpdateT]):
             item._register_client_id_recursive(self.config.uid)
         return item
 
-    def create(self, item: CreateT) -> T:
-        response = self._send(f"{self.MODULE_NAME}/create", item)
+    def create(self, item: CreateT, idempotency_key: Optional[str] = None) -> T:
+        """Create an item on the server.
+
+        Every create request carries an idempotency key, the server returns the original
+        result for a repeated key. Pass the same `idempotency_key` when retrying a create
+        to avoid creating duplicates.
+        """
+        idempotency_key = idempotency_key or new_idempotency_key()
+        response = self._send(
+            f"{self.MODULE_NAME}/create",
+            item,
+            headers={IDEMPOTENCY_KEY_HEADER: idempotency_key},
+        )
         response.raise_for_status()
 
         res = response.model(self.ITEM_TYPE)
         return self.register_client_id(res)
 
     def get_one(self, request: GetOneRequest) -> T:
-        response = self._send(f"{self.MODULE_NAME}/get_one", request)
+        response = self._send(f"{self.MODULE_NAME}/get_one", request, coalesce=True)
         response.raise_for_status()
 
         res = response.model(self.ITEM_TYPE)
         return self.register_client_id(res)
 
     def get_all(self, request: GetAllRequest) -> list[T]:
-        response = self._send(f"{self.MODULE_NAME}/get_all", request)
+        response = self._send(f"{self.MODULE_NAME}/get_all", request, coalesce=True)
         response.raise_for_status()
 
         item_list = response.model(ItemList[self.ITEM_TYPE])
@@ -114,6 +219,21 @@ class JobRPCClient(CRUDRPCClient[Job, JobCreate, JobUpdate]):
     MODULE_NAME = "job"
     ITEM_TYPE = Job
 
+    def create_many(
+        self, items: list[JobCreate], idempotency_key: Optional[str] = None
+    ) -> list[Job]:
+        """Create many jobs in one request, see `create` for `idempotency_key`."""
+        idempotency_key = idempotency_key or new_idempotency_key()
+        response = self._send(
+            f"{self.MODULE_NAME}/create_many",
+            JobCreateMany(items=items),
+            headers={IDEMPOTENCY_KEY_HEADER: idempotency_key},
+        )
+        response.raise_for_status()
+
+        item_list = response.model(ItemList[Job])
+        return [self.register_client_id(item) for item in item_list.items]
+
 
 class RuntimeRPCClient(CRUDRPCClient[Runtime, RuntimeCreate, RuntimeUpdate]):
     MODULE_NAME = "runtime"
@@ -124,6 +244,12 @@ class UserCodeRPCClient(CRUDRPCClient[UserCode, UserCodeCreate, UserCodeUpdate])
     MODULE_NAME = "user_code"
     ITEM_TYPE = UserCode
 
+    def create(
+        self, item: UserCodeCreate, idempotency_key: Optional[str] = None
+    ) -> UserCode:
+        item = self._offload_files_zipped(f"{self.MODULE_NAME}/create", item)
+        return super().create(item, idempotency_key=idempotency_key)
+
 
 class CustomFunctionRPCClient(
     CRUDRPCClient[CustomFunction, CustomFunctionCreate, CustomFunctionUpdate]
@@ -131,6 +257,12 @@ class CustomFunctionRPCClient(
     MODULE_NAME = "custom_function"
     ITEM_TYPE = CustomFunction
 
+    def create(
+        self, item: CustomFunctionCreate, idempotency_key: Optional[str] = None
+    ) -> CustomFunction:
+        item = self._offload_files_zipped(f"{self.MODULE_NAME}/create", item)
+        return super().create(item, idempotency_key=idempotency_key)
+
 
 class RPCClient(RPCClientModule):
     def __init__(self, config: "RDSClientConfig", connection: BlockingRPCConnection):
@@ -159,7 +291,43 @@ class RPCClient(RPCClientModule):
         return self._type_map[type_]
 
     def health(self, expiry: Optional[Union[str, int]] = None) -> dict:
-        response: SyftResponse = self._send("/health", body=None, expiry=expiry)
+        response: SyftResponse = self._send(
+            "/health", body=None, expiry=expiry, coalesce=True
+        )
+        response.raise_for_status()
+
+        return response.json()
+
+    def status(self, expiry: Optional[Union[str, int]] = None) -> ServerStatus:
+        """Server internals: uptime, request queues, stores, caches and running jobs."""
+        response: SyftResponse = self._send(
+            "/status", body=None, expiry=expiry, coalesce=True
+        )
+        response.raise_for_status()
+
+        return response.model(ServerStatus)
+
+    def metrics(self) -> dict:
+        """Client-side RPC metrics: round-trip latency per endpoint and request coalescing."""
+        return {
+            **self.connection.metrics.snapshot(),
+            "singleflight": self.connection.singleflight.metrics(),
+        }
+
+    def server_metrics(
+        self,
+        format: Literal["json", "prometheus"] = "json",
+        expiry: Optional[Union[str, int]] = None,
+    ) -> Union[dict, str]:
+        """Server-side latency metrics per endpoint, as JSON or Prometheus text.
+
+        Only available to the datasite owner.
+        """
+        response: SyftResponse = self._send(
+            "/metrics", body=MetricsRequest(format=format), expiry=expiry
+        )
         response.raise_for_status()
 
+        if format == "prometheus":
+            return response.text()
         return response.json()
@@ -1,20 +1,233 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import yaml
+from loguru import logger
+from pydantic import BaseModel
 from syft_core import Client as SyftBoxClient
+from syft_rpc import rpc
+from syft_rpc.protocol import SyftFuture
 
+from syft_rds.display_utils.jupyter.types import TableList
 from syft_rds.server.app import APP_INFO_FILE, APP_NAME
 
+DEFAULT_DISCOVERY_WORKERS = 32
+DEFAULT_PROBE_TIMEOUT = 5.0  # seconds
+PROBE_POLL_INTERVAL = 0.1  # seconds
+
+
+class RDSServerInfo(BaseModel):
+    host: str
+    reachable: bool
+    # Version in the app info file of the datasite
+    app_version: Optional[str] = None
+    # Version reported by the running server
+    server_version: Optional[str] = None
+    latency_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class _DiscoveryCache:
+    """Discovery results per datasites dir, invalidated by file modification times."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # datasites_dir -> (mtime_ns, datasite names)
+        self._datasites: dict[Path, tuple[int, list[str]]] = {}
+        # app info path -> (mtime_ns, app_version)
+        self._app_info: dict[Path, tuple[int, Optional[str]]] = {}
+
+    def list_datasites(self, datasites_dir: Path) -> list[str]:
+        mtime_ns = datasites_dir.stat().st_mtime_ns
+        with self._lock:
+            cached = self._datasites.get(datasites_dir)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        with os.scandir(datasites_dir) as entries:
+            names = sorted(entry.name for entry in entries if entry.is_dir())
+        with self._lock:
+            self._datasites[datasites_dir] = (mtime_ns, names)
+        return names
+
+    def app_version(self, app_info_path: Path) -> tuple[bool, Optional[str]]:
+        """Returns (installed, app_version), only reads the app info file if it changed."""
+        try:
+            mtime_ns = app_info_path.stat().st_mtime_ns
+        except OSError:
+            return False, None
+
+        with self._lock:
+            cached = self._app_info.get(app_info_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return True, cached[1]
+
+        try:
+            app_info = yaml.safe_load(app_info_path.read_text()) or {}
+            version = app_info.get("app_version")
+        except (OSError, yaml.YAMLError) as e:
+            logger.debug(f"Could not read {app_info_path}: {e}")
+            version = None
+        with self._lock:
+            self._app_info[app_info_path] = (mtime_ns, version)
+        return True, version
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datasites.clear()
+            self._app_info.clear()
+
+
+_DISCOVERY_CACHE = _DiscoveryCache()
+
+
+def _discover(
+    syftbox_client: SyftBoxClient, max_workers: int
+) -> dict[str, Optional[str]]:
+    """Returns {datasite: app_version} for all datasites that have the RDS app installed."""
+    datasites = _DISCOVERY_CACHE.list_datasites(syftbox_client.workspace.datasites)
+
+    def check(datasite: str) -> tuple[bool, Optional[str]]:
+        app_dir = syftbox_client.app_data(APP_NAME, datasite=datasite)
+        return _DISCOVERY_CACHE.app_version(app_dir / APP_INFO_FILE)
+
+    # Stats are I/O bound, and slow on network or synced filesystems
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="rds-discovery"
+    ) as executor:
+        results = executor.map(check, datasites)
+        return {
+            datasite: version
+            for datasite, (installed, version) in zip(datasites, results)
+            if installed
+        }
+
+
+def discover_rds_apps(
+    syftbox_client: SyftBoxClient | None = None,
+    max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+) -> list[str]:
+    """Return all datasites that have the RDS app installed.
+
+    Datasites are checked concurrently, and results are cached until the
+    datasites directory or app info file of a datasite changes.
+    """
+    if syftbox_client is None:
+        syftbox_client = SyftBoxClient.load()
+    return list(_discover(syftbox_client, max_workers))
+
+
+def probe_rds_servers(
+    hosts: list[str],
+    syftbox_client: SyftBoxClient | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> list[RDSServerInfo]:
+    """Send a /health request to all `hosts` at once, and wait for the responses.
+
+    Requests are sent without blocking, so probing many hosts takes at most
+    `timeout` seconds instead of `timeout` seconds per unreachable host.
+    """
+    if syftbox_client is None:
+        syftbox_client = SyftBoxClient.load()
+
+    expiry = f"{max(1, round(timeout))}s"
+    pending: dict[str, tuple[SyftFuture, float]] = {}
+    results: dict[str, RDSServerInfo] = {}
+    for host in hosts:
+        try:
+            future = rpc.send(
+                url=f"syft://{host}/app_data/{APP_NAME}/rpc/health",
+                expiry=expiry,
+                cache=False,
+                client=syftbox_client,
+            )
+            pending[host] = (future, time.monotonic())
+        except Exception as e:
+            results[host] = RDSServerInfo(host=host, reachable=False, error=str(e))
+
+    deadline = time.monotonic() + timeout
+    while pending and time.monotonic() < deadline:
+        for host, (future, sent_at) in list(pending.items()):
+            if _response_incomplete(future):
+                continue
+            try:
+                response = future.resolve()
+            except Exception as e:
+                del pending[host]
+                results[host] = RDSServerInfo(host=host, reachable=False, error=str(e))
+                continue
+            if response is None:
+                continue
+
+            del pending[host]
+            latency = time.monotonic() - sent_at
+            if response.is_success:
+                results[host] = RDSServerInfo(
+                    host=host,
+                    reachable=True,
+                    server_version=response.json().get("version"),
+                    latency_seconds=latency,
+                )
+            else:
+                results[host] = RDSServerInfo(
+                    host=host,
+                    reachable=False,
+                    latency_seconds=latency,
+                    error=f"{response.status_code}: {response.text()}",
+                )
+        if pending:
+            time.sleep(PROBE_POLL_INTERVAL)
+
+    for host, (future, _) in pending.items():
+        # Remove the request, it would otherwise be processed when the server comes online
+        future.request_path.unlink(missing_ok=True)
+        results[host] = RDSServerInfo(
+            host=host, reachable=False, error=f"No response within {timeout}s"
+        )
+    return [results[host] for host in hosts]
+
+
+def _response_incomplete(future: SyftFuture) -> bool:
+    # The response file is created before it is written, resolving it now would fail
+    try:
+        return future.response_path.stat().st_size == 0
+    except OSError:
+        return False
+
+
+def find_rds_servers(
+    syftbox_client: SyftBoxClient | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    include_unreachable: bool = False,
+    max_workers: int = DEFAULT_DISCOVERY_WORKERS,
+) -> TableList:
+    """Discover datasites with the RDS app installed and check which servers respond.
+
+    Args:
+        syftbox_client: SyftBox client, loaded from the default config if not provided
+        timeout: Seconds to wait for the /health responses of all servers
+        include_unreachable: If True, also list servers that did not respond
+        max_workers: Number of threads used to scan the datasites
 
-def discover_rds_apps(syftbox_client: SyftBoxClient | None = None) -> list[str]:
-    """Return all datasites that have the RDS app installed."""
+    Returns:
+        TableList[RDSServerInfo]: Servers with their versions and /health latency,
+            fastest first
+    """
     if syftbox_client is None:
         syftbox_client = SyftBoxClient.load()
 
-    datasites_dir = syftbox_client.workspace.datasites
+    app_versions = _discover(syftbox_client, max_workers)
+    servers = probe_rds_servers(
+        list(app_versions), syftbox_client=syftbox_client, timeout=timeout
+    )
+    for server in servers:
+        server.app_version = app_versions[server.host]
 
-    datasites = []
-    for dir in datasites_dir.iterdir():
-        if not dir.is_dir():
-            continue
-        datasite_app_dir = syftbox_client.app_data(APP_NAME, datasite=dir.name)
-        if (datasite_app_dir / APP_INFO_FILE).exists():
-            datasites.append(dir.name)
-    return datasites
+    if not include_unreachable:
+        servers = [server for server in servers if server.reachable]
+    servers.sort(key=lambda s: (not s.reachable, s.latency_seconds or 0.0))
+    return TableList(servers)
@@ -0,0 +1,68 @@
+import threading
+from typing import Callable, Generic, Hashable, TypeVar
+
+R = TypeVar("R")
+
+
+class _Call(Generic[R]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: R | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[R]):
+    """Coalesce identical concurrent calls into a single execution.
+
+    The first caller for a key (the leader) executes the function, all callers that
+    arrive with the same key while the call is in flight wait for and share the
+    leader's result (or exception). Once the call completes the key is released,
+    so later calls execute again and never observe stale results.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[R]] = {}
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], R]) -> R:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._coalesced += 1
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executed += 1
+                is_leader = True
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def metrics(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "executed": self._executed,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+            }
@@ -3,9 +3,14 @@ import os
 import shutil
 import warnings
 from pathlib import Path
-from typing import Iterator, TypeAlias, Union
+from typing import Callable, Iterator, TypeAlias, TypeVar, Union
+from uuid import uuid4
+
+from loguru import logger
+from syft_rpc.protocol import SyftTimeoutError
 
 PathLike: TypeAlias = Union[str, os.PathLike, Path]
+R = TypeVar("R")
 
 
 def to_path(path: PathLike) -> Path:
@@ -55,3 +60,23 @@ def copy_paths(files: Iterator[Path], dst: Path, exists_ok: bool = False) -> Non
             shutil.copy2(file, dst_path)
         elif file.is_dir():
             shutil.copytree(file, dst_path, dirs_exist_ok=exists_ok)
+
+
+def new_idempotency_key() -> str:
+    return uuid4().hex
+
+
+def call_with_retry(func: Callable[[], R], max_retries: int) -> R:
+    """Call `func`, re-calling it up to `max_retries` times when the request times out.
+
+    Only use with requests that are safe to repeat, e.g. creates with a fixed idempotency key.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return func()
+        except SyftTimeoutError:
+            if attempt == max_retries:
+                raise
+            logger.warning(
+                f"Request timed out, retrying ({attempt + 1}/{max_retries})..."
+            )
@@ -61,6 +61,27 @@ class ANSIPydanticFormatter(PydanticFormatter):
         return self.format_str(model)
 
 
+class NestedANSIPydanticFormatter(ANSIPydanticFormatter):
+    """Format Pydantic models with nested dict fields as an indented tree"""
+
+    def format_value(self, key: str, value: Any, indent: int) -> list[str]:
+        if isinstance(value, dict) and value:
+            formatted_key = f"\033[1m{key}\033[0m" if self.use_colors else key
+            lines = [" " * indent + formatted_key + ":"]
+            for k, v in value.items():
+                lines.extend(self.format_value(str(k), v, indent + 2))
+            return lines
+        return [" " * indent + self.format_field(key, value).strip()]
+
+    def format_str(self, model: BaseModel) -> str:
+        header = self.format_class_name(model.__class__.__name__) + "\n"
+
+        lines = []
+        for key, value in model.model_dump(mode="json").items():
+            lines.extend(self.format_value(key, value, indent=2))
+        return header + "\n".join(lines)
+
+
 class PydanticFormatterMixin:
     __display_formatter__: ClassVar[PydanticFormatter] = ANSIPydanticFormatter()
 
@@ -4,18 +4,17 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, List, Optional
 
-import jinja2
 from pydantic import BaseModel
-from rich.console import Console
-from rich.tree import Tree
 
-from syft_rds.utils.resources import load_css
+from syft_rds.utils.resources import get_jinja_env, load_css
 
-jinja_env = jinja2.Environment(loader=jinja2.PackageLoader("syft_rds", "assets/jinja"))  # nosec
 PERM_FILE = "syftperm.yaml"
 
 
 def make_dirtree_string(root_dir: Path) -> Optional[str]:
+    from rich.console import Console
+    from rich.tree import Tree
+
     try:
         # Create a Tree object
         tree = Tree(f"📁 {root_dir.name}")
@@ -68,7 +67,7 @@ def prepare_path_display(obj: Any, path_field: str, open_default: bool = False)
     Returns:
         str: HTML representation of the file content or directory tree
     """
-    template = jinja_env.get_template("model_repr_file_section.jinja2")
+    template = get_jinja_env().get_template("model_repr_file_section.jinja2")
     render_params = {"title": path_field, "open": open_default}
 
     # Check if field exists
@@ -148,7 +147,7 @@ def create_html_repr(
         for path_field in display_paths
     ]
 
-    template = jinja_env.get_template("model_repr.jinja2")
+    template = get_jinja_env().get_template("model_repr.jinja2")
     return template.render(
         obj=obj,
         obj_name=obj_name,
@@ -12,3 +12,11 @@ def display(obj: Any) -> Any:
         return TableDict(obj)
 
     return obj
+
+
+def show_html(html: str) -> None:
+    """Display HTML in a notebook, IPython is only imported when something is shown."""
+    from IPython.display import HTML
+    from IPython.display import display as ipython_display
+
+    ipython_display(HTML(html))
@@ -2,10 +2,8 @@ import json
 import logging
 import re
 import secrets
-from typing import Any, Optional
-
-import jinja2
-from IPython.display import HTML, display
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
 
 # from syft_rds.display_utils.jupyter.components import Badge, CopyButton, Label
 from syft_rds.display_utils.jupyter.icons import Icon
@@ -14,7 +12,10 @@ from syft_rds.display_utils.jupyter.table_utils import (
     format_table_data,
     prepare_table_data,
 )
-from syft_rds.utils.resources import load_css, load_js
+from syft_rds.utils.resources import get_jinja_env, load_css, load_js
+
+if TYPE_CHECKING:
+    import jinja2
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +26,13 @@ def make_links(text: str) -> str:
 
 
 DEFAULT_ID_WIDTH = 110
-jinja_env = jinja2.Environment(loader=jinja2.PackageLoader("syft_rds", "assets/jinja"))  # nosec
-jinja_env.filters["make_links"] = make_links
+
+
+@lru_cache(maxsize=1)
+def _table_template() -> "jinja2.Template":
+    jinja_env = get_jinja_env()
+    jinja_env.filters["make_links"] = make_links
+    return jinja_env.get_template("table.jinja2")
 
 
 def create_tabulator_columns(
@@ -78,7 +84,7 @@ def _build_table_html(
     # UID is used to identify the table in the DOM
     uid = uid if uid is not None else secrets.token_hex(8)
 
-    table_template = jinja_env.get_template("table.jinja2")
+    table_template = _table_template()
     tabulator_js = load_js("tabulator.min.js")
     tabulator_css = load_css("tabulator_pysyft.min.css")
     js = load_js("table.js")
@@ -159,6 +165,8 @@ def build_tabulator_table(
 
 def show_table(obj: Any) -> None:
     """Utility function to display a Tabulator table in Jupyter, without overwriting `obj._html_repr_`."""
+    from syft_rds.display_utils.jupyter.display import show_html
+
     table = build_tabulator_table(obj)
     if table is not None:
-        display(HTML(table))
+        show_html(table)
@@ -1,8 +1,6 @@
 import os
 from collections import UserDict, UserList
 
-from syft_rds.display_utils.jupyter.tabulator import build_tabulator_table
-
 SYFT_NO_REPR_HTML = "SYFT_NO_REPR_HTML" in os.environ
 
 
@@ -10,6 +8,8 @@ class TableList(UserList):
     def _repr_html_(self) -> str:
         if SYFT_NO_REPR_HTML:
             return None
+        from syft_rds.display_utils.jupyter.tabulator import build_tabulator_table
+
         return build_tabulator_table(self.data)
 
 
@@ -17,4 +17,6 @@ class TableDict(UserDict):
     def _repr_html_(self) -> str:
         if SYFT_NO_REPR_HTML:
             return None
+        from syft_rds.display_utils.jupyter.tabulator import build_tabulator_table
+
         return build_tabulator_table(self.data)
@@ -1,8 +1,15 @@
-from typing import Any, Generic, Literal, Optional, TypeVar
+from datetime import datetime
+from typing import Any, ClassVar, Generic, Literal, Optional, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from syft_rds.display_utils.formatter import (
+    NestedANSIPydanticFormatter,
+    PydanticFormatter,
+    PydanticFormatterMixin,
+)
+
 T = TypeVar("T", bound=BaseModel)
 
 
@@ -22,3 +29,29 @@ class GetAllRequest(BaseModel):
 class GetOneRequest(BaseModel):
     uid: Optional[UUID] = None
     filters: dict[str, Any] = Field(default_factory=dict)
+
+
+class MetricsRequest(BaseModel):
+    format: Literal["json", "prometheus"] = "json"
+
+
+class ServerStatus(PydanticFormatterMixin, BaseModel):
+    # Returned by the /status endpoint
+    __display_formatter__: ClassVar[PydanticFormatter] = NestedANSIPydanticFormatter()
+
+    app_name: str
+    version: str
+    uptime_seconds: float
+    # rss_bytes, cpu_seconds and cpu_percent of the server process
+    process: dict[str, Any]
+    # Queue depth and in-flight handlers, in total and per route
+    requests: dict[str, Any]
+    # Progress of the requests found on startup
+    backlog: dict[str, Any] = Field(default_factory=dict)
+    # Record count and size on disk per store
+    stores: dict[str, dict[str, int]] = Field(default_factory=dict)
+    response_cache: dict[str, Any] = Field(default_factory=dict)
+    running_job_count: int = 0
+    # uid, name and creator of running jobs, only visible to the datasite owner
+    running_jobs: list[dict[str, Any]] = Field(default_factory=list)
+    last_cleanup: Optional[datetime] = None
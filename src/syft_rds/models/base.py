@@ -96,6 +96,11 @@ class ItemBase(BaseModel, ABC):
                 f"Cannot apply update of type {type(other)} to {type(self)}"
             )
 
+        for field_name in update_dict:
+            if field_name in other.model_fields_set:
+                # Keep nested models, `model_dump` turned them into dicts
+                update_dict[field_name] = getattr(other, field_name)
+
         if in_place:
             for field_name, value in update_dict.items():
                 if field_name in self.model_fields:
@@ -3,7 +3,6 @@ import enum
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from IPython.display import HTML, display
 from pydantic import (
     field_serializer,
     field_validator,
@@ -11,7 +10,9 @@ from pydantic import (
 from syft_core import SyftBoxURL
 
 from syft_rds.display_utils.html_format import create_html_repr
+from syft_rds.display_utils.jupyter.display import show_html
 from syft_rds.models.base import ItemBase, ItemBaseCreate, ItemBaseUpdate
+from syft_rds.utils.attachments import validate_attachment_id
 
 if TYPE_CHECKING:
     from syft_rds.models.job_models import Job
@@ -70,7 +71,7 @@ class CustomFunction(ItemBase):
             ],
             display_paths=display_paths,
         )
-        display(HTML(html_description))
+        show_html(html_description)
 
     @property
     def readme_path(self) -> Path | None:
@@ -94,10 +95,26 @@ class CustomFunction(ItemBase):
             **params,
         )
 
+    def submit_sweep(
+        self,
+        dataset_name: str,
+        param_grid: dict[str, list[Any]] | list[dict[str, Any]],
+        **kwargs: Any,
+    ) -> list["Job"]:
+        """Submit a job for every parameter set, see `JobRDSClient.submit_sweep`."""
+        return self._client.job.submit_sweep(
+            custom_function=self,
+            param_grid=param_grid,
+            dataset_name=dataset_name,
+            **kwargs,
+        )
+
 
 class CustomFunctionCreate(ItemBaseCreate[CustomFunction]):
     name: str
     files_zipped: bytes | None = None
+    # Reference to files_zipped sent as a binary attachment instead of base64 in the body
+    files_attachment_id: str | None = None
     entrypoint: str  # name of the entrypoint file in the zip root
     readme_filename: str | None = None  # filename of the readme file in the zip root
 
@@ -118,7 +135,9 @@ class CustomFunctionCreate(ItemBaseCreate[CustomFunction]):
 
     @field_validator("files_zipped", mode="after")
     @classmethod
-    def validate_code_size(cls, v: bytes) -> bytes:
+    def validate_code_size(cls, v: bytes | None) -> bytes | None:
+        if v is None:
+            return v
         zip_size_mb = len(v) / 1024 / 1024
         if zip_size_mb > MAX_USERCODE_ZIP_SIZE:
             raise ValueError(
@@ -126,6 +145,13 @@ class CustomFunctionCreate(ItemBaseCreate[CustomFunction]):
             )
         return v
 
+    @field_validator("files_attachment_id")
+    @classmethod
+    def validate_files_attachment_id(cls, v: str | None) -> str | None:
+        if v is None:
+            return None
+        return validate_attachment_id(v)
+
 
 class CustomFunctionUpdate(ItemBaseUpdate[CustomFunction]):
     pass
@@ -3,13 +3,14 @@ from pathlib import Path
 from typing_extensions import Optional
 from uuid import UUID
 
-from IPython.display import HTML, display
 from loguru import logger
 from pydantic import Field
 from syft_core import SyftBoxURL
 
 from syft_rds.display_utils.html_format import create_html_repr
+from syft_rds.display_utils.jupyter.display import show_html
 from syft_rds.models.base import ItemBase, ItemBaseCreate, ItemBaseUpdate
+from syft_rds.models.runtime_models import ResourceLimits
 
 SYFT_RDS_DATA_DIR = "SYFT_RDS_DATA_DIR"
 
@@ -36,6 +37,10 @@ class Dataset(ItemBase):
         default_factory=list,
         description="List of datasites whose jobs will be automatically approved.",
     )
+    resource_limits: Optional[ResourceLimits] = Field(
+        default=None,
+        description="Resource limits of jobs on the dataset, on top of the runtime's limits.",
+    )
 
     @property
     def mock_path(self) -> Path:
@@ -140,7 +145,7 @@ class Dataset(ItemBase):
             display_paths=display_paths,
         )
 
-        display(HTML(description))
+        show_html(description)
 
     def _is_admin(self) -> bool:
         """Check if the current user is admin by comparing email with host."""
@@ -166,6 +171,10 @@ class DatasetUpdate(ItemBaseUpdate[Dataset]):
         default=None,
         description="List of datasites whose jobs will be automatically approved.",
     )
+    resource_limits: Optional[ResourceLimits] = Field(
+        default=None,
+        description="Resource limits of jobs on the dataset, on top of the runtime's limits.",
+    )
 
 
 class DatasetCreate(ItemBaseCreate[Dataset]):
@@ -184,3 +193,7 @@ class DatasetCreate(ItemBaseCreate[Dataset]):
         default_factory=list,
         description="List of datasites whose jobs will be automatically approved.",
     )
+    resource_limits: Optional[ResourceLimits] = Field(
+        default=None,
+        description="Resource limits of jobs on the dataset, on top of the runtime's limits.",
+    )
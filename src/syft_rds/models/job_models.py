@@ -6,19 +6,25 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any, Optional
 from uuid import UUID
 
-from IPython.display import HTML, display
 from loguru import logger
 from pydantic import BaseModel, ConfigDict, Field, model_validator
 from syft_core import SyftBoxURL
 
 from syft_rds.display_utils.html_format import create_html_repr
+from syft_rds.display_utils.jupyter.display import show_html
 from syft_rds.models.base import ItemBase, ItemBaseCreate, ItemBaseUpdate
-from syft_rds.models.runtime_models import Runtime
+from syft_rds.models.runtime_models import ResourceLimits, Runtime
 from syft_rds.utils.name_generator import generate_name
 
 if TYPE_CHECKING:
     from syft_rds.models import CustomFunction, UserCode
 
+# Keys of `Job.user_metadata` for the jobs of a parameter sweep
+SWEEP_ID_KEY = "sweep_id"
+SWEEP_PARAMS_KEY = "sweep_params"
+# Maximum jobs created by one `/job/create_many` request
+MAX_JOBS_PER_CREATE = 100
+
 
 class JobStatus(str, enum.Enum):
     pending_code_review = "pending_code_review"
@@ -41,6 +47,18 @@ class JobErrorKind(str, enum.Enum):
     failed_output_review = "failed_output_review"
 
 
+class JobUsage(BaseModel):
+    """Resources used by a job run."""
+
+    wall_seconds: float
+    # None when not measurable, e.g. for jobs in a Docker container
+    cpu_seconds: Optional[float] = None
+    peak_rss_mb: Optional[float] = None
+    # Size of the job's output and log files
+    bytes_written: int = 0
+    timed_out: bool = False
+
+
 class Job(ItemBase):
     model_config = ConfigDict(extra="forbid")
 
@@ -71,6 +89,7 @@ class Job(ItemBase):
     error: JobErrorKind = JobErrorKind.no_error
     error_message: str | None = None
     output_url: SyftBoxURL | None = None
+    usage: Optional[JobUsage] = None
 
     def describe(self) -> None:
         fields = [
@@ -95,13 +114,33 @@ class Job(ItemBase):
             fields.append("custom_function_name")
         if self.enclave:
             fields.append("enclave")
+        if self.usage is not None:
+            fields.append("usage")
+        if self.sweep_params is not None:
+            fields.append("sweep_params")
 
         html_description = create_html_repr(
             obj=self,
             fields=fields,
             display_paths=["output_path"],
         )
-        display(HTML(html_description))
+        show_html(html_description)
+
+    @property
+    def sweep_params(self) -> Optional[dict]:
+        """Parameters of a job of a parameter sweep, written to its params file when it runs."""
+        return self.user_metadata.get(SWEEP_PARAMS_KEY)
+
+    @property
+    def queue_position(self) -> Optional[int]:
+        """Number of jobs that start before this job in the client's job scheduler.
+
+        None if the job is not queued, e.g. because it is already running.
+        """
+        if self.client_id is None:
+            return None
+        scheduler = getattr(self._client, "_scheduler", None)
+        return scheduler.position(self) if scheduler is not None else None
 
     @property
     def runtime(self) -> Optional["Runtime"]:
@@ -192,7 +231,10 @@ class Job(ItemBase):
         )
 
     def get_update_for_return_code(
-        self, return_code: int | subprocess.Popen, error_message: str | None = None
+        self,
+        return_code: int | subprocess.Popen,
+        error_message: str | None = None,
+        usage: Optional[JobUsage] = None,
     ) -> "JobUpdate":
         if not isinstance(return_code, int):
             return self.get_update_for_in_progress()
@@ -202,14 +244,21 @@ class Job(ItemBase):
             self.error_message = None
         else:
             self.status = JobStatus.job_run_failed
-            self.error = JobErrorKind.execution_failed
+            self.error = (
+                JobErrorKind.timeout
+                if usage is not None and usage.timed_out
+                else JobErrorKind.execution_failed
+            )
             self.error_message = error_message
+        if usage is not None:
+            self.usage = usage
 
         return JobUpdate(
             uid=self.uid,
             status=self.status,
             error=self.error,
             error_message=self.error_message,
+            usage=usage,
         )
 
     @property
@@ -239,6 +288,7 @@ class JobUpdate(ItemBaseUpdate[Job]):
     status: Optional[JobStatus] = None
     error: Optional[JobErrorKind] = None
     error_message: Optional[str] = None
+    usage: Optional[JobUsage] = None
 
 
 class JobCreate(ItemBaseCreate[Job]):
@@ -250,6 +300,13 @@ class JobCreate(ItemBaseCreate[Job]):
     tags: list[str] = Field(default_factory=list)
     custom_function_id: Optional[UUID] = None
     enclave: str = ""
+    user_metadata: dict = Field(default_factory=dict)
+
+
+class JobCreateMany(BaseModel):
+    """Jobs created in one request, e.g. the jobs of a parameter sweep."""
+
+    items: list[JobCreate] = Field(max_length=MAX_JOBS_PER_CREATE)
 
 
 class JobConfig(BaseModel):
@@ -264,6 +321,11 @@ class JobConfig(BaseModel):
         default_factory=lambda: Path("jobs") / datetime.now().strftime("%Y%m%d_%H%M%S")
     )
     timeout: int = 60
+    # Enforced by the runners, the runtime's limits merged with the dataset's
+    limits: ResourceLimits = Field(default_factory=ResourceLimits)
+    # Size cap of each log file, larger logs are rotated and gzipped. None to disable
+    max_log_bytes: Optional[int] = None
+    log_backups: int = 2
     data_mount_dir: str = "/app/data"
     extra_env: dict[str, str] = {}
     blocking: bool = Field(default=True)
@@ -389,7 +451,7 @@ class JobResults(BaseModel):
             display_paths=display_paths,
         )
 
-        display(HTML(html_repr))
+        show_html(html_repr)
 
 
 def load_output_file(filepath: Path, max_size: int) -> Any:
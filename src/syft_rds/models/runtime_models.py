@@ -3,7 +3,7 @@ from pathlib import Path
 from typing import Literal
 import json
 import hashlib
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 from pydantic import (
@@ -16,6 +16,9 @@ from pydantic import (
 from syft_rds.client.utils import PathLike
 from syft_rds.models.base import ItemBase, ItemBaseCreate, ItemBaseUpdate
 
+if TYPE_CHECKING:
+    from syft_rds.syft_runtime.docker_images import ImageBuild
+
 
 class RuntimeKind(str, Enum):
     PYTHON = "python"
@@ -23,10 +26,57 @@ class RuntimeKind(str, Enum):
     KUBERNETES = "kubernetes"
 
 
+class ResourceLimits(BaseModel):
+    """Resources a job may use, None means unlimited.
+
+    Set on a runtime's config, and optionally on a dataset. A job gets the stricter
+    value of each limit.
+    """
+
+    # CPU cores, also used by the JobScheduler to budget running jobs
+    cpus: float | None = None
+    # CPU time, the job is killed when it has used more
+    cpu_seconds: int | None = None
+    # Memory, address space for Python jobs
+    memory_mb: int | None = None
+    # Wall-clock time, the job is killed after this many seconds
+    timeout: int | None = None
+    # Largest file a job can write, in its output folder or elsewhere
+    max_file_size_mb: float | None = None
+    max_open_files: int | None = None
+    # Only enforced for Docker jobs, the process limit of Python jobs is per user
+    max_processes: int | None = None
+
+    def merge(self, other: "ResourceLimits | None") -> "ResourceLimits":
+        """The stricter value of each limit of `self` and `other`."""
+        if other is None:
+            return self.model_copy()
+        merged = {}
+        for name in type(self).model_fields:
+            values = [
+                value
+                for value in (getattr(self, name), getattr(other, name))
+                if value is not None
+            ]
+            merged[name] = min(values) if values else None
+        return ResourceLimits(**merged)
+
+
+def _default_docker_limits() -> ResourceLimits:
+    return ResourceLimits(
+        cpus=1,
+        memory_mb=1024,
+        max_file_size_mb=10,
+        max_open_files=50,
+        max_processes=100,
+    )
+
+
 class BaseRuntimeConfig(BaseModel):
     """Base configuration for runtime environments."""
 
     cmd: list[str] | None = None
+    limits: ResourceLimits = Field(default_factory=ResourceLimits)
 
     def validate_config(self) -> bool:
         """Override in subclasses for custom validation."""
@@ -38,6 +88,10 @@ class PythonRuntimeConfig(BaseRuntimeConfig):
     requirements_file: PathLike | None = None
     use_uv: bool = True
     cmd: list[str] = Field(default_factory=lambda: ["python"])
+    # Warm processes that run jobs without a pyproject.toml in a fork, 0 to disable
+    warm_pool_size: int = 0
+    # Imported once by the warm processes, e.g. ["pandas", "numpy"]
+    preload_modules: list[str] = Field(default_factory=list)
 
     @field_validator("requirements_file")
     def validate_requirements_file_exist(cls, value: PathLike) -> PathLike:
@@ -70,6 +124,21 @@ class DockerRuntimeConfig(BaseRuntimeConfig):
     cmd: list[str] = ["python"]
     app_name: str | None = None
     extra_mounts: list[DockerMount] = Field(default_factory=list)
+    limits: ResourceLimits = Field(default_factory=_default_docker_limits)
+
+    @model_validator(mode="after")
+    def fill_default_limits(self) -> "DockerRuntimeConfig":
+        """Limits that are not set keep the default sandbox of Docker jobs."""
+        defaults = _default_docker_limits()
+        self.limits = self.limits.model_copy(
+            update={
+                name: getattr(defaults, name)
+                for name in type(defaults).model_fields
+                if getattr(self.limits, name) is None
+                and getattr(defaults, name) is not None
+            }
+        )
+        return self
 
     @model_validator(mode="before")
     @classmethod
@@ -145,6 +214,13 @@ class Runtime(ItemBase):
     def cmd(self) -> list[str]:
         return self.config.cmd
 
+    @property
+    def build_status(self) -> "ImageBuild | None":
+        """Image build of a Docker runtime on this machine, None for other runtimes."""
+        if self.kind != RuntimeKind.DOCKER:
+            return None
+        return self._client.docker_images.status(self)
+
 
 class RuntimeCreate(ItemBaseCreate[Runtime]):
     name: str | None = None
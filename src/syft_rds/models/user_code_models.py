@@ -3,7 +3,6 @@ import enum
 from pathlib import Path
 from typing import Optional, TypeVar
 
-from IPython.display import HTML, display
 from pydantic import (
     field_serializer,
     field_validator,
@@ -11,7 +10,9 @@ from pydantic import (
 from syft_core import SyftBoxURL
 
 from syft_rds.display_utils.html_format import create_html_repr
+from syft_rds.display_utils.jupyter.display import show_html
 from syft_rds.models.base import ItemBase, ItemBaseCreate, ItemBaseUpdate
+from syft_rds.utils.attachments import validate_attachment_id
 
 T = TypeVar("T", bound=ItemBase)
 
@@ -58,12 +59,14 @@ class UserCode(ItemBase):
             ],
             display_paths=["local_dir"],
         )
-        display(HTML(html_description))
+        show_html(html_description)
 
 
 class UserCodeCreate(ItemBaseCreate[UserCode]):
     name: Optional[str] = None
     files_zipped: bytes | None = None
+    # Reference to files_zipped sent as a binary attachment instead of base64 in the body
+    files_attachment_id: str | None = None
     code_type: UserCodeType
     entrypoint: str
 
@@ -84,7 +87,9 @@ class UserCodeCreate(ItemBaseCreate[UserCode]):
 
     @field_validator("files_zipped", mode="after")
     @classmethod
-    def validate_code_size(cls, v: bytes) -> bytes:
+    def validate_code_size(cls, v: bytes | None) -> bytes | None:
+        if v is None:
+            return v
         zip_size_mb = len(v) / 1024 / 1024
         if zip_size_mb > MAX_USERCODE_ZIP_SIZE:
             raise ValueError(
@@ -92,6 +97,13 @@ class UserCodeCreate(ItemBaseCreate[UserCode]):
             )
         return v
 
+    @field_validator("files_attachment_id")
+    @classmethod
+    def validate_files_attachment_id(cls, v: str | None) -> str | None:
+        if v is None:
+            return None
+        return validate_attachment_id(v)
+
 
 class UserCodeUpdate(ItemBaseUpdate[UserCode]):
     pass
@@ -1,21 +1,47 @@
+from concurrent.futures import ThreadPoolExecutor
 from types import MethodType
 
 import yaml
 from loguru import logger
 from syft_core import Client
 from syft_event import SyftEvents
+from syft_event.types import Request, Response
 
 from syft_rds import __version__
-from syft_rds.models import Dataset, Job, Runtime, UserCode
+from syft_rds.models import (
+    Dataset,
+    Job,
+    MetricsRequest,
+    Runtime,
+    ServerStatus,
+    UserCode,
+)
 from syft_rds.models.custom_function_models import CustomFunction
+from syft_rds.models.user_code_models import MAX_USERCODE_ZIP_SIZE
+from syft_rds.server.backlog import DEFAULT_BACKLOG_WORKERS, BacklogProcessor
+from syft_rds.server.dispatcher import DEFAULT_MAX_WORKERS, RequestDispatcher
+from syft_rds.server.executor import AutoExecuteConfig, AutoExecutor
+from syft_rds.server.middleware import (
+    IdempotencyMiddleware,
+    MetricsMiddleware,
+    RateLimit,
+    RateLimitMiddleware,
+    wrap_handler,
+)
 from syft_rds.server.router import RPCRouter
 from syft_rds.server.routers.custom_function_router import custom_function_router
 from syft_rds.server.routers.job_router import job_router
 from syft_rds.server.routers.runtime_router import runtime_router
 from syft_rds.server.routers.user_code_router import user_code_router
+from syft_rds.server.services.attachment_service import AttachmentService
 from syft_rds.server.services.public_file_service import PublicFileService
+from syft_rds.server.services.response_cache_service import ResponseCacheService
+from syft_rds.server.services.status_service import StatusService
 from syft_rds.server.services.user_file_service import UserFileService
+from syft_rds.syft_runtime.uv_env_cache import UvEnvCache
 from syft_rds.store.store import YAMLStore
+from syft_rds.utils.attachments import ATTACHMENT_SUFFIX, prune_attachments
+from syft_rds.utils.metrics import MetricsRegistry
 
 APP_NAME = "RDS"
 APP_INFO_FILE = "app.yaml"
@@ -25,6 +51,15 @@ APP_SYFTPERM = f"""
   - read
   user: '*'
 """
+# Appended to the default syft_event rpc permissions, so senders can write
+# binary attachments next to their own .request files
+RPC_ATTACHMENT_PERMS = f"""- pattern: '**/{{{{.UserEmail}}}}/*{ATTACHMENT_SUFFIX}'
+  access:
+    read:
+    - 'USER'
+    write:
+    - 'USER'
+"""
 
 
 def _init_services(app: SyftEvents) -> None:
@@ -48,6 +83,139 @@ def _init_services(app: SyftEvents) -> None:
     app.state["user_file_service"] = UserFileService(app_dir=app.app_dir)
     # PublicFileService handles files on syftbox that are readable by everyone
     app.state["public_file_service"] = PublicFileService(app_dir=app.app_dir)
+    # AttachmentService resolves binary payloads sent alongside rpc requests
+    app.state["attachment_service"] = AttachmentService(
+        client=app.client, max_size_mb=MAX_USERCODE_ZIP_SIZE
+    )
+    # ResponseCacheService keeps serialized responses of read routes in memory
+    app.state["response_cache"] = ResponseCacheService()
+    # StatusService reports server internals for the /status endpoint
+    app.state["status_service"] = StatusService(app)
+
+
+def _init_attachments(app: SyftEvents) -> None:
+    """Allow attachments in the rpc permissions, and prune them with the request files."""
+    base_init = app.init
+
+    def init(self) -> None:
+        base_init()
+        perms_path = self.app_rpc_dir / "syft.pub.yaml"
+        perms = perms_path.read_text()
+        if RPC_ATTACHMENT_PERMS not in perms:
+            perms_path.write_text(perms.rstrip("\n") + "\n" + RPC_ATTACHMENT_PERMS)
+
+    app.init = MethodType(init, app)
+
+    periodic_cleanup = app._periodic_cleanup
+    base_on_cleanup_complete = periodic_cleanup.on_cleanup_complete
+
+    def on_cleanup_complete(stats) -> None:
+        try:
+            deleted = prune_attachments(
+                app.app_rpc_dir, periodic_cleanup.cleanup_expiry_seconds
+            )
+            if deleted:
+                logger.info(f"[{app.app_name}] Cleanup deleted {deleted} attachments")
+        except Exception as e:
+            logger.error(f"[{app.app_name}] Failed to prune attachments: {e}")
+        if base_on_cleanup_complete is not None:
+            base_on_cleanup_complete(stats)
+
+    periodic_cleanup.on_cleanup_complete = on_cleanup_complete
+
+
+def _init_dispatcher(
+    app: SyftEvents, max_workers: int, route_concurrency: dict[str, int] | None
+) -> None:
+    """Handle requests on a bounded thread pool instead of the file watcher thread."""
+    dispatcher = RequestDispatcher(
+        app_rpc_dir=app.app_rpc_dir,
+        handle_rpc=app._SyftEvents__handle_rpc,
+        max_workers=max_workers,
+        route_concurrency=route_concurrency,
+        metrics=app.state["metrics"],
+    )
+    app.state["dispatcher"] = dispatcher
+
+    # Both the file watcher and process_pending_requests go through __handle_rpc
+    def dispatch_rpc(self, path, func) -> None:
+        dispatcher.dispatch(path, func)
+
+    app._SyftEvents__handle_rpc = MethodType(dispatch_rpc, app)
+
+    base_stop = app.stop
+
+    def stop(self) -> None:
+        base_stop()
+        dispatcher.shutdown(wait=True)
+
+    app.stop = MethodType(stop, app)
+
+
+def _init_backlog(app: SyftEvents, backlog_workers: int) -> None:
+    """Process requests written while the server was down in the background."""
+    backlog = BacklogProcessor(
+        app=app,
+        dispatcher=app.state["dispatcher"],
+        max_workers=backlog_workers,
+    )
+    app.state["backlog"] = backlog
+
+    # Called by SyftEvents.start before the file watcher starts, so it must not block
+    def process_pending_requests(self) -> None:
+        backlog.start()
+
+    app.process_pending_requests = MethodType(process_pending_requests, app)
+
+    base_stop = app.stop
+
+    def stop(self) -> None:
+        backlog.stop()
+        base_stop()
+
+    app.stop = MethodType(stop, app)
+
+
+def _init_uv_env_prewarm(app: SyftEvents) -> None:
+    """Create the uv environments of submitted jobs before they are run."""
+    app.state["uv_env_cache"] = UvEnvCache(
+        app.client.workspace.data_dir.parent
+        / ".syftbox"
+        / "rds"
+        / app.client.email
+        / "uv_envs"
+    )
+    # A single worker, concurrent syncs would compete for the same downloads
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rds-uv-prewarm")
+    app.state["uv_env_prewarm_pool"] = pool
+
+    base_stop = app.stop
+
+    def stop(self) -> None:
+        pool.shutdown(wait=False, cancel_futures=True)
+        base_stop()
+
+    app.stop = MethodType(stop, app)
+
+
+def _init_auto_executor(app: SyftEvents, config: AutoExecuteConfig) -> None:
+    """Run approved jobs in the background once the server has started."""
+    executor = AutoExecutor(app, config)
+    app.state["auto_executor"] = executor
+
+    base_start = app.start
+    base_stop = app.stop
+
+    def start(self, *args, **kwargs) -> None:
+        base_start(*args, **kwargs)
+        executor.start()
+
+    def stop(self) -> None:
+        executor.stop()
+        base_stop()
+
+    app.start = MethodType(start, app)
+    app.stop = MethodType(stop, app)
 
 
 def _write_app_info(app: SyftEvents) -> None:
@@ -73,11 +241,36 @@ def _write_app_info(app: SyftEvents) -> None:
         yaml.safe_dump(app_info, f)
 
 
-def create_app(client: Client | None = None) -> SyftEvents:
+def create_app(
+    client: Client | None = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    route_concurrency: dict[str, int] | None = None,
+    backlog_workers: int = DEFAULT_BACKLOG_WORKERS,
+    rate_limits: dict[str, RateLimit] | None = None,
+    auto_execute: AutoExecuteConfig | None = None,
+    prewarm_uv_envs: bool = False,
+) -> SyftEvents:
     """Create SyftEvent server to detect requests for the client.
 
     The server automatically handles offline requests - any .request files created
-    while the server is down will be processed on startup before watching for new events.
+    while the server is down are processed on startup in the background, while new
+    requests are already being served. Senders are processed in parallel on
+    `backlog_workers` threads, the requests of each sender in the order they were created.
+
+    Requests are handled concurrently on a pool of `max_workers` threads.
+    `route_concurrency` caps concurrent requests per route, e.g. {"job/update": 1},
+    defaults to capping the routes that extract or zip files. Queued requests are
+    served round-robin per sender.
+
+    `rate_limits` sets per-sender token bucket limits per route, requests over the limit
+    receive a 429 response. Defaults to limiting the create and update routes.
+
+    `auto_execute` opts in to running approved jobs on the server, at most
+    `auto_execute.max_parallel` at a time. Jobs are claimed with a lease, so a restarted
+    server does not run a job twice.
+
+    `prewarm_uv_envs` creates the shared uv environment of a job when it is submitted
+    instead of when it runs. Only prebuilt wheels are installed before approval.
     """
     rds_app = SyftEvents(
         app_name=APP_NAME,
@@ -90,10 +283,49 @@ def create_app(client: Client | None = None) -> SyftEvents:
     def health() -> dict:
         return {"app_name": APP_NAME, "version": __version__}
 
+    @rds_app.on_request("/status")
+    def status(request: Request) -> ServerStatus:
+        status_service: StatusService = rds_app.state["status_service"]
+        # Queued requests per sender are only visible to the datasite owner
+        return status_service.status(
+            include_senders=request.sender == rds_app.client.email
+        )
+
+    # Per-endpoint latency histograms, exposed through /metrics
+    rds_app.state["metrics"] = MetricsRegistry()
+
+    @rds_app.on_request("/metrics")
+    def metrics(request: MetricsRequest, rpc_request: Request) -> Response:
+        # Metrics are only visible to the datasite owner
+        if rpc_request.sender != rds_app.client.email:
+            return Response(
+                body="Server metrics are only available to the datasite owner",
+                status_code=403,
+            )
+        registry: MetricsRegistry = rds_app.state["metrics"]
+        if request.format == "prometheus":
+            return Response(
+                body=registry.to_prometheus(),
+                headers={"Content-Type": "text/plain; version=0.0.4"},
+            )
+        return Response(
+            body=registry.snapshot(),
+            headers={"Content-Type": "application/json"},
+        )
+
+    # Applied in order to every request handled by an included router. Retries of an
+    # already handled idempotency key return the stored result before being rate limited.
+    rds_app.middleware = [
+        MetricsMiddleware(rds_app.state["metrics"]),
+        IdempotencyMiddleware(),
+        RateLimitMiddleware(rate_limits),
+    ]
+
     def include_router(self, router: RPCRouter, *, prefix: str = "") -> None:
         for endpoint, func in router.routes.items():
             endpoint_with_prefix = f"{prefix}{endpoint}"
-            _ = self.on_request(endpoint_with_prefix)(func)
+            handler = wrap_handler(func, endpoint_with_prefix, self.middleware)
+            _ = self.on_request(endpoint_with_prefix)(handler)
 
     rds_app.include_router = MethodType(include_router, rds_app)
 
@@ -103,6 +335,13 @@ def create_app(client: Client | None = None) -> SyftEvents:
     rds_app.include_router(custom_function_router, prefix="/custom_function")
 
     _init_services(rds_app)
+    _init_attachments(rds_app)
+    _init_dispatcher(rds_app, max_workers, route_concurrency)
+    _init_backlog(rds_app, backlog_workers)
+    if prewarm_uv_envs:
+        _init_uv_env_prewarm(rds_app)
+    if auto_execute is not None:
+        _init_auto_executor(rds_app, auto_execute)
     _write_app_info(rds_app)
 
     return rds_app
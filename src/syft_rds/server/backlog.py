@@ -0,0 +1,263 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+from syft_event import SyftEvents
+from syft_event.server2 import REQUEST_PATH_PATTERN
+from syft_rpc import SyftRequest, SyftResponse, rpc
+
+from syft_rds.server.dispatcher import RequestDispatcher
+
+DEFAULT_BACKLOG_WORKERS = 4
+DEFAULT_PROGRESS_INTERVAL = 10.0  # seconds
+
+
+@dataclass
+class BacklogStats:
+    total: int = 0
+    processed: int = 0
+    expired: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def running(self) -> bool:
+        return self.started_at is not None and self.finished_at is None
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "running": self.running}
+
+
+@dataclass
+class _PendingRequest:
+    path: Path
+    sender: str
+    created: datetime
+    fingerprint: str
+    handler: Callable
+    # Identical requests directly following this one, answered with its response
+    duplicates: list[Path]
+    expired: bool = False
+
+
+class BacklogProcessor:
+    def __init__(
+        self,
+        app: SyftEvents,
+        dispatcher: RequestDispatcher,
+        max_workers: int = DEFAULT_BACKLOG_WORKERS,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+    ):
+        """Process requests that were written while the server was down.
+
+        The backlog is processed in a background thread, so the file watcher starts
+        immediately and live requests are served in parallel with the backlog.
+
+        - Expired requests are passed to the regular handler, which replies with
+          SYFT_419_EXPIRED without running the route.
+        - Requests of one sender are processed in created-time order, different
+          senders are processed in parallel on `max_workers` threads.
+        - Consecutive identical requests of a sender (e.g. retries) are handled once,
+          the duplicates receive a copy of the response.
+
+        Args:
+            app: The server app
+            dispatcher: Dispatcher of the app, its handler processes a single request
+                and its in-flight tracking avoids handling a request twice.
+            max_workers: Number of senders processed in parallel
+            progress_interval: Seconds between progress log messages
+        """
+        self.app = app
+        self.dispatcher = dispatcher
+        self.max_workers = max_workers
+        self.progress_interval = progress_interval
+        self.stats = BacklogStats()
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> threading.Thread:
+        """Process the backlog in a background thread."""
+        self._thread = threading.Thread(
+            target=self.run, name="rds-backlog", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+
+    def run(self) -> BacklogStats:
+        self.stats = BacklogStats(started_at=time.time())
+        try:
+            by_sender = self.scan()
+            if self.stats.total:
+                logger.info(
+                    f"Processing backlog of {self.stats.total} requests from {len(by_sender)} senders "
+                    f"and {self.stats.expired} expired requests"
+                )
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="rds-backlog"
+            ) as executor:
+                futures = [
+                    executor.submit(self._process_sender, requests)
+                    for requests in by_sender.values()
+                ]
+                last_report = time.monotonic()
+                for future in futures:
+                    while not future.done():
+                        future.exception(timeout=1)
+                        if time.monotonic() - last_report >= self.progress_interval:
+                            self._log_progress()
+                            last_report = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error processing backlog: {e}")
+        finally:
+            self.stats.finished_at = time.time()
+            if self.stats.total:
+                self._log_progress(done=True)
+        return self.stats
+
+    def scan(self) -> dict[str, list[_PendingRequest]]:
+        """Find unanswered requests, grouped per sender in created-time order.
+
+        Only the created and expiry times, sender and fingerprint of each request
+        are kept, the requests are parsed again by the handler.
+        """
+        now = datetime.now(timezone.utc)
+        by_sender: dict[str, list[_PendingRequest]] = {}
+        for path in self.app.app_rpc_dir.glob("**/*.request"):
+            if not REQUEST_PATH_PATTERN.match_file(
+                path.relative_to(self.app.app_rpc_dir)
+            ):
+                logger.warning(f"Skipping request {path} - invalid path")
+                continue
+            if path.with_suffix(".response").exists():
+                continue
+            handler = self.app.get_handler(path.parent.parent)
+            if handler is None:
+                continue
+            try:
+                request = json.loads(path.read_bytes())
+                expires = datetime.fromisoformat(request["expires"])
+                created = datetime.fromisoformat(request["created"])
+            except Exception as e:
+                # Let the regular handling reply with a bad request error
+                logger.warning(f"Could not read pending request {path}: {e}")
+                request, expires, created = {}, None, now
+
+            expired = expires is not None and expires < now
+            if expired:
+                self.stats.expired += 1
+
+            sender = request.get("sender", path.parent.name)
+            by_sender.setdefault(sender, []).append(
+                _PendingRequest(
+                    path=path,
+                    sender=sender,
+                    created=created,
+                    fingerprint=_fingerprint(request),
+                    handler=handler,
+                    duplicates=[],
+                    expired=expired,
+                )
+            )
+
+        for sender, requests in by_sender.items():
+            requests.sort(key=lambda r: r.created)
+            by_sender[sender] = _collapse_duplicates(requests)
+            self.stats.total += sum(
+                1 + len(r.duplicates) for r in by_sender[sender] if not r.expired
+            )
+        return by_sender
+
+    def _process_sender(self, requests: list[_PendingRequest]) -> None:
+        for pending in requests:
+            if self._stop_event.is_set():
+                return
+            try:
+                handled = self.dispatcher.run_inline(pending.path, pending.handler)
+                if pending.expired:
+                    # Counted by the scan
+                    continue
+                if handled and pending.duplicates:
+                    self._reply_to_duplicates(pending)
+                self._count(processed=1 + len(pending.duplicates))
+            except Exception as e:
+                logger.error(f"Error processing pending request {pending.path}: {e}")
+                self._count(failed=1 + len(pending.duplicates))
+
+    def _reply_to_duplicates(self, pending: _PendingRequest) -> None:
+        response_path = pending.path.with_suffix(".response")
+        if not response_path.exists():
+            # No response to copy, handle the duplicates individually
+            for path in pending.duplicates:
+                self.dispatcher.run_inline(path, pending.handler)
+            return
+
+        response = SyftResponse.load(response_path)
+        for path in pending.duplicates:
+            rpc.reply_to(
+                SyftRequest.load(path),
+                body=response.body,
+                headers=response.headers,
+                status_code=response.status_code,
+                client=self.app.client,
+            )
+        self._count(duplicates=len(pending.duplicates))
+
+    def _count(self, processed: int = 0, failed: int = 0, duplicates: int = 0):
+        with self._stats_lock:
+            self.stats.processed += processed
+            self.stats.failed += failed
+            self.stats.duplicates += duplicates
+
+    def _log_progress(self, done: bool = False) -> None:
+        stats = self.stats
+        elapsed = (stats.finished_at or time.time()) - stats.started_at
+        prefix = "Finished backlog" if done else "Backlog progress"
+        logger.info(
+            f"{prefix}: {stats.processed + stats.failed}/{stats.total} requests "
+            f"({stats.duplicates} duplicates, {stats.failed} failed, "
+            f"{stats.expired} expired) in {elapsed:.1f}s"
+        )
+
+
+def _fingerprint(request: dict) -> str:
+    """Requests with the same fingerprint would produce the same result."""
+    content = json.dumps(
+        {
+            key: request.get(key)
+            for key in ("sender", "url", "method", "body", "headers")
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _collapse_duplicates(requests: list[_PendingRequest]) -> list[_PendingRequest]:
+    # Only consecutive duplicates are collapsed, any request in between may change the result
+    collapsed: list[_PendingRequest] = []
+    for pending in requests:
+        # An expired request gets an expired reply, it cannot answer its duplicates
+        if (
+            collapsed
+            and not collapsed[-1].expired
+            and not pending.expired
+            and collapsed[-1].fingerprint == pending.fingerprint
+        ):
+            collapsed[-1].duplicates.append(pending.path)
+        else:
+            collapsed.append(pending)
+    return collapsed
@@ -0,0 +1,224 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+
+from syft_rds.utils.metrics import MetricsRegistry
+
+DEFAULT_MAX_WORKERS = 8
+# Routes that extract, zip or encrypt files. Capped so they cannot occupy every worker
+# and starve cheap requests like health checks and get_all.
+DEFAULT_ROUTE_CONCURRENCY = {
+    "user_code/create": 2,
+    "custom_function/create": 2,
+    "job/update": 2,
+}
+# Request files are picked up on creation, possibly before the sender finished writing them
+REQUEST_FILE_SETTLE_TIMEOUT = 1.0
+
+
+@dataclass
+class _RouteState:
+    limit: Optional[int]
+    # Waiting in a sender queue
+    queued: int = 0
+    # Submitted to the pool or executing
+    active: int = 0
+
+    def has_capacity(self) -> bool:
+        return self.limit is None or self.active < self.limit
+
+
+class RequestDispatcher:
+    def __init__(
+        self,
+        app_rpc_dir: Path,
+        handle_rpc: Callable[[Path, Callable], None],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        route_concurrency: Optional[dict[str, int]] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        """Run RPC requests on a bounded thread pool instead of the file watcher thread.
+
+        Requests for the same .request file are only processed once at a time, and
+        routes in `route_concurrency` run at most that many requests concurrently.
+
+        Requests wait in a queue per sender until a worker is free. Free workers are
+        handed out round-robin over the senders with queued requests, so a sender
+        that floods the server cannot starve the others. Requests of a single sender
+        are started in the order they arrived, unless their route is at its limit.
+
+        Args:
+            app_rpc_dir: RPC directory of the app, used to derive the route of a request
+            handle_rpc: Function that processes a single request file with its handler
+            max_workers: Maximum number of requests processed concurrently
+            route_concurrency: Maximum concurrent requests per route, e.g. {"job/update": 2}
+            metrics: Optional registry for the queue_depth and in_flight gauges
+        """
+        self.app_rpc_dir = app_rpc_dir
+        self.handle_rpc = handle_rpc
+        self.max_workers = max_workers
+        self.route_concurrency = (
+            DEFAULT_ROUTE_CONCURRENCY
+            if route_concurrency is None
+            else route_concurrency
+        )
+        self.metrics = metrics
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="rds-rpc"
+        )
+        self._lock = threading.Lock()
+        self._in_flight: set[Path] = set()
+        self._routes: dict[str, _RouteState] = {}
+        # sender -> queued (route, path, func), in round-robin order of the senders
+        self._queues: OrderedDict[str, deque] = OrderedDict()
+        self._running = 0
+        self._shutdown = False
+
+    def route_for(self, path: Path) -> str:
+        # Same layout as syft_event: {endpoint...}/{sender}/{request_id}.request
+        try:
+            return path.parent.parent.relative_to(self.app_rpc_dir).as_posix()
+        except ValueError:
+            return path.parent.parent.as_posix()
+
+    @staticmethod
+    def sender_for(path: Path) -> str:
+        return path.parent.name
+
+    def dispatch(self, path: Path, func: Callable) -> None:
+        """Schedule `path` to be handled by `func`, returns immediately."""
+        route = self.route_for(path)
+        with self._lock:
+            if path in self._in_flight:
+                # Watchdog may emit multiple events for the same request file
+                return
+            self._in_flight.add(path)
+
+            state = self._route_state(route)
+            state.queued += 1
+            self._queues.setdefault(self.sender_for(path), deque()).append(
+                (route, path, func)
+            )
+            self._schedule()
+            self._update_gauges(route, state)
+
+    def _route_state(self, route: str) -> _RouteState:
+        state = self._routes.get(route)
+        if state is None:
+            state = _RouteState(limit=self.route_concurrency.get(route))
+            self._routes[route] = state
+        return state
+
+    def _schedule(self) -> None:
+        # Must be called with self._lock held
+        while self._running < self.max_workers and not self._shutdown:
+            entry = self._next_request()
+            if entry is None:
+                return
+            route, path, func = entry
+            state = self._routes[route]
+            state.queued -= 1
+            try:
+                self._executor.submit(self._run, route, state, path, func)
+            except RuntimeError:
+                # Shutting down, the request stays on disk and is processed on the next start
+                self._in_flight.discard(path)
+                self._shutdown = True
+                return
+            state.active += 1
+            self._running += 1
+            self._update_gauges(route, state)
+
+    def _next_request(self) -> Optional[tuple[str, Path, Callable]]:
+        # Must be called with self._lock held
+        for sender in list(self._queues):
+            queue = self._queues[sender]
+            for entry in queue:
+                if self._routes[entry[0]].has_capacity():
+                    queue.remove(entry)
+                    # The sender goes to the back of the line
+                    if queue:
+                        self._queues.move_to_end(sender)
+                    else:
+                        del self._queues[sender]
+                    return entry
+        return None
+
+    def _run(self, route: str, state: _RouteState, path: Path, func: Callable):
+        try:
+            _wait_for_request_file(path)
+            self.handle_rpc(path, func)
+        except Exception as e:
+            logger.error(f"Error handling request {path}: {e}")
+        finally:
+            with self._lock:
+                state.active -= 1
+                self._running -= 1
+                self._in_flight.discard(path)
+                self._schedule()
+                self._update_gauges(route, state)
+
+    def run_inline(self, path: Path, func: Callable) -> bool:
+        """Handle `path` on the calling thread, bypassing the pool and route limits.
+
+        Returns False if the request is already being handled, e.g. because the
+        file watcher picked it up first.
+        """
+        with self._lock:
+            if path in self._in_flight:
+                return False
+            self._in_flight.add(path)
+        try:
+            _wait_for_request_file(path)
+            self.handle_rpc(path, func)
+        finally:
+            with self._lock:
+                self._in_flight.discard(path)
+        return True
+
+    def _update_gauges(self, route: str, state: _RouteState) -> None:
+        if self.metrics is None:
+            return
+        self.metrics.set_gauge("queue_depth", route, state.queued)
+        self.metrics.set_gauge("in_flight", route, state.active)
+
+    def stats(self) -> dict[str, dict[str, Optional[int]]]:
+        """Queue depth and in-flight requests per route."""
+        with self._lock:
+            return {
+                route: {
+                    "queue_depth": state.queued,
+                    "in_flight": state.active,
+                    "limit": state.limit,
+                }
+                for route, state in self._routes.items()
+            }
+
+    def queued_by_sender(self) -> dict[str, int]:
+        """Number of queued requests per sender."""
+        with self._lock:
+            return {sender: len(queue) for sender, queue in self._queues.items()}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            self._shutdown = True
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _wait_for_request_file(
+    path: Path, timeout: float = REQUEST_FILE_SETTLE_TIMEOUT
+) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if path.stat().st_size > 0:
+                return
+        except FileNotFoundError:
+            return
+        time.sleep(0.01)
@@ -0,0 +1,315 @@
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+from uuid import UUID
+
+from loguru import logger
+from syft_event import SyftEvents
+
+from syft_rds.models import Job, JobStatus
+from syft_rds.store import YAMLStore
+from syft_rds.syft_runtime.limits import stop_orphaned_job
+from syft_rds.utils.processes import pid_alive
+
+if TYPE_CHECKING:
+    from syft_rds.client.rds_client import RDSClient
+
+DEFAULT_AUTO_EXECUTE_WORKERS = 2
+DEFAULT_EXECUTOR_POLL_INTERVAL = 5.0  # seconds
+DEFAULT_LEASE_TTL = 60.0  # seconds
+
+INTERRUPTED_JOB_MESSAGE = "Interrupted: the server stopped while the job was running."
+
+
+@dataclass(frozen=True)
+class AutoExecuteConfig:
+    """Opt-in execution of approved jobs by the server.
+
+    Args:
+        max_parallel: Maximum number of jobs running at the same time
+        auto_share: If True, share the results of successful jobs whose submitter is
+            in the `auto_approval` list of the job's dataset
+        poll_interval: Seconds between checks of the job store, approvals through the
+            server wake the executor immediately
+        lease_ttl: Seconds after which the claim of an unresponsive server expires
+    """
+
+    max_parallel: int = DEFAULT_AUTO_EXECUTE_WORKERS
+    auto_share: bool = False
+    poll_interval: float = DEFAULT_EXECUTOR_POLL_INTERVAL
+    lease_ttl: float = DEFAULT_LEASE_TTL
+
+
+class JobLeases:
+    def __init__(self, lease_dir: Path, ttl: float = DEFAULT_LEASE_TTL):
+        """Exclusive claims on jobs, stored as files so they survive restarts.
+
+        A lease is created atomically, so only one executor can claim a job. The owner
+        renews its leases while it is alive. A lease expires when it was not renewed for
+        `ttl` seconds, or directly when its owner process on this host has died.
+
+        Args:
+            lease_dir: Local directory for the lease files, must not be synced
+            ttl: Seconds after which a lease that was not renewed expires
+        """
+        self.lease_dir = Path(lease_dir)
+        self.lease_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.owner_id = uuid.uuid4().hex
+        self._owner = {
+            "owner_id": self.owner_id,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+        }
+
+    def _path(self, uid: UUID) -> Path:
+        return self.lease_dir / f"{uid}.lease"
+
+    def claim(self, uid: UUID) -> bool:
+        """Claim a job, returns False if another live owner holds the lease."""
+        path = self._path(uid)
+        if path.exists():
+            if not self.is_expired(uid):
+                return False
+            # Move the expired lease away first, only one executor wins the rename
+            moved = path.with_suffix(f".expired-{self.owner_id}")
+            try:
+                os.rename(path, moved)
+            except FileNotFoundError:
+                return False
+            # Another executor may have replaced the lease since the check above
+            if not self._is_expired(moved):
+                try:
+                    os.link(moved, path)
+                except FileExistsError:
+                    pass
+                moved.unlink(missing_ok=True)
+                return False
+            moved.unlink(missing_ok=True)
+
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w") as f:
+            json.dump({**self._owner, "claimed_at": time.time()}, f)
+        return True
+
+    def is_expired(self, uid: UUID) -> bool:
+        return self._is_expired(self._path(uid))
+
+    def _is_expired(self, path: Path) -> bool:
+        try:
+            owner = json.loads(path.read_text())
+            age = time.time() - path.stat().st_mtime
+        except (OSError, ValueError):
+            # Missing, or still being written by its owner
+            return not path.exists()
+        if owner.get("owner_id") == self.owner_id:
+            return False
+        if owner.get("host") == self._owner["host"] and not pid_alive(owner.get("pid")):
+            return True
+        return age > self.ttl
+
+    def exists(self, uid: UUID) -> bool:
+        return self._path(uid).exists()
+
+    def renew(self, uids: list[UUID]) -> None:
+        for uid in uids:
+            try:
+                os.utime(self._path(uid))
+            except FileNotFoundError:
+                logger.warning(f"Lease of job {uid} was removed while running")
+
+    def release(self, uid: UUID) -> None:
+        self._path(uid).unlink(missing_ok=True)
+
+
+class AutoExecutor:
+    def __init__(self, app: SyftEvents, config: AutoExecuteConfig):
+        """Runs approved jobs in the background of the server.
+
+        Approved jobs, including jobs auto-approved through `Dataset.auto_approval`,
+        are claimed with a lease and run through the client's JobScheduler, so at most
+        `config.max_parallel` jobs run at once.
+
+        After a restart, approved jobs are only claimed again when their previous lease
+        expired. Jobs that were running when the previous server stopped are marked as
+        failed instead of being run twice. Jobs run in their own session and survive a
+        crash of the server, they are stopped first.
+
+        Args:
+            app: The server app
+            config: Executor settings
+        """
+        self.app = app
+        self.config = config
+        email = app.client.email
+        self.leases = JobLeases(
+            app.client.workspace.data_dir.parent
+            / ".syftbox"
+            / "rds"
+            / email
+            / "leases",
+            ttl=config.lease_ttl,
+        )
+        self._client: Optional["RDSClient"] = None
+        self._running: set[UUID] = set()
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def job_store(self) -> YAMLStore[Job]:
+        return self.app.state["job_store"]
+
+    @property
+    def client(self) -> "RDSClient":
+        """Admin client that talks to this server in-process."""
+        if self._client is None:
+            from syft_rds.client.job_scheduler import JobScheduler
+            from syft_rds.client.rds_client import init_session
+
+            email = self.app.client.email
+            self._client = init_session(
+                host=email,
+                email=email,
+                syftbox_client=self.app.client,
+                mock_server=self.app,
+            )
+            self._client.scheduler = JobScheduler(
+                self._client, max_parallel=self.config.max_parallel
+            )
+        return self._client
+
+    def start(self) -> threading.Thread:
+        self._thread = threading.Thread(
+            target=self._run, name="rds-auto-executor", daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        if self._client is not None:
+            self._client.close()
+
+    def wake(self) -> None:
+        """Check for approved jobs now instead of at the next poll."""
+        self._wake_event.set()
+
+    def running(self) -> list[UUID]:
+        with self._lock:
+            return list(self._running)
+
+    def _run(self) -> None:
+        try:
+            self._recover_interrupted_jobs()
+        except Exception as e:
+            logger.error(f"Could not recover interrupted jobs: {e}")
+
+        last_generation = None
+        # Renew leases well before they expire
+        renew_interval = min(self.config.poll_interval, self.config.lease_ttl / 3)
+        next_renew = 0.0
+        while not self._stop_event.is_set():
+            woken = self._wake_event.is_set()
+            self._wake_event.clear()
+            try:
+                generation = self.job_store.generation
+                if woken or generation != last_generation:
+                    last_generation = generation
+                    self._claim_approved_jobs()
+                if time.monotonic() >= next_renew:
+                    self.leases.renew(self.running())
+                    next_renew = time.monotonic() + renew_interval
+            except Exception as e:
+                logger.error(f"Error in auto executor: {e}")
+            self._wake_event.wait(timeout=renew_interval)
+
+    def _claim_approved_jobs(self) -> None:
+        approved = self.job_store.get_all(
+            filters={"status": JobStatus.approved},
+            order_by="created_at",
+            sort_order="asc",
+        )
+        for job in approved:
+            if job.enclave or job.uid in self._running:
+                continue
+            if not self.leases.claim(job.uid):
+                continue
+            with self._lock:
+                self._running.add(job.uid)
+            try:
+                job = self.client.job.get(uid=job.uid)
+                # Re-check after claiming, the job may have started or been rejected
+                if job.status != JobStatus.approved:
+                    self._finish(job.uid)
+                    continue
+                self.client.scheduler.submit(job, on_exit=self._on_job_exit)
+                logger.info(f"Auto-executing job {job.uid} of {job.created_by}")
+            except Exception as e:
+                logger.error(f"Could not schedule job {job.uid}: {e}")
+                self._finish(job.uid)
+
+    def _on_job_exit(self, job: Job) -> None:
+        try:
+            start_error = self.client.scheduler.failed_to_start.get(job.uid)
+            if start_error is not None:
+                # Mark the job as failed, it would otherwise be claimed again
+                job_update = job.get_update_for_return_code(
+                    return_code=1, error_message=f"Could not start job: {start_error}"
+                )
+                self.client.job.update_job_status(job_update, job)
+            elif self.config.auto_share:
+                self._auto_share(job)
+        except Exception as e:
+            logger.error(f"Could not handle exit of job {job.uid}: {e}")
+        finally:
+            self._finish(job.uid)
+
+    def _auto_share(self, job: Job) -> None:
+        job = self.client.job.get(uid=job.uid)
+        if job.status != JobStatus.job_run_finished or not job.dataset_name:
+            return
+        dataset = self.app.state["dataset_store"].get_one(name=job.dataset_name)
+        if dataset is None or job.created_by not in dataset.auto_approval:
+            return
+        self.client.job.share_results(job)
+        logger.info(f"Auto-shared results of job {job.uid} with {job.created_by}")
+
+    def _finish(self, uid: UUID) -> None:
+        with self._lock:
+            self._running.discard(uid)
+        self.leases.release(uid)
+
+    def _recover_interrupted_jobs(self) -> None:
+        in_progress = self.job_store.get_all(
+            filters={"status": JobStatus.job_in_progress}
+        )
+        for job in in_progress:
+            # Only jobs that were started by an executor have a lease
+            if not self.leases.exists(job.uid) or not self.leases.is_expired(job.uid):
+                continue
+            job = self.client.job.get(uid=job.uid)
+            logs_dir = self.client.job._get_job_output_folder() / job.uid.hex / "logs"
+            if stop_orphaned_job(logs_dir):
+                logger.warning(
+                    f"Stopped job {job.uid}, it outlived the previous server"
+                )
+            job_update = job.get_update_for_return_code(
+                return_code=1, error_message=INTERRUPTED_JOB_MESSAGE
+            )
+            self.client.job.update_job_status(job_update, job)
+            self.leases.release(job.uid)
+            logger.warning(f"Marked interrupted job {job.uid} as failed")
@@ -0,0 +1,332 @@
+import inspect
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Hashable, Protocol, get_type_hints
+
+from loguru import logger
+from syft_event import SyftEvents
+from syft_event.types import Request, Response
+from syft_rpc import rpc
+
+from syft_rds.models import JobCreateMany
+from syft_rds.utils.constants import (
+    IDEMPOTENCY_KEY_HEADER,
+    IN_PROCESS_HEADER,
+    RETRY_AFTER_HEADER,
+)
+from syft_rds.utils.metrics import MetricsRegistry
+
+# Injected into every wrapped handler, so middleware always has access to the raw request and app
+_REQUEST_PARAM = "_rds_request"
+_APP_PARAM = "_rds_app"
+
+
+@dataclass
+class RequestContext:
+    endpoint: str
+    request: Request
+    app: SyftEvents
+    # Handler arguments parsed from the request, e.g. the request body model
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+class Middleware(Protocol):
+    def __call__(self, ctx: RequestContext, call_next: Callable[[], Any]) -> Any: ...
+
+
+def wrap_handler(
+    func: Callable, endpoint: str, middleware: list[Middleware]
+) -> Callable:
+    """Wrap an RPC handler so each request passes through `middleware` in order.
+
+    syft_event resolves handler arguments from the signature and type hints of the
+    handler, so the wrapper exposes the original parameters plus a `Request` and
+    `SyftEvents` parameter that are consumed by the middleware chain.
+    """
+    if not middleware:
+        return func
+
+    type_hints = get_type_hints(func)
+    sig = inspect.signature(func)
+    params = [
+        p.replace(annotation=type_hints.get(name, p.annotation))
+        for name, p in sig.parameters.items()
+    ]
+    params += [
+        inspect.Parameter(_REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY),
+        inspect.Parameter(_APP_PARAM, inspect.Parameter.KEYWORD_ONLY),
+    ]
+
+    @wraps(func)
+    def handler(**kwargs: Any) -> Any:
+        ctx = RequestContext(
+            endpoint=endpoint,
+            request=kwargs.pop(_REQUEST_PARAM),
+            app=kwargs.pop(_APP_PARAM),
+            params=kwargs,
+        )
+
+        def call(index: int) -> Any:
+            if index == len(middleware):
+                return func(**kwargs)
+            return middleware[index](ctx, lambda: call(index + 1))
+
+        return call(0)
+
+    handler.__signature__ = sig.replace(parameters=params)
+    handler.__annotations__ = {
+        **type_hints,
+        _REQUEST_PARAM: Request,
+        _APP_PARAM: SyftEvents,
+    }
+    return handler
+
+
+class MetricsMiddleware:
+    def __init__(self, registry: MetricsRegistry):
+        """Record per-endpoint latency histograms for every request.
+
+        - queue_wait: time from writing the .request file until the handler starts.
+          This includes file sync and time spent waiting for earlier requests.
+        - handler: time spent in the handler (and inner middleware)
+        - serialize: time to serialize the handler result. The result is serialized
+          here, so syft_event receives bytes and does not serialize it again.
+
+        Args:
+            registry: Registry the histograms are recorded in
+        """
+        self.registry = registry
+
+    def __call__(self, ctx: RequestContext, call_next: Callable[[], Any]) -> Any:
+        endpoint = ctx.endpoint.strip("/")
+        queue_wait = self._queue_wait(ctx)
+        if queue_wait is not None:
+            self.registry.observe("queue_wait", endpoint, queue_wait)
+
+        start = time.perf_counter()
+        try:
+            result = call_next()
+        finally:
+            self.registry.observe("handler", endpoint, time.perf_counter() - start)
+
+        if isinstance(result, Response) or (ctx.request.headers or {}).get(
+            IN_PROCESS_HEADER
+        ):
+            # In-process callers receive the result object directly
+            return result
+        start = time.perf_counter()
+        body = rpc.serialize(result)
+        self.registry.observe("serialize", endpoint, time.perf_counter() - start)
+        return body
+
+    @staticmethod
+    def _queue_wait(ctx: RequestContext) -> float | None:
+        endpoint_dir = ctx.request.url.to_local_path(ctx.app.client.workspace.datasites)
+        request_path = endpoint_dir / ctx.request.sender / f"{ctx.request.id}.request"
+        try:
+            return max(0.0, time.time() - request_path.stat().st_mtime)
+        except OSError:
+            # Requests that are not read from disk, e.g. with a MockRPCConnection
+            return None
+
+
+class IdempotencyMiddleware:
+    def __init__(self, ttl_seconds: float = 24 * 60 * 60, max_entries: int = 10_000):
+        """Return the original result for requests that repeat an idempotency key.
+
+        Clients send a unique key in the `X-Idempotency-Key` header of create requests,
+        and re-use it when retrying. Results are remembered per (sender, endpoint, key)
+        for `ttl_seconds`, keeping at most `max_entries` recent keys in memory.
+        Failed requests are not remembered, so they can be retried.
+
+        Keys are only kept in memory, duplicates are not detected across a server
+        restart.
+
+        Args:
+            ttl_seconds: How long a result is returned for a repeated key
+            max_entries: Maximum number of remembered keys, least recently used are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._results: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Per-key locks, so concurrent duplicates wait for the first request instead of re-executing it
+        self._key_locks: dict[Hashable, tuple[threading.Lock, int]] = {}
+
+    def __call__(self, ctx: RequestContext, call_next: Callable[[], Any]) -> Any:
+        idempotency_key = (ctx.request.headers or {}).get(IDEMPOTENCY_KEY_HEADER)
+        if not idempotency_key:
+            return call_next()
+
+        cache_key = (ctx.request.sender, ctx.endpoint, idempotency_key)
+        key_lock = self._acquire_key_lock(cache_key)
+        try:
+            found, result = self._get(cache_key)
+            if found:
+                logger.info(
+                    f"Returning original result for repeated request {ctx.endpoint} from {ctx.request.sender}"
+                )
+                return result
+
+            result = call_next()
+            if not (isinstance(result, Response) and result.status_code >= 400):
+                self._put(cache_key, result)
+            return result
+        finally:
+            self._release_key_lock(cache_key, key_lock)
+
+    def _acquire_key_lock(self, cache_key: Hashable) -> threading.Lock:
+        with self._lock:
+            key_lock, refcount = self._key_locks.get(cache_key, (threading.Lock(), 0))
+            self._key_locks[cache_key] = (key_lock, refcount + 1)
+        key_lock.acquire()
+        return key_lock
+
+    def _release_key_lock(self, cache_key: Hashable, key_lock: threading.Lock) -> None:
+        key_lock.release()
+        with self._lock:
+            _, refcount = self._key_locks[cache_key]
+            if refcount <= 1:
+                del self._key_locks[cache_key]
+            else:
+                self._key_locks[cache_key] = (key_lock, refcount - 1)
+
+    def _get(self, cache_key: Hashable) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._results.get(cache_key)
+            if entry is None:
+                return False, None
+            created_at, result = entry
+            if time.monotonic() - created_at > self.ttl_seconds:
+                del self._results[cache_key]
+                return False, None
+            self._results.move_to_end(cache_key)
+            return True, result
+
+    def _put(self, cache_key: Hashable, result: Any) -> None:
+        with self._lock:
+            self._results[cache_key] = (time.monotonic(), result)
+            self._results.move_to_end(cache_key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    # Sustained requests per minute
+    per_minute: float
+    # Maximum requests accepted at once, after a period without requests
+    burst: int
+
+
+@dataclass(frozen=True)
+class RateLimitCost:
+    # Endpoint whose bucket the request is charged to
+    endpoint: str
+    # Number of tokens the request takes
+    cost: Callable[[RequestContext], int]
+
+
+def _count_created_jobs(ctx: RequestContext) -> int:
+    return sum(
+        len(param.items)
+        for param in ctx.params.values()
+        if isinstance(param, JobCreateMany)
+    )
+
+
+# Write routes a data scientist can call in a loop, e.g. through job.submit
+DEFAULT_RATE_LIMITS = {
+    "job/create": RateLimit(per_minute=30, burst=10),
+    "user_code/create": RateLimit(per_minute=30, burst=10),
+    "custom_function/create": RateLimit(per_minute=30, burst=10),
+    "job/update": RateLimit(per_minute=60, burst=20),
+}
+
+# Routes that are charged to the bucket of another route, with a cost per request
+DEFAULT_RATE_LIMIT_COSTS = {
+    # One job/create token per created job, so batches don't bypass the job/create limit
+    "job/create_many": RateLimitCost(endpoint="job/create", cost=_count_created_jobs),
+}
+
+
+class _TokenBucket:
+    def __init__(self, limit: RateLimit):
+        self.rate = limit.per_minute / 60
+        self.capacity = limit.burst
+        self.tokens = float(limit.burst)
+        self.updated_at = time.monotonic()
+
+    def take(self, cost: int = 1) -> float:
+        """Take `cost` tokens, returns 0 on success or the seconds until they are available.
+
+        Nothing is taken when too few tokens are left. A cost over the burst capacity is
+        accepted with a full bucket, the tokens then go negative and later requests wait
+        until the debt is paid back, so the sustained rate still holds.
+        """
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+        required = min(cost, self.capacity)
+        if self.tokens >= required:
+            self.tokens -= cost
+            return 0.0
+        return (required - self.tokens) / self.rate
+
+
+class RateLimitMiddleware:
+    def __init__(
+        self,
+        limits: dict[str, RateLimit] | None = None,
+        costs: dict[str, RateLimitCost] | None = None,
+    ):
+        """Reject requests over a per-sender token bucket limit with a 429 response.
+
+        Each (sender, endpoint) pair has its own bucket, requests of the datasite owner
+        are not limited. Rejected responses carry a `Retry-After` header with the
+        seconds until the next request is accepted.
+
+        Args:
+            limits: Limits per endpoint, e.g. {"job/create": RateLimit(per_minute=30, burst=10)}.
+                Defaults to DEFAULT_RATE_LIMITS, endpoints not in `limits` are not limited.
+            costs: Endpoints charged to the bucket of another endpoint, with a token cost
+                per request. Defaults to DEFAULT_RATE_LIMIT_COSTS.
+        """
+        self.limits = DEFAULT_RATE_LIMITS if limits is None else limits
+        self.costs = DEFAULT_RATE_LIMIT_COSTS if costs is None else costs
+        self._buckets: dict[tuple[str, str], _TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, ctx: RequestContext, call_next: Callable[[], Any]) -> Any:
+        endpoint = ctx.endpoint.strip("/")
+        bucket_endpoint, cost = endpoint, 1
+        if endpoint in self.costs:
+            bucket_endpoint = self.costs[endpoint].endpoint
+            cost = max(1, self.costs[endpoint].cost(ctx))
+        limit = self.limits.get(bucket_endpoint)
+        if limit is None or ctx.request.sender == ctx.app.client.email:
+            return call_next()
+
+        with self._lock:
+            key = (ctx.request.sender, bucket_endpoint)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _TokenBucket(limit)
+            retry_after = bucket.take(cost)
+
+        if retry_after > 0:
+            logger.warning(
+                f"Rate limited {endpoint} from {ctx.request.sender}, retry after {retry_after:.1f}s"
+            )
+            return Response(
+                body=f"Too many {endpoint} requests, retry after {retry_after:.1f} seconds",
+                status_code=429,
+                headers={RETRY_AFTER_HEADER: str(math.ceil(retry_after))},
+            )
+        return call_next()
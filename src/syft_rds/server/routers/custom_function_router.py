@@ -10,7 +10,9 @@ from syft_rds.models import (
     ItemList,
 )
 from syft_rds.server.router import RPCRouter
+from syft_rds.server.services.attachment_service import AttachmentService
 from syft_rds.server.services.public_file_service import PublicFileService
+from syft_rds.server.services.response_cache_service import ResponseCacheService
 from syft_rds.store import YAMLStore
 from syft_rds.utils.zip_utils import extract_zip
 
@@ -30,7 +32,13 @@ def create_custom_function(
     custom_function = create_request.to_item(extra={"created_by": user})
     custom_function_dir = public_file_service.dir_for_item(item=custom_function)
 
-    if create_request.files_zipped is not None:
+    if create_request.files_attachment_id is not None:
+        attachment_service: AttachmentService = app.state["attachment_service"]
+        zip_path = attachment_service.path_for(
+            request, create_request.files_attachment_id
+        )
+        extract_zip(zip_path, custom_function_dir)
+    elif create_request.files_zipped is not None:
         extract_zip(create_request.files_zipped, custom_function_dir)
 
     custom_function.dir_url = SyftBoxURL.from_path(
@@ -56,19 +64,28 @@ def get_custom_function(request: GetOneRequest, app: SyftEvents) -> CustomFuncti
 
 @custom_function_router.on_request("/get_all")
 def get_all_custom_functions(
-    req: GetAllRequest, app: SyftEvents
+    req: GetAllRequest, app: SyftEvents, request: Request
 ) -> ItemList[CustomFunction]:
     custom_function_store: YAMLStore[CustomFunction] = app.state[
         "custom_function_store"
     ]
-    items = custom_function_store.get_all(
-        limit=req.limit,
-        offset=req.offset,
-        order_by=req.order_by,
-        sort_order=req.sort_order,
-        filters=req.filters,
+    cache: ResponseCacheService = app.state["response_cache"]
+
+    def list_items() -> ItemList[CustomFunction]:
+        items = custom_function_store.get_all(
+            limit=req.limit,
+            offset=req.offset,
+            order_by=req.order_by,
+            sort_order=req.sort_order,
+            filters=req.filters,
+        )
+        return ItemList[CustomFunction](items=items)
+
+    # Serve repeated reads from memory until the store changes
+    key = cache.make_key(
+        "custom_function/get_all", req, request.sender, custom_function_store.generation
     )
-    return ItemList[CustomFunction](items=items)
+    return cache.get_or_compute(key, list_items)
 
 
 @custom_function_router.on_request("/update")
@@ -76,8 +93,9 @@ def update_custom_function(update_request, app: SyftEvents) -> CustomFunction:
     custom_function_store: YAMLStore[CustomFunction] = app.state[
         "custom_function_store"
     ]
-    existing_item = custom_function_store.get_by_uid(update_request.uid)
-    if existing_item is None:
-        raise ValueError(f"CustomFunction with uid {update_request.uid} not found")
-    updated_item = existing_item.apply_update(update_request)
-    return custom_function_store.update(updated_item.uid, updated_item)
+    with custom_function_store.lock(update_request.uid):
+        existing_item = custom_function_store.get_by_uid(update_request.uid)
+        if existing_item is None:
+            raise ValueError(f"CustomFunction with uid {update_request.uid} not found")
+        updated_item = existing_item.apply_update(update_request)
+        return custom_function_store.update(updated_item.uid, updated_item)
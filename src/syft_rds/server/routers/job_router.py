@@ -12,23 +12,76 @@ from syft_rds.models import (
     ItemList,
     Job,
     JobCreate,
+    JobCreateMany,
     JobUpdate,
     JobStatus,
+    PythonRuntimeConfig,
+    Runtime,
+    UserCode,
 )
 from syft_rds.server.router import RPCRouter
 from syft_rds.server.services.user_file_service import UserFileService
+from syft_rds.server.services.response_cache_service import ResponseCacheService
 from syft_rds.store import YAMLStore
+from syft_rds.syft_runtime.uv_env_cache import UvEnvCache
 from syft_rds.utils.name_generator import generate_name
 from syft_rds.utils.zip_utils import zip_to_bytes
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 job_router = RPCRouter()
 
 
 @job_router.on_request("/create")
 def create_job(create_request: JobCreate, app: SyftEvents, request: Request) -> Job:
+    job_res = _create_job(create_request, app, request)
+    _prewarm_uv_env(job_res, app)
+    return job_res
+
+
+@job_router.on_request("/create_many")
+def create_jobs(
+    create_request: JobCreateMany, app: SyftEvents, request: Request
+) -> ItemList[Job]:
+    """Create many jobs in one request, e.g. the jobs of a parameter sweep.
+
+    All jobs are created or none: every item is validated before any job is stored,
+    and jobs stored before an unexpected error are deleted again. A failed batch can
+    then be retried with the same idempotency key without creating duplicates.
+    """
+    for item in create_request.items:
+        _validate_job_references(item, app)
+
+    job_store: YAMLStore[Job] = app.state["job_store"]
+    jobs = []
+    try:
+        for item in create_request.items:
+            jobs.append(_create_job(item, app, request))
+    except Exception:
+        for job in jobs:
+            job_store.delete(job.uid)
+        raise
+
+    # The jobs of a sweep share their code, its environment is prepared once
+    prewarmed = set()
+    for job in jobs:
+        if job.user_code_id not in prewarmed:
+            prewarmed.add(job.user_code_id)
+            _prewarm_uv_env(job, app)
+    return ItemList[Job](items=jobs)
+
+
+def _validate_job_references(create_request: JobCreate, app: SyftEvents) -> None:
+    references = [
+        ("user_code_store", "user code", create_request.user_code_id),
+        ("runtime_store", "runtime", create_request.runtime_id),
+        ("custom_function_store", "custom function", create_request.custom_function_id),
+    ]
+    for store_key, name, uid in references:
+        store: YAMLStore = app.state.get(store_key)
+        if uid is not None and store is not None and store.get_by_uid(uid) is None:
+            raise ValueError(f"No {name} found with uid {uid}")
+
+
+def _create_job(create_request: JobCreate, app: SyftEvents, request: Request) -> Job:
     user = request.sender  # TODO auth
     job_store: YAMLStore[Job] = app.state["job_store"]
     user_file_service: UserFileService = app.state["user_file_service"]
@@ -49,6 +102,35 @@ def create_job(create_request: JobCreate, app: SyftEvents, request: Request) ->
     return job_res
 
 
+def _prewarm_uv_env(job: Job, app: SyftEvents) -> None:
+    """Create the uv environment of the job in the background, see `create_app`."""
+    pool = app.state.get("uv_env_prewarm_pool")
+    if pool is None:
+        return
+
+    python_version = None
+    if job.runtime_id is not None:
+        runtime: Runtime = app.state["runtime_store"].get_by_uid(job.runtime_id)
+        if (
+            runtime is None
+            or not isinstance(runtime.config, PythonRuntimeConfig)
+            or not runtime.config.use_uv
+        ):
+            return
+        python_version = runtime.config.version
+
+    user_code: UserCode = app.state["user_code_store"].get_by_uid(job.user_code_id)
+    if user_code is None or user_code.dir_url is None:
+        return
+    code_dir = user_code.dir_url.to_local_path(datasites_path=app.client.datasites)
+    uv_env_cache: UvEnvCache = app.state["uv_env_cache"]
+    try:
+        pool.submit(uv_env_cache.prewarm, code_dir, python_version)
+    except RuntimeError:
+        # The server is shutting down
+        pass
+
+
 def _handle_auto_approval(
     create_request: JobCreate, job_res: Job, app: SyftEvents, request: Request
 ) -> None:
@@ -88,34 +170,54 @@ def get_job(request: GetOneRequest, app: SyftEvents) -> Job:
 
 
 @job_router.on_request("/get_all")
-def get_all_jobs(req: GetAllRequest, app: SyftEvents) -> ItemList[Job]:
+def get_all_jobs(
+    req: GetAllRequest, app: SyftEvents, request: Request
+) -> ItemList[Job]:
     job_store: YAMLStore[Job] = app.state["job_store"]
-    items = job_store.get_all(
-        limit=req.limit,
-        offset=req.offset,
-        order_by=req.order_by,
-        sort_order=req.sort_order,
-        filters=req.filters,
-    )
-    return ItemList[Job](items=items)
+    cache: ResponseCacheService = app.state["response_cache"]
+
+    def list_items() -> ItemList[Job]:
+        items = job_store.get_all(
+            limit=req.limit,
+            offset=req.offset,
+            order_by=req.order_by,
+            sort_order=req.sort_order,
+            filters=req.filters,
+        )
+        return ItemList[Job](items=items)
+
+    # Serve repeated reads from memory until the store changes
+    key = cache.make_key("job/get_all", req, request.sender, job_store.generation)
+    return cache.get_or_compute(key, list_items)
 
 
 @job_router.on_request("/update")
 def update_job(update_request: JobUpdate, app: SyftEvents) -> Job:
     job_store: YAMLStore[Job] = app.state["job_store"]
-    existing_item = job_store.get_by_uid(update_request.uid)
-    if existing_item is None:
-        raise ValueError(f"Job with uid {update_request.uid} not found")
+    # Lock the job, concurrent updates would otherwise overwrite each other
+    with job_store.lock(update_request.uid):
+        existing_item = job_store.get_by_uid(update_request.uid)
+        if existing_item is None:
+            raise ValueError(f"Job with uid {update_request.uid} not found")
+
+        if existing_item.enclave:
+            _handle_enclave_update(existing_item, app)
 
-    if existing_item.enclave:
-        _handle_enclave_update(existing_item, app)
+        updated_item = existing_item.apply_update(update_request)
+        updated_item = job_store.update(updated_item.uid, updated_item)
 
-    updated_item = existing_item.apply_update(update_request)
-    return job_store.update(updated_item.uid, updated_item)
+    executor = app.state.get("auto_executor")
+    if executor is not None and updated_item.status == JobStatus.approved:
+        executor.wake()
+    return updated_item
 
 
 def encrypt_data(data: bytes, public_key_path: Path, output_file_path: Path) -> bytes:
     """Encrypt data using a public key and save it to a file."""
+    # Only enclave jobs are encrypted, keep cryptography out of the server startup
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import padding
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
     with open(public_key_path, "rb") as key_file:
         public_key = serialization.load_pem_public_key(
@@ -1,4 +1,5 @@
 from syft_event import SyftEvents
+from syft_event.types import Request
 
 from syft_rds.models import (
     GetAllRequest,
@@ -9,6 +10,7 @@ from syft_rds.models import (
     RuntimeUpdate,
 )
 from syft_rds.server.router import RPCRouter
+from syft_rds.server.services.response_cache_service import ResponseCacheService
 from syft_rds.store import YAMLStore
 
 runtime_router = RPCRouter()
@@ -34,23 +36,35 @@ def get_runtime(request: GetOneRequest, app: SyftEvents) -> Runtime:
 
 
 @runtime_router.on_request("/get_all")
-def get_all_runtimes(req: GetAllRequest, app: SyftEvents) -> ItemList[Runtime]:
+def get_all_runtimes(
+    req: GetAllRequest, app: SyftEvents, request: Request
+) -> ItemList[Runtime]:
     runtime_store: YAMLStore[Runtime] = app.state["runtime_store"]
-    items = runtime_store.get_all(
-        limit=req.limit,
-        offset=req.offset,
-        order_by=req.order_by,
-        sort_order=req.sort_order,
-        filters=req.filters,
+    cache: ResponseCacheService = app.state["response_cache"]
+
+    def list_items() -> ItemList[Runtime]:
+        items = runtime_store.get_all(
+            limit=req.limit,
+            offset=req.offset,
+            order_by=req.order_by,
+            sort_order=req.sort_order,
+            filters=req.filters,
+        )
+        return ItemList[Runtime](items=items)
+
+    # Serve repeated reads from memory until the store changes
+    key = cache.make_key(
+        "runtime/get_all", req, request.sender, runtime_store.generation
     )
-    return ItemList[Runtime](items=items)
+    return cache.get_or_compute(key, list_items)
 
 
 @runtime_router.on_request("/update")
 def update_runtime(update_request: RuntimeUpdate, app: SyftEvents) -> Runtime:
     runtime_store: YAMLStore[Runtime] = app.state["runtime_store"]
-    existing_item = runtime_store.get_by_uid(update_request.uid)
-    if existing_item is None:
-        raise ValueError(f"Runtime with uid {update_request.uid} not found")
-    updated_item = existing_item.apply_update(update_request)
-    return runtime_store.update(updated_item.uid, updated_item)
+    with runtime_store.lock(update_request.uid):
+        existing_item = runtime_store.get_by_uid(update_request.uid)
+        if existing_item is None:
+            raise ValueError(f"Runtime with uid {update_request.uid} not found")
+        updated_item = existing_item.apply_update(update_request)
+        return runtime_store.update(updated_item.uid, updated_item)
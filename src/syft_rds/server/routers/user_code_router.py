@@ -11,7 +11,9 @@ from syft_rds.models import (
     UserCodeUpdate,
 )
 from syft_rds.server.router import RPCRouter
+from syft_rds.server.services.attachment_service import AttachmentService
 from syft_rds.server.services.user_file_service import UserFileService
+from syft_rds.server.services.response_cache_service import ResponseCacheService
 from syft_rds.store import YAMLStore
 from syft_rds.utils.zip_utils import extract_zip
 
@@ -30,7 +32,13 @@ def create_user_code(
     user_code = create_request.to_item(extra={"created_by": user})
     user_code_dir = user_file_service.dir_for_item(user=user, item=user_code)
 
-    if create_request.files_zipped is not None:
+    if create_request.files_attachment_id is not None:
+        attachment_service: AttachmentService = app.state["attachment_service"]
+        zip_path = attachment_service.path_for(
+            request, create_request.files_attachment_id
+        )
+        extract_zip(zip_path, user_code_dir)
+    elif create_request.files_zipped is not None:
         extract_zip(create_request.files_zipped, user_code_dir)
 
     user_code.dir_url = SyftBoxURL.from_path(user_code_dir, app.client.workspace)
@@ -51,23 +59,35 @@ def get_user_code(request: GetOneRequest, app: SyftEvents) -> UserCode:
 
 
 @user_code_router.on_request("/get_all")
-def get_all_user_codes(req: GetAllRequest, app: SyftEvents) -> ItemList[UserCode]:
+def get_all_user_codes(
+    req: GetAllRequest, app: SyftEvents, request: Request
+) -> ItemList[UserCode]:
     user_code_store: YAMLStore[UserCode] = app.state["user_code_store"]
-    items = user_code_store.get_all(
-        limit=req.limit,
-        offset=req.offset,
-        order_by=req.order_by,
-        sort_order=req.sort_order,
-        filters=req.filters,
+    cache: ResponseCacheService = app.state["response_cache"]
+
+    def list_items() -> ItemList[UserCode]:
+        items = user_code_store.get_all(
+            limit=req.limit,
+            offset=req.offset,
+            order_by=req.order_by,
+            sort_order=req.sort_order,
+            filters=req.filters,
+        )
+        return ItemList[UserCode](items=items)
+
+    # Serve repeated reads from memory until the store changes
+    key = cache.make_key(
+        "user_code/get_all", req, request.sender, user_code_store.generation
     )
-    return ItemList[UserCode](items=items)
+    return cache.get_or_compute(key, list_items)
 
 
 @user_code_router.on_request("/update")
 def update_user_code(update_request: UserCodeUpdate, app: SyftEvents) -> UserCode:
     user_code_store: YAMLStore[UserCode] = app.state["user_code_store"]
-    existing_item = user_code_store.get_by_uid(update_request.uid)
-    if existing_item is None:
-        raise ValueError(f"UserCode with uid {update_request.uid} not found")
-    updated_item = existing_item.apply_update(update_request)
-    return user_code_store.update(updated_item.uid, updated_item)
+    with user_code_store.lock(update_request.uid):
+        existing_item = user_code_store.get_by_uid(update_request.uid)
+        if existing_item is None:
+            raise ValueError(f"UserCode with uid {update_request.uid} not found")
+        updated_item = existing_item.apply_update(update_request)
+        return user_code_store.update(updated_item.uid, updated_item)
@@ -0,0 +1,80 @@
+import time
+from pathlib import Path
+
+from syft_core import Client
+from syft_event.types import Request
+
+from syft_rds.utils.attachments import attachment_path, verify_attachment
+
+# SyftBox can sync a .request file before its attachment
+DEFAULT_ATTACHMENT_WAIT_TIMEOUT = 30.0
+ATTACHMENT_POLL_INTERVAL = 0.1
+
+
+class AttachmentService:
+    def __init__(
+        self,
+        client: Client,
+        max_size_mb: float | None = None,
+        wait_timeout: float = DEFAULT_ATTACHMENT_WAIT_TIMEOUT,
+    ):
+        """Service for resolving binary attachments sent alongside RPC requests.
+
+        Large binary payloads (e.g. zipped code bundles) are not embedded in the JSON
+        request body. Instead the client writes them as content-addressed files next
+        to the .request file, and the request body only references the attachment id:
+
+        {app_rpc_dir}/
+        ├── {endpoint}/
+        │   ├── {sender}/
+        │   │   ├── {request_id}.request
+        │   │   ├── {sha256}.attachment
+
+        Args:
+            client: SyftBox client of the server, used to resolve request URLs
+            max_size_mb: Optional maximum attachment size in MB
+            wait_timeout: Seconds to wait for an attachment that is not synced yet
+        """
+        self.client = client
+        self.max_size_mb = max_size_mb
+        self.wait_timeout = wait_timeout
+
+    def request_dir(self, request: Request) -> Path:
+        """Directory that holds the .request files (and attachments) of `request`."""
+        endpoint_dir = request.url.to_local_path(self.client.workspace.datasites)
+        return endpoint_dir / request.sender
+
+    def path_for(self, request: Request, attachment_id: str) -> Path:
+        """Resolve and validate the attachment `attachment_id` referenced by `request`.
+
+        Waits up to `wait_timeout` seconds for an attachment that is missing or does not
+        match its content hash yet, it can still be syncing.
+
+        Raises:
+            FileNotFoundError: If the attachment was not written (or synced) in time
+            ValueError: If the attachment is too large or does not match its content hash
+        """
+        path = attachment_path(self.request_dir(request), attachment_id)
+        deadline = time.monotonic() + self.wait_timeout
+        while not path.is_file():
+            if time.monotonic() >= deadline:
+                raise FileNotFoundError(
+                    f"Attachment {attachment_id} not found for request {request.id}"
+                )
+            time.sleep(ATTACHMENT_POLL_INTERVAL)
+
+        if self.max_size_mb is not None:
+            size_mb = path.stat().st_size / 1024 / 1024
+            if size_mb > self.max_size_mb:
+                raise ValueError(
+                    f"Provided files too large: {size_mb:.2f}MB. Max size is {self.max_size_mb}MB"
+                )
+
+        while True:
+            try:
+                verify_attachment(path, attachment_id)
+                return path
+            except ValueError:
+                if time.monotonic() >= deadline:
+                    raise
+            time.sleep(ATTACHMENT_POLL_INTERVAL)
@@ -0,0 +1,84 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from pydantic import BaseModel
+from syft_rpc import rpc
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_SIZE_MB = 64
+
+
+class ResponseCacheService:
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_size_mb: float = DEFAULT_MAX_SIZE_MB,
+    ):
+        """Service for caching serialized responses of read routes.
+
+        Dashboards poll get_all routes every few seconds, while the underlying store
+        rarely changes. Keys include the store generation, so a write to the store
+        makes earlier entries unreachable and they are evicted as least recently used.
+
+        Args:
+            max_entries: Maximum number of cached responses
+            max_size_mb: Maximum total size of the cached responses in MB
+        """
+        self.max_entries = max_entries
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        route: str, request: BaseModel, sender: str, generation: Hashable
+    ) -> Hashable:
+        return (route, request.model_dump_json(), sender, generation)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> bytes:
+        """Return the cached response for `key`, or compute, serialize and cache it."""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        # Computed outside the lock, concurrent misses for the same key may both compute
+        body = rpc.serialize(compute())
+        if len(body) <= self.max_size_bytes:
+            self._put(key, body)
+        return body
+
+    def _put(self, key: Hashable, body: bytes) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= len(previous)
+            self._entries[key] = body
+            self._size_bytes += len(body)
+            while (
+                len(self._entries) > self.max_entries
+                or self._size_bytes > self.max_size_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,158 @@
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+from syft_event import SyftEvents
+
+from syft_rds import __version__
+from syft_rds.models import JobStatus, ServerStatus
+from syft_rds.store import YAMLStore
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# App state keys of the stores reported in the status
+STATUS_STORES = {
+    "job": "job_store",
+    "user_code": "user_code_store",
+    "runtime": "runtime_store",
+    "custom_function": "custom_function_store",
+    "dataset": "dataset_store",
+}
+
+
+class StatusService:
+    def __init__(self, app: SyftEvents):
+        """Service for reporting server internals through the /status endpoint.
+
+        The status is cheap enough to poll every second: store statistics and running
+        jobs are only recomputed when the store generation changes, everything else
+        is read from counters that are already kept in memory.
+
+        Args:
+            app: The server app, its state holds the stores, dispatcher and caches
+        """
+        self.app = app
+        self.started_at = time.time()
+        self._memo: dict[str, tuple[Hashable, Any]] = {}
+        self._lock = threading.Lock()
+        self._last_cpu_sample: Optional[tuple[float, float]] = None
+
+    def status(self, include_senders: bool = False) -> ServerStatus:
+        """Current server status.
+
+        Args:
+            include_senders: If True, include the number of queued requests per sender
+                and the name and creator of each running job. Only the datasite owner
+                should see other senders, others only get the number of running jobs.
+        """
+        state = self.app.state
+        cleanup_stats = getattr(
+            getattr(self.app, "_periodic_cleanup", None), "stats", None
+        )
+        running_jobs = self._running_jobs()
+        return ServerStatus(
+            app_name=self.app.app_name,
+            version=__version__,
+            uptime_seconds=time.time() - self.started_at,
+            process=self._process_stats(),
+            requests=self._request_stats(include_senders),
+            backlog=state["backlog"].stats.to_dict() if "backlog" in state else {},
+            stores={
+                name: self._memoized(
+                    f"disk_usage/{name}", state[key], state[key].disk_usage
+                )
+                for name, key in STATUS_STORES.items()
+                if key in state
+            },
+            response_cache=self._response_cache_stats(),
+            running_job_count=len(running_jobs),
+            running_jobs=running_jobs if include_senders else [],
+            last_cleanup=getattr(cleanup_stats, "last_cleanup", None),
+        )
+
+    def _memoized(self, name: str, store: YAMLStore, compute: Callable[[], Any]) -> Any:
+        generation = store.generation
+        with self._lock:
+            memo = self._memo.get(name)
+            if memo is not None and memo[0] == generation:
+                return memo[1]
+        value = compute()
+        with self._lock:
+            self._memo[name] = (generation, value)
+        return value
+
+    def _request_stats(self, include_senders: bool) -> dict[str, Any]:
+        dispatcher = self.app.state.get("dispatcher")
+        if dispatcher is None:
+            return {}
+        routes = dispatcher.stats()
+        stats = {
+            "queue_depth": sum(route["queue_depth"] for route in routes.values()),
+            "in_flight": sum(route["in_flight"] for route in routes.values()),
+            "max_workers": dispatcher.max_workers,
+            "routes": routes,
+        }
+        if include_senders:
+            stats["queued_by_sender"] = dispatcher.queued_by_sender()
+        return stats
+
+    def _response_cache_stats(self) -> dict[str, Any]:
+        cache = self.app.state.get("response_cache")
+        if cache is None:
+            return {}
+        stats = cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        return {**stats, "hit_rate": stats["hits"] / lookups if lookups else 0.0}
+
+    def _running_jobs(self) -> list[dict[str, Any]]:
+        job_store: Optional[YAMLStore] = self.app.state.get("job_store")
+        if job_store is None:
+            return []
+
+        def list_running() -> list[dict[str, Any]]:
+            jobs = job_store.get_all(filters={"status": JobStatus.job_in_progress})
+            return [
+                {"uid": str(job.uid), "name": job.name, "created_by": job.created_by}
+                for job in jobs
+            ]
+
+        return self._memoized("running_jobs", job_store, list_running)
+
+    def _process_stats(self) -> dict[str, Any]:
+        if resource is None:
+            return {"rss_bytes": None, "cpu_seconds": None, "cpu_percent": None}
+
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        cpu_seconds = usage.ru_utime + usage.ru_stime
+        now = time.monotonic()
+
+        # CPU usage since the previous status call
+        cpu_percent = None
+        with self._lock:
+            if self._last_cpu_sample is not None:
+                last_now, last_cpu = self._last_cpu_sample
+                if now > last_now:
+                    cpu_percent = 100 * (cpu_seconds - last_cpu) / (now - last_now)
+            self._last_cpu_sample = (now, cpu_seconds)
+
+        return {
+            "rss_bytes": _current_rss_bytes(usage),
+            "cpu_seconds": cpu_seconds,
+            "cpu_percent": cpu_percent,
+        }
+
+
+def _current_rss_bytes(usage) -> int:
+    try:
+        # Linux, resident pages are the second field
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak instead of current RSS, in KB on Linux and bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return usage.ru_maxrss * scale
@@ -1,7 +1,10 @@
+import os
+import threading
+from contextlib import contextmanager
 from functools import wraps
 from pathlib import Path
-from typing import Generic, Optional, Type, TypeVar
-from uuid import UUID
+from typing import Generic, Iterator, Optional, Type, TypeVar
+from uuid import UUID, uuid4
 
 import yaml
 from pydantic import TypeAdapter
@@ -18,6 +21,15 @@ rules:
 
 T = TypeVar("T", bound=ItemBase)
 
+# Striped record locks, shared by all stores in the process so stores for the same
+# directory serialize writes to the same record.
+_RECORD_LOCK_STRIPES = 64
+_RECORD_LOCKS = [threading.RLock() for _ in range(_RECORD_LOCK_STRIPES)]
+
+# Write counters per item type directory, shared by all stores in the process
+_GENERATIONS: dict[Path, int] = {}
+_GENERATIONS_LOCK = threading.Lock()
+
 
 def ensure_store_exists(func):
     @wraps(func)
@@ -94,6 +106,9 @@ class YAMLStore(Generic[T]):
             - Each model type gets its own subdirectory based on __schema_name__
             - Records must be instances of Pydantic models inheriting from ItemBase
             - All operations are file-system based for now (no in-memory caching)
+            - `generation` changes on every write, so callers can cache derived results
+            - Records are written atomically, and writes to the same record are serialized
+              with per-record locks, so the store can be used from multiple threads
             - Suitable for smaller datasets where simple CRUD operations are needed
             - Provides human-readable storage format
         """
@@ -140,10 +155,40 @@ class YAMLStore(Generic[T]):
     def item_type_dir(self) -> Path:
         return self.store_dir / self.item_type.__schema_name__
 
+    @property
+    @ensure_store_exists
+    def generation(self) -> tuple[int, int]:
+        """Changes whenever a record is created, updated or deleted.
+
+        Combines a counter of writes through any store in this process with the
+        modification time of the item directory, which also changes on writes by
+        other processes (records are written with a rename).
+        """
+        mtime_ns = self.item_type_dir.stat().st_mtime_ns
+        return _GENERATIONS.get(self.item_type_dir, 0), mtime_ns
+
+    def _bump_generation(self) -> None:
+        with _GENERATIONS_LOCK:
+            _GENERATIONS[self.item_type_dir] = (
+                _GENERATIONS.get(self.item_type_dir, 0) + 1
+            )
+
     def _get_record_path(self, uid: str | UUID) -> Path:
         """Get the full path for a record's YAML file from its UID."""
         return self.item_type_dir / f"{uid}.yaml"
 
+    @contextmanager
+    def lock(self, uid: str | UUID) -> Iterator[None]:
+        """Lock a record, e.g. for a read-modify-write across multiple store calls.
+
+        The lock is re-entrant, store methods called while holding it do not block.
+        """
+        record_lock = _RECORD_LOCKS[
+            hash(str(self._get_record_path(uid))) % _RECORD_LOCK_STRIPES
+        ]
+        with record_lock:
+            yield
+
     def _save_record(self, record: T) -> None:
         """Save a single record to its own YAML file"""
         file_path = self._get_record_path(record.uid)
@@ -152,15 +197,23 @@ class YAMLStore(Generic[T]):
             indent=2,
             sort_keys=False,
         )
-        file_path.write_text(yaml_dump)
+        # Write to a temporary file and rename, so readers never see a partial record
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(yaml_dump)
+            os.replace(tmp_path, file_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            self._bump_generation()
 
     @ensure_store_exists
     def get_by_uid(self, uid: str | UUID) -> Optional[T]:
         """Get a single record by UID"""
         file_path = self._get_record_path(uid)
-        if not file_path.exists():
+        try:
+            record_dict = yaml.safe_load(file_path.read_text())
+        except FileNotFoundError:
             return None
-        record_dict = yaml.safe_load(file_path.read_text())
         return self.item_type.model_validate(record_dict)
 
     @ensure_store_exists
@@ -174,6 +227,19 @@ class YAMLStore(Generic[T]):
                 records.append(loaded_record)
         return records
 
+    def disk_usage(self) -> dict[str, int]:
+        """Number of records and their total size on disk, without loading them."""
+        records, size_bytes = 0, 0
+        try:
+            with os.scandir(self.item_type_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".yaml") and entry.is_file():
+                        records += 1
+                        size_bytes += entry.stat().st_size
+        except FileNotFoundError:
+            pass
+        return {"records": records, "size_bytes": size_bytes}
+
     @ensure_store_exists
     def create(self, record: T, overwrite: bool = False) -> T:
         """
@@ -189,9 +255,10 @@ class YAMLStore(Generic[T]):
         if not isinstance(record, self.item_type):
             raise TypeError(f"`record` must be of type {self.item_type.__name__}")
         file_path = self._get_record_path(record.uid)
-        if file_path.exists() and not overwrite:
-            raise ValueError(f"Record with UID {record.uid} already exists")
-        self._save_record(record)
+        with self.lock(record.uid):
+            if file_path.exists() and not overwrite:
+                raise ValueError(f"Record with UID {record.uid} already exists")
+            self._save_record(record)
         return record
 
     @ensure_store_exists
@@ -209,15 +276,20 @@ class YAMLStore(Generic[T]):
         if not isinstance(record, self.item_type):
             raise TypeError(f"`record` must be of type {self.item_type.__name__}")
 
-        existing_record = self.get_by_uid(uid)
-        if not existing_record:
-            return None
+        with self.lock(uid):
+            existing_record = self.get_by_uid(uid)
+            if not existing_record:
+                return None
 
-        # Update the record
-        updated_record = existing_record.model_copy(
-            update=record.model_dump(exclude={"uid"})
-        )
-        self._save_record(updated_record)
+            # Update the record, copying the values keeps nested models
+            updated_record = existing_record.model_copy(
+                update={
+                    name: getattr(record, name)
+                    for name in record.model_fields
+                    if name != "uid"
+                }
+            )
+            self._save_record(updated_record)
         return updated_record
 
     @ensure_store_exists
@@ -232,9 +304,13 @@ class YAMLStore(Generic[T]):
             True if record was deleted, False if not found
         """
         file_path = self._get_record_path(uid)
-        if not file_path.exists():
-            return False
-        file_path.unlink()
+        with self.lock(uid):
+            try:
+                file_path.unlink()
+            except FileNotFoundError:
+                return False
+            finally:
+                self._bump_generation()
         return True
 
     @ensure_store_exists
@@ -337,3 +413,4 @@ class YAMLStore(Generic[T]):
         """Clear all records in the store"""
         for file_path in self.item_type_dir.glob("*.yaml"):
             file_path.unlink()
+        self._bump_generation()
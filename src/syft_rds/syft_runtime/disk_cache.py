@@ -0,0 +1,117 @@
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from loguru import logger
+
+
+class DiskCache:
+    # Name of an entry in log messages
+    entry_name = "cache entry"
+
+    def __init__(self, cache_dir: Path, max_bytes: int, min_idle: float = 0.0):
+        """Cached entries stored as directories, with a disk budget.
+
+        When the cache grows over `max_bytes`, least recently used entries are removed.
+        Subclasses list their entry directories and tell when each entry was last used.
+
+        Args:
+            cache_dir: Local directory of the cache, must not be synced
+            max_bytes: Disk budget of the cache
+            min_idle: Seconds an entry must be unused before it can be evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.min_idle = min_idle
+        self._lock = threading.Lock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._evicting = False
+
+    def size(self) -> int:
+        return sum(dir_size(path) for path in self._entry_dirs())
+
+    def evict(self, exclude: Iterable[str] = ()) -> list[str]:
+        """Remove least recently used entries until the cache is within budget.
+
+        Entries that are in use, i.e. whose key lock is held, are skipped.
+
+        Returns:
+            list[str]: Keys of the removed entries
+        """
+        exclude = set(exclude)
+        entries = [
+            (path, dir_size(path), self._last_used(path.name))
+            for path in self._entry_dirs()
+        ]
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return []
+
+        now = time.time()
+        removed = []
+        for path, size, last_used in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            key = path.name
+            if key in exclude or now - last_used < self.min_idle:
+                continue
+            key_lock = self._key_lock(key)
+            if not key_lock.acquire(blocking=False):
+                continue
+            try:
+                self._remove(key, path)
+            finally:
+                key_lock.release()
+            total -= size
+            removed.append(key)
+            logger.debug(f"Evicted {self.entry_name} {key} ({size} bytes)")
+        return removed
+
+    def _entry_dirs(self) -> list[Path]:
+        raise NotImplementedError
+
+    def _last_used(self, key: str) -> float:
+        raise NotImplementedError
+
+    def _remove(self, key: str, path: Path) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _evict_in_background(self, exclude: Iterable[str]) -> None:
+        # Measuring the entries walks all their files, don't delay the job for it
+        with self._lock:
+            if self._evicting:
+                return
+            self._evicting = True
+
+        def evict() -> None:
+            try:
+                self.evict(exclude=exclude)
+            except Exception as e:
+                logger.warning(f"Could not evict {self.entry_name}s: {e}")
+            finally:
+                with self._lock:
+                    self._evicting = False
+
+        threading.Thread(target=evict, name="rds-cache-eviction", daemon=True).start()
+
+
+def dir_size(path: Path, exclude_names: Iterable[str] = ()) -> int:
+    """Total size of the files under `path`, without files named in `exclude_names`."""
+    exclude_names = set(exclude_names)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            if name in exclude_names:
+                continue
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
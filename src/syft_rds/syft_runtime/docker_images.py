@@ -0,0 +1,235 @@
+import hashlib
+import subprocess
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Optional
+
+from loguru import logger
+
+from syft_rds.models import DockerRuntimeConfig, Runtime
+
+DEFAULT_DOCKER_BINARY = "docker"
+# Seconds a successful daemon or image probe is reused
+DEFAULT_PROBE_TTL = 30.0
+
+# Runs a command like `subprocess.run`, replaceable for tests
+CommandExecutor = Callable[..., subprocess.CompletedProcess]
+
+
+class DockerCLI:
+    def __init__(
+        self,
+        binary: str = DEFAULT_DOCKER_BINARY,
+        executor: CommandExecutor = subprocess.run,
+        probe_ttl: float = DEFAULT_PROBE_TTL,
+    ):
+        """The Docker command line, with cached probes of the daemon and images.
+
+        Successful probes are reused for `probe_ttl` seconds, so running many jobs does
+        not start a `docker info` and `docker image inspect` process per job.
+        Failed probes are not cached, a started daemon or built image is seen directly.
+
+        Args:
+            binary: The docker executable
+            executor: Runs the docker commands, defaults to `subprocess.run`
+            probe_ttl: Seconds a successful probe is cached
+        """
+        self.binary = binary
+        self.executor = executor
+        self.probe_ttl = probe_ttl
+        self._lock = threading.Lock()
+        self._probes: dict[tuple, float] = {}
+
+    def run(self, *args: str, **kwargs) -> subprocess.CompletedProcess:
+        return self.executor([self.binary, *args], **kwargs)
+
+    def daemon_running(self) -> bool:
+        return self._probe(("info",), ["info"])
+
+    def image_exists(self, image: str) -> bool:
+        return self._probe(("image", image), ["image", "inspect", image])
+
+    def build(self, image: str, dockerfile_content: str, context: str = "."):
+        """Build `image` from the Dockerfile content, raises CalledProcessError on failure."""
+        # Use stdin for Dockerfile content
+        build_args = ["build", "-t", image, "-f", "-", context]
+        logger.debug(
+            f"Running docker build command: {self.binary} {' '.join(build_args)}\nDockerfile content:\n{dockerfile_content}"
+        )
+        result = self.run(
+            *build_args,
+            input=dockerfile_content,
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        with self._lock:
+            self._probes[("image", image)] = time.monotonic()
+        return result
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._probes.clear()
+
+    def _probe(self, key: tuple, args: list[str]) -> bool:
+        with self._lock:
+            checked_at = self._probes.get(key)
+            if (
+                checked_at is not None
+                and time.monotonic() - checked_at < self.probe_ttl
+            ):
+                return True
+        try:
+            result = self.run(*args, capture_output=True, check=False, text=True)
+        except FileNotFoundError:
+            return False
+        if result.returncode != 0:
+            return False
+        with self._lock:
+            self._probes[key] = time.monotonic()
+        return True
+
+
+class ImageBuildStatus(str, Enum):
+    NOT_BUILT = "not_built"
+    BUILDING = "building"
+    BUILT = "built"
+    FAILED = "failed"
+
+
+class ImageBuildError(RuntimeError):
+    def __init__(self, message: str, stderr: str = "", returncode: int = 1):
+        super().__init__(message)
+        self.stderr = stderr
+        self.returncode = returncode
+
+
+@dataclass
+class ImageBuild:
+    image: str
+    status: ImageBuildStatus
+    error: Optional[str] = None
+
+
+def get_image_tag(runtime: Runtime) -> str:
+    """Image of a Docker runtime, tagged with the hash of its Dockerfile.
+
+    A changed Dockerfile gets a new tag, so jobs never run in a stale image.
+    """
+    config: DockerRuntimeConfig = runtime.config
+    repository = config.image_name or runtime.name
+    # Drop an explicit tag, but not the port of a registry like host:5000/image
+    name, _, tag = repository.rpartition(":")
+    if name and "/" not in tag:
+        repository = name
+    content_hash = hashlib.sha256(config.dockerfile_content.encode()).hexdigest()[:12]
+    return f"{repository.lower()}:{content_hash}"
+
+
+class DockerImageBuilder:
+    def __init__(self, cli: Optional[DockerCLI] = None, max_workers: int = 1):
+        """Builds the images of Docker runtimes, in the background or on demand.
+
+        A build of the same image is never started twice: jobs that need an image that
+        is being prebuilt wait for that build.
+
+        Args:
+            cli: Docker command line to use
+            max_workers: Number of images built at the same time
+        """
+        self.cli = cli or DockerCLI()
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._builds: dict[str, ImageBuild] = {}
+        self._futures: dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def status(self, runtime: Runtime) -> ImageBuild:
+        image = get_image_tag(runtime)
+        with self._lock:
+            build = self._builds.get(image)
+        if build is not None and build.status != ImageBuildStatus.BUILT:
+            return build
+        if self.cli.image_exists(image):
+            return ImageBuild(image=image, status=ImageBuildStatus.BUILT)
+        return ImageBuild(image=image, status=ImageBuildStatus.NOT_BUILT)
+
+    def prebuild(self, runtime: Runtime) -> Future:
+        """Build the runtime's image in the background, if it does not exist yet."""
+        image = get_image_tag(runtime)
+        with self._lock:
+            future = self._futures.get(image)
+            if future is not None and not future.done():
+                return future
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="rds-docker-build"
+                )
+            self._builds[image] = ImageBuild(
+                image=image, status=ImageBuildStatus.BUILDING
+            )
+            future = self._executor.submit(self._build_if_missing, runtime, image)
+            self._futures[image] = future
+            return future
+
+    def ensure_image(self, runtime: Runtime) -> str:
+        """Wait for the runtime's image, building it if needed. Returns the image tag.
+
+        Raises:
+            ImageBuildError: If `docker build` failed
+            RuntimeError: If the image could not be built for another reason
+        """
+        image = get_image_tag(runtime)
+        with self._lock:
+            future = self._futures.get(image)
+        building = future is not None and not future.done()
+        if not building and self.cli.image_exists(image):
+            return image
+        # Waits for a running prebuild, or builds the image, failed builds are retried
+        self.prebuild(runtime).result()
+        return image
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _build_if_missing(self, runtime: Runtime, image: str) -> None:
+        if self.cli.image_exists(image):
+            logger.info(f"Docker image '{image}' already exists.")
+            self._set_build(image, ImageBuildStatus.BUILT)
+            return
+
+        logger.info(f"Docker image '{image}' not found. Building it now...")
+        self._set_build(image, ImageBuildStatus.BUILDING)
+        try:
+            result = self.cli.build(image, runtime.config.dockerfile_content)
+            logger.debug(result.stdout)
+        except FileNotFoundError:
+            self._set_build(image, ImageBuildStatus.FAILED, "Docker not installed")
+            raise RuntimeError("Docker not installed or not in PATH.")
+        except subprocess.CalledProcessError as e:
+            error_message = f"Failed to build Docker image '{image}'."
+            logger.error(f"{error_message} stderr: {e.stderr}")
+            self._set_build(
+                image, ImageBuildStatus.FAILED, f"{error_message}\n{e.stderr}"
+            )
+            raise ImageBuildError(
+                error_message, stderr=e.stderr, returncode=e.returncode
+            )
+        except Exception as e:
+            self._set_build(image, ImageBuildStatus.FAILED, str(e))
+            raise RuntimeError(f"An error occurred during Docker image build: {e}")
+
+        logger.info(f"Successfully built Docker image '{image}'.")
+        self._set_build(image, ImageBuildStatus.BUILT)
+
+    def _set_build(
+        self, image: str, status: ImageBuildStatus, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            self._builds[image] = ImageBuild(image=image, status=status, error=error)
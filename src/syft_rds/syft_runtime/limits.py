@@ -0,0 +1,288 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+
+from syft_rds.models import JobConfig, JobUsage, ResourceLimits
+from syft_rds.syft_runtime.disk_cache import dir_size
+from syft_rds.syft_runtime.log_files import get_log_rotator
+from syft_rds.utils.processes import group_alive
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Seconds between SIGTERM and SIGKILL when a job exceeds its timeout
+DEFAULT_KILL_GRACE_PERIOD = 5.0
+USAGE_FILE_NAME = "usage.json"
+# Process group of a running job, removed when the job exits
+PROCESS_FILE_NAME = "process.json"
+
+# (resource, soft limit, hard limit), applied with `resource.setrlimit`
+RLimit = tuple[int, int, int]
+RLIMIT_LAUNCHER_PATH = Path(__file__).with_name("rlimit_launcher.py")
+
+
+def get_rlimits(limits: ResourceLimits) -> list[RLimit]:
+    """Limits to set in a job process, capped at the hard limits of this process.
+
+    `max_processes` is not included, RLIMIT_NPROC counts all processes of the user.
+    """
+    if resource is None:
+        return []
+    megabyte = 1024 * 1024
+    wanted = []
+    if limits.cpu_seconds is not None:
+        wanted.append((resource.RLIMIT_CPU, int(limits.cpu_seconds)))
+    if limits.memory_mb is not None:
+        wanted.append((resource.RLIMIT_AS, int(limits.memory_mb * megabyte)))
+    if limits.max_file_size_mb is not None:
+        wanted.append((resource.RLIMIT_FSIZE, int(limits.max_file_size_mb * megabyte)))
+    if limits.max_open_files is not None:
+        wanted.append((resource.RLIMIT_NOFILE, int(limits.max_open_files)))
+
+    rlimits = []
+    for rlimit, soft in wanted:
+        # The CPU hard limit is a second later, so the job gets SIGXCPU before SIGKILL
+        hard = soft + 1 if rlimit == resource.RLIMIT_CPU else soft
+        _, current_hard = resource.getrlimit(rlimit)
+        if current_hard != resource.RLIM_INFINITY:
+            soft, hard = min(soft, current_hard), min(hard, current_hard)
+        rlimits.append((rlimit, soft, hard))
+    return rlimits
+
+
+def with_rlimits(cmd: list[str], rlimits: list[RLimit]) -> list[str]:
+    """`cmd` started through the launcher that sets `rlimits` before it execs."""
+    if not rlimits:
+        return cmd
+    return [
+        sys.executable,
+        "-I",
+        "-S",
+        str(RLIMIT_LAUNCHER_PATH),
+        json.dumps(rlimits),
+        *cmd,
+    ]
+
+
+def kill_process_group(process: subprocess.Popen, sig: int) -> None:
+    """Send `sig` to the job and every process it started."""
+    if process.returncode is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        else:
+            process.send_signal(sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+class JobMonitor:
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        job_config: JobConfig,
+        kill_job: Optional[Callable[[], None]] = None,
+        measure_rusage: bool = True,
+        grace_period: float = DEFAULT_KILL_GRACE_PERIOD,
+    ):
+        """Enforces the timeout of a running job and measures its resource usage.
+
+        The job runs in its own process group. When it exceeds `limits.timeout`, the
+        group gets SIGTERM, and SIGKILL after `grace_period` seconds. Its logs are
+        rotated when they grow over `job_config.max_log_bytes`.
+
+        Args:
+            process: The started job, in a new session
+            job_config: Config of the job, with its limits
+            kill_job: Called before the process group is killed, e.g. to stop a container
+            measure_rusage: If False, CPU time and memory are not recorded, e.g. because
+                `process` only controls the job
+            grace_period: Seconds between SIGTERM and SIGKILL
+        """
+        self.process = process
+        self.timeout = job_config.limits.timeout
+        self.logs_dir = job_config.logs_dir
+        self.output_dir = job_config.output_dir
+        self.measure_rusage = measure_rusage
+        self.grace_period = grace_period
+        self.timed_out = False
+        self.started_at = time.monotonic()
+        self._kill_job = kill_job
+        self._timers: list[threading.Timer] = []
+        self._lock = threading.Lock()
+        self._finished = False
+        if self.timeout is not None:
+            self._start_timer(self.timeout, self._on_timeout)
+        save_job_process(process, self.logs_dir)
+        self._log_paths = [self.logs_dir / "stdout.log", self.logs_dir / "stderr.log"]
+        if job_config.max_log_bytes is not None:
+            for path in self._log_paths:
+                get_log_rotator().watch(
+                    path, job_config.max_log_bytes, job_config.log_backups
+                )
+
+    def kill(self, sig: int = getattr(signal, "SIGKILL", signal.SIGTERM)) -> None:
+        if self.process.returncode is not None:
+            return
+        if self._kill_job is not None:
+            try:
+                self._kill_job()
+            except Exception as e:
+                logger.warning(f"Could not stop job {self.process.pid}: {e}")
+        kill_process_group(self.process, sig)
+
+    def finish(self) -> JobUsage:
+        """Stop the timeout and record the usage of the exited job."""
+        with self._lock:
+            self._finished = True
+            timers, self._timers = self._timers, []
+        for timer in timers:
+            timer.cancel()
+        for path in self._log_paths:
+            get_log_rotator().unwatch(path)
+        (self.logs_dir / PROCESS_FILE_NAME).unlink(missing_ok=True)
+
+        if self.timed_out:
+            with open(self.logs_dir / "stderr.log", "a") as f:
+                f.write(
+                    f"ERROR: Job killed after exceeding its timeout of {self.timeout}s\n"
+                )
+
+        rusage = getattr(self.process, "_rusage", None)
+        if not self.measure_rusage:
+            rusage = None
+        usage = JobUsage(
+            wall_seconds=round(
+                getattr(self.process, "_ended_at", time.monotonic()) - self.started_at,
+                3,
+            ),
+            cpu_seconds=(
+                round(rusage.ru_utime + rusage.ru_stime, 3) if rusage else None
+            ),
+            peak_rss_mb=_max_rss_mb(rusage.ru_maxrss) if rusage else None,
+            bytes_written=_job_bytes(self.output_dir) + _job_bytes(self.logs_dir),
+            timed_out=self.timed_out,
+        )
+        save_job_usage(usage, self.logs_dir)
+        return usage
+
+    def _on_timeout(self) -> None:
+        if self.process.returncode is not None:
+            return
+        self.timed_out = True
+        logger.warning(
+            f"Job process {self.process.pid} exceeded its timeout of {self.timeout}s, stopping it"
+        )
+        self.kill(signal.SIGTERM)
+        self._start_timer(self.grace_period, self.kill)
+
+    def _start_timer(self, interval: float, function: Callable[[], None]) -> None:
+        with self._lock:
+            if self._finished:
+                return
+            timer = threading.Timer(interval, function)
+            timer.daemon = True
+            self._timers.append(timer)
+            timer.start()
+
+
+def save_job_usage(usage: JobUsage, logs_dir: Path) -> None:
+    (logs_dir / USAGE_FILE_NAME).write_text(usage.model_dump_json())
+
+
+def read_job_usage(logs_dir: Path) -> Optional[JobUsage]:
+    """Usage recorded by the JobMonitor of a finished job, None if not recorded."""
+    try:
+        return JobUsage(**json.loads((logs_dir / USAGE_FILE_NAME).read_text()))
+    except (OSError, ValueError):
+        return None
+
+
+def save_job_process(process: subprocess.Popen, logs_dir: Path) -> None:
+    """Record the process group of a job, jobs run in their own session."""
+    try:
+        (logs_dir / PROCESS_FILE_NAME).write_text(
+            json.dumps(
+                {
+                    "pid": process.pid,
+                    "host": socket.gethostname(),
+                    "start_time": _process_start_time(process.pid),
+                }
+            )
+        )
+    except OSError as e:
+        logger.warning(f"Could not record process of job {process.pid}: {e}")
+
+
+def stop_orphaned_job(
+    logs_dir: Path, grace_period: float = DEFAULT_KILL_GRACE_PERIOD
+) -> bool:
+    """Stop a job that outlived the process that started it, e.g. a crashed server.
+
+    Jobs run in their own session, so they keep running when the server dies.
+
+    Returns:
+        bool: True if the job was still running
+    """
+    try:
+        info = json.loads((logs_dir / PROCESS_FILE_NAME).read_text())
+    except (OSError, ValueError):
+        return False
+    pgid = info.get("pid")
+    if not pgid or info.get("host") != socket.gethostname():
+        return False
+    if not hasattr(os, "killpg") or not group_alive(pgid):
+        return False
+    # A live leader with another start time is a new process that reused the pid
+    start_time = _process_start_time(pgid)
+    if start_time is not None and start_time != info.get("start_time"):
+        return False
+
+    logger.warning(f"Stopping job process group {pgid} left by a previous server")
+    _kill_group(pgid, signal.SIGTERM)
+    deadline = time.monotonic() + grace_period
+    while group_alive(pgid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    _kill_group(pgid, signal.SIGKILL)
+    (logs_dir / PROCESS_FILE_NAME).unlink(missing_ok=True)
+    return True
+
+
+def _kill_group(pgid: int, sig: int) -> None:
+    try:
+        os.killpg(pgid, sig)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _process_start_time(pid: int) -> Optional[int]:
+    """Start time of a process in clock ticks after boot, None where /proc is missing."""
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # The command name can contain spaces, the fields after it cannot
+    return int(stat.rsplit(")", 1)[1].split()[19])
+
+
+def _max_rss_mb(max_rss: int) -> float:
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(max_rss / divisor, 1)
+
+
+def _job_bytes(path: Path) -> int:
+    # The files of the monitor are not written by the job
+    return dir_size(path, exclude_names=(USAGE_FILE_NAME, PROCESS_FILE_NAME))
@@ -0,0 +1,256 @@
+import gzip
+import os
+import re
+import shutil
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from loguru import logger
+
+DEFAULT_MAX_LOG_BYTES = 100 * 1024 * 1024  # 100 MB per log file
+DEFAULT_LOG_BACKUPS = 2
+DEFAULT_ROTATION_CHECK_INTERVAL = 1.0  # seconds
+
+
+def open_job_log(path: Path):
+    """Create or truncate a job's log file, and open it for appending.
+
+    Writes always go to the end of the file, so the log can be rotated while the job
+    writes to it.
+    """
+    open(path, "w").close()
+    return open(path, "a", buffering=1)
+
+
+def rotated_log_path(path: Path, index: int) -> Path:
+    return path.with_name(f"{path.name}.{index}.gz")
+
+
+def rotate_log(path: Path, backups: int = DEFAULT_LOG_BACKUPS) -> None:
+    """Compress the content of `path` to `<name>.1.gz` and truncate it.
+
+    Older backups are shifted to `<name>.2.gz` and so on, only `backups` are kept.
+    The log is copied and then truncated, because the job keeps writing to it. Output
+    written in between is lost.
+    """
+    path = Path(path)
+    if backups > 0:
+        rotated_log_path(path, backups).unlink(missing_ok=True)
+        for index in range(backups - 1, 0, -1):
+            if rotated_log_path(path, index).exists():
+                os.replace(
+                    rotated_log_path(path, index), rotated_log_path(path, index + 1)
+                )
+        with open(path, "rb") as src, gzip.open(rotated_log_path(path, 1), "wb") as dst:
+            shutil.copyfileobj(src, dst)
+    os.truncate(path, 0)
+
+
+class LogRotator:
+    def __init__(self, check_interval: float = DEFAULT_ROTATION_CHECK_INTERVAL):
+        """Rotates the log files of running jobs once they grow over their size cap.
+
+        One thread checks the sizes of all watched logs every `check_interval` seconds,
+        so a log can outgrow its cap by what the job writes in that time.
+        """
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        # path -> (max_bytes, backups)
+        self._watched: dict[Path, tuple[int, int]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(
+        self, path: Path, max_bytes: int, backups: int = DEFAULT_LOG_BACKUPS
+    ) -> None:
+        with self._lock:
+            self._watched[Path(path)] = (max_bytes, backups)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="rds-log-rotator", daemon=True
+                )
+                self._thread.start()
+
+    def unwatch(self, path: Path) -> None:
+        with self._lock:
+            self._watched.pop(Path(path), None)
+
+    def check(self) -> None:
+        """Rotate the watched logs that are over their cap."""
+        with self._lock:
+            watched = list(self._watched.items())
+        for path, (max_bytes, backups) in watched:
+            try:
+                if path.stat().st_size > max_bytes:
+                    rotate_log(path, backups)
+                    logger.debug(f"Rotated log {path}, it exceeded {max_bytes} bytes")
+            except FileNotFoundError:
+                self.unwatch(path)
+            except OSError as e:
+                logger.warning(f"Could not rotate log {path}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.check_interval)
+            self.check()
+
+
+_log_rotator: Optional[LogRotator] = None
+_log_rotator_lock = threading.Lock()
+
+
+def get_log_rotator() -> LogRotator:
+    """The log rotator shared by all runners of this process."""
+    global _log_rotator
+    with _log_rotator_lock:
+        if _log_rotator is None:
+            _log_rotator = LogRotator()
+        return _log_rotator
+
+
+class LogRange(NamedTuple):
+    """Part of a log file, `start` and `end` are byte offsets."""
+
+    text: str
+    start: int
+    end: int
+    size: int
+
+
+def read_log(
+    path: Path,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    tail: Optional[int] = None,
+    grep: Optional[str] = None,
+) -> LogRange:
+    """Read part of a log without loading the whole file.
+
+    Args:
+        path: The log file, a missing file reads as empty
+        offset: Byte offset to start at, negative to start that many bytes before the
+            end. A negative offset skips to the next full line.
+        limit: Maximum bytes to read. The range ends at a line boundary when possible,
+            continue from `end` to read the next part.
+        tail: Only return the last `tail` lines. Without `offset`, `limit` and `grep`
+            the file is read backwards from its end.
+        grep: Only return the lines that match this regular expression
+
+    Returns:
+        LogRange: The text, the byte range of the file it was read from and the size
+            of the file.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return LogRange("", 0, 0, 0)
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if tail is not None and offset == 0 and limit is None and grep is None:
+            return _read_tail(f, size, tail)
+
+        start = _resolve_offset(f, offset, size)
+        end = size if limit is None else min(size, start + limit)
+        if grep is None and tail is None:
+            f.seek(start)
+            data = f.read(end - start)
+            if end < size:
+                data = _cut_at_line_end(data)
+            return LogRange(
+                data.decode(errors="replace"), start, start + len(data), size
+            )
+
+        pattern = re.compile(grep) if grep is not None else None
+        lines: deque[str] = deque(maxlen=tail)
+        position = start
+        f.seek(start)
+        while position < end:
+            line = f.readline(end - position)
+            if end < size and not line.endswith(b"\n") and position > start:
+                # The last line continues after the range, it is read in the next part
+                break
+            position += len(line)
+            text = line.decode(errors="replace")
+            if pattern is None or pattern.search(text):
+                lines.append(text if text.endswith("\n") else text + "\n")
+        return LogRange("".join(lines), start, position, size)
+
+
+def follow_log_files(
+    paths: dict[str, Path],
+    is_running: Callable[[], bool],
+    from_start: bool = True,
+    poll_interval: float = 0.1,
+) -> Iterator[tuple[str, str]]:
+    """Yield `(name, line)` for the lines written to the logs in `paths`.
+
+    Stops once `is_running` returns False and the logs are read to their end. With
+    `from_start=False` only new output is yielded. A log that is rotated is read
+    again from its start.
+    """
+    positions = {}
+    for name, path in paths.items():
+        try:
+            positions[name] = 0 if from_start else os.stat(path).st_size
+        except FileNotFoundError:
+            positions[name] = 0
+    partial_lines = {name: b"" for name in paths}
+
+    while True:
+        # Check before reading, so the lines written before the job ended are read
+        running = is_running()
+        for name, path in paths.items():
+            try:
+                with open(path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size < positions[name]:
+                        positions[name] = 0
+                        partial_lines[name] = b""
+                    f.seek(positions[name])
+                    data = f.read()
+            except FileNotFoundError:
+                continue
+            positions[name] += len(data)
+            *lines, partial_lines[name] = (partial_lines[name] + data).split(b"\n")
+            for line in lines:
+                yield name, line.decode(errors="replace") + "\n"
+        if not running:
+            break
+        time.sleep(poll_interval)
+
+    for name, line in partial_lines.items():
+        if line:
+            yield name, line.decode(errors="replace") + "\n"
+
+
+def _read_tail(f, size: int, lines: int, block_size: int = 64 * 1024) -> LogRange:
+    if lines <= 0:
+        return LogRange("", size, size, size)
+    start = size
+    data = b""
+    # One more newline than lines, the part before it is not returned
+    while start > 0 and data.count(b"\n") <= lines:
+        step = min(block_size, start)
+        start -= step
+        f.seek(start)
+        data = f.read(step) + data
+    tail_lines = data.splitlines(keepends=True)[-lines:]
+    text = b"".join(tail_lines)
+    return LogRange(text.decode(errors="replace"), size - len(text), size, size)
+
+
+def _resolve_offset(f, offset: int, size: int) -> int:
+    if offset >= 0:
+        return min(offset, size)
+    start = max(0, size + offset)
+    if start > 0:
+        f.seek(start - 1)
+        # Skip the rest of the line the offset points into
+        start += len(f.readline()) - 1
+    return start
+
+
+def _cut_at_line_end(data: bytes) -> bytes:
+    end = data.rfind(b"\n")
+    return data[: end + 1] if end != -1 else data
@@ -0,0 +1,408 @@
+import ctypes
+import os
+import selectors
+import shutil
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from loguru import logger
+
+from syft_rds.syft_runtime.log_files import open_job_log
+from syft_rds.utils.processes import drain_socket
+
+# Reading a log file without change notifications, only used when there is no inotify
+# and no named pipes (Windows)
+DEFAULT_POLL_INTERVAL = 0.01  # seconds
+DEFAULT_CLOSE_TIMEOUT = 2.0  # seconds
+READ_SIZE = 65536
+
+# Called in the pump thread with complete lines, each ending with "\n"
+LinesCallback = Callable[[list[str]], None]
+
+INOTIFY = "inotify"
+PIPE = "pipe"
+POLL = "poll"
+
+
+class LogStream:
+    """A log file that is followed by a `LogPump`.
+
+    `writer` is the file the job writes to. With inotify or polling, it is the log
+    file itself and the pump reads what is appended. Otherwise it is a named pipe,
+    the pump copies its data to the log file.
+    """
+
+    def __init__(
+        self,
+        pump: "LogPump",
+        path: Path,
+        on_lines: LinesCallback,
+        writer,
+        read_file=None,
+        read_fd: Optional[int] = None,
+        tee_file=None,
+        fifo_dir: Optional[Path] = None,
+    ):
+        self.path = path
+        self.on_lines = on_lines
+        self.writer = writer
+        self._pump = pump
+        self._read_file = read_file
+        self._read_fd = read_fd
+        self._tee_file = tee_file
+        self._fifo_dir = fifo_dir
+        self._buffer = b""
+        self._closed = threading.Event()
+        self._finish_lock = threading.Lock()
+        # Only used by the pump thread
+        self._wd: Optional[int] = None
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Stop following once the lines written so far are delivered."""
+        self.writer.close()
+        self._pump._close(self)
+        if not self._closed.wait(timeout):
+            logger.warning(f"Log stream of {self.path} did not close in time")
+
+    def _read(self) -> None:
+        chunks = []
+        if self._read_file is not None:
+            if os.fstat(self._read_file.fileno()).st_size < self._read_file.tell():
+                # The log was rotated, its new content starts at the beginning
+                self._read_file.seek(0)
+            while data := self._read_file.read(READ_SIZE):
+                chunks.append(data)
+        else:
+            while True:
+                try:
+                    data = os.read(self._read_fd, READ_SIZE)
+                except BlockingIOError:
+                    break
+                if not data:
+                    break
+                chunks.append(data)
+            if chunks:
+                self._tee_file.write(b"".join(chunks))
+        if chunks:
+            self._deliver(b"".join(chunks))
+
+    def _deliver(self, data: bytes, final: bool = False) -> None:
+        data = self._buffer + data
+        if final:
+            complete, self._buffer = data, b""
+            if complete and not complete.endswith(b"\n"):
+                complete += b"\n"
+        else:
+            end = data.rfind(b"\n") + 1
+            complete, self._buffer = data[:end], data[end:]
+        if not complete:
+            return
+        # Lines are split at newlines, so multi-byte characters are never cut
+        text = complete.decode("utf-8", errors="replace")
+        lines = [line + "\n" for line in text.split("\n")[:-1]]
+        try:
+            self.on_lines(lines)
+        except Exception as e:
+            logger.error(f"Error handling log lines of {self.path}: {e}")
+
+    def _finish(self) -> None:
+        with self._finish_lock:
+            if self._closed.is_set():
+                return
+            try:
+                self._read()
+                self._deliver(b"", final=True)
+            finally:
+                if self._read_file is not None:
+                    self._read_file.close()
+                if self._read_fd is not None:
+                    os.close(self._read_fd)
+                if self._tee_file is not None:
+                    self._tee_file.close()
+                if self._fifo_dir is not None:
+                    shutil.rmtree(self._fifo_dir, ignore_errors=True)
+                self._closed.set()
+
+
+class LogPump:
+    def __init__(
+        self, mode: Optional[str] = None, poll_interval: float = DEFAULT_POLL_INTERVAL
+    ):
+        """Streams the log files of running jobs to their output handlers, in one thread.
+
+        New output is read when inotify reports a change of the log file. Without
+        inotify, jobs write to a named pipe that the pump copies to the log file, and
+        as a last resort the log files are polled every `poll_interval` seconds.
+        Lines are delivered in batches, one callback per read.
+
+        Args:
+            mode: "inotify", "pipe" or "poll", defaults to the best available
+            poll_interval: Seconds between reads in "poll" mode
+        """
+        self.mode = mode or _default_mode()
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        # Streams added or closed by other threads, handled by the pump thread
+        self._new: list[LogStream] = []
+        self._closing: list[LogStream] = []
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        # Only used by the pump thread
+        self._streams: set[LogStream] = set()
+        self._polled: set[LogStream] = set()
+        self._by_wd: dict[int, LogStream] = {}
+        self._inotify: Optional[_Inotify] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+
+    def open(self, path: Path, on_lines: LinesCallback) -> LogStream:
+        """Create or truncate the log file at `path` and follow it.
+
+        Returns:
+            LogStream: Pass its `writer` to the job as stdout or stderr
+        """
+        path = Path(path)
+        if self.mode == PIPE:
+            fifo_dir = Path(tempfile.mkdtemp(prefix="rds-log-"))
+            fifo_path = fifo_dir / path.name
+            os.mkfifo(fifo_path)
+            # Opened before the writer, a FIFO cannot be opened for writing without a reader
+            read_fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+            writer = open(fifo_path, "w", buffering=1)
+            open(path, "w").close()
+            stream = LogStream(
+                self,
+                path,
+                on_lines,
+                writer=writer,
+                read_fd=read_fd,
+                tee_file=open(path, "ab", buffering=0),
+                fifo_dir=fifo_dir,
+            )
+        else:
+            writer = open_job_log(path)
+            stream = LogStream(
+                self,
+                path,
+                on_lines,
+                writer=writer,
+                read_file=open(path, "rb", buffering=0),
+            )
+
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("LogPump is stopped")
+            self._new.append(stream)
+            if self._thread is None:
+                self._start()
+            self._wake()
+        return stream
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop the pump, streams that are still open are closed."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+            if thread is None:
+                return
+            self._wake()
+        if thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+
+    def _close(self, stream: LogStream) -> None:
+        with self._lock:
+            stopped = self._thread is None or self._stopped
+            if not stopped:
+                self._closing.append(stream)
+                self._wake()
+        if stopped:
+            # Nothing reads the stream anymore, deliver what is left directly
+            stream._finish()
+
+    def _start(self) -> None:
+        # Called with the lock held, on the first stream
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        if self.mode == INOTIFY:
+            try:
+                self._inotify = _Inotify()
+                self._selector.register(self._inotify.fd, selectors.EVENT_READ)
+            except OSError as e:
+                # E.g. the user's inotify instances are used up
+                logger.warning(f"Cannot use inotify, polling log files instead: {e}")
+                self.mode = POLL
+        self._thread = threading.Thread(
+            target=self._run, name="rds-log-pump", daemon=True
+        )
+        self._thread.start()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if self._stopped:
+                        return
+                    new, self._new = self._new, []
+                    closing, self._closing = self._closing, []
+                for stream in new:
+                    self._register(stream)
+                for stream in closing:
+                    self._unregister(stream)
+
+                timeout = self.poll_interval if self._polled else None
+                for key, _ in self._selector.select(timeout):
+                    if key.fileobj is self._wake_r:
+                        drain_socket(self._wake_r)
+                    elif self._inotify is not None and key.fileobj == self._inotify.fd:
+                        self._read_changed()
+                    else:
+                        _read_stream(key.data)
+                for stream in list(self._polled):
+                    _read_stream(stream)
+        except Exception as e:
+            logger.error(f"Log pump stopped unexpectedly: {e}")
+        finally:
+            with self._lock:
+                self._stopped = True
+                streams = self._streams | set(self._new) | set(self._closing)
+            for stream in streams:
+                self._unregister(stream)
+            self._selector.close()
+            self._wake_r.close()
+            self._wake_w.close()
+            if self._inotify is not None:
+                self._inotify.close()
+
+    def _register(self, stream: LogStream) -> None:
+        self._streams.add(stream)
+        if stream._read_fd is not None:
+            self._selector.register(stream._read_fd, selectors.EVENT_READ, stream)
+        elif self._inotify is not None:
+            try:
+                stream._wd = self._inotify.add_watch(stream.path)
+                self._by_wd[stream._wd] = stream
+            except OSError as e:
+                # E.g. the user's inotify watches are used up
+                logger.warning(f"Cannot watch {stream.path}, polling it instead: {e}")
+                self._polled.add(stream)
+        else:
+            self._polled.add(stream)
+        # Output written before the stream was registered
+        _read_stream(stream)
+
+    def _unregister(self, stream: LogStream) -> None:
+        if stream not in self._streams:
+            if not stream._closed.is_set():
+                stream._finish()
+            return
+        self._streams.discard(stream)
+        self._polled.discard(stream)
+        if stream._wd is not None:
+            self._by_wd.pop(stream._wd, None)
+            self._inotify.rm_watch(stream._wd)
+        elif stream._read_fd is not None:
+            self._selector.unregister(stream._read_fd)
+        stream._finish()
+
+    def _read_changed(self) -> None:
+        changed = set()
+        for wd, mask in self._inotify.read_events():
+            if mask & _Inotify.IN_Q_OVERFLOW:
+                # Events were lost, read every stream
+                changed.update(self._by_wd.values())
+            elif wd in self._by_wd:
+                changed.add(self._by_wd[wd])
+        for stream in changed:
+            _read_stream(stream)
+
+
+class _Inotify:
+    IN_MODIFY = 0x00000002
+    IN_Q_OVERFLOW = 0x00004000
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        libc = ctypes.CDLL(None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, path: Path) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(path), self.IN_MODIFY)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(path))
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> list[tuple[int, int]]:
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_length = self._EVENT.unpack_from(data, offset)
+                events.append((wd, mask))
+                offset += self._EVENT.size + name_length
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _default_mode() -> str:
+    if sys.platform.startswith("linux"):
+        try:
+            _Inotify().close()
+            return INOTIFY
+        except (OSError, AttributeError):
+            pass
+    if hasattr(os, "mkfifo"):
+        return PIPE
+    return POLL
+
+
+def _read_stream(stream: LogStream) -> None:
+    try:
+        stream._read()
+    except Exception as e:
+        logger.error(f"Error reading log {stream.path}: {e}")
+
+
+_log_pump: Optional[LogPump] = None
+_log_pump_lock = threading.Lock()
+
+
+def get_log_pump() -> LogPump:
+    """The log pump shared by all runners of this process."""
+    global _log_pump
+    with _log_pump_lock:
+        if _log_pump is None or _log_pump._stopped:
+            _log_pump = LogPump()
+        return _log_pump
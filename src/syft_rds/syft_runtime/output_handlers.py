@@ -9,6 +9,15 @@ from rich.spinner import Spinner
 
 from syft_rds.models import JobConfig, PythonRuntimeConfig
 
+# Loguru format: "YYYY-MM-DD HH:MM:SS.mmm | LEVEL | ..."
+_LOGURU_LEVEL_PATTERN = re.compile(
+    r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} \| (\w+)\s+\|"
+)
+# Standard logging format: "[LEVEL]" or "LEVEL:"
+_STANDARD_LEVEL_PATTERN = re.compile(r"^\[?(\w+)\]?\s*[:\-]")
+_LOGURU_LEVELS = {"ERROR", "CRITICAL", "WARNING", "INFO", "DEBUG", "TRACE", "SUCCESS"}
+_STANDARD_LEVELS = {"ERROR", "CRITICAL", "WARNING", "WARN", "INFO", "DEBUG"}
+
 
 def parse_log_level(line: str) -> tuple[str | None, str]:
     """
@@ -28,28 +37,16 @@ def parse_log_level(line: str) -> tuple[str | None, str]:
     if not line or not line.strip():
         return None, line
 
-    # Loguru format: "YYYY-MM-DD HH:MM:SS.mmm | LEVEL | ..."
-    loguru_match = re.match(
-        r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d{3} \| (\w+)\s+\|", line
-    )
+    loguru_match = _LOGURU_LEVEL_PATTERN.match(line)
     if loguru_match:
         level = loguru_match.group(1).upper()
-        if level in (
-            "ERROR",
-            "CRITICAL",
-            "WARNING",
-            "INFO",
-            "DEBUG",
-            "TRACE",
-            "SUCCESS",
-        ):
+        if level in _LOGURU_LEVELS:
             return level, line
 
-    # Standard logging format: "[LEVEL]" or "LEVEL:"
-    standard_match = re.match(r"^\[?(\w+)\]?\s*[:\-]", line)
+    standard_match = _STANDARD_LEVEL_PATTERN.match(line)
     if standard_match:
         level = standard_match.group(1).upper()
-        if level in ("ERROR", "CRITICAL", "WARNING", "WARN", "INFO", "DEBUG"):
+        if level in _STANDARD_LEVELS:
             return "WARNING" if level == "WARN" else level, line
 
     return None, line
@@ -63,7 +60,7 @@ class JobOutputHandler(Protocol):
         pass
 
     def on_job_progress(self, stdout: str, stderr: str) -> None:
-        """Display job progress"""
+        """Display job progress, `stdout` and `stderr` can hold several lines"""
         pass
 
     def on_job_completion(self, return_code: int) -> None:
@@ -142,20 +139,26 @@ class RichConsoleUI(JobOutputHandler):
         if stdout and self.show_stdout:
             self.live.console.print(stdout, end="")
         if stderr and self.show_stderr:
-            # Parse log level to determine display style
-            log_level, _ = parse_log_level(stderr)
-            if log_level in ("ERROR", "CRITICAL"):
-                # Actual error: show in bold red
-                self.live.console.print(f"[bold red]{stderr}[/]", end="")
-            elif log_level in ("WARNING", "WARN"):
-                # Warning: show in yellow
-                self.live.console.print(f"[yellow]{stderr}[/]", end="")
-            elif log_level:
-                # Other log levels (INFO, DEBUG, etc.): show in dim white
-                self.live.console.print(f"[dim]{stderr}[/]", end="")
-            else:
-                # Unparsed stderr: show in red
-                self.live.console.print(f"[red]{stderr}[/]", end="")
+            lines = stderr.splitlines(keepends=True)
+            self.live.console.print(
+                "".join(self._format_stderr_line(line) for line in lines), end=""
+            )
+
+    def _format_stderr_line(self, line: str) -> str:
+        # Parse log level to determine display style
+        log_level, _ = parse_log_level(line)
+        if log_level in ("ERROR", "CRITICAL"):
+            # Actual error: show in bold red
+            return f"[bold red]{line}[/]"
+        elif log_level in ("WARNING", "WARN"):
+            # Warning: show in yellow
+            return f"[yellow]{line}[/]"
+        elif log_level:
+            # Other log levels (INFO, DEBUG, etc.): show in dim white
+            return f"[dim]{line}[/]"
+        else:
+            # Unparsed stderr: show in red
+            return f"[red]{line}[/]"
 
     def on_job_completion(self, return_code: int) -> None:
         # Update UI display
@@ -206,20 +209,24 @@ class TextUI(JobOutputHandler):
         if stdout and self.show_stdout:
             print(stdout, end="")
         if stderr and self.show_stderr:
-            # Parse log level to determine if this is an actual error
-            log_level, _ = parse_log_level(stderr)
-            if log_level in ("ERROR", "CRITICAL"):
-                # Actual error: show with [ERROR] prefix
-                print(f"[ERROR] {stderr}", end="")
-            elif log_level in ("WARNING", "WARN"):
-                # Warning: show with [WARNING] prefix
-                print(f"[WARNING] {stderr}", end="")
-            elif log_level:
-                # Other log levels (INFO, DEBUG, etc.): show without prefix
-                print(stderr, end="")
-            else:
-                # Unparsed stderr: show with [STDERR] prefix
-                print(f"[STDERR] {stderr}", end="")
+            lines = stderr.splitlines(keepends=True)
+            print("".join(self._format_stderr_line(line) for line in lines), end="")
+
+    def _format_stderr_line(self, line: str) -> str:
+        # Parse log level to determine if this is an actual error
+        log_level, _ = parse_log_level(line)
+        if log_level in ("ERROR", "CRITICAL"):
+            # Actual error: show with [ERROR] prefix
+            return f"[ERROR] {line}"
+        elif log_level in ("WARNING", "WARN"):
+            # Warning: show with [WARNING] prefix
+            return f"[WARNING] {line}"
+        elif log_level:
+            # Other log levels (INFO, DEBUG, etc.): show without prefix
+            return line
+        else:
+            # Unparsed stderr: show with [STDERR] prefix
+            return f"[STDERR] {line}"
 
     def on_job_completion(self, return_code: int) -> None:
         self._job_running = False
@@ -0,0 +1,237 @@
+import os
+import selectors
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from loguru import logger
+
+from syft_rds.utils.processes import drain_socket
+
+# Used when pidfds are not available (macOS, Windows, Linux < 5.3)
+DEFAULT_POLL_INTERVAL = 0.5  # seconds
+DEFAULT_CALLBACK_WORKERS = 4
+
+ExitCallback = Callable[[subprocess.Popen], None]
+
+
+class ProcessReaper:
+    def __init__(
+        self,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        callback_workers: int = DEFAULT_CALLBACK_WORKERS,
+    ):
+        """Waits for many child processes in a single thread.
+
+        On Linux every process gets a pidfd, which becomes readable when the process
+        exits, so exits are detected immediately without polling. Other platforms fall
+        back to calling `poll()` on the watched processes every `poll_interval` seconds.
+
+        Exit callbacks run on a small thread pool, so a slow callback (e.g. an RPC
+        status update) does not delay detecting other exits.
+
+        Args:
+            poll_interval: Seconds between checks of processes without a pidfd
+            callback_workers: Number of threads that run exit callbacks
+        """
+        self.poll_interval = poll_interval
+        self.callback_workers = callback_workers
+        self._lock = threading.Lock()
+        # Processes added by `watch`, registered with the selector by the reaper thread
+        self._new: list[tuple[subprocess.Popen, ExitCallback]] = []
+        self._watched: dict[int, tuple[subprocess.Popen, ExitCallback]] = {}
+        # Only used by the reaper thread: pidfd per pid, and pids without a pidfd
+        self._pidfds: dict[int, int] = {}
+        self._polled: set[int] = set()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def watch(self, process: subprocess.Popen, on_exit: ExitCallback) -> None:
+        """Call `on_exit(process)` once `process` has exited and was reaped."""
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("ProcessReaper is stopped")
+            self._new.append((process, on_exit))
+            if self._thread is None:
+                self._start()
+            self._wake()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._new) + len(self._watched)
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop watching, running callbacks are finished. Watched processes keep running."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            thread = self._thread
+            if thread is None:
+                return
+            # Woken up while holding the lock, the thread closes the sockets after this
+            self._wake()
+        if thread is not threading.current_thread():
+            thread.join(timeout=timeout)
+        self._executor.shutdown(wait=False)
+
+    def _start(self) -> None:
+        # Called with the lock held, on the first watched process
+        self._selector = selectors.DefaultSelector()
+        # A socket pair instead of a pipe, Windows can only select sockets
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.callback_workers, thread_name_prefix="rds-reaper-callback"
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="rds-reaper", daemon=True
+        )
+        self._thread.start()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            # The buffer is full, the reaper thread is already woken up
+            pass
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    if self._stopped:
+                        return
+                    new, self._new = self._new, []
+                for process, on_exit in new:
+                    self._register(process, on_exit)
+
+                timeout = self.poll_interval if self._polled else None
+                exited = []
+                for key, _ in self._selector.select(timeout):
+                    if key.fileobj is self._wake_r:
+                        drain_socket(self._wake_r)
+                    else:
+                        exited.append(key.data)
+                with self._lock:
+                    watched = self._watched
+                    exited.extend(
+                        pid
+                        for pid in self._polled
+                        if poll_for_exit(watched[pid][0]) is not None
+                    )
+
+                for pid in exited:
+                    self._reap(pid)
+        except Exception as e:
+            logger.error(f"Process reaper stopped unexpectedly: {e}")
+        finally:
+            with self._lock:
+                self._stopped = True
+                self._close()
+
+    def _register(self, process: subprocess.Popen, on_exit: ExitCallback) -> None:
+        with self._lock:
+            self._watched[process.pid] = (process, on_exit)
+
+        # Opened before checking the exit, an exit in between still makes the pidfd readable
+        pidfd = _pidfd_open(process.pid)
+        if pidfd is not None:
+            self._pidfds[process.pid] = pidfd
+            self._selector.register(pidfd, selectors.EVENT_READ, data=process.pid)
+        else:
+            self._polled.add(process.pid)
+
+        if poll_for_exit(process) is not None:
+            self._reap(process.pid)
+
+    def _reap(self, pid: int) -> None:
+        self._polled.discard(pid)
+        pidfd = self._pidfds.pop(pid, None)
+        if pidfd is not None:
+            self._selector.unregister(pidfd)
+            os.close(pidfd)
+        with self._lock:
+            process, on_exit = self._watched.pop(pid)
+
+        # The process has exited, this returns immediately and sets the return code
+        wait_for_exit(process)
+        self._executor.submit(_run_callback, on_exit, process)
+
+    def _close(self) -> None:
+        for pidfd in self._pidfds.values():
+            os.close(pidfd)
+        self._pidfds.clear()
+        self._selector.close()
+        self._wake_r.close()
+        self._wake_w.close()
+
+
+def wait_for_exit(process: subprocess.Popen) -> int:
+    """Like `process.wait()`, also records the resource usage of the process.
+
+    Uses `os.wait4` where available, the usage is stored as `process._rusage`.
+    """
+    if process.returncode is None and _can_wait4(process):
+        try:
+            _, status, rusage = os.wait4(process.pid, 0)
+        except ChildProcessError:
+            # Reaped elsewhere, wait() below knows the return code
+            pass
+        else:
+            _set_exited(process, status, rusage)
+    returncode = process.wait()
+    if not hasattr(process, "_ended_at"):
+        process._ended_at = time.monotonic()
+    return returncode
+
+
+def poll_for_exit(process: subprocess.Popen) -> Optional[int]:
+    """Like `process.poll()`, also records the resource usage of the process."""
+    if process.returncode is None and _can_wait4(process):
+        try:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        except ChildProcessError:
+            return process.poll()
+        if pid == 0:
+            return None
+        _set_exited(process, status, rusage)
+        return process.returncode
+    return process.poll()
+
+
+def _can_wait4(process: subprocess.Popen) -> bool:
+    # Other process types, like warm processes, report their own usage
+    return hasattr(os, "wait4") and isinstance(process, subprocess.Popen)
+
+
+def _set_exited(process: subprocess.Popen, status: int, rusage) -> None:
+    process.returncode = os.waitstatus_to_exitcode(status)
+    process._rusage = rusage
+    process._ended_at = time.monotonic()
+
+
+def _pidfd_open(pid: int) -> Optional[int]:
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        # Not supported by the kernel, or the process was already reaped
+        return None
+
+
+def _run_callback(on_exit: ExitCallback, process: subprocess.Popen) -> None:
+    try:
+        on_exit(process)
+    except Exception as e:
+        logger.error(f"Error in exit callback of process {process.pid}: {e}")
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+from uuid import uuid4
+
+from loguru import logger
+
+from syft_rds.models import JobConfig
+from syft_rds.syft_runtime.disk_cache import DiskCache, dir_size
+
+DEFAULT_RESULT_CACHE_MAX_BYTES = 5 * 1024**3  # 5 GB
+# Written to the folder of a job whose results were taken from the cache
+CACHED_RESULT_FILE_NAME = "cached_result.json"
+# Files in the job's code that do not change its result
+IGNORED_CODE_NAMES = {".venv", "__pycache__", ".DS_Store"}
+RESULT_FOLDERS = ["output", "logs"]
+META_FILE_NAME = "meta.json"
+
+
+class ResultCache(DiskCache):
+    entry_name = "cached result"
+
+    def __init__(
+        self, cache_dir: Path, max_bytes: int = DEFAULT_RESULT_CACHE_MAX_BYTES
+    ):
+        """Results of successful jobs, reused by jobs that would compute the same result.
+
+        A result is keyed by the fingerprint of everything the job's result depends
+        on: its code and custom function, arguments, runtime config and the manifest
+        of its dataset (path, size and modification time of every file). Changing any
+        dataset file changes the fingerprint, so stale results are never reused.
+
+        The cache holds a copy of the `output/` and `logs/` folders of the job that
+        computed the result. Jobs that reuse it get their own copy, so editing the
+        results of one job before sharing them does not change the cache.
+
+        Least recently used results are removed when the cache grows over `max_bytes`.
+
+        Args:
+            cache_dir: Local directory for the results, must not be synced
+            max_bytes: Disk budget of the cache
+        """
+        super().__init__(cache_dir, max_bytes=max_bytes)
+
+    def fingerprint(
+        self, job_config: JobConfig, extra_dirs: Iterable[Path] = ()
+    ) -> str:
+        """Cache key of the result of a job.
+
+        Args:
+            job_config: Config of the job
+            extra_dirs: Other code of the job, e.g. the folder of its custom function
+        """
+        digest = hashlib.sha256()
+        runtime = job_config.runtime
+        _update(
+            digest,
+            "config",
+            json.dumps(
+                {
+                    "runtime_kind": runtime.kind.value,
+                    "runtime_config": runtime.config.model_dump(mode="json"),
+                    "args": job_config.args,
+                    "uv_args": job_config.uv_args,
+                    "extra_env": job_config.extra_env,
+                },
+                sort_keys=True,
+            ).encode(),
+        )
+        _hash_code(digest, "code", Path(job_config.function_folder))
+        for extra_dir in extra_dirs:
+            _hash_code(digest, "extra", Path(extra_dir))
+        _hash_manifest(digest, job_config.data_path)
+        return digest.hexdigest()[:32]
+
+    def result_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def has(self, key: str) -> bool:
+        return (self.result_dir(key) / META_FILE_NAME).exists()
+
+    def store(self, key: str, job_config: JobConfig, job_uid: str) -> bool:
+        """Copy the results of a successful job into the cache.
+
+        Returns:
+            bool: True if the results are cached
+        """
+        if self.has(key):
+            return True
+        size = sum(dir_size(job_config.job_path / name) for name in RESULT_FOLDERS)
+        if size > self.max_bytes:
+            logger.debug(f"Results of job {job_uid} do not fit in the result cache")
+            return False
+
+        with self._key_lock(key):
+            if self.has(key):
+                return True
+            # Copied next to the final folder and renamed, so a result is complete
+            tmp_dir = self.cache_dir / f".tmp-{key}-{uuid4().hex}"
+            try:
+                for name in RESULT_FOLDERS:
+                    source = job_config.job_path / name
+                    if source.exists():
+                        shutil.copytree(source, tmp_dir / name)
+                    else:
+                        (tmp_dir / name).mkdir(parents=True)
+                (tmp_dir / META_FILE_NAME).write_text(
+                    json.dumps({"job_uid": job_uid, "stored_at": time.time()})
+                )
+                os.replace(tmp_dir, self.result_dir(key))
+            except OSError as e:
+                logger.warning(f"Could not cache results of job {job_uid}: {e}")
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+                return False
+        logger.debug(f"Cached results of job {job_uid} as {key}")
+        self._evict_in_background(exclude=[key])
+        return True
+
+    def materialize(self, key: str, job_config: JobConfig) -> Optional[str]:
+        """Put the cached results of `key` into the job folder of `job_config`.
+
+        Returns:
+            Optional[str]: UID of the job that computed the results, None if they are
+                not cached
+        """
+        with self._key_lock(key):
+            result_dir = self.result_dir(key)
+            try:
+                meta = json.loads((result_dir / META_FILE_NAME).read_text())
+            except (OSError, ValueError):
+                return None
+            # Marks the result as used
+            os.utime(result_dir / META_FILE_NAME)
+
+            remove_cached_result(job_config)
+            job_config.job_path.mkdir(parents=True, exist_ok=True)
+            for name in RESULT_FOLDERS:
+                shutil.rmtree(job_config.job_path / name, ignore_errors=True)
+                shutil.copytree(result_dir / name, job_config.job_path / name)
+            os.chmod(job_config.output_dir, 0o777)
+            (job_config.job_path / CACHED_RESULT_FILE_NAME).write_text(
+                json.dumps({"fingerprint": key, "job_uid": meta["job_uid"]})
+            )
+        return meta["job_uid"]
+
+    def _entry_dirs(self) -> list[Path]:
+        if not self.cache_dir.exists():
+            return []
+        return [
+            path
+            for path in self.cache_dir.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        ]
+
+    def _last_used(self, key: str) -> float:
+        try:
+            return (self.result_dir(key) / META_FILE_NAME).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+
+def remove_cached_result(job_config: JobConfig) -> None:
+    """Remove results a job got from the cache, before the job runs itself."""
+    marker = job_config.job_path / CACHED_RESULT_FILE_NAME
+    if not marker.exists():
+        return
+    for name in RESULT_FOLDERS:
+        shutil.rmtree(job_config.job_path / name, ignore_errors=True)
+    marker.unlink(missing_ok=True)
+
+
+def _update(digest, label: str, data: bytes) -> None:
+    digest.update(f"{label}:{len(data)}:".encode())
+    digest.update(data)
+
+
+def _hash_code(digest, label: str, path: Path) -> None:
+    if path.is_file():
+        _update(digest, f"{label}-file:{path.name}", path.read_bytes())
+        return
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_CODE_NAMES)
+        for name in sorted(files):
+            if name in IGNORED_CODE_NAMES:
+                continue
+            file_path = Path(root) / name
+            relative = file_path.relative_to(path).as_posix()
+            _update(digest, f"{label}-file:{relative}", file_path.read_bytes())
+
+
+def _hash_manifest(digest, data_path: Optional[Path]) -> None:
+    """Hash the path, size and modification time of every dataset file.
+
+    Reading the content of a large dataset for every job would cost more than most
+    jobs, any write to a file changes its size or modification time.
+    """
+    if data_path is None:
+        _update(digest, "data", b"")
+        return
+    data_path = Path(data_path)
+    paths = [data_path] if data_path.is_file() else []
+    for root, dirs, files in os.walk(data_path):
+        dirs.sort()
+        paths.extend(Path(root) / name for name in sorted(files))
+    for path in paths:
+        stat = path.stat()
+        relative = path.relative_to(data_path).as_posix() if path != data_path else ""
+        _update(
+            digest,
+            "data-file",
+            f"{relative}:{stat.st_size}:{stat.st_mtime_ns}".encode(),
+        )
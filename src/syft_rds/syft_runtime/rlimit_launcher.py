@@ -0,0 +1,25 @@
+"""Starts a job with resource limits, as `<interpreter> rlimit_launcher.py <rlimits> <cmd ...>`.
+
+`rlimits` is a JSON list of `[resource, soft, hard]`. The limits are set in this
+process, which then execs the job, so the job and the processes it starts inherit
+them. Runs with `-I -S`, so it only uses the standard library.
+
+Setting the limits with `preexec_fn` would run Python code between fork and exec of
+a multi-threaded server, which can deadlock.
+"""
+
+import json
+import os
+import resource
+import sys
+
+
+def main() -> None:
+    for rlimit, soft, hard in json.loads(sys.argv[1]):
+        resource.setrlimit(rlimit, (soft, hard))
+    cmd = sys.argv[2:]
+    os.execvp(cmd[0], cmd)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,8 +3,8 @@ from __future__ import annotations
 import os
 import shlex
 import subprocess
-import threading
-import time
+from collections import deque
+from functools import partial
 from pathlib import Path
 from typing import Callable, Type
 
@@ -16,14 +16,35 @@ from syft_rds.models import (
     JobConfig,
     JobUpdate,
     PythonRuntimeConfig,
+    ResourceLimits,
     RuntimeKind,
 )
+from syft_rds.syft_runtime.docker_images import (
+    DockerImageBuilder,
+    ImageBuildError,
+    get_image_tag,
+)
+from syft_rds.syft_runtime.limits import (
+    JobMonitor,
+    RLimit,
+    get_rlimits,
+    with_rlimits,
+)
+from syft_rds.syft_runtime.log_files import open_job_log
+from syft_rds.syft_runtime.log_pump import LogStream, get_log_pump
 from syft_rds.syft_runtime.mounts import get_mount_provider
 from syft_rds.syft_runtime.output_handlers import JobOutputHandler, parse_log_level
+from syft_rds.syft_runtime.reaper import wait_for_exit
+from syft_rds.syft_runtime.uv_env_cache import UvEnvCache
+from syft_rds.syft_runtime.warm_pool import WarmPools, warm_pool_supported
 
 
 DEFAULT_WORKDIR = "/app"
 DEFAULT_OUTPUT_DIR = DEFAULT_WORKDIR + "/output"
+# Bounds of the error message read from the stderr log of a job
+DEFAULT_ERROR_TAIL_LINES = 100
+DEFAULT_MAX_ERROR_LINES = 50
+MAX_ERROR_LINE_LENGTH = 4096
 
 
 def get_runner_cls(job_config: JobConfig) -> Type["JobRunner"]:
@@ -68,9 +89,15 @@ class JobRunner:
         self,
         handlers: list[JobOutputHandler],
         update_job_status_callback: Callable[[JobUpdate, Job], Job | None],
+        uv_env_cache: UvEnvCache | None = None,
+        warm_pools: WarmPools | None = None,
+        docker_images: DockerImageBuilder | None = None,
     ):
         self.handlers = handlers
         self.update_job_status_callback = update_job_status_callback
+        self.uv_env_cache = uv_env_cache
+        self.warm_pools = warm_pools
+        self.docker_images = docker_images or DockerImageBuilder()
 
     def run(
         self,
@@ -129,26 +156,32 @@ class JobRunner:
         # Open log files for direct subprocess output (line buffered for real-time writes)
         stdout_log_path = job_config.logs_dir / "stdout.log"
         stderr_log_path = job_config.logs_dir / "stderr.log"
-        stdout_file = open(stdout_log_path, "w", buffering=1)
-        stderr_file = open(stderr_log_path, "w", buffering=1)
+        log_streams = None
+        if blocking:
+            # The log pump streams new lines to the handlers while the job runs
+            log_pump = get_log_pump()
+            log_streams = (
+                log_pump.open(stdout_log_path, partial(self._on_log_lines, False)),
+                log_pump.open(stderr_log_path, partial(self._on_log_lines, True)),
+            )
+            stdout_file, stderr_file = (stream.writer for stream in log_streams)
+        else:
+            stdout_file = open_job_log(stdout_log_path)
+            stderr_file = open_job_log(stderr_log_path)
 
         for handler in self.handlers:
             handler.on_job_start(job_config)
 
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=stdout_file,  # Write directly to file
-                stderr=stderr_file,  # Write directly to file
-                text=True,
-                env=env,
+            process = self._start_process(
+                cmd, job_config, env, stdout_file, stderr_file
             )
+            # Enforces the job's timeout, and records its usage when it exits
+            process._job_monitor = self._monitor_job(process, job_config)
 
             if blocking:
                 logger.info("Running job in blocking mode")
-                return self._run_blocking(
-                    process, job, job_config, stdout_file, stderr_file
-                )
+                return self._run_blocking(process, job, job_config, log_streams)
             else:
                 logger.info("Running job in non-blocking mode")
                 # Store file handles for cleanup later
@@ -156,86 +189,76 @@ class JobRunner:
                 return process
         except Exception:
             # Clean up files if process creation fails
-            stdout_file.close()
-            stderr_file.close()
+            if log_streams is not None:
+                for stream in log_streams:
+                    stream.close()
+            else:
+                stdout_file.close()
+                stderr_file.close()
             raise
 
-    def _run_blocking(
+    def _on_log_lines(self, is_stderr: bool, lines: list[str]) -> None:
+        output = "".join(lines)
+        for handler in self.handlers:
+            if is_stderr:
+                handler.on_job_progress("", output)
+            else:
+                handler.on_job_progress(output, "")
+
+    def _start_process(
         self,
-        process: subprocess.Popen,
-        job: Job,
+        cmd: list[str],
         job_config: JobConfig,
+        env: dict,
         stdout_file,
         stderr_file,
-    ) -> tuple[int, str | None]:
-        """Wait for process to complete while tailing logs in real-time."""
-        # Create stop event for tailing threads
-        stop_event = threading.Event()
-
-        # Start threads to tail log files and stream to handlers
-        stdout_log_path = job_config.logs_dir / "stdout.log"
-        stderr_log_path = job_config.logs_dir / "stderr.log"
-
-        stdout_thread = threading.Thread(
-            target=_tail_file,
-            args=(stdout_log_path, self.handlers, stop_event, False),
-            daemon=True,
-        )
-        stderr_thread = threading.Thread(
-            target=_tail_file,
-            args=(stderr_log_path, self.handlers, stop_event, True),
-            daemon=True,
+    ) -> subprocess.Popen:
+        return subprocess.Popen(
+            with_rlimits(cmd, self._get_rlimits(job_config)),
+            stdout=stdout_file,  # Write directly to file
+            stderr=stderr_file,  # Write directly to file
+            text=True,
+            env=env,
+            # Own process group, so a timeout kills the processes the job started too
+            start_new_session=True,
         )
 
-        # Start tailing threads
-        stdout_thread.start()
-        stderr_thread.start()
+    def _get_rlimits(self, job_config: JobConfig) -> list[RLimit]:
+        """Resource limits set in the job process before it starts."""
+        return []
+
+    def _monitor_job(
+        self, process: subprocess.Popen, job_config: JobConfig
+    ) -> JobMonitor:
+        return JobMonitor(process, job_config)
 
+    def _run_blocking(
+        self,
+        process: subprocess.Popen,
+        job: Job,
+        job_config: JobConfig,
+        log_streams: tuple[LogStream, LogStream],
+    ) -> tuple[int, str | None]:
+        """Wait for process to complete, its logs are streamed by the log pump."""
+        stderr_log_path = job_config.logs_dir / "stderr.log"
         try:
             # Wait for process to complete
-            return_code = process.wait()
+            return_code = wait_for_exit(process)
             logger.debug(
                 f"Process {process.pid} terminated with return code {return_code}"
             )
+        except BaseException:
+            # The job runs in its own session, a Ctrl-C does not reach it
+            process._job_monitor.kill()
+            raise
         finally:
-            # Stop tailing threads
-            stop_event.set()
-
-            # Close log files to ensure all data is flushed
-            stdout_file.close()
-            stderr_file.close()
-
-            # Wait for tailing threads to finish (with timeout)
-            stdout_thread.join(timeout=2.0)
-            stderr_thread.join(timeout=2.0)
-
-        # Read log files to check for errors
-        stderr_logs = []
-        error_logs = []
-
-        if stderr_log_path.exists():
-            with open(stderr_log_path, "r", errors="replace") as f:
-                for line in f:
-                    stderr_logs.append(line.rstrip("\n"))
-                    # Check if this is an actual ERROR log
-                    log_level, _ = parse_log_level(line)
-                    if log_level in ("ERROR", "CRITICAL"):
-                        error_logs.append(line.rstrip("\n"))
-
-        logger.debug(f"Return code: {return_code}")
-        error_message = None
-
-        # Build error message from actual ERROR logs or all stderr if job failed
-        if return_code != 0:
-            # Job failed: include all stderr
-            if stderr_logs:
-                logger.debug(f"Job failed with stderr: {len(stderr_logs)} lines")
-                error_message = "\n".join(stderr_logs)
-        elif error_logs:
-            # Job succeeded but had ERROR logs: treat as failure
-            logger.debug(f"Job succeeded but found {len(error_logs)} ERROR-level logs")
-            error_message = "\n".join(error_logs)
-            return_code = 1
+            # Deliver the remaining lines and close the log files
+            for stream in log_streams:
+                stream.close()
+
+        usage = process._job_monitor.finish()
+        logger.debug(f"Job used {usage}")
+        return_code, error_message = read_job_errors(stderr_log_path, return_code)
 
         # Notify handlers of completion
         for handler in self.handlers:
@@ -244,6 +267,79 @@ class JobRunner:
         return return_code, error_message
 
 
+def read_job_errors(
+    stderr_log_path: Path,
+    return_code: int,
+    max_lines: int = DEFAULT_ERROR_TAIL_LINES,
+    max_error_lines: int = DEFAULT_MAX_ERROR_LINES,
+) -> tuple[int, str | None]:
+    """Read the error message of a finished job from its stderr log file.
+
+    The log is streamed, only its last `max_lines` lines and first `max_error_lines`
+    ERROR/CRITICAL lines are kept, so large logs are read in bounded memory.
+
+    Returns:
+        tuple[int, str | None]: The return code, 1 if a successful job logged errors,
+            and the error message if the job failed, otherwise None.
+    """
+    stderr_logs: deque[str] = deque(maxlen=max_lines)
+    error_logs = []
+    total_lines = 0
+    total_errors = 0
+
+    if stderr_log_path.exists():
+        with open(stderr_log_path, "r", errors="replace") as f:
+            for line in _read_bounded_lines(f):
+                total_lines += 1
+                stderr_logs.append(line)
+                # Check if this is an actual ERROR log
+                log_level, _ = parse_log_level(line)
+                if log_level in ("ERROR", "CRITICAL"):
+                    total_errors += 1
+                    if len(error_logs) < max_error_lines:
+                        error_logs.append(line)
+
+    logger.debug(f"Return code: {return_code}")
+    error_message = None
+
+    # Build error message from actual ERROR logs or all stderr if job failed
+    if return_code != 0:
+        # Job failed: include the end of stderr
+        if stderr_logs:
+            logger.debug(f"Job failed with stderr: {total_lines} lines")
+            lines = list(stderr_logs)
+            if total_lines > len(lines):
+                skipped = total_lines - len(lines)
+                lines.insert(0, f"[... {skipped} earlier lines truncated ...]")
+            error_message = "\n".join(lines)
+    elif error_logs:
+        # Job succeeded but had ERROR logs: treat as failure
+        logger.debug(f"Job succeeded but found {total_errors} ERROR-level logs")
+        lines = error_logs
+        if total_errors > len(lines):
+            skipped = total_errors - len(lines)
+            lines.append(f"[... {skipped} more error lines truncated ...]")
+        error_message = "\n".join(lines)
+        return_code = 1
+
+    return return_code, error_message
+
+
+def _read_bounded_lines(f, max_line_length: int = MAX_ERROR_LINE_LENGTH):
+    """Yield the lines of `f` without newlines, overlong lines are cut short."""
+    while True:
+        line = f.readline(max_line_length)
+        if not line:
+            return
+        if not line.endswith("\n") and len(line) == max_line_length:
+            # Skip the rest of the line
+            rest = f.readline(max_line_length)
+            while rest and not rest.endswith("\n"):
+                rest = f.readline(max_line_length)
+            line += " [line truncated]"
+        yield line.rstrip("\n")
+
+
 class PythonRunner(JobRunner):
     """Runs a Python job in a local subprocess."""
 
@@ -262,10 +358,77 @@ class PythonRunner(JobRunner):
         env.update(job_config.get_env())
         env.update(job_config.extra_env)
 
+        uv_env = self._get_cached_uv_env(job_config, cmd)
+        if uv_env is not None:
+            logger.debug(f"Using cached uv environment {uv_env}")
+            env["UV_PROJECT_ENVIRONMENT"] = str(uv_env)
+
         return self._run_subprocess(
             cmd, job_config, job, env=env, blocking=job_config.blocking
         )
 
+    def _start_process(
+        self,
+        cmd: list[str],
+        job_config: JobConfig,
+        env: dict,
+        stdout_file,
+        stderr_file,
+    ) -> subprocess.Popen:
+        runtime_config = job_config.runtime.config
+        if (
+            self.warm_pools is None
+            or not isinstance(runtime_config, PythonRuntimeConfig)
+            or runtime_config.warm_pool_size <= 0
+            # Jobs run by uv need their project environment, they start cold
+            or cmd[0] == "uv"
+            or not warm_pool_supported()
+        ):
+            return super()._start_process(
+                cmd, job_config, env, stdout_file, stderr_file
+            )
+
+        pool = self.warm_pools.get(
+            cmd=job_config.runtime.cmd,
+            preload_modules=runtime_config.preload_modules,
+            size=runtime_config.warm_pool_size,
+        )
+        script_path = Path(job_config.function_folder) / job_config.args[0]
+        try:
+            process = pool.spawn(
+                argv=[str(script_path), *job_config.args[1:]],
+                env=env,
+                stdout_path=Path(stdout_file.name),
+                stderr_path=Path(stderr_file.name),
+                rlimits=get_rlimits(job_config.limits),
+            )
+            logger.debug(f"Started job in warm process {process.pid}")
+            return process
+        except RuntimeError as e:
+            logger.warning(f"Could not use warm pool, starting job cold: {e}")
+            return super()._start_process(
+                cmd, job_config, env, stdout_file, stderr_file
+            )
+
+    def _get_rlimits(self, job_config: JobConfig) -> list[RLimit]:
+        # Limits also apply to `uv run`, which starts the job as its child
+        return get_rlimits(job_config.limits)
+
+    def _get_cached_uv_env(self, job_config: JobConfig, cmd: list[str]) -> Path | None:
+        """Shared environment for jobs with the same dependencies, see `UvEnvCache`."""
+        # uv args like --active select another environment, the cache is not used then
+        if self.uv_env_cache is None or cmd[0] != "uv" or job_config.uv_args:
+            return None
+        if "UV_PROJECT_ENVIRONMENT" in job_config.extra_env:
+            return None
+        runtime_config = job_config.runtime.config
+        python_version = (
+            runtime_config.version
+            if isinstance(runtime_config, PythonRuntimeConfig)
+            else None
+        )
+        return self.uv_env_cache.use(job_config.function_folder, python_version)
+
     def _prepare_run_command(self, job_config: JobConfig) -> list[str]:
         script_path = Path(job_config.function_folder) / job_config.args[0]
 
@@ -361,91 +524,71 @@ class DockerRunner(JobRunner):
 
     def _check_docker_daemon(self, job: Job) -> None:
         """Check if the Docker daemon is running."""
-        try:
-            process = subprocess.run(
-                ["docker", "info"],
-                check=True,
-                capture_output=True,
+        if self.docker_images.cli.daemon_running():
+            return
+        error_message = "Docker daemon is not running or Docker is not installed."
+        if self.update_job_status_callback:
+            job_update = job.get_update_for_return_code(
+                return_code=1, error_message=error_message
             )
-        except Exception as e:
-            if self.update_job_status_callback:
-                job_update = job.get_update_for_return_code(
-                    return_code=process.returncode,
-                    error_message="Docker daemon is not running with error: " + str(e),
-                )
-                self.update_job_status_callback(job_update, job)
-            raise RuntimeError("Docker daemon is not running with error: " + str(e))
+            self.update_job_status_callback(job_update, job)
+        raise RuntimeError(error_message)
 
     def _get_image_name(self, job_config: JobConfig) -> str:
-        """Get the Docker image name from the config or use the default."""
-        runtime_config = job_config.runtime.config
-        if not runtime_config.image_name:
-            return job_config.runtime.name
-        return runtime_config.image_name
+        """Get the Docker image of the runtime, tagged with its Dockerfile's hash."""
+        return get_image_tag(job_config.runtime)
 
     def _check_or_build_image(self, job_config: JobConfig, job: Job) -> None:
-        """Check if the Docker image exists, otherwise build it."""
-        image_name = self._get_image_name(job_config)
-        result = subprocess.run(
-            ["docker", "image", "inspect", image_name],
-            capture_output=True,
-            check=False,
-            text=True,
-        )
-        if result.returncode == 0:
-            logger.info(f"Docker image '{image_name}' already exists.")
-            return
-
-        logger.info(f"Docker image '{image_name}' not found. Building it now...")
-        self._build_docker_image(job_config, job)
-
-    def _build_docker_image(self, job_config: JobConfig, job: Job) -> None:
-        """Build the Docker image."""
-        image_name = self._get_image_name(job_config)
-        dockerfile_content: str = job_config.runtime.config.dockerfile_content
-        error_for_job: str | None = None
-        build_context = "."
+        """Check if the Docker image exists, otherwise build it or wait for its prebuild."""
         try:
-            build_cmd = [
-                "docker",
-                "build",
-                "-t",
-                image_name,
-                "-f",
-                "-",  # Use stdin for Dockerfile content
-                str(build_context),
-            ]
-            logger.debug(
-                f"Running docker build command: {' '.join(build_cmd)}\nDockerfile content:\n{dockerfile_content}"
-            )
-            process = subprocess.run(
-                build_cmd,
-                input=dockerfile_content,
-                capture_output=True,
-                check=True,
-                text=True,
-            )
-
-            logger.debug(process.stdout)
-            logger.info(f"Successfully built Docker image '{image_name}'.")
-        except FileNotFoundError:
-            raise RuntimeError("Docker not installed or not in PATH.")
-        except subprocess.CalledProcessError as e:
-            error_message = f"Failed to build Docker image '{image_name}'."
-            logger.error(f"{error_message} stderr: {e.stderr}")
-            error_for_job = f"{error_message}\n{e.stderr}"
-
+            self.docker_images.ensure_image(job_config.runtime)
+        except ImageBuildError as e:
             # Update job status if callback is available
             if self.update_job_status_callback:
                 job_failed = job.get_update_for_return_code(
                     return_code=e.returncode,
-                    error_message=error_for_job,
+                    error_message=f"{e}\n{e.stderr}",
                 )
                 self.update_job_status_callback(job_failed, job)
+            raise RuntimeError(str(e))
+
+    def _get_container_name(self, job_config: JobConfig) -> str:
+        return f"rds-job-{job_config.job_path.name}"
+
+    def _monitor_job(
+        self, process: subprocess.Popen, job_config: JobConfig
+    ) -> JobMonitor:
+        # The docker CLI is not the job, its CPU time and memory are not the job's
+        return JobMonitor(
+            process,
+            job_config,
+            kill_job=lambda: self._kill_container(job_config),
+            measure_rusage=False,
+        )
+
+    def _kill_container(self, job_config: JobConfig) -> None:
+        self.docker_images.cli.run(
+            "kill", self._get_container_name(job_config), capture_output=True
+        )
 
-            raise RuntimeError(f"Failed to build Docker image '{image_name}'.")
-        except Exception as e:
-            raise RuntimeError(f"An error occurred during Docker image build: {e}")
+    def _get_resource_limit_args(self, limits: ResourceLimits) -> list[str]:
+        args = []
+        if limits.memory_mb is not None:
+            args.extend(["--memory", f"{limits.memory_mb}m"])
+        if limits.cpus is not None:
+            args.extend(["--cpus", str(limits.cpus)])
+        if limits.max_processes is not None:
+            args.extend(["--pids-limit", str(limits.max_processes)])
+        if limits.max_open_files is not None:
+            n = limits.max_open_files
+            args.extend(["--ulimit", f"nofile={n}:{n}"])
+        if limits.max_file_size_mb is not None:
+            n = int(limits.max_file_size_mb * 1024 * 1024)
+            args.extend(["--ulimit", f"fsize={n}:{n}"])
+        if limits.cpu_seconds is not None:
+            n = limits.cpu_seconds
+            args.extend(["--ulimit", f"cpu={n}:{n + 1}"])
+        return args
 
     def _get_extra_mounts(self, job_config: JobConfig) -> list[DockerMount]:
         """Get extra mounts for a job"""
@@ -504,18 +647,7 @@ class DockerRunner(JobRunner):
             "--tmpfs",
             "/tmp:size=16m,noexec,nosuid,nodev",  # Secure temp directory
             # Resource limits
-            "--memory",
-            "1G",
-            "--cpus",
-            "1",
-            "--pids-limit",
-            "100",
-            "--ulimit",
-            "nproc=4096:4096",
-            "--ulimit",
-            "nofile=50:50",
-            "--ulimit",
-            "fsize=10000000:10000000",  # ~10MB file size limit
+            *self._get_resource_limit_args(job_config.limits),
         ]
 
         # Base environment variables
@@ -540,9 +672,11 @@ class DockerRunner(JobRunner):
             )
 
         docker_run_cmd = [
-            "docker",
+            self.docker_images.cli.binary,
             "run",
             "--rm",  # Remove container after completion
+            "--name",
+            self._get_container_name(job_config),  # Stopped by name on timeout
             *limits,
             *env_args,
             *job_config.get_extra_env_as_docker_args(),
@@ -555,57 +689,3 @@ class DockerRunner(JobRunner):
         ]
         logger.debug(f"Docker run command: {docker_run_cmd}")
         return docker_run_cmd
-
-
-def _tail_file(
-    file_path: Path,
-    handlers: list[JobOutputHandler],
-    stop_event: threading.Event,
-    is_stderr: bool = False,
-    poll_interval: float = 0.1,
-) -> None:
-    """
-    Tail a file in real-time and call handlers with new lines.
-
-    This function runs in a background thread and follows a log file like `tail -f`,
-    calling handler.on_job_progress() for each new line that appears.
-
-    Args:
-        file_path: Path to the log file to tail
-        handlers: List of output handlers to notify
-        stop_event: Threading event to signal when to stop tailing
-        is_stderr: Whether this is stderr (vs stdout)
-        poll_interval: How often to check for new lines (seconds)
-    """
-    # Wait for file to be created
-    max_wait = 5  # seconds
-    wait_time = 0
-    while not file_path.exists() and wait_time < max_wait:
-        if stop_event.is_set():
-            return
-        time.sleep(0.1)
-        wait_time += 0.1
-
-    if not file_path.exists():
-        logger.warning(f"Log file {file_path} was not created")
-        return
-
-    try:
-        with open(file_path, "r", errors="replace") as f:
-            # Start from beginning to catch any early output
-            while not stop_event.is_set():
-                line = f.readline()
-                if line:
-                    # Remove trailing newline for handler
-                    line = line.rstrip("\n")
-                    # Call handlers with new line
-                    for handler in handlers:
-                        if is_stderr:
-                            handler.on_job_progress("", line + "\n")
-                        else:
-                            handler.on_job_progress(line + "\n", "")
-                else:
-                    # No new line, sleep briefly
-                    time.sleep(poll_interval)
-    except Exception as e:
-        logger.error(f"Error tailing {file_path}: {e}")
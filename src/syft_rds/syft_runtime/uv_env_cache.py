@@ -0,0 +1,167 @@
+import hashlib
+import os
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from typing import Optional
+
+from loguru import logger
+
+from syft_rds.syft_runtime.disk_cache import DiskCache
+
+try:
+    import tomllib  # only available in Python 3.11+
+except ImportError:
+    import tomli as tomllib
+
+DEFAULT_UV_ENV_CACHE_MAX_BYTES = 10 * 1024**3  # 10 GB
+# Environments used more recently are never evicted, they may belong to a running job
+DEFAULT_UV_ENV_MIN_IDLE = 3600.0  # seconds
+
+# Files that determine the environment of a project
+ENV_KEY_FILES = ["pyproject.toml", "uv.lock", ".python-version"]
+
+
+class UvEnvCache(DiskCache):
+    entry_name = "uv environment"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = DEFAULT_UV_ENV_CACHE_MAX_BYTES,
+        min_idle: float = DEFAULT_UV_ENV_MIN_IDLE,
+    ):
+        """Virtual environments of uv projects, shared by jobs with identical dependencies.
+
+        Every job ships its code in a new directory, so `uv run` would create a new
+        `.venv` per job. Instead, jobs get a cached environment through
+        `UV_PROJECT_ENVIRONMENT`, keyed by the hash of their `pyproject.toml`, `uv.lock`,
+        `.python-version` and the runtime's Python version.
+
+        Projects with a `[build-system]` are not cached, installing the project itself
+        into a shared environment would let jobs import each other's code.
+
+        Least recently used environments are removed when the cache grows over
+        `max_bytes`, environments used in the last `min_idle` seconds are kept.
+
+        Args:
+            cache_dir: Local directory for the environments, must not be synced
+            max_bytes: Disk budget of the cache
+            min_idle: Seconds an environment must be unused before it can be evicted
+        """
+        super().__init__(cache_dir, max_bytes=max_bytes, min_idle=min_idle)
+
+    @property
+    def envs_dir(self) -> Path:
+        return self.cache_dir / "envs"
+
+    @property
+    def last_used_dir(self) -> Path:
+        # Kept outside the environments, uv owns the environment directories
+        return self.cache_dir / "last_used"
+
+    def env_key(
+        self, code_dir: Path, python_version: Optional[str] = None
+    ) -> Optional[str]:
+        """Cache key of the environment of `code_dir`, None if it cannot be cached."""
+        code_dir = Path(code_dir)
+        pyproject_path = code_dir / "pyproject.toml"
+        if not pyproject_path.exists():
+            return None
+        try:
+            pyproject = tomllib.loads(pyproject_path.read_text())
+        except (OSError, tomllib.TOMLDecodeError):
+            return None
+        if "build-system" in pyproject:
+            return None
+
+        digest = hashlib.sha256()
+        for filename in ENV_KEY_FILES:
+            path = code_dir / filename
+            content = path.read_bytes() if path.exists() else b""
+            digest.update(f"{filename}:{len(content)}:".encode())
+            digest.update(content)
+        digest.update(f"python:{python_version or ''}".encode())
+        return digest.hexdigest()[:32]
+
+    def env_dir(self, key: str) -> Path:
+        return self.envs_dir / key
+
+    def use(
+        self, code_dir: Path, python_version: Optional[str] = None
+    ) -> Optional[Path]:
+        """Environment to run `code_dir` in, None if it cannot be cached.
+
+        The environment is created or synced by `uv run`, this marks it as used and
+        evicts other environments in the background if the cache is over budget.
+        """
+        key = self.env_key(code_dir, python_version)
+        if key is None:
+            return None
+        self._touch(key)
+        self._evict_in_background(exclude=[key])
+        return self.env_dir(key)
+
+    def prewarm(self, code_dir: Path, python_version: Optional[str] = None) -> bool:
+        """Create the environment of `code_dir` ahead of running it.
+
+        Only prebuilt wheels are installed (`--no-build`), so no code of the project's
+        dependencies runs before the job is approved. Projects that need to build a
+        dependency are synced by `uv run` when the job runs.
+
+        Returns:
+            bool: True if the environment is ready
+        """
+        key = self.env_key(code_dir, python_version)
+        if key is None:
+            return False
+        key_lock = self._key_lock(key)
+        # Another thread is syncing the same environment already
+        if not key_lock.acquire(blocking=False):
+            return False
+        try:
+            cmd = ["uv", "sync", "--no-install-project", "--no-build"]
+            if (Path(code_dir) / "uv.lock").exists():
+                cmd.append("--frozen")
+            cmd.extend(["--directory", str(code_dir)])
+            env = os.environ.copy()
+            env["UV_PROJECT_ENVIRONMENT"] = str(self.env_dir(key))
+            self.envs_dir.mkdir(parents=True, exist_ok=True)
+            self._touch(key)
+
+            start = time.monotonic()
+            result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            if result.returncode != 0:
+                logger.info(
+                    f"Could not prewarm uv environment {key}, it is synced when the job runs: {result.stderr.strip()}"
+                )
+                return False
+            logger.info(
+                f"Prewarmed uv environment {key} in {time.monotonic() - start:.1f}s"
+            )
+            return True
+        except FileNotFoundError:
+            logger.warning("uv is not installed, cannot prewarm environments")
+            return False
+        finally:
+            key_lock.release()
+
+    def _entry_dirs(self) -> list[Path]:
+        if not self.envs_dir.exists():
+            return []
+        return [path for path in self.envs_dir.iterdir() if path.is_dir()]
+
+    def _touch(self, key: str) -> None:
+        self.last_used_dir.mkdir(parents=True, exist_ok=True)
+        (self.last_used_dir / key).touch()
+
+    def _last_used(self, key: str) -> float:
+        try:
+            return (self.last_used_dir / key).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def _remove(self, key: str, path: Path) -> None:
+        shutil.rmtree(path, ignore_errors=True)
+        (self.last_used_dir / key).unlink(missing_ok=True)
@@ -0,0 +1,293 @@
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+
+from loguru import logger
+
+from syft_rds.utils.processes import pid_alive
+
+DEFAULT_WARM_WORKER_START_TIMEOUT = 60.0  # seconds
+DEFAULT_SPAWN_TIMEOUT = 10.0  # seconds
+
+WARM_WORKER_PATH = Path(__file__).with_name("warm_worker.py")
+
+
+class WarmProcess:
+    """A job forked by a warm worker.
+
+    Implements the part of the `subprocess.Popen` interface the runners and the
+    `ProcessReaper` use. The job is a child of the warm worker, which reports its exit.
+    """
+
+    def __init__(self, pid: int, args: list[str]):
+        self.pid = pid
+        self.args = args
+        self.returncode: Optional[int] = None
+        self._exited = threading.Event()
+
+    def poll(self) -> Optional[int]:
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if not self._exited.wait(timeout):
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        if self.returncode is not None:
+            return
+        try:
+            os.kill(self.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+    def _set_returncode(self, returncode: int, rusage: Optional[dict] = None) -> None:
+        # Same fields as `resource.struct_rusage`, measured by the warm worker
+        if rusage is not None:
+            self._rusage = SimpleNamespace(**rusage)
+        self._ended_at = time.monotonic()
+        self.returncode = returncode
+        self._exited.set()
+
+
+class _WarmWorker:
+    def __init__(
+        self,
+        cmd: list[str],
+        preload_modules: list[str],
+        start_timeout: float = DEFAULT_WARM_WORKER_START_TIMEOUT,
+    ):
+        self.process = subprocess.Popen(
+            [*cmd, str(WARM_WORKER_PATH), *preload_modules],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self._lock = threading.Lock()
+        self._next_id = 0
+        # Requests waiting for their pid, and forked jobs that have not exited
+        self._requests: dict[int, tuple[threading.Event, dict]] = {}
+        self._processes: dict[int, WarmProcess] = {}
+        self._ready = threading.Event()
+        self._alive = True
+        self._reader = threading.Thread(
+            target=self._read, name="rds-warm-worker", daemon=True
+        )
+        self._reader.start()
+
+        if not self._ready.wait(start_timeout) or not self._alive:
+            self.close()
+            raise RuntimeError(
+                f"Warm worker '{' '.join(cmd)}' with modules {preload_modules} did not start"
+            )
+
+    @property
+    def alive(self) -> bool:
+        return self._alive and self.process.poll() is None
+
+    def spawn(
+        self,
+        argv: list[str],
+        env: dict[str, str],
+        cwd: str,
+        stdout_path: Path,
+        stderr_path: Path,
+        rlimits: list[tuple[int, int, int]] = [],
+    ) -> WarmProcess:
+        done = threading.Event()
+        response: dict = {}
+        with self._lock:
+            if not self.alive:
+                raise RuntimeError("Warm worker has exited")
+            request_id = self._next_id
+            self._next_id += 1
+            self._requests[request_id] = (done, response)
+            request = {
+                "id": request_id,
+                "argv": argv,
+                "env": env,
+                "cwd": cwd,
+                "stdout": str(stdout_path),
+                "stderr": str(stderr_path),
+                "rlimits": [list(rlimit) for rlimit in rlimits],
+            }
+            try:
+                self.process.stdin.write((json.dumps(request) + "\n").encode())
+                self.process.stdin.flush()
+            except OSError as e:
+                del self._requests[request_id]
+                raise RuntimeError(f"Warm worker has exited: {e}")
+
+        if not done.wait(DEFAULT_SPAWN_TIMEOUT):
+            with self._lock:
+                self._requests.pop(request_id, None)
+            raise RuntimeError("Warm worker did not start the job in time")
+        if "error" in response:
+            raise RuntimeError(
+                f"Warm worker could not start the job: {response['error']}"
+            )
+        return response["process"]
+
+    def close(self) -> None:
+        """Stop accepting jobs, the worker exits once its running jobs have exited."""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+    def _read(self) -> None:
+        for line in self.process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                logger.warning(f"Invalid message from warm worker: {line!r}")
+                continue
+
+            if "ready" in message:
+                self._ready.set()
+            elif "exit" in message:
+                with self._lock:
+                    process = self._processes.pop(message["exit"], None)
+                if process is not None:
+                    process._set_returncode(
+                        message["returncode"], message.get("rusage")
+                    )
+            elif "id" in message:
+                with self._lock:
+                    done, response = self._requests.pop(message["id"], (None, None))
+                    if done is None:
+                        continue
+                    if "pid" in message:
+                        process = WarmProcess(message["pid"], args=[])
+                        self._processes[process.pid] = process
+                        response["process"] = process
+                    else:
+                        response["error"] = message.get("error")
+                done.set()
+
+        self._on_worker_exit()
+
+    def _on_worker_exit(self) -> None:
+        with self._lock:
+            self._alive = False
+            requests, self._requests = self._requests, {}
+            processes = list(self._processes.values())
+        self._ready.set()
+        for done, response in requests.values():
+            response["error"] = "warm worker exited"
+            done.set()
+
+        # The exit codes of running jobs are lost, wait until they are gone
+        while processes:
+            for process in list(processes):
+                if not pid_alive(process.pid):
+                    process._set_returncode(1)
+                    processes.remove(process)
+            time.sleep(0.1)
+
+
+class WarmPool:
+    def __init__(self, cmd: list[str], preload_modules: list[str], size: int = 1):
+        """Warm Python processes of a runtime, each job runs in a fork of one of them.
+
+        The workers import `preload_modules` once, so a job skips the interpreter startup
+        and the import of these modules. Every job runs in its own forked child,
+        jobs don't share any state.
+
+        Args:
+            cmd: The runtime's interpreter command, e.g. `["python"]`
+            preload_modules: Modules to import in the workers, e.g. `["pandas"]`
+            size: Number of workers, jobs are distributed round-robin
+        """
+        self.cmd = list(cmd)
+        self.preload_modules = list(preload_modules)
+        self.size = max(1, size)
+        self._lock = threading.Lock()
+        self._workers: list[_WarmWorker] = []
+        self._next = 0
+        self._closed = False
+
+    def start(self) -> None:
+        """Start the workers, called by the first `spawn` if not called before."""
+        with self._lock:
+            self._ensure_workers()
+
+    def spawn(
+        self,
+        argv: list[str],
+        env: dict[str, str],
+        stdout_path: Path,
+        stderr_path: Path,
+        cwd: Optional[str] = None,
+        rlimits: list[tuple[int, int, int]] = [],
+    ) -> WarmProcess:
+        """Run the Python script `argv[0]` with arguments `argv[1:]` in a forked worker.
+
+        `rlimits` are `(resource, soft, hard)` limits set in the forked job.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("WarmPool is closed")
+            self._ensure_workers()
+            worker = self._workers[self._next % len(self._workers)]
+            self._next += 1
+        process = worker.spawn(
+            argv=argv,
+            env=env,
+            cwd=cwd or os.getcwd(),
+            stdout_path=stdout_path,
+            stderr_path=stderr_path,
+            rlimits=rlimits,
+        )
+        process.args = argv
+        return process
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+    def _ensure_workers(self) -> None:
+        # Called with the lock held, replaces workers that have exited
+        self._workers = [worker for worker in self._workers if worker.alive]
+        while len(self._workers) < self.size:
+            self._workers.append(_WarmWorker(self.cmd, self.preload_modules))
+
+
+class WarmPools:
+    def __init__(self):
+        """Warm pools of the Python runtimes used by a client, created on first use."""
+        self._lock = threading.Lock()
+        self._pools: dict[tuple, WarmPool] = {}
+
+    def get(self, cmd: list[str], preload_modules: list[str], size: int) -> WarmPool:
+        key = (tuple(cmd), tuple(preload_modules), size)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = WarmPool(cmd, preload_modules, size=size)
+                self._pools[key] = pool
+            return pool
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = list(self._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+
+def warm_pool_supported() -> bool:
+    return hasattr(os, "fork")
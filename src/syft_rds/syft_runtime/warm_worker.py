@@ -0,0 +1,170 @@
+"""Warm parent process of a `WarmPool`, runs every job in a forked child.
+
+Started as `<interpreter> warm_worker.py [module ...]` with the runtime's interpreter,
+so it only uses the standard library. The given modules are imported once, each forked
+job starts with them already loaded.
+
+Protocol, one JSON object per line:
+- stdin: `{"id": ..., "argv": [...], "env": {...}, "cwd": ..., "stdout": ..., "stderr": ...,
+  "rlimits": [[resource, soft, hard], ...]}`
+- stdout: `{"ready": pid}` after the preload, `{"id": ..., "pid": ...}` or
+  `{"id": ..., "error": ...}` per request, and
+  `{"exit": pid, "returncode": ..., "rusage": {...}}` when a job exits.
+
+When stdin is closed the process exits after its running jobs have exited.
+"""
+
+import importlib
+import json
+import os
+import selectors
+import signal
+import sys
+import traceback
+
+
+def _send(message: dict) -> None:
+    os.write(_PROTOCOL_FD, (json.dumps(message) + "\n").encode())
+
+
+def _run_job(request: dict) -> int:
+    # Runs in the forked child, the job's output goes to its log files
+    os.setsid()
+    if request.get("rlimits"):
+        import resource
+
+        for rlimit, soft, hard in request["rlimits"]:
+            resource.setrlimit(rlimit, (soft, hard))
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    for fd, path in ((1, request["stdout"]), (2, request["stderr"])):
+        log_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        os.dup2(log_fd, fd)
+        os.close(log_fd)
+    os.closerange(3, 1024)
+
+    sys.stdin = open(0, "r")
+    sys.stdout = open(1, "w", buffering=1)
+    sys.stderr = open(2, "w", buffering=1)
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(request["cwd"])
+
+    import atexit
+    import runpy
+    import threading
+
+    script = request["argv"][0]
+    sys.argv = list(request["argv"])
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    returncode = 0
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None:
+            returncode = 0
+        elif isinstance(e.code, int):
+            returncode = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            returncode = 1
+    except BaseException:
+        traceback.print_exc()
+        returncode = 1
+
+    # Shut down like the interpreter would: wait for threads, then run atexit handlers
+    for thread in threading.enumerate():
+        if thread is not threading.main_thread() and not thread.daemon:
+            thread.join()
+    atexit._run_exitfuncs()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return returncode
+
+
+def _reap(children: set[int]) -> None:
+    while children:
+        try:
+            pid, status, rusage = os.wait4(-1, os.WNOHANG)
+        except ChildProcessError:
+            return
+        if pid == 0:
+            return
+        children.discard(pid)
+        _send(
+            {
+                "exit": pid,
+                "returncode": os.waitstatus_to_exitcode(status),
+                "rusage": {
+                    "ru_utime": rusage.ru_utime,
+                    "ru_stime": rusage.ru_stime,
+                    "ru_maxrss": rusage.ru_maxrss,
+                },
+            }
+        )
+
+
+def main() -> None:
+    for module in sys.argv[1:]:
+        importlib.import_module(module)
+
+    wake_r, wake_w = os.pipe()
+    os.set_blocking(wake_r, False)
+    os.set_blocking(wake_w, False)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    signal.set_wakeup_fd(wake_w, warn_on_full_buffer=False)
+
+    selector = selectors.DefaultSelector()
+    selector.register(0, selectors.EVENT_READ)
+    selector.register(wake_r, selectors.EVENT_READ)
+
+    children: set[int] = set()
+    buffer = b""
+    accepting = True
+    _send({"ready": os.getpid()})
+    while accepting or children:
+        for key, _ in selector.select(timeout=1.0):
+            if key.fd == wake_r:
+                try:
+                    os.read(wake_r, 4096)
+                except BlockingIOError:
+                    pass
+                continue
+
+            data = os.read(0, 65536)
+            if not data:
+                accepting = False
+                selector.unregister(0)
+                continue
+            buffer += data
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                request = json.loads(line)
+                # Output buffered in this process would be written again by the child
+                sys.stdout.flush()
+                sys.stderr.flush()
+                try:
+                    pid = os.fork()
+                except OSError as e:
+                    _send({"id": request["id"], "error": str(e)})
+                    continue
+                if pid == 0:
+                    returncode = 1
+                    try:
+                        returncode = _run_job(request)
+                    except BaseException:
+                        traceback.print_exc()
+                    finally:
+                        os._exit(returncode)
+                children.add(pid)
+                _send({"id": request["id"], "pid": pid})
+        _reap(children)
+
+
+if __name__ == "__main__":
+    # The protocol uses a duplicate of stdout, imported modules that print can't break it
+    _PROTOCOL_FD = os.dup(1)
+    os.dup2(2, 1)
+    main()
@@ -0,0 +1,92 @@
+import hashlib
+import os
+import re
+import time
+from pathlib import Path
+from typing import Union
+from uuid import uuid4
+
+ATTACHMENT_SUFFIX = ".attachment"
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+_ATTACHMENT_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+def get_attachment_id(data: Union[bytes, memoryview]) -> str:
+    """Content address of an attachment (sha256 hex digest of its bytes)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def validate_attachment_id(attachment_id: str) -> str:
+    """Attachment ids end up in file names, only allow plain sha256 hex digests."""
+    if not isinstance(attachment_id, str) or not _ATTACHMENT_ID_PATTERN.match(
+        attachment_id
+    ):
+        raise ValueError(f"Invalid attachment id: {attachment_id!r}")
+    return attachment_id
+
+
+def attachment_path(request_dir: Path, attachment_id: str) -> Path:
+    """Path of an attachment that lives next to the .request files in `request_dir`."""
+    validate_attachment_id(attachment_id)
+    return Path(request_dir) / f"{attachment_id}{ATTACHMENT_SUFFIX}"
+
+
+def write_attachment(request_dir: Path, data: Union[bytes, memoryview]) -> str:
+    """Write `data` as a content-addressed attachment in `request_dir`.
+
+    The file is written to a temporary name and renamed into place, so the receiving
+    side never observes a partially written attachment. Identical payloads map to the
+    same file and are only written once.
+
+    Returns:
+        The attachment id, to be referenced from the request body.
+    """
+    attachment_id = get_attachment_id(data)
+    path = attachment_path(request_dir, attachment_id)
+    if path.exists() and path.stat().st_size == len(data):
+        # Refresh mtime so the attachment is not pruned while it is still referenced
+        os.utime(path)
+        return attachment_id
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return attachment_id
+
+
+def verify_attachment(path: Path, attachment_id: str) -> None:
+    """Stream the attachment from disk and check it matches its content address."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(ATTACHMENT_CHUNK_SIZE):
+            digest.update(chunk)
+    if digest.hexdigest() != attachment_id:
+        raise ValueError(f"Attachment {path.name} does not match its content hash")
+
+
+def prune_attachments(root_dir: Path, max_age_seconds: float) -> int:
+    """Delete attachments under `root_dir` that have not been touched for `max_age_seconds`.
+
+    Returns:
+        Number of deleted attachments
+    """
+    root_dir = Path(root_dir)
+    if not root_dir.exists():
+        return 0
+
+    cutoff = time.time() - max_age_seconds
+    deleted = 0
+    for path in root_dir.glob(f"**/*{ATTACHMENT_SUFFIX}"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        except FileNotFoundError:
+            continue
+    return deleted
@@ -1,5 +1,10 @@
 JOB_STATUS_POLLING_INTERVAL = 2
 SYFTBOX_DATASITES_BASE_URL = "https://syftbox.net/datasites"
+IDEMPOTENCY_KEY_HEADER = "X-Idempotency-Key"
+# Set on requests handled in-process, the server skips serializing the result
+IN_PROCESS_HEADER = "X-RDS-In-Process"
+# Seconds a rate limited client should wait before retrying
+RETRY_AFTER_HEADER = "Retry-After"
 
 
 def get_datasite_url(email: str) -> str:
@@ -0,0 +1,177 @@
+import bisect
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable
+
+# Latency buckets in seconds. RPC round trips over file sync can take minutes.
+DEFAULT_LATENCY_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    300.0,
+)
+
+
+class RollingHistogram:
+    def __init__(
+        self,
+        window_seconds: float = 300,
+        buckets: Iterable[float] = DEFAULT_LATENCY_BUCKETS,
+        max_samples: int = 10_000,
+    ):
+        """Latency histogram with all-time buckets and a rolling window of recent samples.
+
+        The cumulative bucket counts, sum and count follow Prometheus histogram semantics.
+        Quantiles and throughput are computed over the samples of the last `window_seconds`,
+        keeping at most `max_samples` samples in memory.
+        """
+        self.window_seconds = window_seconds
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_counts = [0] * (len(self.buckets) + 1)  # last bucket is +Inf
+        self._count = 0
+        self._sum = 0.0
+        self._samples: deque[tuple[float, float]] = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._count += 1
+            self._sum += value
+            self._samples.append((now, value))
+
+    def _window(self) -> list[float]:
+        cutoff = time.monotonic() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return sorted(value for _, value in self._samples)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            values = self._window()
+            count, total = self._count, self._sum
+
+        window = {
+            "count": len(values),
+            "throughput_per_s": (
+                len(values) / self.window_seconds if self.window_seconds > 0 else 0.0
+            ),
+        }
+        if values:
+            window.update(
+                mean=sum(values) / len(values),
+                p50=_quantile(values, 0.5),
+                p90=_quantile(values, 0.9),
+                p99=_quantile(values, 0.99),
+                max=values[-1],
+            )
+        return {
+            "count": count,
+            "sum": total,
+            "window_seconds": self.window_seconds,
+            "window": window,
+        }
+
+    def cumulative_buckets(self) -> list[tuple[str, int]]:
+        with self._lock:
+            counts = list(self._bucket_counts)
+        result, cumulative = [], 0
+        for bound, bucket_count in zip([*self.buckets, math.inf], counts):
+            cumulative += bucket_count
+            result.append(("+Inf" if bound == math.inf else repr(bound), cumulative))
+        return result
+
+
+def _quantile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class MetricsRegistry:
+    def __init__(self, window_seconds: float = 300):
+        """Rolling latency histograms and gauges per (metric, endpoint).
+
+        Args:
+            window_seconds: Window used for quantiles and throughput
+        """
+        self.window_seconds = window_seconds
+        self._histograms: dict[tuple[str, str], RollingHistogram] = {}
+        self._gauges: dict[tuple[str, str], float] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, metric: str, endpoint: str) -> RollingHistogram:
+        key = (metric, endpoint)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(
+                    key, RollingHistogram(window_seconds=self.window_seconds)
+                )
+        return histogram
+
+    def observe(self, metric: str, endpoint: str, seconds: float) -> None:
+        self.histogram(metric, endpoint).observe(seconds)
+
+    def set_gauge(self, metric: str, endpoint: str, value: float) -> None:
+        with self._lock:
+            self._gauges[(metric, endpoint)] = value
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """JSON-serializable metrics, as {metric: {endpoint: stats or gauge value}}."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+            gauges = sorted(self._gauges.items())
+        result: dict[str, dict[str, Any]] = {}
+        for (metric, endpoint), histogram in items:
+            result.setdefault(metric, {})[endpoint] = histogram.snapshot()
+        for (metric, endpoint), value in gauges:
+            result.setdefault(metric, {})[endpoint] = value
+        return result
+
+    def to_prometheus(self, prefix: str = "syft_rds") -> str:
+        """Metrics in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._histograms.items())
+
+        lines: list[str] = []
+        current_metric = None
+        for (metric, endpoint), histogram in items:
+            name = f"{prefix}_{metric}_seconds"
+            if metric != current_metric:
+                lines.append(f"# TYPE {name} histogram")
+                current_metric = metric
+            label = f'endpoint="{_escape_label(endpoint)}"'
+            for bound, count in histogram.cumulative_buckets():
+                lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+            snapshot = histogram.snapshot()
+            lines.append(f"{name}_sum{{{label}}} {snapshot['sum']}")
+            lines.append(f"{name}_count{{{label}}} {snapshot['count']}")
+
+        with self._lock:
+            gauges = sorted(self._gauges.items())
+        current_metric = None
+        for (metric, endpoint), value in gauges:
+            name = f"{prefix}_{metric}"
+            if metric != current_metric:
+                lines.append(f"# TYPE {name} gauge")
+                current_metric = metric
+            lines.append(f'{name}{{endpoint="{_escape_label(endpoint)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,38 @@
+import os
+import socket
+from typing import Optional
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    """Whether a process with `pid` exists on this host."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def group_alive(pgid: int) -> bool:
+    """Whether any process of the process group `pgid` is still running."""
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def drain_socket(sock: socket.socket) -> None:
+    """Read everything buffered in a non-blocking socket, e.g. a wakeup socket."""
+    try:
+        while sock.recv(4096):
+            pass
+    except BlockingIOError:
+        pass
@@ -1,5 +1,9 @@
 import importlib.resources
 from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import jinja2
 
 ASSETS = "syft_rds.assets"
 CSS_ASSETS = f"{ASSETS}.css"
@@ -19,6 +23,14 @@ def load_svg(fname: str) -> str:
     return load_resource(fname, SVG_ASSETS)
 
 
+@lru_cache(maxsize=1)
+def get_jinja_env() -> "jinja2.Environment":
+    # jinja2 is only needed to render HTML reprs, imported on first use
+    import jinja2
+
+    return jinja2.Environment(loader=jinja2.PackageLoader("syft_rds", "assets/jinja"))  # nosec
+
+
 @lru_cache(maxsize=64)
 def load_resource(fname: str, module: str = ASSETS) -> str:
     return importlib.resources.read_text(module, fname)
@@ -62,14 +62,16 @@ def _should_ignore(path: Path, base_dir: Path, ignore_patterns: List[str]) -> bo
     return False
 
 
-def extract_zip(zip_data: bytes, target_dir: PathLike) -> None:
+def extract_zip(zip_data: Union[bytes, PathLike], target_dir: PathLike) -> None:
     """Extract zip data to a target directory.
 
     Args:
-        zip_data: Bytes containing zip content
+        zip_data: Bytes containing zip content, or path to a zip file.
+            Zip files are read directly from disk without loading them into memory.
         target_dir: Directory to extract files to
     """
-    with ZipFile(BytesIO(zip_data)) as z:
+    source = BytesIO(zip_data) if isinstance(zip_data, bytes) else str(zip_data)
+    with ZipFile(source) as z:
         z.extractall(str(target_dir))
 
 
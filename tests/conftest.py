@@ -30,6 +30,31 @@ DO_OUTPUT_PATH = DO_PATH / "job_outputs"
 DS_PATH = ASSET_PATH / "ds"
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        help="Run timing benchmarks, skipped by default",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "benchmark: timing benchmark, needs --run-benchmarks"
+    )
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    if config.getoption("--run-benchmarks"):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def do_syftbox_client(tmp_path: Path) -> SyftBoxClient:
     return SyftBoxClient(
@@ -9,6 +9,8 @@ from syft_rds.client.rds_clients.runtime import (
 )
 from syft_rds.models import (
     CustomFunctionCreate,
+    Dataset,
+    DatasetUpdate,
     DockerRuntimeConfig,
     GetAllRequest,
     GetOneRequest,
@@ -16,12 +18,14 @@ from syft_rds.models import (
     JobCreate,
     JobStatus,
     JobUpdate,
+    ResourceLimits,
     Runtime,
     RuntimeCreate,
     RuntimeUpdate,
     UserCodeCreate,
     UserCodeType,
 )
+from syft_rds.utils.attachments import ATTACHMENT_SUFFIX
 from syft_rds.utils.zip_utils import zip_to_bytes
 from tests.conftest import ASSET_PATH
 
@@ -146,6 +150,66 @@ def test_user_code_crud(ds_rds_client: RDSClient):
     assert code2 in all_codes
 
 
+def test_create_with_idempotency_key(ds_rds_client: RDSClient):
+    user_code_create = UserCodeCreate(
+        name="Test UserCode",
+        code_type=UserCodeType.FILE,
+        entrypoint="test.py",
+    )
+    user_code = ds_rds_client.rpc.user_code.create(
+        user_code_create, idempotency_key="retry-key"
+    )
+    # Retrying with the same key returns the original item instead of a duplicate
+    retried = ds_rds_client.rpc.user_code.create(
+        user_code_create, idempotency_key="retry-key"
+    )
+    assert retried.uid == user_code.uid
+
+    other = ds_rds_client.rpc.user_code.create(user_code_create)
+    assert other.uid != user_code.uid
+
+    all_codes = ds_rds_client.rpc.user_code.get_all(GetAllRequest())
+    assert len(all_codes) == 2
+
+
+def test_get_all_response_cache(ds_rds_client: RDSClient):
+    cache = ds_rds_client.rpc.connection.app.state["response_cache"]
+    user_code_create = UserCodeCreate(
+        name="Test UserCode",
+        code_type=UserCodeType.FILE,
+        entrypoint="test.py",
+    )
+    ds_rds_client.rpc.user_code.create(user_code_create)
+
+    for _ in range(3):
+        assert len(ds_rds_client.rpc.user_code.get_all(GetAllRequest())) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 2
+
+    # A write changes the store generation, the next read is not served from the cache
+    ds_rds_client.rpc.user_code.create(user_code_create)
+    assert len(ds_rds_client.rpc.user_code.get_all(GetAllRequest())) == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_user_code_files_sent_as_attachment(ds_rds_client: RDSClient):
+    code_dir = ASSET_PATH / "ds" / "code"
+    user_code_create = UserCodeCreate(
+        name="Test UserCode with files",
+        code_type=UserCodeType.FOLDER,
+        entrypoint="main.py",
+        files_zipped=zip_to_bytes(code_dir, base_dir=code_dir),
+    )
+    user_code = ds_rds_client.rpc.user_code.create(user_code_create)
+
+    assert (user_code.local_dir / "main.py").exists()
+
+    # The zip is written next to the request file instead of embedded in the body
+    rpc_dir = ds_rds_client.rpc.connection.app.app_rpc_dir
+    attachments = list(rpc_dir.glob(f"user_code/create/**/*{ATTACHMENT_SUFFIX}"))
+    assert len(attachments) == 1
+
+
 def test_runtime_crud(do_rds_client: RDSClient, ds_rds_client: RDSClient):
     runtime_create = RuntimeCreate(
         name="python3.9",
@@ -289,6 +353,44 @@ def test_apply_update():
     assert new_job.status == JobStatus.rejected
 
 
+@pytest.mark.parametrize("in_place", [True, False])
+def test_apply_update_keeps_nested_models(in_place: bool):
+    dataset = Dataset(
+        name="test",
+        private="syft://do@openmined.org/private/datasets/test",
+        mock="syft://do@openmined.org/public/datasets/test",
+        summary=None,
+        readme=None,
+        tags=[],
+    )
+    update = DatasetUpdate(uid=dataset.uid, resource_limits=ResourceLimits(timeout=10))
+
+    updated = dataset.apply_update(update, in_place=in_place)
+
+    assert isinstance(updated.resource_limits, ResourceLimits)
+    assert updated.resource_limits.merge(ResourceLimits(timeout=5)).timeout == 5
+
+
+def test_store_update_keeps_nested_models(yaml_store):
+    store = yaml_store(Dataset)
+    dataset = store.create(
+        Dataset(
+            name="test",
+            private="syft://do@openmined.org/private/datasets/test",
+            mock="syft://do@openmined.org/public/datasets/test",
+            summary=None,
+            readme=None,
+            tags=[],
+        )
+    )
+    dataset.resource_limits = ResourceLimits(timeout=10)
+
+    updated = store.update(dataset.uid, dataset)
+
+    assert isinstance(updated.resource_limits, ResourceLimits)
+    assert store.get_by_uid(dataset.uid).resource_limits.timeout == 10
+
+
 def test_search_with_filters(do_rds_client):
     runtime: Runtime = do_rds_client.runtime.create(
         runtime_name="python3.12", runtime_kind="python"
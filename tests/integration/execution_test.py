@@ -1,16 +1,36 @@
+import json
+import threading
 import time
+from uuid import uuid4
 
 import pytest
 import pandas as pd
+from syft_core import Client as SyftBoxClient
 
-from syft_rds.client.rds_client import RDSClient
+from syft_rds.client.job_scheduler import JobScheduler
+from syft_rds.client.rds_client import RDSClient, init_session
 from syft_rds.client.rds_clients.runtime import (
     DEFAULT_DOCKERFILE_FILE_PATH,
 )
-from syft_rds.models import Job, JobStatus
+from syft_rds.models import Job, JobCreate, JobErrorKind, JobStatus, ResourceLimits
+from syft_rds.server.app import create_app
+from syft_rds.server.executor import AutoExecuteConfig
+from syft_rds.syft_runtime.docker_images import (
+    DockerCLI,
+    ImageBuildStatus,
+    get_image_tag,
+)
 from syft_rds.utils.constants import JOB_STATUS_POLLING_INTERVAL
-from tests.conftest import DS_PATH
-from tests.utils import create_dataset
+from tests.conftest import (
+    ASSET_PATH,
+    DO_EMAIL,
+    DS_EMAIL,
+    DS_PATH,
+    MOCK_DATA_PATH,
+    PRIVATE_DATA_PATH,
+    README_PATH,
+)
+from tests.utils import create_dataset, create_fake_docker, fake_docker_calls
 
 single_file_submission = {"user_code_path": DS_PATH / "code" / "main.py"}
 folder_submission = {"user_code_path": DS_PATH / "code", "entrypoint": "main.py"}
@@ -29,6 +49,15 @@ runtime_configs = {
         },
         "ds_submit_params": {"runtime_name": "test_python"},
     },
+    "warm_python_runtime": {
+        "do_creates_runtime": True,
+        "runtime_create_params": {
+            "runtime_name": "test_warm_python",
+            "runtime_kind": "python",
+            "config": {"warm_pool_size": 1, "preload_modules": ["pandas"]},
+        },
+        "ds_submit_params": {"runtime_name": "test_warm_python"},
+    },
     "docker_runtime": {
         "do_creates_runtime": True,
         "runtime_create_params": {
@@ -127,6 +156,9 @@ def _run_and_verify_job(do_rds_client: RDSClient, blocking: bool):
 
     job = do_rds_client.job.get(uid=job.uid)
     assert job.status == JobStatus.job_run_finished
+    assert job.usage is not None
+    assert job.usage.wall_seconds > 0
+    assert job.usage.bytes_written > 0
 
     # DO shares the results
     do_rds_client.job.share_results(job)
@@ -146,3 +178,306 @@ def _run_and_verify_job(do_rds_client: RDSClient, blocking: bool):
     assert len(df) == 5  # 5 rows of data
     # Verify first row: A=2, B=3, C=4, sum should be 9
     assert df.iloc[0]["sum"] == 9
+
+
+def test_scheduler_runs_approved_jobs(
+    ds_rds_client: RDSClient, do_rds_client: RDSClient
+):
+    create_dataset(do_rds_client, "dummy")
+    for _ in range(3):
+        ds_rds_client.job.submit(dataset_name="dummy", **single_file_submission)
+    for job in do_rds_client.job.get_all():
+        do_rds_client.job.approve(job)
+
+    do_rds_client.scheduler = JobScheduler(do_rds_client, max_parallel=2)
+    queued = do_rds_client.scheduler.run_approved()
+    assert len(queued) == 3
+    assert do_rds_client.scheduler.wait(timeout=60)
+
+    jobs = do_rds_client.job.get_all()
+    assert [job.status for job in jobs] == [JobStatus.job_run_finished] * 3
+    assert all(job.queue_position is None for job in jobs)
+    assert do_rds_client.scheduler.stats()["finished"] == 3
+
+
+def test_auto_execute_approved_jobs(
+    do_syftbox_client: SyftBoxClient, ds_syftbox_client: SyftBoxClient
+):
+    app = create_app(
+        do_syftbox_client,
+        auto_execute=AutoExecuteConfig(auto_share=True, poll_interval=0.1),
+    )
+    do_client = init_session(
+        host=DO_EMAIL,
+        email=DO_EMAIL,
+        syftbox_client=do_syftbox_client,
+        mock_server=app,
+    )
+    ds_client = init_session(
+        host=DO_EMAIL,
+        email=DS_EMAIL,
+        syftbox_client=ds_syftbox_client,
+        mock_server=app,
+    )
+    do_client.dataset.create(
+        name="dummy",
+        path=PRIVATE_DATA_PATH,
+        mock_path=MOCK_DATA_PATH,
+        summary="Test data",
+        description_path=README_PATH,
+        auto_approval=[DS_EMAIL],
+    )
+
+    executor = app.state["auto_executor"]
+    executor.start()
+    try:
+        job = ds_client.job.submit(dataset_name="dummy", **single_file_submission)
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            job = do_client.job.get(uid=job.uid)
+            if job.status == JobStatus.shared:
+                break
+            time.sleep(0.2)
+        assert job.status == JobStatus.shared
+        assert executor.running() == []
+        assert not executor.leases.exists(job.uid)
+    finally:
+        executor.stop()
+
+
+def test_runtime_image_prebuilt_on_create(
+    ds_rds_client: RDSClient, do_rds_client: RDSClient, tmp_path
+):
+    fake_docker = create_fake_docker(tmp_path / "fake_docker")
+    do_rds_client.docker_images.cli = DockerCLI(binary=str(fake_docker))
+    create_dataset(do_rds_client, "dummy")
+
+    runtime = do_rds_client.runtime.create(
+        runtime_name="test_prebuilt",
+        runtime_kind="docker",
+        config={"dockerfile": str(DEFAULT_DOCKERFILE_FILE_PATH)},
+    )
+    image = get_image_tag(runtime)
+    do_rds_client.docker_images.prebuild(runtime).result(timeout=30)
+    assert runtime.build_status.status == ImageBuildStatus.BUILT
+    assert runtime.build_status.image == image
+
+    job = ds_rds_client.job.submit(
+        dataset_name="dummy", runtime_name="test_prebuilt", **single_file_submission
+    )
+    job = do_rds_client.job.approve(job)
+    do_rds_client.run_private(job, blocking=True)
+
+    job = do_rds_client.job.get(uid=job.uid)
+    assert job.status == JobStatus.job_run_finished
+    calls = fake_docker_calls(fake_docker)
+    # Built once when the runtime was created, the job reused the image
+    assert sum(call.startswith("build") for call in calls) == 1
+    # Containers are named, so a job that exceeds its timeout can be killed
+    assert "run --rm --name" in calls
+
+
+@pytest.mark.parametrize("blocking", [True, False])
+def test_job_killed_after_dataset_timeout(
+    ds_rds_client: RDSClient, do_rds_client: RDSClient, tmp_path, blocking: bool
+):
+    do_rds_client.dataset.create(
+        name="limited",
+        path=PRIVATE_DATA_PATH,
+        mock_path=MOCK_DATA_PATH,
+        summary="Test data",
+        description_path=README_PATH,
+        resource_limits=ResourceLimits(timeout=1),
+    )
+    do_rds_client.runtime.create(
+        runtime_name="test_limited",
+        runtime_kind="python",
+        config={"limits": {"timeout": 60, "memory_mb": 4096}},
+    )
+    code_path = tmp_path / "sleep.py"
+    code_path.write_text("import time\nprint('started')\ntime.sleep(60)\n")
+
+    job = ds_rds_client.job.submit(
+        dataset_name="limited", runtime_name="test_limited", user_code_path=code_path
+    )
+    job = do_rds_client.job.approve(job)
+    exited = threading.Event()
+    start = time.monotonic()
+    if blocking:
+        do_rds_client.run_private(job, blocking=True)
+    else:
+        do_rds_client.run_private(job, blocking=False, on_exit=lambda job: exited.set())
+        assert exited.wait(timeout=30)
+    # The stricter timeout of the dataset applies
+    assert time.monotonic() - start < 30
+
+    job = do_rds_client.job.get(uid=job.uid)
+    assert job.status == JobStatus.job_run_failed
+    assert job.error == JobErrorKind.timeout
+    assert "exceeding its timeout of 1s" in job.error_message
+    assert job.usage.timed_out
+    assert job.usage.cpu_seconds is not None
+
+
+def test_get_and_follow_logs(
+    do_rds_client: RDSClient, ds_rds_client: RDSClient, tmp_path
+):
+    create_dataset(do_rds_client, "dummy")
+    code_path = tmp_path / "logs.py"
+    code_path.write_text(
+        "import sys, time\n"
+        "for i in range(200):\n"
+        "    print(f'step {i}', flush=True)\n"
+        "    time.sleep(0.005)\n"
+        "print('WARNING: almost done', file=sys.stderr)\n"
+    )
+    job = ds_rds_client.job.submit(dataset_name="dummy", user_code_path=code_path)
+    job = do_rds_client.job.approve(job)
+    exited = threading.Event()
+    do_rds_client.run_private(job, blocking=False, on_exit=lambda job: exited.set())
+
+    stdout = [
+        line
+        for name, line in do_rds_client.job.follow_logs(job, status_interval=0.1)
+        if name == "stdout"
+    ]
+    assert exited.wait(timeout=30)
+    assert [line for line in stdout if line.startswith("step")] == [
+        f"step {i}\n" for i in range(200)
+    ]
+
+    logs = do_rds_client.job.get_logs(job, tail=2)
+    assert logs["stdout"] == "step 198\nstep 199\n"
+    assert logs["stderr"].endswith("WARNING: almost done\n")
+    logs = do_rds_client.job.get_logs(job, grep=r"step 1\d\d$")
+    assert logs["stdout"] == "".join(f"step {i}\n" for i in range(100, 200))
+
+    # Each log is paged from its own offset, stderr ends long before stdout
+    full = do_rds_client.job.get_logs(job)
+    pages = {"stdout": "", "stderr": ""}
+    offsets = {"stdout_offset": 0, "stderr_offset": 0}
+    while offsets["stdout_offset"] < len(full["stdout"]):
+        logs = do_rds_client.job.get_logs(job, limit=500, **offsets)
+        for name in pages:
+            pages[name] += logs[name]
+            offsets[f"{name}_offset"] = logs[f"{name}_offset"]
+    assert pages["stdout"] == full["stdout"]
+    assert pages["stderr"] == full["stderr"]
+
+
+@pytest.mark.parametrize("blocking", [True, False])
+def test_identical_job_reuses_cached_result(
+    do_rds_client: RDSClient, ds_rds_client: RDSClient, tmp_path, blocking
+):
+    do_rds_client.config.runner_config.use_result_cache = True
+    create_dataset(do_rds_client, "dummy")
+    runs_file = tmp_path / "runs.txt"
+    code_path = tmp_path / "count.py"
+    code_path.write_text(
+        "import os, uuid\n"
+        f"open({str(runs_file)!r}, 'a').write('run\\n')\n"
+        "path = os.path.join(os.environ['OUTPUT_DIR'], 'result.txt')\n"
+        "open(path, 'w').write(uuid.uuid4().hex)\n"
+        "print('computed')\n"
+    )
+
+    def run(**kwargs) -> Job:
+        job = ds_rds_client.job.submit(dataset_name="dummy", user_code_path=code_path)
+        job = do_rds_client.job.approve(job)
+        exited = threading.Event()
+        if blocking:
+            do_rds_client.run_private(job, blocking=True, **kwargs)
+        else:
+            do_rds_client.run_private(
+                job, blocking=False, on_exit=lambda job: exited.set(), **kwargs
+            )
+            assert exited.wait(timeout=30)
+        job = do_rds_client.job.get(uid=job.uid)
+        assert job.status == JobStatus.job_run_finished
+        return job
+
+    def result(job: Job) -> str:
+        folder = do_rds_client.config.runner_config.job_output_folder / job.uid.hex
+        return (folder / "output" / "result.txt").read_text()
+
+    first = run()
+    second = run()
+    # The second job got the results and logs of the first one without running
+    assert runs_file.read_text() == "run\n"
+    assert result(second) == result(first)
+    assert "computed" in do_rds_client.job.get_logs(second)["stdout"]
+    # The second job used no resources
+    assert first.usage.wall_seconds > 0
+    assert second.usage.wall_seconds == 0
+
+    third = run(use_cache=False)
+    assert runs_file.read_text() == "run\n" * 2
+    assert result(third) != result(first)
+
+    # Changing the dataset invalidates the cached result
+    private_path = do_rds_client.dataset.get(name="dummy").get_private_path()
+    data_file = next(path for path in private_path.rglob("*") if path.is_file())
+    data_file.write_text(data_file.read_text() + "\n")
+    run()
+    assert runs_file.read_text() == "run\n" * 3
+
+
+def test_custom_function_sweep(do_rds_client: RDSClient, ds_rds_client: RDSClient):
+    do_rds_client.config.runner_config.use_result_cache = True
+    create_dataset(do_rds_client, "dummy")
+    custom_function = do_rds_client.custom_function.submit(
+        name="Echo", code_path=ASSET_PATH / "custom_function" / "echo_function.py"
+    )
+    custom_function = ds_rds_client.custom_function.get(uid=custom_function.uid)
+
+    jobs = custom_function.submit_sweep(
+        "dummy", {"lr": [0.1, 0.01], "layers": [1, 2]}, name="sweep"
+    )
+    assert [job.name for job in jobs] == [f"sweep-{i}" for i in range(4)]
+    assert [job.sweep_params for job in jobs] == [
+        {"lr": 0.1, "layers": 1},
+        {"lr": 0.1, "layers": 2},
+        {"lr": 0.01, "layers": 1},
+        {"lr": 0.01, "layers": 2},
+    ]
+    # All jobs share the uploaded code
+    assert len({job.user_code_id for job in jobs}) == 1
+
+    for job in do_rds_client.job.get_all():
+        do_rds_client.job.approve(job)
+    do_rds_client.scheduler = JobScheduler(do_rds_client, max_parallel=2)
+    assert len(do_rds_client.scheduler.run_approved()) == 4
+    assert do_rds_client.scheduler.wait(timeout=60)
+
+    for job in jobs:
+        job = do_rds_client.job.get(uid=job.uid)
+        assert job.status == JobStatus.job_run_finished
+        folder = do_rds_client.config.runner_config.job_output_folder / job.uid.hex
+        result = json.loads((folder / "output" / "result.json").read_text())
+        # Every job got its own params, none of them reused another's result
+        assert result == job.sweep_params
+
+
+def test_create_many_creates_all_jobs_or_none(
+    do_rds_client: RDSClient, ds_rds_client: RDSClient
+):
+    create_dataset(do_rds_client, "dummy")
+    custom_function = do_rds_client.custom_function.submit(
+        name="Echo", code_path=ASSET_PATH / "custom_function" / "echo_function.py"
+    )
+    custom_function = ds_rds_client.custom_function.get(uid=custom_function.uid)
+    jobs = custom_function.submit_sweep("dummy", [{"lr": 0.1}])
+
+    # The second job references code that does not exist, no job is created
+    items = [
+        JobCreate(name="good", user_code_id=jobs[0].user_code_id),
+        JobCreate(name="bad", user_code_id=uuid4()),
+    ]
+    with pytest.raises(Exception, match="No user code found"):
+        ds_rds_client.rpc.job.create_many(items)
+    assert [job.name for job in do_rds_client.job.get_all()] == [jobs[0].name]
+
+    # The params file of a custom function must be JSON, checked before uploading
+    custom_function.input_params_filename = "params.yaml"
+    with pytest.raises(ValueError, match="must be a JSON file"):
+        custom_function.submit_sweep("dummy", [{"lr": 0.1}])
@@ -0,0 +1,129 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from syft_core import Client as SyftBoxClient
+from syft_core import SyftClientConfig
+
+from syft_rds.client.federated import FederatedRDSClient
+from syft_rds.client.rds_client import RDSClient, init_session
+from syft_rds.client.rds_clients import user_code as user_code_module
+from syft_rds.models import JobStatus
+from syft_rds.models.job_models import JobResults
+from syft_rds.server.app import create_app
+from tests.conftest import DS_EMAIL, DS_PATH, SHARED_DATA_DIR
+from tests.utils import create_dataset
+
+DO_EMAILS = ["do1@test.openmined.org", "do2@test.openmined.org"]
+
+
+def _syftbox_client(tmp_path: Path, email: str) -> SyftBoxClient:
+    return SyftBoxClient(
+        SyftClientConfig(
+            email=email,
+            server_url="http://localhost:8080",
+            client_url="http://localhost:5000",
+            path=tmp_path / f"{email}.json",
+            data_dir=tmp_path / "clients" / SHARED_DATA_DIR,
+        ),
+    )
+
+
+@pytest.fixture
+def federation(tmp_path: Path) -> tuple[FederatedRDSClient, dict[str, RDSClient]]:
+    ds_syftbox_client = _syftbox_client(tmp_path, DS_EMAIL)
+    ds_clients = []
+    do_clients = {}
+    for email in DO_EMAILS:
+        do_syftbox_client = _syftbox_client(tmp_path, email)
+        server = create_app(do_syftbox_client)
+        do_clients[email] = init_session(
+            host=email,
+            email=email,
+            syftbox_client=do_syftbox_client,
+            mock_server=server,
+        )
+        ds_clients.append(
+            init_session(
+                host=email,
+                email=DS_EMAIL,
+                syftbox_client=ds_syftbox_client,
+                mock_server=server,
+            )
+        )
+    return FederatedRDSClient(ds_clients), do_clients
+
+
+def test_federated_submit_and_collect(federation, monkeypatch):
+    federated, do_clients = federation
+    for do_client in do_clients.values():
+        create_dataset(do_client, "dummy")
+
+    zip_calls = []
+    zip_to_bytes = user_code_module.zip_to_bytes
+
+    def counting_zip(*args, **kwargs):
+        zip_calls.append(args)
+        return zip_to_bytes(*args, **kwargs)
+
+    monkeypatch.setattr(user_code_module, "zip_to_bytes", counting_zip)
+
+    submitted = federated.submit(
+        user_code_path=DS_PATH / "code",
+        entrypoint="main.py",
+        dataset_name="dummy",
+        hosts=DO_EMAILS,
+    )
+    # The code is zipped once for all hosts
+    assert len(zip_calls) == 1
+    assert [info.host for info in submitted] == DO_EMAILS
+    assert all(info.status == JobStatus.pending_code_review for info in submitted)
+    assert not federated.errors
+
+    # Only the first host shares its results
+    first_host = DO_EMAILS[0]
+    do_client = do_clients[first_host]
+    job = do_client.job.approve(do_client.job.get_all()[0])
+    do_client.run_private(job, blocking=True)
+    do_client.job.share_results(do_client.job.get(uid=job.uid))
+
+    statuses = {info.host: info.status for info in federated.jobs()}
+    assert statuses == {
+        first_host: JobStatus.shared,
+        DO_EMAILS[1]: JobStatus.pending_code_review,
+    }
+
+    def total_sum(results: dict[str, JobResults]) -> int:
+        return sum(
+            pd.read_csv(r.output_dir / "result.csv")["sum"].sum()
+            for r in results.values()
+        )
+
+    # The pending host is skipped after the timeout, the shared results are reduced
+    total = federated.collect(reduce=total_sum, timeout=0.5, poll_interval=0.1)
+    single_host = pd.read_csv(
+        federated.clients[first_host]
+        .job.get_results(federated.jobs_by_host[first_host])
+        .output_dir
+        / "result.csv"
+    )["sum"].sum()
+    assert total == single_host
+
+
+def test_federated_submit_collects_host_errors(federation):
+    federated, do_clients = federation
+    do_clients[DO_EMAILS[0]].runtime.create(
+        runtime_name="test_python", runtime_kind="python"
+    )
+
+    submitted = federated.submit(
+        user_code_path=DS_PATH / "code" / "main.py",
+        runtime_name="test_python",
+    )
+
+    # The runtime only exists on the first host, the second submit fails on its own
+    infos = {info.host: info for info in submitted}
+    assert infos[DO_EMAILS[0]].status == JobStatus.pending_code_review
+    assert infos[DO_EMAILS[1]].status is None
+    assert "test_python" in infos[DO_EMAILS[1]].error
+    assert list(federated.errors) == [DO_EMAILS[1]]
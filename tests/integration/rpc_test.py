@@ -1,12 +1,23 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
 from syft_core import Client as SyftBoxClient
 from syft_core import SyftClientConfig
+from syft_core import SyftBoxURL
 from syft_event import SyftEvents
-from syft_rds.client.rds_client import init_session
+from syft_rpc import SyftRequest, SyftResponse
+from syft_rpc.protocol import SyftStatus
+from syft_rds.client.connection import InProcessResponse
+from syft_rds.client.rds_client import _RUNNING_RDS_SERVERS, init_session
+from syft_rds.models import GetAllRequest, Job, JobStatus, JobUpdate, JobUsage
 from syft_rds.orchestra import RDSStack
-from syft_rds.server.app import create_app
+from syft_rds.client.setup import discover_rds_apps, find_rds_servers
+from syft_rds.server.app import APP_INFO_FILE, APP_NAME, create_app
+from syft_rds.server.middleware import RateLimit
+from syft_rds.utils.constants import IDEMPOTENCY_KEY_HEADER
 
 DO_EMAIL = "data_owner@test.openmined.org"
 DS_EMAIL = "data_scientist@test.openmined.org"
@@ -67,6 +78,151 @@ def test_rpc_mocked(rds_server: SyftEvents, ds_syftbox_client):
     assert info["app_name"] == "RDS"
 
 
+def test_rpc_metrics(rds_server: SyftEvents, ds_syftbox_client, do_syftbox_client):
+    ds_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DS_EMAIL,
+        syftbox_client=ds_syftbox_client,
+        mock_server=rds_server,
+    )
+    ds_rds_client.rpc.job.get_all(GetAllRequest())
+    ds_rds_client.rpc.job.get_all(GetAllRequest())
+
+    metrics = ds_rds_client.metrics()
+    assert metrics["client"]["round_trip"]["job/get_all"]["count"] == 2
+    # Server metrics are only available to the datasite owner
+    assert "server" not in metrics
+    with pytest.raises(Exception):
+        ds_rds_client.rpc.server_metrics()
+
+    do_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DO_EMAIL,
+        syftbox_client=do_syftbox_client,
+        mock_server=rds_server,
+    )
+    metrics = do_rds_client.metrics()
+    assert metrics["server"]["handler"]["job/get_all"]["count"] == 2
+    assert metrics["server"]["serialize"]["job/get_all"]["count"] == 2
+
+    prometheus = do_rds_client.rpc.server_metrics(format="prometheus")
+    assert "# TYPE syft_rds_handler_seconds histogram" in prometheus
+
+
+def test_rpc_status(rds_server: SyftEvents, ds_syftbox_client, do_syftbox_client):
+    ds_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DS_EMAIL,
+        syftbox_client=ds_syftbox_client,
+        mock_server=rds_server,
+    )
+    ds_rds_client.rpc.job.get_all(GetAllRequest())
+    ds_rds_client.rpc.job.get_all(GetAllRequest())
+
+    status = ds_rds_client.server_status()
+    assert status.app_name == "RDS"
+    assert status.uptime_seconds > 0
+    assert status.stores["job"] == {"records": 0, "size_bytes": 0}
+    assert status.response_cache["hits"] == 1
+    assert status.running_jobs == []
+    assert status.requests["in_flight"] == 0
+    # Other senders are only visible to the datasite owner
+    assert "queued_by_sender" not in status.requests
+
+    do_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DO_EMAIL,
+        syftbox_client=do_syftbox_client,
+        mock_server=rds_server,
+    )
+    status = do_rds_client.server_status()
+    assert "queued_by_sender" in status.requests
+    assert status.process["rss_bytes"] > 0
+    assert "uptime_seconds" in str(status)
+
+
+def test_rpc_status_hides_running_jobs(
+    rds_server: SyftEvents, ds_syftbox_client, do_syftbox_client
+):
+    do_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DO_EMAIL,
+        syftbox_client=do_syftbox_client,
+        mock_server=rds_server,
+    )
+    runtime = do_rds_client.runtime.create(
+        runtime_name="python3.12", runtime_kind="python"
+    )
+    user_code = do_rds_client.user_code.create(
+        code_path=Path(__file__), entrypoint=Path(__file__).name
+    )
+    job = do_rds_client.job.create(
+        user_code=user_code, runtime_name=runtime.name, name="secret-job"
+    )
+    do_rds_client.rpc.job.update(
+        JobUpdate(uid=job.uid, status=JobStatus.job_in_progress)
+    )
+
+    status = do_rds_client.server_status()
+    assert status.running_job_count == 1
+    assert status.running_jobs[0]["name"] == "secret-job"
+
+    # Other senders only see how many jobs are running, not whose
+    ds_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DS_EMAIL,
+        syftbox_client=ds_syftbox_client,
+        mock_server=rds_server,
+    )
+    status = ds_rds_client.server_status()
+    assert status.running_job_count == 1
+    assert status.running_jobs == []
+    assert DO_EMAIL not in status.model_dump_json()
+
+
+def test_rpc_rate_limit(do_syftbox_client, ds_syftbox_client):
+    rds_server = create_app(
+        do_syftbox_client,
+        rate_limits={"job/get_all": RateLimit(per_minute=60, burst=1)},
+    )
+    ds_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DS_EMAIL,
+        syftbox_client=ds_syftbox_client,
+        mock_server=rds_server,
+    )
+    ds_rds_client.rpc.config.rate_limit_retries = 0
+
+    assert ds_rds_client.rpc.job.get_all(GetAllRequest()) == []
+    response = ds_rds_client.rpc.job._send("job/get_all", GetAllRequest())
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+
+    # The datasite owner is not rate limited
+    do_rds_client = init_session(
+        host=DO_EMAIL,
+        email=DO_EMAIL,
+        syftbox_client=do_syftbox_client,
+        mock_server=rds_server,
+    )
+    for _ in range(3):
+        do_rds_client.rpc.job.get_all(GetAllRequest())
+
+    # With retries the client waits for the Retry-After hint
+    ds_rds_client.rpc.config.rate_limit_retries = 2
+    assert ds_rds_client.rpc.job.get_all(GetAllRequest()) == []
+
+    # Retries of a handled idempotency key are answered without taking a token
+    ds_rds_client.rpc.config.rate_limit_retries = 0
+    headers = {IDEMPOTENCY_KEY_HEADER: "retry-key"}
+    time.sleep(1)
+    for _ in range(3):
+        response = ds_rds_client.rpc.job._send(
+            "job/get_all", GetAllRequest(), headers=headers
+        )
+        assert response.status_code == 200
+
+
 def test_rpc_with_files(rds_no_sync_stack: RDSStack):
     do_rds_client = rds_no_sync_stack.do_rds_client
     ds_rds_client = rds_no_sync_stack.ds_rds_client
@@ -76,3 +232,118 @@ def test_rpc_with_files(rds_no_sync_stack: RDSStack):
 
     info = do_rds_client.rpc.health()
     assert info["app_name"] == "RDS"
+
+
+def test_find_rds_servers(rds_no_sync_stack: RDSStack):
+    syftbox_client = rds_no_sync_stack.ds_rds_client.syftbox_client
+    # A datasite with the app installed, but no running server
+    offline_app_dir = syftbox_client.app_data(
+        APP_NAME, datasite="offline@openmined.org"
+    )
+    offline_app_dir.mkdir(parents=True)
+    (offline_app_dir / APP_INFO_FILE).write_text("app_version: 0.0.1\n")
+
+    assert set(discover_rds_apps(syftbox_client)) == {DO_EMAIL, "offline@openmined.org"}
+
+    servers = find_rds_servers(syftbox_client, timeout=2, include_unreachable=True)
+    assert [server.host for server in servers] == [DO_EMAIL, "offline@openmined.org"]
+    online, offline = servers
+    assert online.reachable
+    assert online.server_version == online.app_version
+    assert online.latency_seconds < 2
+    assert not offline.reachable
+    assert offline.app_version == "0.0.1"
+
+    # Results are cached until the app info file changes
+    (offline_app_dir / APP_INFO_FILE).unlink()
+    assert discover_rds_apps(syftbox_client) == [DO_EMAIL]
+
+
+def test_rpc_in_process(rds_server: SyftEvents, do_syftbox_client: SyftBoxClient):
+    # Register the server as running in this process, without starting the file watcher
+    _RUNNING_RDS_SERVERS[DO_EMAIL] = {
+        "thread": threading.current_thread(),
+        "server": rds_server,
+    }
+    try:
+        do_rds_client = init_session(
+            host=DO_EMAIL,
+            email=DO_EMAIL,
+            syftbox_client=do_syftbox_client,
+            start_syft_event_server=False,
+        )
+
+        response = do_rds_client.rpc._send("/health", body=None)
+        assert isinstance(response, InProcessResponse)
+        assert response.json()["app_name"] == "RDS"
+
+        runtime = do_rds_client.runtime.create(
+            runtime_name="python3.12", runtime_kind="python"
+        )
+        user_code = do_rds_client.user_code.create(
+            code_path=Path(__file__), entrypoint=Path(__file__).name
+        )
+        job = do_rds_client.job.create(user_code=user_code, runtime_name=runtime.name)
+        updated = do_rds_client.rpc.job.update(
+            JobUpdate(uid=job.uid, status=JobStatus.approved)
+        )
+        assert updated.status == JobStatus.approved
+
+        job = do_rds_client.job.update_job_status(
+            JobUpdate(
+                uid=job.uid,
+                status=JobStatus.job_run_finished,
+                usage=JobUsage(wall_seconds=1.5),
+            ),
+            job,
+        )
+        assert isinstance(job.usage, JobUsage)
+        assert job.usage.wall_seconds == 1.5
+        # The client and server never share instances
+        response = do_rds_client.rpc.job._send(
+            "job/update", JobUpdate(uid=job.uid, usage=JobUsage(wall_seconds=2.0))
+        )
+        assert isinstance(response, InProcessResponse)
+        assert response.model(Job).usage is not response.model(Job).usage
+
+        # Handlers were called directly, no request files were written
+        assert not list(rds_server.app_rpc_dir.glob("**/*.request"))
+    finally:
+        _RUNNING_RDS_SERVERS.pop(DO_EMAIL, None)
+
+
+def test_rpc_backlog(rds_server: SyftEvents, ds_syftbox_client: SyftBoxClient):
+    url = SyftBoxURL(f"syft://{DO_EMAIL}/app_data/RDS/rpc/job/get_all")
+    request_dir = url.to_local_path(ds_syftbox_client.workspace.datasites) / DS_EMAIL
+    request_dir.mkdir(parents=True, exist_ok=True)
+
+    def write_request(**kwargs) -> Path:
+        request = SyftRequest(
+            sender=DS_EMAIL,
+            url=url,
+            body=GetAllRequest().model_dump_json().encode(),
+            **kwargs,
+        )
+        path = request_dir / f"{request.id}.request"
+        request.dump(path)
+        return path
+
+    expired = write_request(expires=datetime.now(timezone.utc) - timedelta(hours=1))
+    # Consecutive identical requests, e.g. retries while the server was down
+    requests = [write_request() for _ in range(3)]
+
+    backlog = rds_server.state["backlog"]
+    stats = backlog.run()
+    rds_server.state["dispatcher"].shutdown()
+
+    assert stats.expired == 1
+    assert stats.total == 3
+    assert stats.processed == 3
+    assert stats.duplicates == 2
+    # The expired request is answered, so its sender does not wait for its timeout
+    expired_response = SyftResponse.load(expired.with_suffix(".response"))
+    assert expired_response.status_code == SyftStatus.SYFT_419_EXPIRED
+    for path in requests:
+        response = SyftResponse.load(path.with_suffix(".response"))
+        assert response.status_code == 200
+        assert response.json() == {"items": []}
@@ -3,11 +3,13 @@
 import time
 
 import pytest
+from syft_core import Client as SyftBoxClient
 
-from syft_rds.client.rds_client import RDSClient
+from syft_rds.client.rds_client import RDSClient, init_session
 from syft_rds.models import JobStatus
+from syft_rds.server.app import create_app
 from syft_rds.utils.constants import JOB_STATUS_POLLING_INTERVAL
-from tests.conftest import DS_PATH
+from tests.conftest import DO_EMAIL, DS_EMAIL, DS_PATH
 from tests.utils import create_dataset
 
 
@@ -274,3 +276,65 @@ def test_get_logs_before_execution(
     # Try to get logs before execution
     with pytest.raises(ValueError, match="Logs directory does not exist"):
         do_rds_client.job.get_logs(job)
+
+
+def test_uv_env_is_shared_between_jobs(
+    ds_rds_client: RDSClient,
+    do_rds_client: RDSClient,
+):
+    """Jobs with the same dependencies run in one cached environment."""
+    create_dataset(do_rds_client, "dummy")
+    code_with_deps = DS_PATH / "code_with_deps"
+
+    jobs = []
+    for _ in range(2):
+        job = ds_rds_client.job.submit(
+            user_code_path=code_with_deps,
+            dataset_name="dummy",
+            entrypoint="main.py",
+        )
+        jobs.append(do_rds_client.job.approve(job))
+
+    for job in jobs:
+        do_rds_client.run_private(job, blocking=True)
+        job = do_rds_client.job.get(uid=job.uid)
+        assert (
+            job.status == JobStatus.job_run_finished
+        ), f"Job failed with error: {job.error_message}"
+        assert not (job.user_code.local_dir / ".venv").exists()
+
+    env_dirs = list(do_rds_client.uv_env_cache.envs_dir.iterdir())
+    assert len(env_dirs) == 1
+
+
+def test_uv_env_prewarmed_on_submit(
+    do_syftbox_client: SyftBoxClient, ds_syftbox_client: SyftBoxClient
+):
+    app = create_app(do_syftbox_client, prewarm_uv_envs=True)
+    do_client = init_session(
+        host=DO_EMAIL,
+        email=DO_EMAIL,
+        syftbox_client=do_syftbox_client,
+        mock_server=app,
+    )
+    ds_client = init_session(
+        host=DO_EMAIL,
+        email=DS_EMAIL,
+        syftbox_client=ds_syftbox_client,
+        mock_server=app,
+    )
+    create_dataset(do_client, "dummy")
+
+    job = ds_client.job.submit(
+        user_code_path=DS_PATH / "code_with_deps",
+        dataset_name="dummy",
+        entrypoint="main.py",
+    )
+    # Wait for the single prewarm worker to finish the queued sync
+    app.state["uv_env_prewarm_pool"].submit(lambda: None).result(timeout=120)
+
+    job = do_client.job.get(uid=job.uid)
+    uv_env_cache = do_client.uv_env_cache
+    key = uv_env_cache.env_key(job.user_code.local_dir)
+    assert (uv_env_cache.env_dir(key) / "pyvenv.cfg").exists()
+    assert job.status == JobStatus.pending_code_review
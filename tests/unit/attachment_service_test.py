@@ -0,0 +1,43 @@
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from syft_rds.server.services.attachment_service import AttachmentService
+from syft_rds.utils.attachments import get_attachment_id, write_attachment
+
+
+class _LocalAttachmentService(AttachmentService):
+    def __init__(self, request_dir: Path, **kwargs):
+        super().__init__(client=None, **kwargs)
+        self._request_dir = request_dir
+
+    def request_dir(self, request) -> Path:
+        return self._request_dir
+
+
+def test_waits_for_attachment_synced_after_request(tmp_path: Path):
+    service = _LocalAttachmentService(tmp_path, wait_timeout=5)
+    data = b"zipped code"
+    attachment_id = get_attachment_id(data)
+    # Synced after the request file, first as a partial file
+    path = tmp_path / f"{attachment_id}.attachment"
+
+    def sync() -> None:
+        time.sleep(0.2)
+        path.write_bytes(data[:4])
+        time.sleep(0.2)
+        write_attachment(tmp_path, data)
+
+    threading.Thread(target=sync).start()
+
+    assert service.path_for(SimpleNamespace(id="1"), attachment_id) == path
+
+
+def test_missing_attachment_times_out(tmp_path: Path):
+    service = _LocalAttachmentService(tmp_path, wait_timeout=0.2)
+
+    with pytest.raises(FileNotFoundError):
+        service.path_for(SimpleNamespace(id="1"), get_attachment_id(b"never synced"))
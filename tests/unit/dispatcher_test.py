@@ -0,0 +1,113 @@
+import threading
+import time
+from pathlib import Path
+
+from syft_rds.server.dispatcher import RequestDispatcher
+from syft_rds.utils.metrics import MetricsRegistry
+
+
+def _request_file(
+    rpc_dir: Path, route: str, name: str, sender: str = "user@openmined.org"
+) -> Path:
+    path = rpc_dir / route / sender / f"{name}.request"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("{}")
+    return path
+
+
+def _wait_until(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_route_concurrency_limit(tmp_path: Path):
+    release = threading.Event()
+    running: list[Path] = []
+    done: list[Path] = []
+
+    def handle_rpc(path: Path, func) -> None:
+        running.append(path)
+        release.wait(timeout=5)
+        done.append(path)
+
+    metrics = MetricsRegistry()
+    dispatcher = RequestDispatcher(
+        app_rpc_dir=tmp_path,
+        handle_rpc=handle_rpc,
+        max_workers=4,
+        route_concurrency={"user_code/create": 1},
+        metrics=metrics,
+    )
+    slow = [_request_file(tmp_path, "user_code/create", f"req{i}") for i in range(3)]
+    fast = _request_file(tmp_path, "job/get_all", "req")
+
+    for path in slow:
+        dispatcher.dispatch(path, func=None)
+    dispatcher.dispatch(fast, func=None)
+
+    # The capped route runs one request at a time, other routes are not blocked
+    _wait_until(lambda: len(running) == 2)
+    assert set(running) == {slow[0], fast}
+    stats = dispatcher.stats()
+    assert stats["user_code/create"]["queue_depth"] == 2
+    assert stats["user_code/create"]["in_flight"] == 1
+    assert metrics.snapshot()["queue_depth"]["user_code/create"] == 2
+
+    release.set()
+    _wait_until(lambda: len(done) == 4)
+    dispatcher.shutdown()
+    assert dispatcher.stats()["user_code/create"]["queue_depth"] == 0
+
+
+def test_duplicate_events_are_handled_once(tmp_path: Path):
+    release = threading.Event()
+    calls: list[Path] = []
+
+    def handle_rpc(path: Path, func) -> None:
+        calls.append(path)
+        release.wait(timeout=5)
+
+    dispatcher = RequestDispatcher(app_rpc_dir=tmp_path, handle_rpc=handle_rpc)
+    path = _request_file(tmp_path, "job/create", "req")
+    for _ in range(3):
+        dispatcher.dispatch(path, func=None)
+
+    release.set()
+    dispatcher.shutdown()
+    assert calls == [path]
+
+
+def test_senders_are_served_round_robin(tmp_path: Path):
+    release = threading.Event()
+    order: list[str] = []
+
+    def handle_rpc(path: Path, func) -> None:
+        if path.stem == "block":
+            release.wait(timeout=5)
+            return
+        order.append(path.parent.name)
+
+    dispatcher = RequestDispatcher(
+        app_rpc_dir=tmp_path, handle_rpc=handle_rpc, max_workers=1
+    )
+    # Occupy the only worker, so the requests below are queued
+    dispatcher.dispatch(_request_file(tmp_path, "job/get_all", "block"), func=None)
+    for i in range(4):
+        path = _request_file(
+            tmp_path, "job/create", f"req{i}", sender="a@openmined.org"
+        )
+        dispatcher.dispatch(path, func=None)
+    for i in range(2):
+        path = _request_file(
+            tmp_path, "job/create", f"req{i}", sender="b@openmined.org"
+        )
+        dispatcher.dispatch(path, func=None)
+    assert dispatcher.queued_by_sender() == {"a@openmined.org": 4, "b@openmined.org": 2}
+
+    release.set()
+    _wait_until(lambda: len(order) == 6)
+    dispatcher.shutdown()
+    # b is not starved by the requests a queued first
+    assert order[:4] == ["a@openmined.org", "b@openmined.org"] * 2
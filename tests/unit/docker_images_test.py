@@ -0,0 +1,92 @@
+import pytest
+
+from syft_rds.models import DockerRuntimeConfig, Runtime, RuntimeKind
+from syft_rds.syft_runtime.docker_images import (
+    DockerCLI,
+    DockerImageBuilder,
+    ImageBuildError,
+    ImageBuildStatus,
+    get_image_tag,
+)
+from tests.utils import create_fake_docker, fake_docker_calls
+
+
+def _runtime(dockerfile_content: str = "FROM python:3.12", **config) -> Runtime:
+    return Runtime(
+        name="test_docker",
+        kind=RuntimeKind.DOCKER,
+        config=DockerRuntimeConfig(dockerfile_content=dockerfile_content, **config),
+    )
+
+
+@pytest.fixture
+def fake_docker(tmp_path):
+    return create_fake_docker(tmp_path / "fake_docker")
+
+
+def test_image_tag_follows_dockerfile():
+    runtime = _runtime()
+    tag = get_image_tag(runtime)
+    assert tag.startswith("test_docker:")
+    assert get_image_tag(_runtime()) == tag
+    assert get_image_tag(_runtime("FROM python:3.13")) != tag
+
+    # An explicit tag is replaced, a registry port is kept
+    assert get_image_tag(_runtime(image_name="repo:latest")).startswith("repo:")
+    assert get_image_tag(_runtime(image_name="host:5000/image")).startswith(
+        "host:5000/image:"
+    )
+
+
+def test_successful_probes_are_cached(fake_docker):
+    cli = DockerCLI(binary=str(fake_docker), probe_ttl=60)
+    assert cli.daemon_running()
+    assert cli.daemon_running()
+    assert fake_docker_calls(fake_docker) == ["info"]
+
+    # Missing images are probed again, so a finished build is seen directly
+    assert not cli.image_exists("image:1")
+    assert not cli.image_exists("image:1")
+    assert fake_docker_calls(fake_docker).count("image inspect image:1") == 2
+
+    cli.probe_ttl = 0
+    (fake_docker.parent / "daemon_down").touch()
+    assert not cli.daemon_running()
+
+
+def test_prebuild_runs_in_background(fake_docker):
+    builder = DockerImageBuilder(DockerCLI(binary=str(fake_docker)))
+    runtime = _runtime()
+    hold = fake_docker.parent / "hold_build"
+    hold.touch()
+
+    future = builder.prebuild(runtime)
+    assert builder.status(runtime).status == ImageBuildStatus.BUILDING
+    # A second prebuild, or a job needing the image, waits for the same build
+    assert builder.prebuild(runtime) is future
+
+    hold.unlink()
+    assert builder.ensure_image(runtime) == get_image_tag(runtime)
+    assert future.done()
+    assert builder.status(runtime).status == ImageBuildStatus.BUILT
+    assert sum(call.startswith("build") for call in fake_docker_calls(fake_docker)) == 1
+    builder.close()
+
+
+def test_failed_build_is_retried(fake_docker):
+    builder = DockerImageBuilder(DockerCLI(binary=str(fake_docker)))
+    runtime = _runtime()
+    fail = fake_docker.parent / "fail_build"
+    fail.touch()
+
+    with pytest.raises(ImageBuildError) as exc_info:
+        builder.prebuild(runtime).result(timeout=30)
+    assert "build failed" in exc_info.value.stderr
+    build = builder.status(runtime)
+    assert build.status == ImageBuildStatus.FAILED
+    assert "build failed" in build.error
+
+    fail.unlink()
+    builder.ensure_image(runtime)
+    assert builder.status(runtime).status == ImageBuildStatus.BUILT
+    builder.close()
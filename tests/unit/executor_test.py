@@ -0,0 +1,71 @@
+import json
+import os
+import subprocess
+import sys
+import time
+import uuid
+
+from syft_rds.server.executor import JobLeases
+
+
+def test_lease_claim_is_exclusive(tmp_path):
+    uid = uuid.uuid4()
+    leases = JobLeases(tmp_path)
+    other = JobLeases(tmp_path)
+
+    assert leases.claim(uid)
+    assert not other.claim(uid)
+    assert not leases.is_expired(uid)
+
+    leases.release(uid)
+    assert not leases.exists(uid)
+    assert other.claim(uid)
+
+
+def test_lease_of_dead_owner_expires(tmp_path):
+    uid = uuid.uuid4()
+    leases = JobLeases(tmp_path)
+    assert leases.claim(uid)
+
+    # Simulate a lease left behind by a server process that has exited
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    path = tmp_path / f"{uid}.lease"
+    owner = json.loads(path.read_text())
+    path.write_text(json.dumps({**owner, "owner_id": "old", "pid": process.pid}))
+
+    restarted = JobLeases(tmp_path)
+    assert restarted.is_expired(uid)
+    assert restarted.claim(uid)
+    assert json.loads(path.read_text())["owner_id"] == restarted.owner_id
+
+
+def test_lease_expires_without_renewal(tmp_path):
+    uid = uuid.uuid4()
+    leases = JobLeases(tmp_path, ttl=60)
+    other = JobLeases(tmp_path, ttl=60)
+    assert leases.claim(uid)
+
+    # The owner is alive, but has not renewed the lease within the ttl
+    stale = time.time() - 120
+    os.utime(tmp_path / f"{uid}.lease", (stale, stale))
+    assert other.is_expired(uid)
+
+    leases.renew([uid])
+    assert not other.is_expired(uid)
+    assert not other.claim(uid)
+
+
+def test_lease_renewed_during_takeover_is_kept(tmp_path, monkeypatch):
+    uid = uuid.uuid4()
+    leases = JobLeases(tmp_path)
+    other = JobLeases(tmp_path)
+    assert leases.claim(uid)
+
+    # The lease looked expired, but was renewed before the rename
+    monkeypatch.setattr(other, "is_expired", lambda uid: True)
+    assert not other.claim(uid)
+    assert json.loads((tmp_path / f"{uid}.lease").read_text())["owner_id"] == (
+        leases.owner_id
+    )
+    assert [path.name for path in tmp_path.iterdir()] == [f"{uid}.lease"]
@@ -0,0 +1,53 @@
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative import time of the `syft_rds` package itself, in microseconds.
+# Generous to stay stable on slow CI machines, importing the client eagerly takes ~600ms.
+IMPORT_TIME_BUDGET_US = 50_000
+
+# Heavy dependencies that should only be loaded when the client or display is used
+DEFERRED_MODULES = ["IPython", "jinja2", "syft_rds.client", "syft_rds.models"]
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Cumulative import time in microseconds per module, from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("statement", ["import syft_rds", "import syft_rds.cli"])
+def test_import_does_not_load_deferred_modules(statement: str):
+    times = _import_times(statement)
+    loaded = [module for module in DEFERRED_MODULES if module in times]
+    assert loaded == []
+
+
+def test_import_time_budget():
+    times = _import_times("import syft_rds")
+    assert times["syft_rds"] < IMPORT_TIME_BUDGET_US
+
+
+def test_lazy_public_api():
+    import syft_rds
+
+    assert "init_session" in dir(syft_rds)
+    from syft_rds import SyftBoxClient, init_session
+    from syft_rds.client.rds_client import init_session as client_init_session
+
+    assert init_session is client_init_session
+    assert SyftBoxClient.__name__ == "Client"
+    with pytest.raises(AttributeError):
+        syft_rds.does_not_exist
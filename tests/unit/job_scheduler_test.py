@@ -0,0 +1,114 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from uuid import UUID, uuid4
+
+from syft_rds.client.job_scheduler import JobResources, JobScheduler
+from syft_rds.models import JobStatus
+
+
+@dataclass
+class FakeJob:
+    created_by: str
+    name: str = "job"
+    status: JobStatus = JobStatus.approved
+    uid: UUID = field(default_factory=uuid4)
+
+
+class FakeClient:
+    def __init__(self):
+        self.started: list[FakeJob] = []
+        self.on_exit: dict[UUID, callable] = {}
+        self.lock = threading.Lock()
+
+    def run_private(self, job, blocking, on_exit, **kwargs):
+        with self.lock:
+            self.started.append(job)
+            self.on_exit[job.uid] = on_exit
+        return job
+
+    def finish(self, job) -> None:
+        self.on_exit.pop(job.uid)(job)
+
+
+def _wait_until(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_scheduler_limits_parallel_jobs_and_is_fair():
+    client = FakeClient()
+    scheduler = JobScheduler(client, max_parallel=2)
+    a_jobs = [FakeJob(created_by="a@openmined.org") for _ in range(4)]
+    b_jobs = [FakeJob(created_by="b@openmined.org") for _ in range(2)]
+    urgent = FakeJob(created_by="c@openmined.org")
+
+    # Hold the scheduler while queueing, so the start order is not racing the submits
+    with scheduler._cond:
+        scheduler.submit_many(a_jobs)
+        scheduler.submit_many(b_jobs)
+        scheduler.submit(urgent, priority=10)
+        assert scheduler.position(urgent) == 0
+        assert scheduler.position(b_jobs[0]) == 2
+
+    _wait_until(lambda: len(client.started) == 2)
+    time.sleep(0.05)
+    assert client.started == [urgent, a_jobs[0]]
+    assert scheduler.stats()["running"] == 2
+
+    while len(client.started) < 7:
+        running = list(client.on_exit)
+        job = next(j for j in client.started if j.uid == running[0])
+        client.finish(job)
+        _wait_until(lambda: len(client.on_exit) == min(2, 7 - scheduler.finished))
+
+    # Submitters take turns within a priority
+    assert [j.created_by[0] for j in client.started[1:]] == list("ababaa")
+    for uid in list(client.on_exit):
+        client.finish(next(j for j in client.started if j.uid == uid))
+    assert scheduler.wait(timeout=5)
+    assert scheduler.stats()["finished"] == 7
+    scheduler.shutdown()
+
+
+def test_scheduler_cpu_budget():
+    client = FakeClient()
+    scheduler = JobScheduler(
+        client,
+        cpu_budget=4,
+        job_resources=lambda job: JobResources(cpus=3 if job.name == "big" else 1),
+    )
+    big = FakeJob(created_by="a@openmined.org", name="big")
+    small = [FakeJob(created_by="a@openmined.org") for _ in range(2)]
+    scheduler.submit(big)
+    scheduler.submit_many(small)
+
+    # 3 + 1 CPUs fit, the second small job waits for a CPU
+    _wait_until(lambda: len(client.started) == 2)
+    time.sleep(0.05)
+    assert len(client.started) == 2
+    assert scheduler.position(small[1]) == 0
+
+    client.finish(big)
+    _wait_until(lambda: len(client.started) == 3)
+    assert scheduler.cancel(small[1]) is False
+    scheduler.shutdown()
+
+
+def test_scheduler_on_exit_gets_finished_job():
+    client = FakeClient()
+    scheduler = JobScheduler(client)
+    job = FakeJob(created_by="a@openmined.org")
+    exited = []
+    scheduler.submit(job, on_exit=exited.append)
+    _wait_until(lambda: len(client.started) == 1)
+
+    finished = FakeJob(
+        created_by=job.created_by, status=JobStatus.job_run_finished, uid=job.uid
+    )
+    client.finish(finished)
+
+    assert exited == [finished]
+    scheduler.shutdown()
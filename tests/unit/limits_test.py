@@ -0,0 +1,193 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from syft_rds.models import (
+    DockerRuntimeConfig,
+    JobConfig,
+    PythonRuntimeConfig,
+    ResourceLimits,
+    Runtime,
+    RuntimeKind,
+)
+from syft_rds.syft_runtime.limits import (
+    PROCESS_FILE_NAME,
+    JobMonitor,
+    RLimit,
+    get_rlimits,
+    read_job_usage,
+    stop_orphaned_job,
+    with_rlimits,
+)
+from syft_rds.syft_runtime.reaper import wait_for_exit
+from syft_rds.syft_runtime.runners import DockerRunner
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="resource limits need POSIX"
+)
+
+
+def _job_config(tmp_path: Path, limits: ResourceLimits) -> JobConfig:
+    runtime = Runtime(kind=RuntimeKind.PYTHON, config=PythonRuntimeConfig())
+    config = JobConfig(
+        function_folder=tmp_path,
+        args=["main.py"],
+        runtime=runtime,
+        job_folder=tmp_path / "job",
+        limits=limits,
+    )
+    config.logs_dir.mkdir(parents=True)
+    config.output_dir.mkdir()
+    return config
+
+
+def _start(
+    code: str, job_config: JobConfig, rlimits: list[RLimit] | None = None
+) -> subprocess.Popen:
+    return subprocess.Popen(
+        with_rlimits([sys.executable, "-c", code], rlimits or []),
+        stderr=open(job_config.logs_dir / "stderr.log", "w"),
+        cwd=job_config.output_dir,
+        start_new_session=True,
+    )
+
+
+def _running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    # An orphan that was killed may not be reaped yet
+    stat = Path(f"/proc/{pid}/stat")
+    return not (stat.exists() and stat.read_text().rsplit(")", 1)[1].split()[0] == "Z")
+
+
+def test_merge_takes_stricter_limits():
+    runtime_limits = ResourceLimits(cpus=4, memory_mb=2048, timeout=600)
+    dataset_limits = ResourceLimits(memory_mb=512, timeout=3600, max_open_files=64)
+
+    merged = runtime_limits.merge(dataset_limits)
+
+    assert merged == ResourceLimits(
+        cpus=4, memory_mb=512, timeout=600, max_open_files=64
+    )
+    assert runtime_limits.merge(None) == runtime_limits
+
+
+def test_docker_limits_keep_defaults():
+    config = DockerRuntimeConfig(
+        dockerfile_content="FROM python:3.12", limits={"timeout": 10}
+    )
+    runner = DockerRunner(handlers=[], update_job_status_callback=None)
+
+    assert config.limits.timeout == 10
+    assert config.limits.memory_mb == 1024
+    assert runner._get_resource_limit_args(config.limits) == [
+        "--memory",
+        "1024m",
+        "--cpus",
+        "1.0",
+        "--pids-limit",
+        "100",
+        "--ulimit",
+        "nofile=50:50",
+        "--ulimit",
+        f"fsize={10 * 1024 * 1024}:{10 * 1024 * 1024}",
+    ]
+
+
+def test_get_rlimits():
+    import resource
+
+    rlimits = get_rlimits(
+        ResourceLimits(cpu_seconds=10, max_file_size_mb=1, max_processes=5)
+    )
+
+    assert (resource.RLIMIT_CPU, 10, 11) in rlimits
+    assert (resource.RLIMIT_FSIZE, 1024 * 1024, 1024 * 1024) in rlimits
+    # The process limit counts all processes of the user, it is not set
+    assert len(rlimits) == 2
+    assert get_rlimits(ResourceLimits()) == []
+
+
+def test_rlimits_applied_to_job(tmp_path):
+    job_config = _job_config(tmp_path, ResourceLimits(max_file_size_mb=1))
+    rlimits = get_rlimits(job_config.limits)
+
+    process = _start(
+        "open('big.bin', 'wb').write(b'0' * 2 * 1024 * 1024)",
+        job_config,
+        rlimits=rlimits,
+    )
+
+    assert wait_for_exit(process) != 0
+    assert (job_config.output_dir / "big.bin").stat().st_size <= 1024 * 1024
+
+
+def test_timeout_kills_process_group(tmp_path):
+    job_config = _job_config(tmp_path, ResourceLimits(timeout=1))
+    pid_file = tmp_path / "child.pid"
+    process = _start(
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(pid_file)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(60)\n",
+        job_config,
+    )
+    monitor = JobMonitor(process, job_config, grace_period=1)
+
+    start = time.monotonic()
+    wait_for_exit(process)
+    usage = monitor.finish()
+
+    assert time.monotonic() - start < 10
+    assert usage.timed_out
+    assert (
+        "exceeding its timeout of 1s"
+        in (job_config.logs_dir / "stderr.log").read_text()
+    )
+    # Processes started by the job are killed with it
+    child_pid = int(pid_file.read_text())
+    deadline = time.monotonic() + 5
+    while _running(child_pid) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _running(child_pid)
+
+
+def test_usage_recorded(tmp_path):
+    job_config = _job_config(tmp_path, ResourceLimits())
+    process = _start(
+        "import time\n"
+        "data = bytearray(64 * 1024 * 1024)\n"
+        "end = time.process_time() + 0.3\n"
+        "while time.process_time() < end: pass\n"
+        "open('result.bin', 'wb').write(b'0' * 1000)\n",
+        job_config,
+    )
+    monitor = JobMonitor(process, job_config)
+
+    assert wait_for_exit(process) == 0
+    usage = monitor.finish()
+
+    assert not usage.timed_out
+    assert usage.cpu_seconds >= 0.25
+    assert usage.peak_rss_mb >= 64
+    assert usage.wall_seconds >= usage.cpu_seconds * 0.9
+    assert usage.bytes_written >= 1000
+    assert read_job_usage(job_config.logs_dir) == usage
+
+
+def test_orphaned_job_stopped(tmp_path):
+    job_config = _job_config(tmp_path, ResourceLimits())
+    process = _start("import time; time.sleep(60)", job_config)
+    # The server that started the job crashed, only its process file is left
+    JobMonitor(process, job_config)
+
+    assert stop_orphaned_job(job_config.logs_dir, grace_period=1)
+    assert wait_for_exit(process) != 0
+    assert not (job_config.logs_dir / PROCESS_FILE_NAME).exists()
+    assert not stop_orphaned_job(job_config.logs_dir)
@@ -0,0 +1,179 @@
+import gzip
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from syft_rds.syft_runtime.log_files import (
+    LogRotator,
+    follow_log_files,
+    open_job_log,
+    read_log,
+    rotate_log,
+    rotated_log_path,
+)
+from syft_rds.syft_runtime.log_pump import POLL, LogPump
+from syft_rds.syft_runtime.runners import read_job_errors
+
+
+def test_rotate_log_keeps_backups(tmp_path: Path):
+    log_path = tmp_path / "stdout.log"
+    for i in range(4):
+        log_path.write_text(f"run {i}\n")
+        rotate_log(log_path, backups=2)
+
+    assert log_path.read_text() == ""
+    assert gzip.open(rotated_log_path(log_path, 1), "rt").read() == "run 3\n"
+    assert gzip.open(rotated_log_path(log_path, 2), "rt").read() == "run 2\n"
+    assert not rotated_log_path(log_path, 3).exists()
+
+
+def test_rotator_caps_log_of_running_job(tmp_path: Path):
+    log_path = tmp_path / "stdout.log"
+    rotator = LogRotator(check_interval=0.05)
+    rotator.watch(log_path, max_bytes=10_000, backups=1)
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import time\nfor i in range(40):\n    print('x' * 999)\n    time.sleep(0.01)",
+        ],
+        stdout=open_job_log(log_path),
+    )
+    sizes = []
+    while process.poll() is None:
+        rotator.check()
+        sizes.append(log_path.stat().st_size)
+        time.sleep(0.01)
+    rotator.unwatch(log_path)
+
+    assert process.returncode == 0
+    assert rotated_log_path(log_path, 1).exists()
+    # The log restarts after each rotation, it can overshoot by one check interval
+    assert max(sizes) < 40_000
+    assert log_path.stat().st_size < 40_000
+
+
+def test_log_pump_follows_rotated_log(tmp_path: Path):
+    pump = LogPump(mode=POLL)
+    lines = []
+    stream = pump.open(tmp_path / "stdout.log", lines.extend)
+    stream.writer.write("before\n")
+    time.sleep(0.1)
+    rotate_log(tmp_path / "stdout.log")
+    stream.writer.write("after\n")
+    stream.close()
+    pump.stop()
+
+    assert lines == ["before\n", "after\n"]
+
+
+def test_read_job_errors_keeps_tail_of_large_log(tmp_path: Path):
+    stderr_log_path = tmp_path / "stderr.log"
+    with open(stderr_log_path, "w") as f:
+        for i in range(10_000):
+            f.write(f"line {i}\n")
+        f.write("y" * 10_000 + "\n")
+        f.write("Traceback: failed\n")
+
+    return_code, error_message = read_job_errors(stderr_log_path, 1, max_lines=5)
+
+    lines = error_message.split("\n")
+    assert return_code == 1
+    assert lines[0] == "[... 9997 earlier lines truncated ...]"
+    assert lines[1:4] == ["line 9997", "line 9998", "line 9999"]
+    assert lines[4].endswith("[line truncated]") and len(lines[4]) < 5000
+    assert lines[5] == "Traceback: failed"
+
+
+def test_read_job_errors_caps_error_lines(tmp_path: Path):
+    stderr_log_path = tmp_path / "stderr.log"
+    stderr_log_path.write_text("".join(f"ERROR: failure {i}\n" for i in range(100)))
+
+    return_code, error_message = read_job_errors(stderr_log_path, 0, max_error_lines=3)
+
+    assert return_code == 1
+    assert error_message.split("\n") == [
+        "ERROR: failure 0",
+        "ERROR: failure 1",
+        "ERROR: failure 2",
+        "[... 97 more error lines truncated ...]",
+    ]
+
+
+def _write_numbered_log(path: Path, count: int) -> None:
+    path.write_text("".join(f"line {i}\n" for i in range(count)))
+
+
+def test_read_log_pages(tmp_path: Path):
+    log_path = tmp_path / "stdout.log"
+    _write_numbered_log(log_path, 1000)
+
+    text, offset = "", 0
+    while True:
+        page = read_log(log_path, offset=offset, limit=100)
+        if not page.text:
+            break
+        # Pages end at line boundaries
+        assert page.text.endswith("\n")
+        text += page.text
+        offset = page.end
+    assert text == log_path.read_text()
+
+    last = read_log(log_path, offset=-20)
+    assert last.text == "line 998\nline 999\n"
+    assert last.end == last.size == log_path.stat().st_size
+    assert read_log(tmp_path / "missing.log").text == ""
+
+
+def test_read_log_tail_and_grep(tmp_path: Path):
+    log_path = tmp_path / "stdout.log"
+    _write_numbered_log(log_path, 100_000)
+    with open(log_path, "a") as f:
+        f.write("no newline")
+
+    tail = read_log(log_path, tail=3)
+    assert tail.text == "line 99998\nline 99999\nno newline"
+    assert tail.end == tail.size
+
+    assert read_log(log_path, grep=r"line 9999\d$").text == "".join(
+        f"line {i}\n" for i in range(99990, 100_000)
+    )
+    assert read_log(log_path, grep="line 5", tail=2).text == (
+        "line 59998\nline 59999\n"
+    )
+    first_page = read_log(log_path, grep="line 1", limit=100)
+    assert first_page.text == "line 1\nline 10\nline 11\nline 12\n"
+    assert first_page.end <= 100
+
+
+def test_follow_log_files(tmp_path: Path):
+    paths = {"stdout": tmp_path / "stdout.log", "stderr": tmp_path / "stderr.log"}
+    paths["stdout"].write_text("old\n")
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys, time\n"
+            "for i in range(3):\n"
+            "    print(i, flush=True)\n"
+            "    time.sleep(0.05)\n"
+            "sys.stderr.write('done')\n",
+        ],
+        stdout=open(paths["stdout"], "a"),
+        stderr=open(paths["stderr"], "w"),
+    )
+
+    lines = list(
+        follow_log_files(
+            paths, lambda: process.poll() is None, from_start=False, poll_interval=0.01
+        )
+    )
+
+    assert lines == [
+        ("stdout", "0\n"),
+        ("stdout", "1\n"),
+        ("stdout", "2\n"),
+        ("stderr", "done\n"),
+    ]
@@ -0,0 +1,144 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from syft_rds.syft_runtime.log_pump import INOTIFY, PIPE, POLL, LogPump, _default_mode
+from syft_rds.syft_runtime.output_handlers import TextUI, parse_log_level
+
+
+def _available_modes() -> list[str]:
+    modes = [POLL]
+    if hasattr(os, "mkfifo"):
+        modes.append(PIPE)
+    if _default_mode() == INOTIFY:
+        modes.append(INOTIFY)
+    return modes
+
+
+@pytest.fixture(params=_available_modes())
+def pump(request):
+    pump = LogPump(mode=request.param)
+    yield pump
+    pump.stop()
+
+
+class _Collector:
+    def __init__(self):
+        self.batches: list[list[str]] = []
+        self.received_at: list[float] = []
+        self._cond = threading.Condition()
+
+    def __call__(self, lines: list[str]) -> None:
+        with self._cond:
+            self.batches.append(lines)
+            self.received_at.append(time.monotonic())
+            self._cond.notify_all()
+
+    @property
+    def lines(self) -> list[str]:
+        return [line for batch in self.batches for line in batch]
+
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.lines) >= count, timeout)
+
+
+def test_lines_streamed_and_written_to_log(pump: LogPump, tmp_path: Path):
+    collector = _Collector()
+    log_path = tmp_path / "stdout.log"
+    stream = pump.open(log_path, collector)
+
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "import sys, time\n"
+            "print('first')\n"
+            "sys.stdout.write('partial')\n"
+            "sys.stdout.flush()\n"
+            "time.sleep(0.2)\n"
+            "print(' line')\n"
+            "sys.stdout.write('no newline at the end')\n",
+        ],
+        stdout=stream.writer,
+    )
+    assert collector.wait_for(1)
+    assert collector.lines == ["first\n"]
+    assert process.wait(timeout=10) == 0
+    stream.close()
+
+    assert collector.lines == ["first\n", "partial line\n", "no newline at the end\n"]
+    assert log_path.read_text() == "first\npartial line\nno newline at the end"
+
+
+def test_lines_delivered_in_batches(pump: LogPump, tmp_path: Path):
+    collector = _Collector()
+    stream = pump.open(tmp_path / "stdout.log", collector)
+
+    process = subprocess.Popen(
+        [sys.executable, "-c", "for i in range(5000): print(i)"],
+        stdout=stream.writer,
+    )
+    assert process.wait(timeout=10) == 0
+    stream.close()
+
+    assert collector.lines == [f"{i}\n" for i in range(5000)]
+    assert len(collector.batches) < 500
+
+
+def test_line_latency(pump: LogPump, tmp_path: Path):
+    collector = _Collector()
+    stream = pump.open(tmp_path / "stdout.log", collector)
+
+    latencies = []
+    for i in range(20):
+        written_at = time.monotonic()
+        stream.writer.write(f"line {i}\n")
+        assert collector.wait_for(i + 1)
+        latencies.append(collector.received_at[-1] - written_at)
+    stream.close()
+
+    latencies.sort()
+    # The median line is delivered within 10ms, polling adds up to one interval
+    limit = 0.01 + (pump.poll_interval if pump.mode == POLL else 0)
+    assert latencies[len(latencies) // 2] < limit
+    assert latencies[-1] < 0.5
+
+
+def _pump_threads() -> int:
+    return sum(thread.name == "rds-log-pump" for thread in threading.enumerate())
+
+
+def test_many_streams_one_thread(pump: LogPump, tmp_path: Path):
+    threads_before = _pump_threads()
+    collectors = [_Collector() for _ in range(20)]
+    streams = [
+        pump.open(tmp_path / f"{i}.log", collector)
+        for i, collector in enumerate(collectors)
+    ]
+    for i, stream in enumerate(streams):
+        stream.writer.write(f"stream {i}\n")
+    for i, (stream, collector) in enumerate(zip(streams, collectors)):
+        assert collector.wait_for(1)
+        stream.close()
+        assert collector.lines == [f"stream {i}\n"]
+
+    assert _pump_threads() == threads_before + 1
+
+
+def test_batched_stderr_formatted_per_line(capsys):
+    ui = TextUI()
+    ui._job_running = True
+    ui.on_job_progress("", "ERROR: failed\nplain\nWARNING: careful\n")
+
+    assert capsys.readouterr().out == (
+        "[ERROR] ERROR: failed\n[STDERR] plain\n[WARNING] WARNING: careful\n"
+    )
+    assert parse_log_level("2025-10-13 21:39:04.550 | INFO     | m:f:1 - x")[0] == (
+        "INFO"
+    )
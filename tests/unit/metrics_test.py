@@ -0,0 +1,39 @@
+from syft_rds.utils.metrics import MetricsRegistry, RollingHistogram
+
+
+def test_rolling_histogram_snapshot():
+    histogram = RollingHistogram(window_seconds=60, buckets=(0.1, 1.0))
+    for value in [0.05, 0.2, 0.3, 2.0]:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 2.55
+    assert snapshot["window"]["count"] == 4
+    assert snapshot["window"]["p50"] == 0.2
+    assert snapshot["window"]["max"] == 2.0
+    assert histogram.cumulative_buckets() == [("0.1", 1), ("1.0", 3), ("+Inf", 4)]
+
+
+def test_rolling_histogram_window_expires_samples():
+    histogram = RollingHistogram(window_seconds=0)
+    histogram.observe(1.0)
+
+    snapshot = histogram.snapshot()
+    # All-time counters are kept, the rolling window is empty
+    assert snapshot["count"] == 1
+    assert snapshot["window"]["count"] == 0
+    assert "p50" not in snapshot["window"]
+
+
+def test_registry_prometheus_format():
+    registry = MetricsRegistry()
+    registry.observe("handler", "job/create", 0.01)
+    registry.observe("handler", "job/get_all", 0.02)
+
+    assert set(registry.snapshot()["handler"]) == {"job/create", "job/get_all"}
+
+    text = registry.to_prometheus()
+    assert text.count("# TYPE syft_rds_handler_seconds histogram") == 1
+    assert 'syft_rds_handler_seconds_bucket{endpoint="job/create",le="+Inf"} 1' in text
+    assert 'syft_rds_handler_seconds_count{endpoint="job/get_all"} 1' in text
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+from uuid import uuid4
+
+from syft_event.types import Response
+
+from syft_rds.models import JobCreate, JobCreateMany
+from syft_rds.server.middleware import (
+    DEFAULT_RATE_LIMIT_COSTS,
+    RateLimit,
+    RateLimitMiddleware,
+    RequestContext,
+)
+
+DO_EMAIL = "do@openmined.org"
+DS_EMAIL = "ds@openmined.org"
+
+
+def _ctx(endpoint: str, **params) -> RequestContext:
+    return RequestContext(
+        endpoint=endpoint,
+        request=SimpleNamespace(sender=DS_EMAIL),
+        app=SimpleNamespace(client=SimpleNamespace(email=DO_EMAIL)),
+        params=params,
+    )
+
+
+def _create_many(n: int) -> RequestContext:
+    items = [JobCreate(name=f"job-{i}", user_code_id=uuid4()) for i in range(n)]
+    return _ctx("/job/create_many", create_request=JobCreateMany(items=items))
+
+
+def _accepted(middleware: RateLimitMiddleware, ctx: RequestContext) -> bool:
+    result = middleware(ctx, lambda: "ok")
+    if isinstance(result, Response):
+        assert result.status_code == 429
+        return False
+    return True
+
+
+def test_create_many_charges_job_create_per_job():
+    middleware = RateLimitMiddleware(
+        {"job/create": RateLimit(per_minute=6, burst=10)}, DEFAULT_RATE_LIMIT_COSTS
+    )
+
+    assert _accepted(middleware, _create_many(4))
+    assert _accepted(middleware, _create_many(4))
+    # Two job/create tokens are left, the whole batch is rejected
+    assert not _accepted(middleware, _create_many(3))
+    assert _accepted(middleware, _ctx("/job/create"))
+    assert _accepted(middleware, _ctx("/job/create"))
+    assert not _accepted(middleware, _ctx("/job/create"))
+
+
+def test_batch_over_burst_waits_for_full_bucket():
+    middleware = RateLimitMiddleware(
+        {"job/create": RateLimit(per_minute=6, burst=10)}, DEFAULT_RATE_LIMIT_COSTS
+    )
+
+    assert _accepted(middleware, _ctx("/job/create"))
+    assert not _accepted(middleware, _create_many(25))
+
+    middleware = RateLimitMiddleware(
+        {"job/create": RateLimit(per_minute=6, burst=10)}, DEFAULT_RATE_LIMIT_COSTS
+    )
+    # Accepted with a full bucket, later requests wait until the extra jobs are paid back
+    assert _accepted(middleware, _create_many(25))
+    response = middleware(_ctx("/job/create"), lambda: "ok")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 150
@@ -0,0 +1,66 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from syft_rds.syft_runtime import reaper as reaper_module
+from syft_rds.syft_runtime.reaper import ProcessReaper
+
+
+def _spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code])
+
+
+@pytest.mark.parametrize("use_pidfd", [True, False])
+def test_reaper_calls_back_on_exit(use_pidfd: bool, monkeypatch):
+    if not use_pidfd:
+        monkeypatch.setattr(reaper_module, "_pidfd_open", lambda pid: None)
+
+    done = threading.Event()
+    return_codes: dict[int, int] = {}
+    lock = threading.Lock()
+    processes = [_spawn(f"import sys; sys.exit({i})") for i in range(20)]
+
+    def on_exit(process: subprocess.Popen) -> None:
+        with lock:
+            return_codes[process.pid] = process.returncode
+            if len(return_codes) == len(processes):
+                done.set()
+
+    reaper = ProcessReaper(poll_interval=0.05)
+    for process in processes:
+        reaper.watch(process, on_exit)
+
+    assert done.wait(timeout=30)
+    assert return_codes == {p.pid: i for i, p in enumerate(processes)}
+    assert len(reaper) == 0
+    reaper.stop()
+
+
+def test_reaper_does_not_wait_for_slow_callbacks():
+    slow_started = threading.Event()
+    release = threading.Event()
+    fast_done = threading.Event()
+
+    def slow_callback(process: subprocess.Popen) -> None:
+        slow_started.set()
+        release.wait(timeout=10)
+
+    reaper = ProcessReaper(callback_workers=2)
+    reaper.watch(_spawn("pass"), slow_callback)
+    assert slow_started.wait(timeout=10)
+
+    # Another exit is reaped while the first callback is still running
+    start = time.monotonic()
+    reaper.watch(_spawn("pass"), lambda process: fast_done.set())
+    assert fast_done.wait(timeout=10)
+    assert time.monotonic() - start < 5
+
+    release.set()
+    reaper.stop()
+    process = _spawn("pass")
+    with pytest.raises(RuntimeError):
+        reaper.watch(process, lambda process: None)
+    process.wait()
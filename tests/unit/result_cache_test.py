@@ -0,0 +1,117 @@
+import os
+import time
+from pathlib import Path
+
+from syft_rds.models import (
+    JobConfig,
+    PythonRuntimeConfig,
+    Runtime,
+    RuntimeKind,
+)
+from syft_rds.syft_runtime.result_cache import (
+    CACHED_RESULT_FILE_NAME,
+    META_FILE_NAME,
+    ResultCache,
+    remove_cached_result,
+)
+
+
+def _job_config(tmp_path: Path, job_name: str, **runtime_config) -> JobConfig:
+    code_dir = tmp_path / "code"
+    if not code_dir.exists():
+        code_dir.mkdir()
+        (code_dir / "main.py").write_text("print('hello')")
+    data_dir = tmp_path / "data"
+    if not data_dir.exists():
+        data_dir.mkdir()
+        (data_dir / "data.csv").write_text("a,b\n1,2\n")
+    runtime = Runtime(
+        kind=RuntimeKind.PYTHON, config=PythonRuntimeConfig(**runtime_config)
+    )
+    return JobConfig(
+        function_folder=code_dir,
+        args=["main.py"],
+        data_path=data_dir,
+        runtime=runtime,
+        job_folder=tmp_path / "jobs" / job_name,
+    )
+
+
+def _run_job(job_config: JobConfig, output: str) -> None:
+    job_config.logs_dir.mkdir(parents=True)
+    job_config.output_dir.mkdir()
+    (job_config.logs_dir / "stdout.log").write_text("hello\n")
+    (job_config.output_dir / "result.txt").write_text(output)
+
+
+def test_fingerprint(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    job_config = _job_config(tmp_path, "job_1")
+    key = cache.fingerprint(job_config)
+
+    # The job folder does not matter, its inputs do
+    assert cache.fingerprint(_job_config(tmp_path, "job_2")) == key
+    assert cache.fingerprint(_job_config(tmp_path, "job_2", use_uv=False)) != key
+    (tmp_path / "code" / "__pycache__").mkdir()
+    (tmp_path / "code" / "__pycache__" / "main.pyc").write_bytes(b"0")
+    assert cache.fingerprint(job_config) == key
+
+    (tmp_path / "code" / "main.py").write_text("print('other')")
+    code_key = cache.fingerprint(job_config)
+    assert code_key != key
+
+    # Changing the dataset invalidates the result
+    data_file = tmp_path / "data" / "data.csv"
+    data_file.write_text("a,b\n1,3\n")
+    os.utime(data_file, ns=(0, time.time_ns() + 10**9))
+    assert cache.fingerprint(job_config) != code_key
+
+
+def test_store_and_materialize(tmp_path):
+    cache = ResultCache(tmp_path / "cache")
+    job_config = _job_config(tmp_path, "job_1")
+    key = cache.fingerprint(job_config)
+    _run_job(job_config, "42")
+
+    assert cache.materialize(key, job_config) is None
+    assert cache.store(key, job_config, job_uid="job_1")
+
+    new_config = _job_config(tmp_path, "job_2")
+    assert cache.materialize(key, new_config) == "job_1"
+    result = new_config.output_dir / "result.txt"
+    assert result.read_text() == "42"
+    assert (new_config.logs_dir / "stdout.log").read_text() == "hello\n"
+    # Editing the results of a job, e.g. to redact them, does not change the cache
+    result.write_text("redacted")
+    assert (cache.result_dir(key) / "output/result.txt").read_text() == "42"
+
+    # A job that runs itself first removes the cached results
+    remove_cached_result(new_config)
+    assert not new_config.output_dir.exists()
+    assert not (new_config.job_path / CACHED_RESULT_FILE_NAME).exists()
+    assert (cache.result_dir(key) / "output/result.txt").read_text() == "42"
+
+
+def _fill_result(cache: ResultCache, key: str, size: int, last_used: float) -> None:
+    result_dir = cache.result_dir(key)
+    (result_dir / "output").mkdir(parents=True)
+    (result_dir / "output" / "data").write_bytes(b"0" * size)
+    (result_dir / META_FILE_NAME).write_text("{}")
+    os.utime(result_dir / META_FILE_NAME, (last_used, last_used))
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=2500)
+    now = time.time()
+    _fill_result(cache, "oldest", 1000, now - 300)
+    _fill_result(cache, "old", 1000, now - 200)
+    _fill_result(cache, "recent", 1000, now)
+
+    assert cache.evict(exclude=["oldest"]) == ["old"]
+    assert cache.has("oldest") and cache.has("recent")
+    assert cache.size() <= 2500
+
+    # Results larger than the budget are not cached
+    big_config = _job_config(tmp_path, "big")
+    _run_job(big_config, "0" * 3000)
+    assert not cache.store("big", big_config, job_uid="big")
@@ -0,0 +1,52 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from syft_rds.client.singleflight import SingleFlight
+
+
+def test_identical_calls_are_coalesced():
+    group = SingleFlight[int]()
+    n_calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def fn() -> int:
+        nonlocal n_calls
+        n_calls += 1
+        started.set()
+        release.wait(timeout=5)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(group.do, "key", fn)
+        started.wait(timeout=5)
+        followers = [pool.submit(group.do, "key", fn) for _ in range(4)]
+        # Give followers time to join the in-flight call
+        while group.metrics()["coalesced"] < 4:
+            time.sleep(0.01)
+        release.set()
+
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert results == [42] * 5
+    assert n_calls == 1
+    assert group.metrics() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_errors_are_shared_and_key_is_released():
+    group = SingleFlight[int]()
+
+    def fail() -> int:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        group.do("key", fail)
+
+    # Completed calls are not cached
+    assert group.do("key", lambda: 1) == 1
+    assert group.do("other", lambda: 2) == 2
+    assert group.metrics()["executed"] == 3
+    assert group.in_flight() == 0
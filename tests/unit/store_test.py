@@ -55,3 +55,22 @@ def test_search_record(mock_user_store: YAMLStore, mock_user_1: MockUserSchema):
     results = mock_user_store.text_search(query=mock_user_1.email, fields=["email"])
     assert len(results) == 1
     assert results[0] == mock_user_1
+
+
+def test_generation_changes_on_write(
+    mock_user_store: YAMLStore, mock_user_1: MockUserSchema
+):
+    initial = mock_user_store.generation
+    record = mock_user_store.create(mock_user_1)
+    created = mock_user_store.generation
+    assert created != initial
+
+    mock_user_store.get_all()
+    assert mock_user_store.generation == created
+
+    mock_user_store.update(record.uid, mock_user_1)
+    updated = mock_user_store.generation
+    assert updated != created
+
+    mock_user_store.delete(record.uid)
+    assert mock_user_store.generation != updated
@@ -0,0 +1,67 @@
+import os
+import time
+from pathlib import Path
+
+from syft_rds.syft_runtime.uv_env_cache import UvEnvCache
+
+PYPROJECT = """
+[project]
+name = "job"
+version = "0.1.0"
+dependencies = ["colorama>=0.4.0"]
+"""
+
+
+def _make_project(path: Path, pyproject: str = PYPROJECT, lock: str = "") -> Path:
+    path.mkdir(parents=True)
+    (path / "pyproject.toml").write_text(pyproject)
+    if lock:
+        (path / "uv.lock").write_text(lock)
+    (path / "main.py").write_text("print('hello')")
+    return path
+
+
+def _fill_env(cache: UvEnvCache, key: str, size: int, last_used: float) -> None:
+    env_dir = cache.env_dir(key)
+    env_dir.mkdir(parents=True)
+    (env_dir / "data").write_bytes(b"0" * size)
+    cache._touch(key)
+    os.utime(cache.last_used_dir / key, (last_used, last_used))
+
+
+def test_env_key(tmp_path):
+    cache = UvEnvCache(tmp_path / "cache")
+    job_1 = _make_project(tmp_path / "job_1", lock="lock-1")
+    job_2 = _make_project(tmp_path / "job_2", lock="lock-1")
+    job_3 = _make_project(tmp_path / "job_3", lock="lock-2")
+
+    # Only the dependency files matter, not the code or its location
+    (job_2 / "main.py").write_text("print('other')")
+    assert cache.env_key(job_1) == cache.env_key(job_2)
+    assert cache.env_key(job_1) != cache.env_key(job_3)
+    assert cache.env_key(job_1) != cache.env_key(job_1, python_version="3.12")
+
+    # Not cached: no pyproject.toml, or a project that is installed itself
+    assert cache.env_key(tmp_path / "job_4") is None
+    packaged = _make_project(
+        tmp_path / "job_5",
+        pyproject=PYPROJECT + '\n[build-system]\nrequires = ["hatchling"]\n',
+    )
+    assert cache.env_key(packaged) is None
+    assert cache.use(packaged) is None
+
+
+def test_evict_least_recently_used(tmp_path):
+    cache = UvEnvCache(tmp_path / "cache", max_bytes=2500, min_idle=60)
+    now = time.time()
+    _fill_env(cache, "oldest", 1000, now - 300)
+    _fill_env(cache, "old", 1000, now - 200)
+    _fill_env(cache, "recent", 1000, now)
+
+    assert cache.evict() == ["oldest"]
+    assert cache.size() == 2000
+
+    cache.max_bytes = 0
+    # Environments used within min_idle seconds or excluded are kept
+    assert cache.evict(exclude=["old"]) == []
+    assert sorted(path.name for path in cache.envs_dir.iterdir()) == ["old", "recent"]
@@ -0,0 +1,133 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from syft_rds.models import ResourceLimits
+from syft_rds.syft_runtime.limits import get_rlimits
+from syft_rds.syft_runtime.reaper import ProcessReaper
+from syft_rds.syft_runtime.warm_pool import WarmPool, warm_pool_supported
+
+pytestmark = pytest.mark.skipif(
+    not warm_pool_supported(), reason="warm pools need os.fork"
+)
+
+# A module that takes a while to import, the import is skipped by warm jobs
+HEAVY_MODULE = "pandas"
+
+
+@pytest.fixture
+def pool():
+    pool = WarmPool(cmd=[sys.executable], preload_modules=[HEAVY_MODULE], size=2)
+    yield pool
+    pool.close()
+
+
+def _write_script(tmp_path: Path, code: str) -> Path:
+    script = tmp_path / "main.py"
+    script.write_text(code)
+    return script
+
+
+def _spawn(pool: WarmPool, tmp_path: Path, script: Path, *args: str, **kwargs):
+    logs_dir = tmp_path / f"logs_{time.monotonic_ns()}"
+    logs_dir.mkdir()
+    stdout_path = logs_dir / "stdout.log"
+    stderr_path = logs_dir / "stderr.log"
+    process = pool.spawn(
+        argv=[str(script), *args],
+        env={**os.environ, "JOB_VAR": "value"},
+        stdout_path=stdout_path,
+        stderr_path=stderr_path,
+        cwd=str(tmp_path),
+        **kwargs,
+    )
+    return process, stdout_path, stderr_path
+
+
+def test_warm_job_output_and_exit_code(pool: WarmPool, tmp_path: Path):
+    script = _write_script(
+        tmp_path,
+        "import os, sys\n"
+        "print('args', sys.argv[1:], os.environ['JOB_VAR'], os.getcwd())\n"
+        "print('preloaded', 'pandas' in sys.modules)\n"
+        "print('an error', file=sys.stderr)\n"
+        "sys.exit(3)\n",
+    )
+    process, stdout_path, stderr_path = _spawn(pool, tmp_path, script, "--n", "1")
+
+    assert process.wait(timeout=30) == 3
+    stdout = stdout_path.read_text().splitlines()
+    assert stdout == [
+        f"args ['--n', '1'] value {tmp_path}",
+        "preloaded True",
+    ]
+    assert stderr_path.read_text() == "an error\n"
+
+
+def test_warm_jobs_are_isolated(pool: WarmPool, tmp_path: Path):
+    # A job changing module state does not affect later jobs
+    script = _write_script(
+        tmp_path,
+        "import pandas\nprint(hasattr(pandas, 'tampered'))\npandas.tampered = True\n",
+    )
+    for _ in range(3):
+        process, stdout_path, _ = _spawn(pool, tmp_path, script)
+        assert process.wait(timeout=30) == 0
+        assert stdout_path.read_text() == "False\n"
+
+
+def test_warm_job_exception_and_reaper(pool: WarmPool, tmp_path: Path):
+    script = _write_script(tmp_path, "raise ValueError('boom')\n")
+    process, _, stderr_path = _spawn(pool, tmp_path, script)
+
+    done = threading.Event()
+    reaper = ProcessReaper()
+    reaper.watch(process, lambda process: done.set())
+    assert done.wait(timeout=30)
+    reaper.stop()
+
+    assert process.returncode == 1
+    assert "ValueError: boom" in stderr_path.read_text()
+
+
+def test_warm_job_limits_and_usage(pool: WarmPool, tmp_path: Path):
+    script = _write_script(
+        tmp_path,
+        "import resource, time\n"
+        "print(resource.getrlimit(resource.RLIMIT_NOFILE))\n"
+        "end = time.process_time() + 0.2\n"
+        "while time.process_time() < end: pass\n",
+    )
+    rlimits = get_rlimits(ResourceLimits(max_open_files=64))
+    process, stdout_path, _ = _spawn(pool, tmp_path, script, rlimits=rlimits)
+
+    assert process.wait(timeout=30) == 0
+    assert stdout_path.read_text() == "(64, 64)\n"
+    # The warm worker reports the job's usage
+    assert process._rusage.ru_utime + process._rusage.ru_stime >= 0.15
+    assert process._rusage.ru_maxrss > 0
+
+
+@pytest.mark.benchmark
+def test_warm_start_is_faster_than_cold(pool: WarmPool, tmp_path: Path):
+    """Benchmark: job start latency, from spawning until the job's code has run."""
+    script = _write_script(tmp_path, f"import {HEAVY_MODULE}\n")
+    pool.start()
+
+    cold_times, warm_times = [], []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-u", str(script)], check=True)
+        cold_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        process, _, _ = _spawn(pool, tmp_path, script)
+        assert process.wait(timeout=30) == 0
+        warm_times.append(time.perf_counter() - start)
+
+    assert min(warm_times) < min(cold_times) / 2
@@ -1,3 +1,6 @@
+import sys
+from pathlib import Path
+
 from syft_rds.client.rds_client import RDSClient
 from syft_rds.models import Dataset
 from tests.conftest import (
@@ -17,3 +20,52 @@ def create_dataset(do_rds_client: RDSClient, name: str) -> Dataset:
         tags=["test"],
     )
     return data
+
+
+FAKE_DOCKER_SCRIPT = """#!{python}
+import sys
+import time
+from pathlib import Path
+
+state = Path({state!r})
+args = sys.argv[1:]
+with open(state / "calls.log", "a") as f:
+    f.write(" ".join(args[:3]) + "\\n")
+
+images = state / "images"
+if args[0] == "info":
+    sys.exit(1 if (state / "daemon_down").exists() else 0)
+if args[:2] == ["image", "inspect"]:
+    sys.exit(0 if (images / args[2].replace("/", "_")).exists() else 1)
+if args[0] == "build":
+    sys.stdin.read()
+    # Builds block while the test holds the gate
+    while (state / "hold_build").exists():
+        time.sleep(0.01)
+    if (state / "fail_build").exists():
+        print("build failed", file=sys.stderr)
+        sys.exit(2)
+    images.mkdir(exist_ok=True)
+    (images / args[2].replace("/", "_")).touch()
+    sys.exit(0)
+if args[0] == "run":
+    print("ran", args[-1])
+    sys.exit(0)
+sys.exit(1)
+"""
+
+
+def create_fake_docker(path: Path) -> Path:
+    """A fake `docker` executable that records its calls in `path / "calls.log"`."""
+    path.mkdir(parents=True, exist_ok=True)
+    binary = path / "docker"
+    binary.write_text(FAKE_DOCKER_SCRIPT.format(python=sys.executable, state=str(path)))
+    binary.chmod(0o755)
+    return binary
+
+
+def fake_docker_calls(binary: Path) -> list[str]:
+    calls_path = binary.parent / "calls.log"
+    if not calls_path.exists():
+        return []
+    return calls_path.read_text().splitlines()